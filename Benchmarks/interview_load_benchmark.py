@@ -0,0 +1,566 @@
+"""
+Interview Load Benchmark - end-to-end throughput of the WhatsApp interview flow
+
+Drives the Flask app (in-process test client, or a local HTTP server) with
+synthetic candidates that walk the whole interview, one message per turn:
+
+- free:       new user -> language (-1) -> name (1) ... stage 13 -> feedback (14) -> closing (15)
+- borderline: same path with vague answers, aiming at the REVIEW IN 6 MONTHS
+              band so the stage 13.5 second chance is exercised
+- demo:       new user -> language (-1) -> RESTART -> mode (0.6) -> DEMO language/profile
+              (DEMO) -> privacy (0.5) -> availability (3) ... 15
+
+Replies to outbound messages go to a fake Twilio sender (nothing leaves the
+machine). With --models stub (default) the sentiment, similarity and grammar
+models are replaced by deterministic stubs, so the numbers measure framework
+overhead (Flask, sessions, scoring, detection logic); --models real loads the
+real models to measure inference on top of it.
+
+Reports req/s, p50/p95/p99 latency per stage (stage the message arrived at),
+CPU time and RSS growth.
+
+Usage:
+    python Benchmarks/interview_load_benchmark.py [--candidates 50] [--concurrency 8]
+        [--mix free,borderline,demo] [--models stub|real] [--transport test-client|http]
+        [--async] [--model-latency-ms 0] [--json results.json]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ----------------------------------------------------------------------
+# Synthetic candidates
+# ----------------------------------------------------------------------
+
+STRONG_TECH = [
+    "I design data pipelines in Python and SQL, orchestrated with Airflow. Each task is idempotent, "
+    "we use Docker images in CI/CD and unit tests with pytest, and the jobs run on AWS with Spark "
+    "because the volume grew past what a single database could handle.",
+    "For APIs I use Django REST framework and FastAPI. I validate input with schemas, add caching "
+    "with Redis where reads dominate, and monitor latency with Prometheus. When an endpoint was slow "
+    "I profiled the ORM queries and added indexes, which reduced p95 latency by half.",
+    "I deploy with Terraform and Kubernetes. Every change goes through code review, automated tests "
+    "and a staging environment. When we had an incident I wrote the postmortem, added alerts and "
+    "a rollback runbook so the team could recover faster next time.",
+]
+WEAK_TECH = [
+    "I have worked with that a little in some projects and it was fine, although I do not remember every detail.",
+    "I think it is useful for the work and I would learn more about it when the project needs it.",
+    "I used it once with my team, it was okay and we finished the task on time.",
+]
+STRONG_ENGLISH = [
+    "In my current role I collaborate daily with a distributed team in the United States. I lead "
+    "technical discussions, write design documents and present results to stakeholders, which has "
+    "made me comfortable communicating complex ideas clearly in English.",
+    "Last year I mentored two junior engineers. We had weekly sessions where I explained our "
+    "architecture, reviewed their code and encouraged them to ask questions. Both of them now own "
+    "important services, which I consider one of my best achievements.",
+]
+WEAK_ENGLISH = [
+    "I speak english in my work sometimes with the clients and it is okay for me.",
+    "I like to work with people and I learn every day new things in the job.",
+]
+STRONG_SOFT = (
+    "When two teammates disagreed about the architecture, I organized a meeting where each one explained "
+    "their proposal. We listened, compared trade-offs with data and agreed on a solution. Communication, "
+    "empathy and shared ownership helped the team deliver on time."
+)
+WEAK_SOFT = "I try to talk with the people when there is a problem and we solve it together somehow."
+FINAL_ANSWER = (
+    "I want to join because the position matches my experience and I am motivated to keep growing, "
+    "learning from the team and contributing to products that have real impact."
+)
+
+PERSONAS = {
+    'free': {'tech': STRONG_TECH, 'english': STRONG_ENGLISH, 'soft': STRONG_SOFT},
+    'borderline': {'tech': WEAK_TECH, 'english': WEAK_ENGLISH, 'soft': WEAK_SOFT},
+    'demo': {'tech': STRONG_TECH, 'english': STRONG_ENGLISH, 'soft': STRONG_SOFT},
+}
+
+
+class Candidate:
+    """
+    Chooses the next message from the session state the bot left behind
+
+    Free-text answers get a candidate-specific sentence so the inference
+    caches see realistic (mostly distinct) texts.
+    """
+
+    def __init__(self, index, persona):
+        self.index = index
+        self.persona = persona
+        self.phone = f"whatsapp:+1555{index:07d}"
+        self.answers = PERSONAS[persona]
+        self.turns = 0
+        self.restarted = False
+
+    def _unique(self, text):
+        return f"{text} For example, in project number {self.index} this was also the case."
+
+    def next_message(self, session, retry):
+        """
+        Message for the current state, or None when the interview is over
+
+        Args:
+            session: Bot session (None before the first message)
+            retry: How many times the current stage already got a message
+        """
+        if session is None:
+            return 'hello'
+        stage = session.get('stage', 0)
+        demo_mode = session.get('demo_mode')
+
+        if demo_mode in ('select_language', 'select_profile'):
+            # Language, then profile (Ana / Luis)
+            return '1' if demo_mode == 'select_language' else str(1 + self.index % 2)
+        if stage == -1:
+            return '1'  # English
+        if stage == 0.6:
+            return '1' if self.persona == 'demo' else '2'  # DEMO / Free mode
+        if stage == 1 and self.persona == 'demo' and not self.restarted:
+            # DEMO is offered by the mode menu that RESTART opens
+            self.restarted = True
+            return 'RESTART'
+        if stage == 0.5:
+            return 'yes'
+        if stage == 0:
+            return 'hello'
+        if stage == 1:
+            return f"My name is Candidate {self.index}"
+        if stage == 2:
+            return str(1 + self.index % 6)
+        if stage == 3:
+            return 'Immediate'
+        if stage == 4:
+            return f"{3000 + (self.index % 10) * 250} USD per month"
+        if stage == 5:
+            return '1'
+        if stage == 6:
+            return 'Mexico City (UTC-6)'
+        if stage in (7, 8, 9):
+            pool = self.answers['tech']
+            return self._unique(pool[(int(stage) - 7 + retry) % len(pool)])
+        if stage in (10, 11):
+            pool = self.answers['english']
+            return self._unique(pool[(int(stage) - 10 + retry) % len(pool)])
+        if stage == 12:
+            return self._unique(self.answers['soft'])
+        if stage == 13:
+            return self._unique(FINAL_ANSWER)
+        if stage == 13.5:
+            return 'SKIP'
+        if stage == 14:
+            return "The interview was clear and friendly, thank you for the experience and the quick feedback."
+        if stage == 15:
+            return 'thanks' if retry == 0 else None
+        return None
+
+
+# ----------------------------------------------------------------------
+# Stubs
+# ----------------------------------------------------------------------
+
+def _digest(text):
+    return int.from_bytes(hashlib.sha1(text.encode('utf-8')).digest()[:8], 'big')
+
+
+class StubSentimentPredictor:
+    """Deterministic stand-in for SentimentPredictor (same output format)"""
+
+    EMOTIONS = ('enthusiastic', 'confident', 'neutral', 'anxious', 'frustrated')
+    SENTIMENTS = {'enthusiastic': 'positive', 'confident': 'positive', 'neutral': 'neutral',
+                  'anxious': 'negative', 'frustrated': 'negative'}
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self.backend = 'stub'
+
+    def predict_batch(self, texts):
+        if self.latency:
+            time.sleep(self.latency)
+        results = []
+        for text in texts:
+            h = _digest(text)
+            emotion = self.EMOTIONS[h % len(self.EMOTIONS)]
+            confidence = 0.55 + (h % 40) / 100
+            sentiment = self.SENTIMENTS[emotion]
+            probabilities = {key: (confidence if key == sentiment else (1 - confidence) / 2)
+                             for key in ('positive', 'neutral', 'negative')}
+            results.append({'sentiment': sentiment, 'emotion': emotion,
+                            'confidence': confidence, 'probabilities': probabilities})
+        return results
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+
+class StubSentenceEncoder:
+    """Deterministic stand-in for SentenceTransformer.encode (unit vectors seeded by the text)"""
+
+    def __init__(self, dimension=384, latency_ms=0.0):
+        self.dimension = dimension
+        self.latency = latency_ms / 1000.0
+        self.embedding_cache_key = f"stub-{dimension}"
+
+    def encode(self, sentences, convert_to_numpy=True, convert_to_tensor=False, batch_size=32,
+               show_progress_bar=False, **kwargs):
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = np.vstack([
+            np.random.default_rng(_digest(text)).standard_normal(self.dimension).astype(np.float32)
+            for text in sentences
+        ]) if sentences else np.zeros((0, self.dimension), dtype=np.float32)
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        if convert_to_tensor:
+            import torch
+            vectors = torch.from_numpy(vectors)
+        return vectors[0] if single else vectors
+
+
+class FakeTwilioSender:
+    """Outbound sender that records messages instead of calling the Twilio API"""
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self._sent = defaultdict(int)
+        self._condition = threading.Condition()
+        self.total = 0
+
+    def send(self, from_, to, body):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._condition:
+            self._sent[to] += 1
+            self.total += 1
+            self._condition.notify_all()
+            return f"SM{self.total:032d}"
+
+    def sent_to(self, to):
+        with self._condition:
+            return self._sent[to]
+
+    def wait_for(self, to, count, timeout):
+        with self._condition:
+            return self._condition.wait_for(lambda: self._sent[to] >= count, timeout)
+
+
+# ----------------------------------------------------------------------
+# App setup
+# ----------------------------------------------------------------------
+
+def load_app(args):
+    """Import the bot with benchmark-friendly settings and install fakes/stubs"""
+    # Before import: nothing loaded eagerly, no real Twilio client, sessions in memory
+    os.environ['MODEL_PRELOAD'] = ''
+    os.environ['GRAMMAR_WARMUP'] = ''
+    os.environ['WEBHOOK_ASYNC'] = ''
+    os.environ['SESSION_STORE'] = args.session_store
+    os.environ['TWILIO_ACCOUNT_SID'] = 'your_account_sid'
+    os.environ['TWILIO_AUTH_TOKEN'] = 'your_auth_token'
+    if not args.verbose:
+        # Structured logs: the log writer keeps its own reference to stdout, so quiet() does not cover them
+        os.environ['LOG_LEVEL'] = 'ERROR'
+
+    with quiet(not args.verbose):
+        import src.whatsapp_bot as bot
+        from src.inbound_processor import InboundProcessor
+        from src.outbound_dispatcher import OutboundDispatcher
+
+    if args.models == 'stub':
+        bot.model_registry.register(
+            'sentiment', lambda: StubSentimentPredictor(args.model_latency_ms), pinned=True
+        )
+        bot.model_registry.register(
+            'similarity', lambda language: StubSentenceEncoder(latency_ms=args.model_latency_ms),
+            variants=bot.detector_module.BERT_LANGUAGES
+        )
+        bot.grammar_service.check = lambda text: []
+
+    sender = FakeTwilioSender(args.twilio_latency_ms)
+    bot.outbound = OutboundDispatcher(
+        sender, default_from=bot.TWILIO_WHATSAPP_NUMBER, workers=4,
+        rate_per_second=1e6, burst=10 ** 6, max_retries=0
+    )
+    if args.async_webhook:
+        bot.inbound_processor = InboundProcessor(
+            bot.process_inbound_message, workers=args.webhook_workers, max_pending=10 ** 6
+        )
+    return bot, sender
+
+
+@contextlib.contextmanager
+def quiet(enabled):
+    """
+    Silence what still writes straight to stdout (Modules/ print() lines,
+    third-party libraries); it would dominate the measurements. The bot's
+    own logging goes through the structured logger and is turned down
+    with LOG_LEVEL instead.
+
+    sys.stdout is process-wide: use it once around all the worker threads,
+    never per thread.
+    """
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class TestClientTransport:
+    def __init__(self, app):
+        self.app = app
+
+    def post(self, data):
+        response = self.app.test_client().post('/webhook', data=data)
+        return response.status_code
+
+
+class HttpTransport:
+    """Real sockets: werkzeug server on a background thread, urllib client"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/webhook"
+        threading.Thread(target=self.server.serve_forever, name="load-test-http", daemon=True).start()
+
+    def post(self, data):
+        body = urllib.parse.urlencode(data).encode('utf-8')
+        with urllib.request.urlopen(urllib.request.Request(self.url, data=body), timeout=120) as response:
+            response.read()
+            return response.status
+
+    def close(self):
+        self.server.shutdown()
+
+
+# ----------------------------------------------------------------------
+# Run
+# ----------------------------------------------------------------------
+
+def run_candidate(bot, transport, sender, candidate, args, record):
+    """
+    Walk one candidate through the interview
+
+    Returns:
+        dict: path (stage labels in order), turns, error (None if finished)
+    """
+    path = []
+    last_stage, retries = None, 0
+    for _ in range(args.max_turns):
+        session = bot.sessions.get(candidate.phone)
+        stage = bot.stage_label(session) if session is not None else '0'
+        retries = retries + 1 if stage == last_stage else 0
+        if retries >= 4 and stage != '15':
+            return {'path': path, 'turns': len(path), 'error': f"stuck at stage {stage}"}
+        last_stage = stage
+
+        message = candidate.next_message(session, retries)
+        if message is None:
+            return {'path': path, 'turns': len(path), 'error': None}
+
+        candidate.turns += 1
+        data = {
+            'From': candidate.phone,
+            'Body': message,
+            'MessageSid': f"SM{candidate.index:08d}{candidate.turns:06d}",
+        }
+        replies_before = sender.sent_to(candidate.phone)
+        start = time.perf_counter()
+        status = transport.post(data)
+        if args.async_webhook:
+            # End-to-end: until the first reply part reaches the (fake) Twilio API
+            sender.wait_for(candidate.phone, replies_before + 1, timeout=args.reply_timeout)
+        elapsed = time.perf_counter() - start
+        record(stage, elapsed, status)
+        path.append(stage)
+    return {'path': path, 'turns': len(path), 'error': 'max turns reached'}
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def rss_mb():
+    """Current resident set size (Linux), else peak RSS, else None"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def stage_sort_key(label):
+    try:
+        return (0, float(label))
+    except ValueError:
+        return (1, label)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--candidates', type=int, default=50, help='Synthetic candidates to run')
+    parser.add_argument('--concurrency', type=int, default=8, help='Candidates talking at the same time')
+    parser.add_argument('--mix', default='free,borderline,demo', help='Personas, assigned round-robin')
+    parser.add_argument('--models', choices=('stub', 'real'), default='stub',
+                        help='Stub predictors (framework overhead) or the real models')
+    parser.add_argument('--model-latency-ms', type=float, default=0.0,
+                        help='Simulated inference time per stub call')
+    parser.add_argument('--transport', choices=('test-client', 'http'), default='test-client')
+    parser.add_argument('--async', dest='async_webhook', action='store_true',
+                        help='Fast-ack webhook; latency measured until the reply is sent')
+    parser.add_argument('--webhook-workers', type=int, default=8, help='Workers for --async')
+    parser.add_argument('--twilio-latency-ms', type=float, default=0.0, help='Simulated Twilio API time')
+    parser.add_argument('--session-store', default='memory', help='SESSION_STORE backend for the run')
+    parser.add_argument('--warmup', type=int, default=1, help='Candidates run before measuring')
+    parser.add_argument('--max-turns', type=int, default=60, help='Safety limit per candidate')
+    parser.add_argument('--reply-timeout', type=float, default=30.0, help='Max wait for an --async reply')
+    parser.add_argument('--json', help='Also write the results to this file')
+    parser.add_argument('--verbose', action='store_true', help="Keep the bot's logging on stdout")
+    args = parser.parse_args()
+
+    personas = [p.strip() for p in args.mix.split(',') if p.strip()]
+    unknown = [p for p in personas if p not in PERSONAS]
+    if unknown:
+        parser.error(f"unknown personas: {', '.join(unknown)} (choose from {', '.join(PERSONAS)})")
+
+    bot, sender = load_app(args)
+    transport = HttpTransport(bot.app) if args.transport == 'http' else TestClientTransport(bot.app)
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(int)
+    lock = threading.Lock()
+
+    def record(stage, elapsed, status):
+        with lock:
+            latencies[stage].append(elapsed)
+            statuses[status] += 1
+
+    def run(index, measure=True):
+        candidate = Candidate(index, personas[index % len(personas)])
+        outcome = run_candidate(bot, transport, sender, candidate, args,
+                                record if measure else (lambda *a: None))
+        outcome['persona'] = candidate.persona
+        return outcome
+
+    with quiet(not args.verbose):
+        # Warm-up: first-use costs (lazy model loads, regex compilation) stay out of the numbers
+        for i in range(args.warmup):
+            run(10 ** 6 + i, measure=False)
+
+        rss_before = rss_mb()
+        cpu_before = time.process_time()
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency), thread_name_prefix="candidate") as pool:
+            outcomes = list(pool.map(run, range(args.candidates)))
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_before
+        rss_after = rss_mb()
+
+    requests_total = sum(len(v) for v in latencies.values())
+    all_latencies = sorted(x for values in latencies.values() for x in values)
+    stages = {}
+    for stage in sorted(latencies, key=stage_sort_key):
+        values = sorted(latencies[stage])
+        stages[stage] = {
+            'requests': len(values),
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': values[-1] * 1000,
+        }
+    failed = [o for o in outcomes if o['error']]
+    results = {
+        'config': vars(args),
+        'candidates': len(outcomes),
+        'completed': len(outcomes) - len(failed),
+        'second_chance': sum(1 for o in outcomes if '13.5' in o['path']),
+        'requests': requests_total,
+        'wall_seconds': wall,
+        'requests_per_second': requests_total / wall if wall else 0.0,
+        'latency_ms': {
+            'p50': percentile(all_latencies, 50) * 1000,
+            'p95': percentile(all_latencies, 95) * 1000,
+            'p99': percentile(all_latencies, 99) * 1000,
+        },
+        'cpu_seconds': cpu,
+        'cpu_ms_per_request': cpu / requests_total * 1000 if requests_total else 0.0,
+        'rss_mb_before': rss_before,
+        'rss_mb_after': rss_after,
+        'rss_mb_growth': (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+        'http_statuses': dict(statuses),
+        'outbound_messages': sender.total,
+        'stages': stages,
+        'failures': [{'persona': o['persona'], 'error': o['error'], 'path': o['path']} for o in failed],
+    }
+
+    print(f"Candidates: {results['completed']}/{results['candidates']} completed "
+          f"({results['second_chance']} through stage 13.5), models={args.models}, "
+          f"transport={args.transport}{' (async)' if args.async_webhook else ''}, concurrency={args.concurrency}")
+    print(f"Requests:   {requests_total} in {wall:.2f}s -> {results['requests_per_second']:.1f} req/s "
+          f"(p50 {results['latency_ms']['p50']:.1f} ms, p95 {results['latency_ms']['p95']:.1f} ms, "
+          f"p99 {results['latency_ms']['p99']:.1f} ms)")
+    print(f"CPU:        {cpu:.2f}s ({results['cpu_ms_per_request']:.2f} ms/request)")
+    if rss_before is not None:
+        print(f"RSS:        {rss_before:.0f} MB -> {rss_after:.0f} MB ({results['rss_mb_growth']:+.1f} MB)")
+    print(f"HTTP:       {dict(statuses)}, outbound messages: {sender.total}\n")
+
+    print(f"{'stage':>6} {'requests':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage, row in stages.items():
+        print(f"{stage:>6} {row['requests']:>9} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+              f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+    if not results['second_chance'] and 'borderline' in personas:
+        print("\n[WARNING] No candidate reached stage 13.5; the borderline answers no longer land in the "
+              "REVIEW IN 6 MONTHS band")
+    for failure in results['failures'][:5]:
+        print(f"[WARNING] {failure['persona']} candidate: {failure['error']} (path: {' > '.join(failure['path'])})")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"\nResults written to {args.json}")
+
+    if isinstance(transport, HttpTransport):
+        transport.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
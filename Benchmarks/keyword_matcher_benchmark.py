@@ -0,0 +1,128 @@
+"""
+Keyword Matcher Benchmark - parity + speed against the previous substring loops
+
+Checks that KeywordMatcher returns exactly the same counts as the
+`sum(1 for kw in keywords if kw in text.lower())` loops it replaced, for every
+keyword table used by the scorers, then times both.
+
+Corpus: Data/sentiment_training/labeled_data.json sentences plus synthetic
+interview answers (sentences mixed with keywords from the tables).
+
+Usage:
+    python Benchmarks/keyword_matcher_benchmark.py [--answers 2000] [--repeat 3]
+"""
+
+import argparse
+import ast
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from Modules.keyword_matcher import KeywordMatcher
+from Modules.english_level_evaluator import ENGLISH_INDICATORS
+from Modules.soft_skills_evaluator import SoftSkillsEvaluator
+import src.whatsapp_inconsistency_detector as detector
+
+
+def load_bot_tables():
+    """Read the keyword tables from whatsapp_bot.py without importing Flask/Twilio"""
+    source = (project_root / "src" / "whatsapp_bot.py").read_text(encoding='utf-8')
+    tables = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            name = getattr(node.targets[0], 'id', None)
+            if name in ('SOFT_SKILLS_KEYWORDS', 'TECHNICAL_KEYWORDS'):
+                tables[name] = ast.literal_eval(node.value)
+    return tables
+
+
+def keyword_tables():
+    bot = load_bot_tables()
+    return {
+        'bot.evaluate_response': bot['TECHNICAL_KEYWORDS'],
+        'bot.evaluate_soft_skills': bot['SOFT_SKILLS_KEYWORDS'],
+        'SoftSkillsEvaluator': SoftSkillsEvaluator().soft_skills_keywords,
+        'EnglishLevelEvaluator': ENGLISH_INDICATORS,
+        'detector.DETECTION_2': detector.DONT_KNOW_PATTERNS,
+        'detector.DETECTION_4': detector.POSITION_KEYWORDS,
+        'detector.DETECTION_9': detector.GENERIC_PATTERNS,
+    }
+
+
+def build_corpus(tables, answers, seed=42):
+    sentences = [
+        item['text'] for item in
+        json.loads((project_root / "Data" / "sentiment_training" / "labeled_data.json").read_text(encoding='utf-8'))
+    ]
+    vocabulary = []
+    for table in tables.values():
+        words = table.values() if isinstance(table, dict) else [table]
+        for group in words:
+            vocabulary.extend(group)
+
+    rng = random.Random(seed)
+    corpus = list(sentences)
+    for _ in range(answers):
+        parts = rng.sample(sentences, k=rng.randint(2, 6))
+        parts += rng.sample(vocabulary, k=rng.randint(0, 12))
+        rng.shuffle(parts)
+        text = ' '.join(parts)
+        corpus.append(text.upper() if rng.random() < 0.1 else text)
+    return corpus
+
+
+def legacy_count(table, text):
+    """The loops being replaced: one lower() + substring scan per keyword"""
+    if isinstance(table, dict):
+        return {category: sum(1 for kw in words if kw.lower() in text.lower()) for category, words in table.items()}
+    return {None: sum(1 for kw in table if kw.lower() in text.lower())}
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--answers', type=int, default=2000, help='Synthetic answers to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    tables = keyword_tables()
+    corpus = build_corpus(tables, args.answers)
+    print(f"Corpus: {len(corpus)} texts, avg {sum(map(len, corpus)) / len(corpus):.0f} chars\n")
+
+    failures = 0
+    print(f"{'table':28} {'keywords':>8} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8}  parity")
+    for name, table in tables.items():
+        matcher = KeywordMatcher(table)
+        mismatches = sum(1 for text in corpus if matcher.count(text) != legacy_count(table, text))
+        failures += mismatches
+
+        legacy_time = best_of(args.repeat, lambda: [legacy_count(table, text) for text in corpus])
+        matcher_time = best_of(args.repeat, lambda: [matcher.count(text) for text in corpus])
+        size = sum(len(v) for v in table.values()) if isinstance(table, dict) else len(table)
+        print(
+            f"{name:28} {size:>8} {legacy_time * 1000:>10.1f} {matcher_time * 1000:>11.1f} "
+            f"{legacy_time / matcher_time:>7.1f}x  {'OK' if not mismatches else f'{mismatches} MISMATCHES'}"
+        )
+
+    print()
+    if failures:
+        print(f"❌ Parity check failed ({failures} mismatching texts)")
+        sys.exit(1)
+    print("✅ Parity check passed for all tables")
+
+
+if __name__ == "__main__":
+    main()
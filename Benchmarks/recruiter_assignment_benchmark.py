@@ -0,0 +1,164 @@
+"""
+Recruiter Assignment Benchmark - parity + speed of RecruiterIndex against the list scans
+
+Parity: assign_batch() must pick the same recruiter, in the same order, as
+the previous implementation (three filtered + sorted lists per candidate,
+linear search by id to update the workload), for Data/recruiters.json and
+for synthetic recruiters. Capacity caps are checked separately (no
+recruiter ever goes over its cap, and the least loaded one is still chosen).
+
+Speed: 1M synthetic candidates across 2000 recruiters by default; the
+previous implementation is timed on a slice and extrapolated.
+
+Usage:
+    python Benchmarks/recruiter_assignment_benchmark.py [--candidates 1000000] [--recruiters 2000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from Modules.recruiter_assignment import assign_batch, RecruiterIndex, UNASSIGNED_ID
+
+AREAS = ["tech", "admin", "marketing", "design", "finance", "data", "backend", "cloud", "content", "product"]
+REGIONS = ["LATAM", "US", "EU", "Remote", "APAC"]
+
+
+def legacy_assign_recruiter(candidate, recruiters):
+    """The list scans being replaced (previous assign_recruiter)"""
+    vacancy_area = candidate.get("vacancy_area", "").lower()
+    location_region = candidate.get("location_region", "").lower()
+    perfect_match = [
+        r for r in recruiters
+        if vacancy_area in [s.lower() for s in r.get("specialties", [])]
+        and location_region in [reg.lower() for reg in r.get("regions", [])]
+    ]
+    if perfect_match:
+        perfect_match.sort(key=lambda r: r.get("active_profiles", 0))
+        return perfect_match[0]
+    specialty_match = [r for r in recruiters if vacancy_area in [s.lower() for s in r.get("specialties", [])]]
+    if specialty_match:
+        specialty_match.sort(key=lambda r: r.get("active_profiles", 0))
+        return specialty_match[0]
+    region_match = [
+        r for r in recruiters
+        if location_region in [reg.lower() for reg in r.get("regions", [])]
+        or "remote" in [reg.lower() for reg in r.get("regions", [])]
+    ]
+    if region_match:
+        region_match.sort(key=lambda r: r.get("active_profiles", 0))
+        return region_match[0]
+    return {"id": UNASSIGNED_ID}
+
+
+def legacy_assign_batch(candidates, recruiters):
+    recruiters_copy = [dict(r) for r in recruiters]
+    chosen = []
+    for candidate in candidates:
+        recruiter = legacy_assign_recruiter(candidate, recruiters_copy)
+        chosen.append(recruiter.get("id"))
+        if recruiter.get("id") != UNASSIGNED_ID:
+            for r in recruiters_copy:
+                if r["id"] == recruiter["id"]:
+                    r["active_profiles"] = r.get("active_profiles", 0) + 1
+                    break
+    return chosen
+
+
+def synthetic_recruiters(n, seed=11):
+    rng = random.Random(seed)
+    return [{
+        "id": f"R{i + 1:05d}",
+        "name": f"Recruiter {i}",
+        # Mayúsculas mezcladas como en los datos reales
+        "specialties": [a.upper() if rng.random() < 0.2 else a for a in rng.sample(AREAS, rng.randint(1, 3))],
+        "regions": rng.sample(REGIONS, rng.randint(1, 2)),
+        "active_profiles": rng.randint(0, 20),
+    } for i in range(n)]
+
+
+def synthetic_candidates(n, seed=13):
+    rng = random.Random(seed)
+    areas = AREAS + ["legal"]  # sin especialista: cae al nivel de región
+    regions = REGIONS + ["Africa"]
+    return [{"name": f"Candidate {i}", "vacancy_area": rng.choice(areas), "location_region": rng.choice(regions)}
+            for i in range(n)]
+
+
+def check_parity(failures):
+    real = json.loads((project_root / "Data" / "recruiters.json").read_text(encoding='utf-8'))
+    for label, recruiters in (("Data/recruiters.json", real), ("synthetic", synthetic_recruiters(60))):
+        candidates = synthetic_candidates(3000)
+        expected = legacy_assign_batch(candidates, recruiters)
+        got = [c["assigned_recruiter"]["id"] for c in assign_batch([dict(c) for c in candidates], recruiters)]
+        if got != expected:
+            failures.append(f"{label}: assign_batch() differs from the list scans")
+
+    recruiters = synthetic_recruiters(60)
+    index = RecruiterIndex(recruiters, capacity=25)
+    for candidate in synthetic_candidates(3000):
+        expected = None
+        area, region = candidate["vacancy_area"].lower(), candidate["location_region"].lower()
+        free = [(r["active_profiles"], pos) for pos, r in enumerate(index.recruiters) if r["active_profiles"] < 25]
+        tiers = (
+            lambda r: area in [s.lower() for s in r["specialties"]] and region in [g.lower() for g in r["regions"]],
+            lambda r: area in [s.lower() for s in r["specialties"]],
+            lambda r: region in [g.lower() for g in r["regions"]] or "remote" in [g.lower() for g in r["regions"]],
+        )
+        for tier in tiers:
+            eligible = [item for item in free if tier(index.recruiters[item[1]])]
+            if eligible:
+                expected = index.recruiters[min(eligible)[1]]["id"]
+                break
+        if index.assign(candidate)["id"] != (expected or UNASSIGNED_ID):
+            failures.append("capacity: assignment differs from the capped brute force")
+            break
+    if any(r["active_profiles"] > 25 for r in index.recruiters):
+        failures.append("capacity: a recruiter went over its cap")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--candidates', type=int, default=1_000_000, help='Synthetic candidates')
+    parser.add_argument('--recruiters', type=int, default=2000, help='Synthetic recruiters')
+    parser.add_argument('--capacity', type=int, default=None, help='Cap per recruiter (default: none)')
+    parser.add_argument('--legacy-sample', type=int, default=500, help='Candidates timed with the list scans')
+    args = parser.parse_args()
+
+    failures = []
+    check_parity(failures)
+
+    recruiters = synthetic_recruiters(args.recruiters)
+    candidates = synthetic_candidates(args.candidates)
+
+    start = time.perf_counter()
+    assigned = assign_batch(candidates, recruiters, capacity=args.capacity)
+    index_time = time.perf_counter() - start
+    unassigned = sum(1 for c in assigned if c["assigned_recruiter"]["id"] == UNASSIGNED_ID)
+
+    sample = candidates[:args.legacy_sample]
+    start = time.perf_counter()
+    legacy_assign_batch(sample, recruiters)
+    legacy_time = (time.perf_counter() - start) * len(candidates) / max(1, len(sample))
+
+    print(f"Candidates x recruiters: {len(candidates):,} x {len(recruiters):,} "
+          f"(capacity: {args.capacity or 'none'}, unassigned: {unassigned:,})\n")
+    print(f"{'RecruiterIndex':24} {index_time:>10.2f} s")
+    print(f"{'list scans (estimated)':24} {legacy_time:>10.0f} s")
+    print(f"{'speedup':24} {legacy_time / index_time:>10.0f}x\n")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Parity check passed (tiers, workload order, capacity caps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Recruiter Solver Benchmark - greedy vs min-cost-flow batch assignment
+
+Runs assign_batch() with solver="greedy" (input order) and solver="flow"
+(whole batch at once) on the same synthetic batch and reports, for each:
+assigned / unassigned candidates, candidates per priority tier (perfect,
+specialty, region), highest workload, and runtime.
+
+Candidates are skewed toward a few popular (area, region) classes and
+recruiters are capped, which is where input order matters: early
+candidates take recruiters that later ones needed.
+
+Usage:
+    python Benchmarks/recruiter_solver_benchmark.py [--candidates 10000] [--recruiters 500] [--capacity 30]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from Modules.recruiter_assignment import assign_batch, _match_tier, UNASSIGNED_ID
+from recruiter_assignment_benchmark import synthetic_recruiters, AREAS, REGIONS
+
+TIER_NAMES = ("perfect", "specialty", "region")
+
+
+def skewed_candidates(n, seed=17):
+    rng = random.Random(seed)
+    areas = AREAS + ["legal"]
+    regions = REGIONS + ["Africa"]
+    area_weights = [1.0 / (i + 1) for i in range(len(areas))]
+    region_weights = [1.0 / (i + 1) for i in range(len(regions))]
+    return [{
+        "name": f"Candidate {i}",
+        "vacancy_area": rng.choices(areas, weights=area_weights)[0],
+        "location_region": rng.choices(regions, weights=region_weights)[0],
+    } for i in range(n)]
+
+
+def quality(assigned, recruiters):
+    tiers = [0, 0, 0]
+    unassigned = 0
+    skills = {r["id"]: ({s.lower() for s in r["specialties"]}, {g.lower() for g in r["regions"]}) for r in recruiters}
+    loads = {}
+    for candidate in assigned:
+        recruiter = candidate["assigned_recruiter"]
+        if recruiter["id"] == UNASSIGNED_ID:
+            unassigned += 1
+            continue
+        specialties, regions = skills[recruiter["id"]]
+        tiers[_match_tier(specialties, regions, candidate["vacancy_area"].lower(),
+                          candidate["location_region"].lower())] += 1
+        loads[recruiter["id"]] = recruiter["active_profiles"]
+    return {
+        "assigned": len(assigned) - unassigned,
+        "unassigned": unassigned,
+        **dict(zip(TIER_NAMES, tiers)),
+        "tier_cost": tiers[1] + 2 * tiers[2],
+        "max_load": max(loads.values(), default=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--candidates', type=int, default=10_000, help='Synthetic candidates')
+    parser.add_argument('--recruiters', type=int, default=500, help='Synthetic recruiters')
+    parser.add_argument('--capacity', type=int, default=30, help='Cap per recruiter (0 = none)')
+    args = parser.parse_args()
+
+    recruiters = synthetic_recruiters(args.recruiters)
+    capacity = args.capacity or None
+
+    results = {}
+    for solver in ("greedy", "flow"):
+        candidates = [dict(c) for c in skewed_candidates(args.candidates)]
+        start = time.perf_counter()
+        assigned = assign_batch(candidates, recruiters, capacity=capacity, solver=solver)
+        elapsed = time.perf_counter() - start
+        results[solver] = {**quality(assigned, recruiters), "seconds": elapsed}
+
+    print(f"Candidates x recruiters: {args.candidates:,} x {args.recruiters:,} (capacity: {capacity or 'none'})\n")
+    metrics = ("assigned", "unassigned") + TIER_NAMES + ("tier_cost", "max_load", "seconds")
+    print(f"{'':12} {'greedy':>10} {'flow':>10}")
+    for metric in metrics:
+        row = [results[solver][metric] for solver in ("greedy", "flow")]
+        cells = [f"{value:>10.2f}" if metric == "seconds" else f"{value:>10,}" for value in row]
+        print(f"{metric:12} {' '.join(cells)}")
+
+    greedy, flow = results["greedy"], results["flow"]
+    print()
+    if (flow["unassigned"], flow["tier_cost"]) > (greedy["unassigned"], greedy["tier_cost"]):
+        print("❌ Flow solution is worse than greedy")
+        sys.exit(1)
+    print(f"✅ Flow assigns {greedy['unassigned'] - flow['unassigned']:,} more candidates "
+          f"(tier cost {greedy['tier_cost']:,} -> {flow['tier_cost']:,})")
+
+
+if __name__ == "__main__":
+    main()
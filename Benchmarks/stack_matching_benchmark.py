@@ -0,0 +1,170 @@
+"""
+Stack Matching Benchmark - parity + speed of StackMatchEngine against the nested loop
+
+Parity: run_inference() (engine) must return exactly the rows of the
+previous profile x vacancy loop for Data/profiles.json + Data/Vacancy.json
+and for a synthetic sample, and top_k() must equal the first k rows of a
+stable sort of that loop by adjusted score.
+
+Speed: top_k() over synthetic profiles x vacancies (100k x 5k by default);
+the legacy loop is timed on a slice and extrapolated.
+
+Usage:
+    python Benchmarks/stack_matching_benchmark.py [--profiles 100000] [--vacancies 5000] [--k 10]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from Modules.emotional_inference_engine import (
+    load_json, calculate_match_score, apply_penalties, generate_message, run_inference
+)
+from Modules.stack_matching_engine import StackMatchEngine, sparse
+
+PROFILES_PATH = project_root / "Data" / "profiles.json"
+VACANCIES_PATH = project_root / "Data" / "Vacancy.json"
+
+MODALITIES = ['Remote', 'Hybrid', 'Onsite']
+ZONES = ['Central', 'North', 'South', 'East', 'West', 'Santo Domingo', 'Medellin', 'Lima']
+
+
+def legacy_rows(profiles, vacancies):
+    """The nested loop being replaced (body of the old run_inference)"""
+    results = []
+    for profile in profiles:
+        for vacancy in vacancies:
+            match_score = calculate_match_score(profile["stack"], vacancy["stack"])
+            penalty = apply_penalties(profile, vacancy)
+            results.append({
+                "name": profile["name"],
+                "vacancy": vacancy["title"],
+                "match_score": round(match_score, 2),
+                "penalty": round(penalty, 2),
+                "adjusted_score": round(match_score - penalty, 2),
+                "emotional_state": profile["emotional_state"],
+                "message": generate_message(profile, match_score, penalty)
+            })
+    return results
+
+
+def legacy_top_k(profiles, vacancies, k):
+    """Top k (vacancy index, unrounded adjusted score) per profile, stable sort of the loop"""
+    top = []
+    for profile in profiles:
+        scored = [
+            (i, calculate_match_score(profile["stack"], v["stack"]) - apply_penalties(profile, v))
+            for i, v in enumerate(vacancies)
+        ]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        top.append(scored[:k])
+    return top
+
+
+def synthetic_data(n_profiles, n_vacancies, n_techs=800, seed=7):
+    rng = random.Random(seed)
+    techs = [f"tech-{i}" for i in range(n_techs)]
+    # Popularidad desigual, como en las vacantes reales
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(n_techs)]
+
+    def stack(low, high):
+        return rng.choices(techs, weights=weights, k=rng.randint(low, high))
+
+    vacancies = [{
+        "title": f"Vacancy {i}",
+        "stack": stack(2, 8),
+        "modality": rng.choice(MODALITIES),
+        "zone": rng.choice(ZONES),
+        **({"urgency": rng.choice(['low', 'medium', 'high'])} if rng.random() < 0.8 else {}),
+    } for i in range(n_vacancies)]
+    profiles = [{
+        "name": f"Candidate {i}",
+        "stack": stack(1, 10) + [f"other-{rng.randint(0, 50)}"],
+        "emotional_state": rng.choice(['Positive', 'Neutral', 'Negative']),
+        "preferred_modality": rng.choice(MODALITIES),
+        "zone": rng.choice(ZONES + ['Unknown']),
+    } for i in range(n_profiles)]
+    return profiles, vacancies
+
+
+def check_parity(k, failures):
+    profiles = load_json(PROFILES_PATH)
+    vacancies = [v for v in load_json(VACANCIES_PATH) if "title" in v]
+    if run_inference(PROFILES_PATH, VACANCIES_PATH) != legacy_rows(profiles, vacancies):
+        failures.append("run_inference() differs from the loop on Data/")
+
+    sample_profiles, sample_vacancies = synthetic_data(300, 400, n_techs=60)
+    for use_sparse in (True, False):
+        if use_sparse and sparse is None:
+            continue
+        engine = StackMatchEngine(sample_vacancies, block_cells=10_000, use_sparse=use_sparse)
+        label = 'sparse' if use_sparse else 'dense'
+
+        rows = []
+        for start, match, penalty in engine.iter_scores(sample_profiles):
+            for offset, (match_row, penalty_row) in enumerate(zip(match.tolist(), penalty.tolist())):
+                profile = sample_profiles[start + offset]
+                rows.extend(
+                    {"name": profile["name"], "vacancy": v["title"], "match_score": round(m, 2),
+                     "penalty": round(p, 2), "adjusted_score": round(m - p, 2),
+                     "emotional_state": profile["emotional_state"], "message": generate_message(profile, m, p)}
+                    for v, m, p in zip(sample_vacancies, match_row, penalty_row)
+                )
+        if rows != legacy_rows(sample_profiles, sample_vacancies):
+            failures.append(f"{label}: iter_scores() differs from the loop on the synthetic sample")
+
+        indices, match, penalty = engine.top_k(sample_profiles, k)
+        expected = legacy_top_k(sample_profiles, sample_vacancies, k)
+        got = [list(zip(i_row, (m - p for m, p in zip(m_row, p_row))))
+               for i_row, m_row, p_row in zip(indices.tolist(), match.tolist(), penalty.tolist())]
+        if got != expected:
+            failures.append(f"{label}: top_k() differs from the sorted loop on the synthetic sample")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--profiles', type=int, default=100_000, help='Synthetic profiles')
+    parser.add_argument('--vacancies', type=int, default=5_000, help='Synthetic vacancies')
+    parser.add_argument('--k', type=int, default=10, help='Vacancies kept per profile')
+    parser.add_argument('--legacy-sample', type=int, default=200, help='Profiles timed with the legacy loop')
+    parser.add_argument('--dense', action='store_true', help='Force the NumPy dense path')
+    args = parser.parse_args()
+
+    failures = []
+    check_parity(args.k, failures)
+
+    profiles, vacancies = synthetic_data(args.profiles, args.vacancies)
+    start = time.perf_counter()
+    engine = StackMatchEngine(vacancies, use_sparse=False if args.dense else None)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.top_k(profiles, args.k)
+    engine_time = time.perf_counter() - start
+
+    sample = profiles[:args.legacy_sample]
+    start = time.perf_counter()
+    legacy_top_k(sample, vacancies, args.k)
+    legacy_time = (time.perf_counter() - start) * len(profiles) / max(1, len(sample))
+
+    print(f"Profiles x vacancies: {len(profiles):,} x {len(vacancies):,} "
+          f"({len(engine.vocabulary)} techs, {'sparse' if engine.use_sparse else 'dense'} backend)\n")
+    print(f"{'engine build':24} {build_time:>10.2f} s")
+    print(f"{'engine top_k':24} {engine_time:>10.2f} s")
+    print(f"{'legacy loop (estimated)':24} {legacy_time:>10.0f} s")
+    print(f"{'speedup':24} {legacy_time / engine_time:>10.0f}x\n")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Parity check passed (run_inference, iter_scores, top_k)")
+
+
+if __name__ == "__main__":
+    main()
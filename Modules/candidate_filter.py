@@ -300,13 +300,15 @@ def generate_feedback_for_rejected(candidate: Dict) -> str:
     return feedback
 
 
-def suggest_alternative_vacancies(candidate: Dict, all_vacancies: List[str]) -> List[str]:
+def suggest_alternative_vacancies(candidate: Dict, all_vacancies: List[str], index=None) -> List[str]:
     """
     Suggest alternative vacancies that might be a better fit
     
     Args:
         candidate: Candidate dictionary
         all_vacancies: List of available vacancy names
+        index: Optional TechnologyIndex; eligible vacancies are then ranked
+            by stack fit with the candidate's profile (looked up by name)
     
     Returns:
         List of recommended alternative vacancies
@@ -332,6 +334,11 @@ def suggest_alternative_vacancies(candidate: Dict, all_vacancies: List[str]) ->
                 if vacancy != current_vacancy:
                     suggestions.append(vacancy)
     
+    # Rank by stack fit: only vacancies sharing technologies are scored
+    if index is not None and suggestions:
+        matches = index.vacancy_matches(candidate.get("name", ""))
+        suggestions.sort(key=lambda vacancy: matches.get(vacancy, 0), reverse=True)
+    
     return suggestions[:3]  # Return top 3 suggestions
 
 
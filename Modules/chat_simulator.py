@@ -41,6 +41,7 @@ from recruiter_assignment import (
     infer_location_region
 )
 from emotional_closure import generate_closing_message
+from technology_index import TechnologyIndex
 
 # NOTE: Timezone locations are now read directly from JSON files
 # profiles.json contains "location" for each candidate
@@ -222,25 +223,29 @@ def run_simulation():
         # Analyze vacancies by MATCH SCORE (not just count) for better recruiter matching
         candidate_data = {}  # candidate name -> {area: total_match_score}
         
-        for entry in entries:
-            name = entry["name"]
-            vacancy_title = entry["vacancy"]
-            match_score = entry.get("match_score", 0)
-            
-            # Only consider meaningful matches (score > 0.2)
-            if match_score < 0.2:
-                continue
-            
-            area = infer_vacancy_area(vacancy_title)
-            
-            if name not in candidate_data:
-                candidate_data[name] = {"areas": {}, "vacancies": []}
-            
-            # Accumulate match scores by area
-            if area not in candidate_data[name]["areas"]:
-                candidate_data[name]["areas"][area] = 0
-            candidate_data[name]["areas"][area] += match_score
-            candidate_data[name]["vacancies"].append(vacancy_title)
+        # Matches come from the technology index: only vacancies sharing a
+        # technology with each candidate are visited, not every log row
+        index = TechnologyIndex.load_or_build("Data/profiles.json", "Data/Vacancy.json")
+        logged_names = dict.fromkeys(entry["name"] for entry in entries)
+        
+        for name in logged_names:
+            for vacancy_title, match_score in index.vacancy_matches(name).items():
+                match_score = round(match_score, 2)  # same precision as the emotional log
+                
+                # Only consider meaningful matches (score > 0.2)
+                if match_score < 0.2:
+                    continue
+                
+                area = infer_vacancy_area(vacancy_title)
+                
+                if name not in candidate_data:
+                    candidate_data[name] = {"areas": {}, "vacancies": []}
+                
+                # Accumulate match scores by area
+                if area not in candidate_data[name]["areas"]:
+                    candidate_data[name]["areas"][area] = 0
+                candidate_data[name]["areas"][area] += match_score
+                candidate_data[name]["vacancies"].append(vacancy_title)
         
         # Create assignment list with weighted area analysis
         candidates_for_assignment = []
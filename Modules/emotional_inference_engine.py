@@ -4,6 +4,11 @@ from datetime import datetime
 import os
 import csv
 
+try:
+    from Modules.stack_matching_engine import StackMatchEngine
+except ImportError:
+    from stack_matching_engine import StackMatchEngine
+
 # Load profiles and vacancies
 def load_json(path):
     with open(path, "r", encoding="utf-8") as f:
@@ -35,34 +40,58 @@ def generate_message(profile, match_score, penalty):
         return f"Hey {profile['name']}! Great energy — this opportunity could be a perfect fit!"
 
 # Main inference loop
-def run_inference(profiles_path, vacancies_path):
+def run_inference(profiles_path, vacancies_path, top_k=None):
+    """
+    Score every profile against every vacancy
+
+    Scores come from the vectorized StackMatchEngine (same values as
+    calculate_match_score / apply_penalties).
+
+    Args:
+        profiles_path: Profiles JSON
+        vacancies_path: Vacancies JSON
+        top_k: Keep only the best k vacancies per profile, best first
+            (None = every pair, in vacancy order)
+
+    Returns:
+        List of result dicts (name, vacancy, scores, emotional_state, message)
+    """
     profiles = load_json(profiles_path)
     vacancies = load_json(vacancies_path)
-    
+
     # Filter out metadata objects
-    vacancies = [v for v in vacancies if "title" in v]
-    
+    engine = StackMatchEngine(vacancies)
+    vacancies = engine.vacancies
+
     results = []
 
-    for profile in profiles:
-        for vacancy in vacancies:
-            match_score = calculate_match_score(profile["stack"], vacancy["stack"])
-            penalty = apply_penalties(profile, vacancy)
-            adjusted_score = round(match_score - penalty, 2)
-            message = generate_message(profile, match_score, penalty)
-
-            results.append({
-                "name": profile["name"],
-                "vacancy": vacancy["title"],
-                "match_score": round(match_score, 2),
-                "penalty": round(penalty, 2),
-                "adjusted_score": adjusted_score,
-                "emotional_state": profile["emotional_state"],
-                "message": message
-            })
+    if top_k is None:
+        for start, match_block, penalty_block in engine.iter_scores(profiles):
+            for row, (match_row, penalty_row) in enumerate(zip(match_block.tolist(), penalty_block.tolist())):
+                profile = profiles[start + row]
+                for vacancy, match_score, penalty in zip(vacancies, match_row, penalty_row):
+                    results.append(build_result(profile, vacancy, match_score, penalty))
+        return results
+
+    indices, match_scores, penalties = engine.top_k(profiles, top_k)
+    for profile, vacancy_row, match_row, penalty_row in zip(
+            profiles, indices.tolist(), match_scores.tolist(), penalties.tolist()):
+        for vacancy_index, match_score, penalty in zip(vacancy_row, match_row, penalty_row):
+            results.append(build_result(profile, vacancies[vacancy_index], match_score, penalty))
 
     return results
 
+def build_result(profile, vacancy, match_score, penalty):
+    return {
+        "name": profile["name"],
+        "vacancy": vacancy["title"],
+        "match_score": round(match_score, 2),
+        "penalty": round(penalty, 2),
+        "adjusted_score": round(match_score - penalty, 2),
+        "emotional_state": profile["emotional_state"],
+        "message": generate_message(profile, match_score, penalty)
+    }
+
 # Save results to markdown log file
 def save_results_to_log(results, profiles, vacancies, timestamp=None):
     if timestamp is None:
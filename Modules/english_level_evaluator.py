@@ -13,6 +13,59 @@ Usage:
     result = evaluator.evaluate_during_conversation(responses, declared_level)
 """
 
+try:
+    from Modules.keyword_matcher import KeywordMatcher
+except ImportError:  # Ejecutado como script desde Modules/
+    from keyword_matcher import KeywordMatcher
+
+# Indicadores por dimensión (substring, como antes)
+ENGLISH_INDICATORS = {
+    # Gramática - nivel avanzado
+    "advanced_structures": [
+        "would have", "could have", "should have",  # Conditionals
+        "which", "whom", "whose",                    # Relative pronouns
+        "despite", "although", "whereas", "however", # Conjunctions
+        "having", "been",                            # Perfect tenses
+        "not only", "but also"                       # Correlatives
+    ],
+    # Gramática - nivel intermedio
+    "intermediate_structures": [
+        "because", "therefore", "thus",
+        "can", "could", "should", "would",
+        "if", "when", "while", "since",
+        "will", "going to"
+    ],
+    # Vocabulario técnico
+    "technical_terms": [
+        "implement", "optimize", "architecture", "scalability",
+        "framework", "infrastructure", "deployment", "integration",
+        "algorithm", "efficiency", "methodology", "collaborate",
+        "database", "performance", "security", "reliability"
+    ],
+    # Vocabulario sofisticado
+    "sophisticated_words": [
+        "utilize", "demonstrate", "analyze", "comprehensive",
+        "facilitate", "enhance", "establish", "significant",
+        "particularly", "specifically", "primarily", "essentially"
+    ],
+    # Conectores de fluidez
+    "fluency_markers": [
+        "well", "actually", "you know", "i mean",
+        "so", "also", "additionally", "furthermore",
+        "for example", "for instance", "in fact", "basically",
+        "moreover", "consequently", "therefore"
+    ],
+    # Indicadores de buena comprensión
+    "elaboration_markers": [
+        "for example", "such as", "like", "because",
+        "first", "second", "also", "additionally",
+        "specifically", "in particular"
+    ]
+}
+
+# Compilado una vez: todas las dimensiones en una sola pasada sobre el texto
+_indicator_matcher = KeywordMatcher(ENGLISH_INDICATORS)
+
 class EnglishLevelEvaluator:
     """
     Evaluates English proficiency based on conversation responses
@@ -125,11 +178,12 @@ class EnglishLevelEvaluator:
                 }
             }
         
-        # Evaluar cada dimensión
-        grammar_score = self._evaluate_grammar(user_responses)
-        vocabulary_score = self._evaluate_vocabulary(user_responses)
-        fluency_score = self._evaluate_fluency(user_responses)
-        comprehension_score = self._evaluate_comprehension(user_responses)
+        # Evaluar cada dimensión (indicadores contados una sola vez)
+        indicator_counts = self._count_indicators(user_responses)
+        grammar_score = self._evaluate_grammar(user_responses, indicator_counts)
+        vocabulary_score = self._evaluate_vocabulary(user_responses, indicator_counts)
+        fluency_score = self._evaluate_fluency(user_responses, indicator_counts)
+        comprehension_score = self._evaluate_comprehension(user_responses, indicator_counts)
         
         # Nivel demostrado (promedio ponderado)
         demonstrated_level = round(
@@ -175,7 +229,20 @@ class EnglishLevelEvaluator:
             }
         }
     
-    def _evaluate_grammar(self, responses):
+    @staticmethod
+    def _count_indicators(responses):
+        """
+        Cuenta los indicadores de todas las dimensiones en una pasada
+        
+        Args:
+            responses: Lista de strings
+        
+        Returns:
+            dict: {categoría de ENGLISH_INDICATORS: número de indicadores presentes}
+        """
+        return _indicator_matcher.count(" ".join(responses))
+    
+    def _evaluate_grammar(self, responses, indicator_counts=None):
         """
         Evalúa calidad gramatical
         
@@ -186,31 +253,16 @@ class EnglishLevelEvaluator:
         
         Args:
             responses: Lista de strings
+            indicator_counts: Resultado de _count_indicators() (se calcula si falta)
         
         Returns:
             int: 1-3
         """
-        all_text = " ".join(responses).lower()
+        if indicator_counts is None:
+            indicator_counts = self._count_indicators(responses)
         
-        # Indicadores de nivel avanzado
-        advanced_structures = [
-            "would have", "could have", "should have",  # Conditionals
-            "which", "whom", "whose",                    # Relative pronouns
-            "despite", "although", "whereas", "however", # Conjunctions
-            "having", "been",                            # Perfect tenses
-            "not only", "but also"                       # Correlatives
-        ]
-        
-        # Indicadores de nivel intermedio
-        intermediate_structures = [
-            "because", "therefore", "thus",
-            "can", "could", "should", "would",
-            "if", "when", "while", "since",
-            "will", "going to"
-        ]
-        
-        advanced_count = sum(1 for struct in advanced_structures if struct in all_text)
-        intermediate_count = sum(1 for struct in intermediate_structures if struct in all_text)
+        advanced_count = indicator_counts["advanced_structures"]
+        intermediate_count = indicator_counts["intermediate_structures"]
         
         # Scoring
         if advanced_count >= 2:
@@ -220,7 +272,7 @@ class EnglishLevelEvaluator:
         else:
             return 1  # Básico
     
-    def _evaluate_vocabulary(self, responses):
+    def _evaluate_vocabulary(self, responses, indicator_counts=None):
         """
         Evalúa riqueza de vocabulario
         
@@ -231,6 +283,7 @@ class EnglishLevelEvaluator:
         
         Args:
             responses: Lista de strings
+            indicator_counts: Resultado de _count_indicators() (se calcula si falta)
         
         Returns:
             int: 1-3
@@ -245,22 +298,14 @@ class EnglishLevelEvaluator:
         unique_words = len(set(words))
         lexical_diversity = unique_words / len(words)
         
+        if indicator_counts is None:
+            indicator_counts = self._count_indicators(responses)
+        
         # 2. Technical vocabulary
-        technical_terms = [
-            "implement", "optimize", "architecture", "scalability",
-            "framework", "infrastructure", "deployment", "integration",
-            "algorithm", "efficiency", "methodology", "collaborate",
-            "database", "performance", "security", "reliability"
-        ]
-        technical_count = sum(1 for term in technical_terms if term in all_text)
+        technical_count = indicator_counts["technical_terms"]
         
         # 3. Sophisticated vocabulary
-        sophisticated_words = [
-            "utilize", "demonstrate", "analyze", "comprehensive",
-            "facilitate", "enhance", "establish", "significant",
-            "particularly", "specifically", "primarily", "essentially"
-        ]
-        sophisticated_count = sum(1 for word in sophisticated_words if word in all_text)
+        sophisticated_count = indicator_counts["sophisticated_words"]
         
         # Scoring
         if lexical_diversity > 0.7 and (technical_count >= 3 or sophisticated_count >= 2):
@@ -270,7 +315,7 @@ class EnglishLevelEvaluator:
         else:
             return 1  # Básico
     
-    def _evaluate_fluency(self, responses):
+    def _evaluate_fluency(self, responses, indicator_counts=None):
         """
         Evalúa fluidez basándose en:
         - Longitud de respuestas
@@ -279,6 +324,7 @@ class EnglishLevelEvaluator:
         
         Args:
             responses: Lista de strings
+            indicator_counts: Resultado de _count_indicators() (se calcula si falta)
         
         Returns:
             int: 1-3
@@ -290,15 +336,9 @@ class EnglishLevelEvaluator:
         avg_length = sum(len(r.split()) for r in responses) / len(responses)
         
         # Conectores de fluidez
-        fluency_markers = [
-            "well", "actually", "you know", "i mean",
-            "so", "also", "additionally", "furthermore",
-            "for example", "for instance", "in fact", "basically",
-            "moreover", "consequently", "therefore"
-        ]
-        
-        all_text = " ".join(responses).lower()
-        connector_count = sum(1 for marker in fluency_markers if marker in all_text)
+        if indicator_counts is None:
+            indicator_counts = self._count_indicators(responses)
+        connector_count = indicator_counts["fluency_markers"]
         
         # Scoring
         if avg_length > 20 and connector_count >= 3:
@@ -308,7 +348,7 @@ class EnglishLevelEvaluator:
         else:
             return 1  # Básico: respuestas cortas
     
-    def _evaluate_comprehension(self, responses):
+    def _evaluate_comprehension(self, responses, indicator_counts=None):
         """
         Evalúa comprensión basándose en:
         - Relevancia de respuestas a las preguntas
@@ -317,6 +357,7 @@ class EnglishLevelEvaluator:
         
         Args:
             responses: Lista de strings
+            indicator_counts: Resultado de _count_indicators() (se calcula si falta)
         
         Returns:
             int: 1-3
@@ -325,14 +366,9 @@ class EnglishLevelEvaluator:
         avg_length = sum(len(r.split()) for r in responses) / len(responses) if responses else 0
         
         # Indicadores de buena comprensión
-        elaboration_markers = [
-            "for example", "such as", "like", "because",
-            "first", "second", "also", "additionally",
-            "specifically", "in particular"
-        ]
-        
-        all_text = " ".join(responses).lower()
-        elaboration_count = sum(1 for marker in elaboration_markers if marker in all_text)
+        if indicator_counts is None:
+            indicator_counts = self._count_indicators(responses)
+        elaboration_count = indicator_counts["elaboration_markers"]
         
         # Scoring
         if avg_length > 15 and elaboration_count >= 2:
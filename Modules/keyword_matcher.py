@@ -0,0 +1,132 @@
+"""
+Keyword Matcher - SAORI AI Core
+Compiled multi-keyword substring matching for the scorers
+
+Key Innovation:
+- All keyword tables are compiled once into a single trie-shaped regex
+- One pass over the text finds every keyword (substring semantics, exactly
+  like `keyword in text.lower()`), instead of one scan per keyword
+- Per-category counts respect duplicated entries in the original lists,
+  so scores stay identical to the previous loops
+
+How it works:
+    At every position a zero-width lookahead matches the LONGEST keyword
+    starting there (the trie regex is greedy). Every shorter keyword that
+    starts at the same position is a prefix of that one, so each keyword
+    keeps a precomputed list of its keyword-prefixes and the full set of
+    hits is recovered without extra scans.
+
+Usage:
+    matcher = KeywordMatcher({'teamwork': ['team', 'colabor'], 'leadership': ['lead']})
+    matcher.count("I lead a team")      # {'teamwork': 1, 'leadership': 1}
+    matcher.categories_hit("I lead")    # {'leadership'}
+"""
+
+import re
+
+_TERMINAL = ''
+
+
+def _build_trie(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[_TERMINAL] = True
+    return trie
+
+
+def _trie_to_pattern(node):
+    """Regex for a trie node; greedy, so it prefers the longest keyword"""
+    branches = [
+        re.escape(ch) + _trie_to_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch != _TERMINAL
+    ]
+    if not branches:
+        return ''
+    if len(branches) == 1 and _TERMINAL not in node:
+        return branches[0]
+    group = '(?:' + '|'.join(branches) + ')'
+    return group + '?' if _TERMINAL in node else group
+
+
+class KeywordMatcher:
+    """
+    Finds all keywords of several categories in one pass
+
+    Args:
+        categories: dict {category: [keywords]} or a plain list of keywords
+            (stored under category None). Keywords are lowercased; lists
+            may contain duplicates and they are counted as such.
+    """
+
+    def __init__(self, categories):
+        if not isinstance(categories, dict):
+            categories = {None: list(categories)}
+        self.categories = {category: [kw.lower() for kw in words] for category, words in categories.items()}
+
+        # keyword -> [(category, multiplicity)]
+        self._owners = {}
+        for category, words in self.categories.items():
+            for keyword in words:
+                if not keyword:
+                    continue
+                owners = self._owners.setdefault(keyword, {})
+                owners[category] = owners.get(category, 0) + 1
+        self._owners = {kw: list(owners.items()) for kw, owners in self._owners.items()}
+
+        keywords = sorted(self._owners)
+        # keyword -> every keyword that is a prefix of it (itself included)
+        keyword_set = set(keywords)
+        self._prefixes = {
+            kw: [kw[:i] for i in range(1, len(kw) + 1) if kw[:i] in keyword_set]
+            for kw in keywords
+        }
+        pattern = _trie_to_pattern(_build_trie(keywords))
+        self._regex = re.compile(f'(?=({pattern}))') if pattern else None
+
+    def matches(self, text):
+        """
+        Distinct keywords contained in text (case-insensitive)
+
+        Returns:
+            set: Keywords k such that k in text.lower()
+        """
+        if not text or self._regex is None:
+            return set()
+        longest = {m.group(1) for m in self._regex.finditer(text.lower())}
+        found = set()
+        for keyword in longest:
+            found.update(self._prefixes[keyword])
+        return found
+
+    def count(self, text):
+        """
+        Number of keyword entries found per category
+
+        Equivalent to {c: sum(1 for kw in words if kw in text.lower())}, with
+        duplicated entries counted every time they appear in the list.
+        """
+        counts = {category: 0 for category in self.categories}
+        for keyword in self.matches(text):
+            for category, multiplicity in self._owners[keyword]:
+                counts[category] += multiplicity
+        return counts
+
+    def total(self, text):
+        """Entries found across all categories (single-list matchers)"""
+        return sum(self.count(text).values())
+
+    def categories_hit(self, text):
+        """Categories with at least one keyword in text"""
+        hit = set()
+        for keyword in self.matches(text):
+            for category, _ in self._owners[keyword]:
+                hit.add(category)
+        return hit
+
+    def contains_any(self, text):
+        """True if any keyword occurs in text"""
+        return bool(text) and self._regex is not None and self._regex.search(text.lower()) is not None
@@ -0,0 +1,163 @@
+"""
+Min-Cost Flow - TRS Engine Core
+Small pure-Python min-cost max-flow solver for batch assignment problems
+
+Key Innovation:
+- Primal-dual algorithm: one Dijkstra (reduced costs, node potentials) per
+  phase finds the current shortest distance to the sink, then a Dinic
+  blocking flow pushes everything along the zero-reduced-cost edges at once
+- With few distinct costs (assignment tiers) the number of phases stays
+  small, instead of one shortest path per unit of flow
+- No third-party dependency: integer capacities and non-negative integer
+  costs are all the recruiter model needs
+
+Usage:
+    flow = MinCostFlow(4)
+    e = flow.add_edge(0, 1, capacity=3, cost=1)
+    ...
+    total_flow, total_cost = flow.solve(source=0, sink=3)
+    flow.flow_on(e)
+"""
+
+import heapq
+from collections import deque
+
+
+class MinCostFlow:
+    """
+    Directed graph with integer capacities and non-negative costs
+
+    Args:
+        n_nodes: Nodes are 0 .. n_nodes - 1
+    """
+
+    def __init__(self, n_nodes):
+        self.n_nodes = n_nodes
+        self.graph = [[] for _ in range(n_nodes)]  # edge ids leaving each node
+        # Aristas en arreglos paralelos; la arista e y su reversa e ^ 1
+        self.to = []
+        self.capacity = []
+        self.cost = []
+
+    def add_edge(self, u, v, capacity, cost=0):
+        """
+        Add an edge u -> v
+
+        Returns:
+            int: Edge id (for flow_on)
+        """
+        if cost < 0:
+            raise ValueError("MinCostFlow needs non-negative costs")
+        edge = len(self.to)
+        self.to += [v, u]
+        self.capacity += [capacity, 0]
+        self.cost += [cost, -cost]
+        self.graph[u].append(edge)
+        self.graph[v].append(edge + 1)
+        return edge
+
+    def flow_on(self, edge):
+        """Flow sent through an edge (the residual capacity of its reverse)"""
+        return self.capacity[edge ^ 1]
+
+    def solve(self, source, sink, max_flow=None):
+        """
+        Send as much flow as possible (up to max_flow) at minimum cost
+
+        Returns:
+            tuple: (flow, cost)
+        """
+        potential = [0] * self.n_nodes
+        total_flow = 0
+        total_cost = 0
+        limit = float('inf') if max_flow is None else max_flow
+
+        while total_flow < limit:
+            dist = self._dijkstra(source, potential)
+            if dist[sink] is None:
+                break
+            for node, d in enumerate(dist):
+                if d is not None:
+                    potential[node] += d
+            pushed = self._blocking_flow(source, sink, potential, limit - total_flow)
+            if pushed == 0:
+                break
+            total_flow += pushed
+            # Todas las rutas de la fase cuestan lo mismo: potential[sink] - potential[source]
+            total_cost += pushed * (potential[sink] - potential[source])
+        return total_flow, total_cost
+
+    def _dijkstra(self, source, potential):
+        to, capacity, cost, graph = self.to, self.capacity, self.cost, self.graph
+        dist = [None] * self.n_nodes
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d != dist[u]:
+                continue
+            base = d + potential[u]
+            for edge in graph[u]:
+                if capacity[edge] > 0:
+                    v = to[edge]
+                    nd = base + cost[edge] - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        return dist
+
+    def _blocking_flow(self, source, sink, potential, limit):
+        """Dinic max flow restricted to edges with zero reduced cost"""
+        to, capacity, cost, graph = self.to, self.capacity, self.cost, self.graph
+
+        def admissible(u, edge):
+            v = to[edge]
+            return capacity[edge] > 0 and cost[edge] + potential[u] - potential[v] == 0
+
+        pushed_total = 0
+        while pushed_total < limit:
+            # BFS levels over the admissible subgraph
+            level = [-1] * self.n_nodes
+            level[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                for edge in graph[u]:
+                    v = to[edge]
+                    if level[v] < 0 and admissible(u, edge):
+                        level[v] = level[u] + 1
+                        queue.append(v)
+            if level[sink] < 0:
+                break
+
+            # Iterative DFS with per-node edge pointers
+            pointer = [0] * self.n_nodes
+            while pushed_total < limit:
+                path = []
+                u = source
+                while u != sink:
+                    edges = graph[u]
+                    while pointer[u] < len(edges):
+                        edge = edges[pointer[u]]
+                        v = to[edge]
+                        if level[v] == level[u] + 1 and admissible(u, edge):
+                            break
+                        pointer[u] += 1
+                    if pointer[u] == len(edges):
+                        # Dead end: retreat
+                        level[u] = -1
+                        if not path:
+                            break
+                        u = to[path.pop() ^ 1]
+                        pointer[u] += 1
+                        continue
+                    path.append(edges[pointer[u]])
+                    u = to[edges[pointer[u]]]
+                if u != sink:
+                    break
+                amount = min(min(capacity[edge] for edge in path), limit - pushed_total)
+                for edge in path:
+                    capacity[edge] -= amount
+                    capacity[edge ^ 1] += amount
+                pushed_total += amount
+        return pushed_total
@@ -0,0 +1,241 @@
+"""
+Model Optimization - Optimized CPU artifacts for the BERT models
+Carga versiones int8 (cuantización dinámica) u ONNX Runtime de los modelos
+de sentimiento y similitud cuando existen y pasaron el control de paridad
+
+Artifacts are produced by export_optimized_models.py into
+Models/optimized/<model-name>/ together with a manifest.json:
+
+    {
+      "model": "bert-sentiment-saori",
+      "artifacts": {
+        "onnx-int8":  {"file": "model.int8.onnx", "parity_passed": true, "parity": {...}},
+        "torch-int8": {"file": "model-int8.pt",   "parity_passed": true, "parity": {...}}
+      }
+    }
+
+At runtime select_backend() picks the first artifact (in BACKENDS order)
+that exists, passed parity and whose runtime is installed; otherwise the
+fp32 model is used exactly as before.
+"""
+
+import json
+from pathlib import Path
+
+OPTIMIZED_ROOT = Path(__file__).parent.parent / "Models" / "optimized"
+MANIFEST_NAME = "manifest.json"
+
+# Preference order for backend='auto' (int8 kernels are CPU only)
+BACKENDS = ('onnx-int8', 'torch-int8')
+
+
+def optimized_dir_for(model_name_or_path, root=OPTIMIZED_ROOT):
+    """
+    Directory of the optimized artifacts of a model
+
+    Args:
+        model_name_or_path: Local model path or HuggingFace model id
+        root: Base directory (Models/optimized)
+
+    Returns:
+        Path: root / <last path component of the model>
+    """
+    name = str(model_name_or_path).replace('\\', '/').rstrip('/').split('/')[-1]
+    return Path(root) / name
+
+
+def load_manifest(directory):
+    """manifest.json of an artifact directory ({} if missing or unreadable)"""
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[OPTIMIZATION] Manifest ilegible en {path}: {e}")
+        return {}
+
+
+def write_manifest(directory, manifest):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def onnxruntime_available():
+    try:
+        import onnxruntime  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def select_backend(directory, requested='auto', device='cpu'):
+    """
+    Choose the inference backend for a model
+
+    Args:
+        directory: Artifact directory (see optimized_dir_for)
+        requested: 'auto', 'fp32', 'onnx-int8' or 'torch-int8'
+        device: 'cpu' or 'cuda' (int8 artifacts are only used on CPU)
+
+    Returns:
+        tuple: (backend, artifact entry) or ('fp32', None)
+    """
+    requested = (requested or 'auto').lower()
+    if requested == 'fp32':
+        return 'fp32', None
+    if device != 'cpu':
+        return 'fp32', None
+    if requested != 'auto' and requested not in BACKENDS:
+        print(f"[OPTIMIZATION] Backend desconocido '{requested}', usando fp32")
+        return 'fp32', None
+
+    artifacts = load_manifest(directory).get('artifacts', {})
+    for backend in (BACKENDS if requested == 'auto' else (requested,)):
+        entry = artifacts.get(backend)
+        if not entry or not (Path(directory) / entry['file']).exists():
+            if requested != 'auto':
+                print(f"[OPTIMIZATION] Artefacto {backend} no encontrado en {directory}, usando fp32")
+            continue
+        if not entry.get('parity_passed'):
+            if requested == 'auto':
+                continue
+            # Explicit request (e.g. the parity check itself): allowed, but flagged
+            print(f"[OPTIMIZATION] {backend} en {directory} no pasó el control de paridad")
+        if backend.startswith('onnx') and not onnxruntime_available():
+            print("[OPTIMIZATION] onnxruntime no instalado, ignorando artefacto ONNX")
+            continue
+        return backend, entry
+    return 'fp32', None
+
+
+# ----------------------------------------------------------------------
+# torch dynamic int8
+# ----------------------------------------------------------------------
+
+def quantize_dynamic_int8(model):
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations fp32)"""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_torch_int8(model, path):
+    """
+    Quantize an fp32 module and load exported int8 weights into it
+
+    Args:
+        model: fp32 module with the same architecture used at export time
+        path: State dict saved by export_optimized_models.py
+
+    Returns:
+        Quantized module in eval mode
+    """
+    import torch
+    quantized = quantize_dynamic_int8(model)
+    quantized.load_state_dict(torch.load(path, map_location='cpu'))
+    quantized.eval()
+    return quantized
+
+
+# ----------------------------------------------------------------------
+# ONNX Runtime
+# ----------------------------------------------------------------------
+
+class OnnxModel:
+    """
+    ONNX Runtime session on CPU
+
+    Args:
+        path: .onnx file
+        intra_op_threads: Threads per inference (None = onnxruntime default)
+    """
+
+    def __init__(self, path, intra_op_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.path = str(path)
+        self.session = ort.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def run(self, encoded):
+        """
+        First output of the model
+
+        Args:
+            encoded: Tokenizer output with numpy arrays (extra keys are ignored)
+        """
+        import numpy as np
+        feed = {name: np.asarray(encoded[name], dtype=np.int64) for name in self.input_names}
+        return self.session.run(None, feed)[0]
+
+
+class OnnxSentenceEncoder:
+    """
+    Replacement for SentenceTransformer.encode() on an exported transformer
+
+    Applies the same pooling as the original model (mean over tokens, plus
+    L2 normalization if the original had a Normalize module).
+
+    Args:
+        directory: Artifact directory (ONNX file + tokenizer)
+        entry: Manifest entry of the ONNX artifact
+    """
+
+    def __init__(self, directory, entry):
+        from transformers import AutoTokenizer
+
+        directory = Path(directory)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(directory))
+        self.max_seq_length = entry.get('max_seq_length', 128)
+        self.normalize = entry.get('normalize', False)
+        self.model = OnnxModel(directory / entry['file'], entry.get('intra_op_threads'))
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, convert_to_tensor=False,
+               show_progress_bar=False, **kwargs):
+        """
+        Sentence embeddings (same call signature subset as SentenceTransformer.encode)
+
+        Returns:
+            numpy.ndarray (or torch.Tensor with convert_to_tensor=True);
+            1D for a single string
+        """
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Ordenar por longitud: menos padding por lote
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        embeddings = [None] * len(sentences)
+        for start in range(0, len(order), batch_size):
+            chunk_indices = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [sentences[i] for i in chunk_indices],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            hidden = self.model.run(encoded)
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for row, original_index in zip(pooled, chunk_indices):
+                embeddings[original_index] = row
+
+        result = np.vstack(embeddings).astype(np.float32) if embeddings else np.zeros((0, 0), dtype=np.float32)
+        if single:
+            result = result[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(result)
+        return result
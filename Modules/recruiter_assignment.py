@@ -7,10 +7,166 @@ Features:
 - Match candidates to recruiters by geographic region (LATAM, US, EU, Remote)
 - Balance workload across recruiters (assigns to recruiter with lowest active_profiles)
 - Fallback to "Unassigned" if no matching recruiter found
+- Optional capacity caps per recruiter (max_profiles)
+- RecruiterIndex: heap per (specialty, region) bucket, O(log R) per assignment
 - Batch processing for multiple candidates
 """
 
-from typing import List, Dict
+import heapq
+from typing import List, Dict, Optional
+
+UNASSIGNED_ID = "R000"
+
+
+def unassigned_recruiter(reason: str = "No matching recruiter found") -> Dict:
+    """Placeholder returned when no recruiter can take the candidate"""
+    return {
+        "id": UNASSIGNED_ID,
+        "name": "Unassigned",
+        "email": "unassigned@empresa.com",
+        "location": "Remote",
+        "specialties": [],
+        "regions": [],
+        "active_profiles": 0,
+        "reason": reason
+    }
+
+
+class RecruiterIndex:
+    """
+    Recruiters indexed by (specialty, region), specialty and region, each
+    bucket a min-heap keyed by (active_profiles, position in the list)
+
+    Specialties and regions are lowercased once here instead of on every
+    candidate. Choosing a recruiter reads the top of at most four heaps and
+    an assignment only bumps a counter, so each candidate costs O(log R)
+    instead of filtering and sorting the whole list.
+
+    Heap entries are refreshed lazily: a workload increase leaves an entry
+    that underestimates the load, which is re-keyed when it reaches the top;
+    a decrease (release) pushes a fresh entry and the outdated one is
+    dropped when it surfaces. Recruiters at capacity leave their heaps until
+    a release frees a slot.
+
+    Args:
+        recruiters: Recruiter dicts (as in Data/recruiters.json)
+        capacity: Default max active_profiles per recruiter (None = no cap);
+            a recruiter's own "max_profiles" field takes precedence
+        copy: Work on copies of the dicts (False updates the originals)
+    """
+
+    def __init__(self, recruiters: List[Dict], capacity: Optional[int] = None, copy: bool = True):
+        self.recruiters = [dict(r) for r in recruiters] if copy else list(recruiters)
+        self._loads = [r.get("active_profiles", 0) for r in self.recruiters]
+        self._capacity = [r.get("max_profiles", capacity) for r in self.recruiters]
+        self._positions = {r.get("id"): pos for pos, r in reversed(list(enumerate(self.recruiters)))}
+        self._memberships = [[] for _ in self.recruiters]
+        self._heaps = {}
+
+        for pos, recruiter in enumerate(self.recruiters):
+            specialties = {s.lower() for s in recruiter.get("specialties", [])}
+            regions = {reg.lower() for reg in recruiter.get("regions", [])}
+            keys = [("both", s, reg) for s in specialties for reg in regions]
+            keys += [("specialty", s) for s in specialties]
+            keys += [("region", reg) for reg in regions]
+            if "remote" in regions:
+                keys.append(("remote",))
+            for key in keys:
+                self._heaps.setdefault(key, []).append((self._loads[pos], pos))
+            self._memberships[pos] = keys
+
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+
+    def _top(self, key):
+        """(load, position) of the least loaded recruiter with free capacity in a bucket"""
+        heap = self._heaps.get(key)
+        while heap:
+            load, pos = heap[0]
+            current = self._loads[pos]
+            capacity = self._capacity[pos]
+            if capacity is not None and current >= capacity:
+                heapq.heappop(heap)  # vuelve con release()
+            elif load < current:
+                heapq.heapreplace(heap, (current, pos))
+            elif load > current:
+                heapq.heappop(heap)  # release() already pushed the current load
+            else:
+                return load, pos
+        return None
+
+    def _push(self, pos):
+        entry = (self._loads[pos], pos)
+        for key in self._memberships[pos]:
+            heapq.heappush(self._heaps[key], entry)
+
+    def choose(self, candidate: Dict) -> Optional[int]:
+        """
+        Position of the recruiter for a candidate, without assigning it
+
+        Priority:
+        1. Perfect match: specialty + region
+        2. Specialty match only
+        3. Region match only (with Remote)
+        4. Lowest workload as tiebreaker (then list order)
+
+        Returns:
+            Index in self.recruiters, or None if nobody matches or has capacity
+        """
+        vacancy_area = candidate.get("vacancy_area", "").lower()
+        location_region = candidate.get("location_region", "").lower()
+
+        for key in (("both", vacancy_area, location_region), ("specialty", vacancy_area)):
+            top = self._top(key)
+            if top is not None:
+                return top[1]
+
+        candidates = [t for t in (self._top(("region", location_region)), self._top(("remote",))) if t]
+        return min(candidates)[1] if candidates else None
+
+    def recruiter_for(self, candidate: Dict) -> Dict:
+        """Recruiter dict chosen for a candidate (or the Unassigned placeholder), without assigning it"""
+        pos = self.choose(candidate)
+        return self.recruiters[pos] if pos is not None else unassigned_recruiter(self._no_match_reason())
+
+    def assign(self, candidate: Dict) -> Dict:
+        """
+        Choose a recruiter and add the candidate to their workload
+
+        Returns:
+            The recruiter dict (its active_profiles already incremented) or
+            the Unassigned placeholder
+        """
+        pos = self.choose(candidate)
+        if pos is None:
+            return unassigned_recruiter(self._no_match_reason())
+        self._loads[pos] += 1
+        self.recruiters[pos]["active_profiles"] = self._loads[pos]
+        return self.recruiters[pos]
+
+    def release(self, recruiter_id: str) -> bool:
+        """Remove one candidate from a recruiter's workload; False if unknown or already at 0"""
+        pos = self._positions.get(recruiter_id)
+        if pos is None or self._loads[pos] <= 0:
+            return False
+        self._loads[pos] -= 1
+        self.recruiters[pos]["active_profiles"] = self._loads[pos]
+        self._push(pos)
+        return True
+
+    def set_capacity(self, recruiter_id: str, capacity: Optional[int]) -> bool:
+        """Change a recruiter's cap (None = unlimited); False if the id is unknown"""
+        pos = self._positions.get(recruiter_id)
+        if pos is None:
+            return False
+        self._capacity[pos] = capacity
+        self._push(pos)  # por si estaba fuera de los heaps por llegar al tope
+        return True
+
+    def _no_match_reason(self):
+        if any(cap is not None for cap in self._capacity):
+            return "No matching recruiter with free capacity"
+        return "No matching recruiter found"
 
 
 def assign_recruiter(candidate: Dict, recruiters: List[Dict]) -> Dict:
@@ -25,87 +181,172 @@ def assign_recruiter(candidate: Dict, recruiters: List[Dict]) -> Dict:
     
     Args:
         candidate: Diccionario con datos del candidato
-        recruiters: Lista de reclutadores disponibles
+        recruiters: Lista de reclutadores disponibles o un RecruiterIndex
+            (para muchos candidatos, construir el índice una sola vez)
     
     Returns:
         Diccionario con datos del reclutador asignado o 'Unassigned'
     """
-    vacancy_area = candidate.get("vacancy_area", "").lower()
-    location_region = candidate.get("location_region", "").lower()
-    
-    # Priority 1: Perfect match (specialty + region)
-    perfect_match = [
-        r for r in recruiters 
-        if vacancy_area in [s.lower() for s in r.get("specialties", [])]
-        and location_region in [reg.lower() for reg in r.get("regions", [])]
-    ]
-    
-    if perfect_match:
-        # Sort by workload and return the one with lowest load
-        perfect_match.sort(key=lambda r: r.get("active_profiles", 0))
-        return perfect_match[0]
-    
-    # Priority 2: Specialty match only
-    specialty_match = [
-        r for r in recruiters 
-        if vacancy_area in [s.lower() for s in r.get("specialties", [])]
-    ]
-    
-    if specialty_match:
-        specialty_match.sort(key=lambda r: r.get("active_profiles", 0))
-        return specialty_match[0]
-    
-    # Priority 3: Region match with "Remote" capability
-    region_match = [
-        r for r in recruiters 
-        if location_region in [reg.lower() for reg in r.get("regions", [])]
-        or "remote" in [reg.lower() for reg in r.get("regions", [])]
+    index = recruiters if isinstance(recruiters, RecruiterIndex) else RecruiterIndex(recruiters, copy=False)
+    return index.recruiter_for(candidate)
+
+
+# Costes del modelo de flujo por nivel de prioridad (perfect, specialty, region/remote)
+TIER_COSTS = (0, 1, 2)
+
+
+def _match_tier(specialties: set, regions: set, vacancy_area: str, location_region: str) -> Optional[int]:
+    """Priority tier of a recruiter for a candidate (0 perfect, 1 specialty, 2 region/remote, None)"""
+    if vacancy_area in specialties:
+        return 0 if location_region in regions else 1
+    if location_region in regions or "remote" in regions:
+        return 2
+    return None
+
+
+def solve_batch_assignment(candidates: List[Dict], recruiters: List[Dict], capacity: Optional[int] = None,
+                           balance: bool = True) -> List[Optional[int]]:
+    """
+    Globally optimal recruiter for every candidate of a batch (min-cost flow)
+
+    Candidates with the same (vacancy_area, location_region) are one supply
+    node, so the network has one edge per (candidate class, eligible
+    recruiter) instead of one per (candidate, recruiter):
+
+        source -> class (count) -> recruiter (tier cost) -> sink (free slots)
+        class -> sink (unassigned cost)
+
+    The unassigned cost exceeds any possible sum of tier costs, so the
+    solution first assigns as many candidates as the capacities allow and
+    then minimizes the tier costs. With balance, the smallest uniform load
+    ceiling that keeps that optimal cost is found by binary search, so equal
+    cost choices are spread instead of piling on one recruiter.
+
+    Args:
+        candidates: Candidate dicts (vacancy_area, location_region)
+        recruiters: Recruiter dicts (specialties, regions, active_profiles, max_profiles)
+        capacity: Default max active_profiles per recruiter (None = no cap)
+        balance: Minimize the highest resulting workload among optimal solutions
+
+    Returns:
+        Index in recruiters for each candidate, None when unassigned
+    """
+    try:
+        from Modules.min_cost_flow import MinCostFlow
+    except ImportError:
+        from min_cost_flow import MinCostFlow
+
+    loads = [r.get("active_profiles", 0) for r in recruiters]
+    caps = [r.get("max_profiles", capacity) for r in recruiters]
+    skills = [
+        ({s.lower() for s in r.get("specialties", [])}, {reg.lower() for reg in r.get("regions", [])})
+        for r in recruiters
     ]
-    
-    if region_match:
-        region_match.sort(key=lambda r: r.get("active_profiles", 0))
-        return region_match[0]
-    
-    # Fallback: Sin match
-    return {
-        "id": "R000",
-        "name": "Unassigned",
-        "email": "unassigned@empresa.com",
-        "location": "Remote",
-        "specialties": [],
-        "regions": [],
-        "active_profiles": 0,
-        "reason": "No matching recruiter found"
+
+    classes = {}
+    for i, candidate in enumerate(candidates):
+        key = (candidate.get("vacancy_area", "").lower(), candidate.get("location_region", "").lower())
+        classes.setdefault(key, []).append(i)
+    class_keys = list(classes)
+    eligible = {
+        key: [(pos, tier) for pos, (specialties, regions) in enumerate(skills)
+              if (tier := _match_tier(specialties, regions, *key)) is not None]
+        for key in class_keys
     }
 
+    n = len(candidates)
+    unassigned_cost = TIER_COSTS[-1] * n + 1
+    source, sink = 0, 1
+    class_node = {key: 2 + i for i, key in enumerate(class_keys)}
+    recruiter_offset = 2 + len(class_keys)
+
+    def solve(ceiling):
+        flow = MinCostFlow(recruiter_offset + len(recruiters))
+        for pos, load in enumerate(loads):
+            limit = caps[pos] if ceiling is None else (ceiling if caps[pos] is None else min(caps[pos], ceiling))
+            slots = n if limit is None else max(0, min(n, limit - load))
+            if slots:
+                flow.add_edge(recruiter_offset + pos, sink, slots)
+        edges = {}
+        for key in class_keys:
+            count = len(classes[key])
+            node = class_node[key]
+            flow.add_edge(source, node, count)
+            flow.add_edge(node, sink, count, unassigned_cost)
+            edges[key] = [(flow.add_edge(node, recruiter_offset + pos, count, TIER_COSTS[tier]), pos, tier)
+                          for pos, tier in eligible[key]]
+        _, cost = flow.solve(source, sink)
+        return cost, flow, edges
 
-def assign_batch(candidates: List[Dict], recruiters: List[Dict]) -> List[Dict]:
+    best_cost, flow, edges = solve(None)
+    if balance and n:
+        # Techo más alto que usa la solución sin balancear: siempre alcanza
+        final_loads = {}
+        for key in class_keys:
+            for edge, pos, _ in edges[key]:
+                if flow.flow_on(edge):
+                    final_loads[pos] = final_loads.get(pos, loads[pos]) + flow.flow_on(edge)
+        high = max(final_loads.values(), default=0)
+        low = 0
+        while low < high:
+            middle = (low + high) // 2
+            if solve(middle)[0] == best_cost:
+                high = middle
+            else:
+                low = middle + 1
+        best_cost, flow, edges = solve(high)
+
+    assignment = [None] * n
+    for key in class_keys:
+        members = iter(classes[key])
+        for edge, pos, tier in sorted(edges[key], key=lambda item: (item[2], item[1])):
+            for _ in range(flow.flow_on(edge)):
+                assignment[next(members)] = pos
+    return assignment
+
+
+def assign_batch(candidates: List[Dict], recruiters: List[Dict], capacity: Optional[int] = None,
+                 solver: str = "greedy") -> List[Dict]:
     """
     Asigna reclutadores a un lote de candidatos
     
     Args:
         candidates: Lista de perfiles
         recruiters: Lista de reclutadores
+        capacity: Máximo de active_profiles por reclutador (None = sin tope;
+            el campo "max_profiles" de cada reclutador tiene prioridad)
+        solver: "greedy" (en orden de llegada, O(log R) por candidato) o
+            "flow" (óptimo global del lote con min-cost flow, ver
+            solve_batch_assignment)
     
     Returns:
         Lista de candidatos con campo 'assigned_recruiter'
     """
     assigned = []
     
-    # Create a mutable copy of recruiters to track workload changes
-    recruiters_copy = [dict(r) for r in recruiters]
+    if solver == "flow":
+        recruiters_copy = [dict(r) for r in recruiters]
+        positions = solve_batch_assignment(candidates, recruiters_copy, capacity=capacity)
+        reason = "No matching recruiter with free capacity" if capacity is not None or any(
+            "max_profiles" in r for r in recruiters_copy) else "No matching recruiter found"
+        for candidate, pos in zip(candidates, positions):
+            if pos is None:
+                candidate["assigned_recruiter"] = unassigned_recruiter(reason)
+            else:
+                recruiter = recruiters_copy[pos]
+                recruiter["active_profiles"] = recruiter.get("active_profiles", 0) + 1
+                candidate["assigned_recruiter"] = recruiter
+            assigned.append(candidate)
+        return assigned
+    if solver != "greedy":
+        raise ValueError(f"Unknown solver '{solver}' (expected 'greedy' or 'flow')")
+    
+    # The index works on copies of the recruiters to track workload changes
+    index = RecruiterIndex(recruiters, capacity=capacity)
     
     for candidate in candidates:
-        recruiter = assign_recruiter(candidate, recruiters_copy)
-        candidate["assigned_recruiter"] = recruiter
+        candidate["assigned_recruiter"] = index.assign(candidate)
         assigned.append(candidate)
-        
-        # Update active_profiles count for workload balancing
-        if recruiter.get("id") != "R000":
-            for r in recruiters_copy:
-                if r["id"] == recruiter["id"]:
-                    r["active_profiles"] = r.get("active_profiles", 0) + 1
-                    break
     
     return assigned
 
@@ -3,25 +3,41 @@ Sentiment Inference Module
 Usa el modelo BERT entrenado para predecir emociones en respuestas de candidatos
 """
 
-import torch
-from transformers import BertTokenizer, BertForSequenceClassification
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    from Modules.model_optimization import optimized_dir_for, select_backend, load_torch_int8, OnnxModel
+except ImportError:
+    from model_optimization import optimized_dir_for, select_backend, load_torch_int8, OnnxModel
 
 class SentimentPredictor:
     """
     Predictor de sentimiento usando modelo BERT entrenado
     """
     
-    def __init__(self, model_path="Models/bert-sentiment-saori", fallback_model="nlptown/bert-base-multilingual-uncased-sentiment"):
+    def __init__(self, model_path="Models/bert-sentiment-saori", fallback_model="nlptown/bert-base-multilingual-uncased-sentiment",
+                 backend='auto', device=None, optimized_dir=None):
         """
         Inicializa el predictor cargando el modelo y tokenizer
         
         Args:
             model_path: Ruta al modelo entrenado local (si existe)
             fallback_model: Modelo público de HuggingFace a usar si el local no existe
+            backend: 'auto' (artefacto optimizado si existe y pasó paridad),
+                'fp32', 'onnx-int8' o 'torch-int8'
+            device: 'cpu' / 'cuda' (None = cuda si está disponible)
+            optimized_dir: Carpeta de artefactos (por defecto Models/optimized/<modelo>)
         """
+        # torch/transformers se importan aquí: MicroBatcher y los stubs del benchmark no los necesitan
+        import torch
+        from transformers import BertTokenizer, BertForSequenceClassification, BertConfig
+        
         self.model_path = model_path
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
         
         # Verificar si el modelo local existe
         model_exists = os.path.exists(model_path) and os.path.exists(os.path.join(model_path, "config.json"))
@@ -36,16 +52,29 @@ class SentimentPredictor:
             print(f"[SENTIMENT] Usando modelo público de HuggingFace: {fallback_model}")
             load_path = fallback_model
         
-        # Cargar modelo y tokenizer
+        self.load_path = load_path
+        self.optimized_dir = optimized_dir or optimized_dir_for(load_path)
+        self.backend, artifact = select_backend(self.optimized_dir, backend, self.device.type)
+        
+        # Cargar modelo y tokenizer (versión optimizada si corresponde)
         self.tokenizer = BertTokenizer.from_pretrained(load_path)
-        self.model = BertForSequenceClassification.from_pretrained(load_path)
-        self.model.to(self.device)
-        self.model.eval()  # Modo evaluación
+        self.onnx_model = None
+        if self.backend == 'onnx-int8':
+            self.onnx_model = OnnxModel(os.path.join(self.optimized_dir, artifact['file']))
+            self.model = None
+            config = BertConfig.from_pretrained(load_path)
+        else:
+            self.model = BertForSequenceClassification.from_pretrained(load_path)
+            if self.backend == 'torch-int8':
+                self.model = load_torch_int8(self.model, os.path.join(self.optimized_dir, artifact['file']))
+            self.model.to(self.device)
+            self.model.eval()  # Modo evaluación
+            config = self.model.config
         
         # Mapeo de labels (compatible con modelos estándar de sentimiento)
         # Si el modelo tiene su propio id2label, usarlo; si no, usar el mapeo por defecto
-        if hasattr(self.model.config, 'id2label') and self.model.config.id2label:
-            self.id2label = {int(k): v for k, v in self.model.config.id2label.items()}
+        if hasattr(config, 'id2label') and config.id2label:
+            self.id2label = {int(k): v for k, v in config.id2label.items()}
             # Normalizar labels a nuestro formato estándar
             label_mapping = {}
             for idx, label in self.id2label.items():
@@ -67,7 +96,7 @@ class SentimentPredictor:
             'negative': ['anxious', 'frustrated', 'negative']
         }
         
-        print(f"[SENTIMENT] Modelo cargado en {self.device}")
+        print(f"[SENTIMENT] Modelo cargado en {self.device} (backend: {self.backend})")
         print(f"[SENTIMENT] Labels disponibles: {list(self.id2label.values())}")
     
     def predict(self, text):
@@ -85,31 +114,78 @@ class SentimentPredictor:
                 'probabilities': {'positive': float, 'neutral': float, 'negative': float}
             }
         """
-        # Tokenizar
-        inputs = self.tokenizer(
-            text,
-            truncation=True,
-            padding=True,
-            max_length=128,
-            return_tensors="pt"
-        )
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
-        # Predecir
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            probs = torch.softmax(logits, dim=-1)
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts, batch_size=32):
+        """
+        Predice el sentimiento de múltiples textos en un solo forward pass por lote
+        
+        Los textos se ordenan por longitud antes de tokenizar para que el padding
+        dinámico (al más largo de cada lote) desperdicie el mínimo de cómputo.
+        
+        Args:
+            texts (list): Lista de textos
+            batch_size (int): Máximo de textos por forward pass
+            
+        Returns:
+            list: Lista de diccionarios con predicciones (mismo orden que texts)
+        """
+        if not texts:
+            return []
+        import torch
+        
+        # Ordenar por longitud para agrupar textos de tamaño similar
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [None] * len(texts)
+        
+        for start in range(0, len(order), batch_size):
+            chunk_indices = order[start:start + batch_size]
+            chunk = [texts[i] for i in chunk_indices]
+            
+            # Tokenizar con padding dinámico (al texto más largo del lote)
+            inputs = self.tokenizer(
+                chunk,
+                truncation=True,
+                padding=True,
+                max_length=128,
+                return_tensors="np" if self.onnx_model else "pt"
+            )
+            
+            # Predecir (un solo forward pass para todo el lote)
+            if self.onnx_model:
+                probs = torch.softmax(torch.from_numpy(self.onnx_model.run(inputs)), dim=-1)
+            else:
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                    probs = torch.softmax(outputs.logits, dim=-1).cpu()
+            
+            for row, original_index in zip(probs, chunk_indices):
+                results[original_index] = self._build_prediction(row)
+        
+        return results
+    
+    def _build_prediction(self, probs):
+        """
+        Convierte una fila de probabilidades en el dict de predicción
+        
+        Args:
+            probs (torch.Tensor): Probabilidades (1D) de un texto
+            
+        Returns:
+            dict: Predicción con sentiment, emotion, confidence y probabilities
+        """
+        import torch
         
         # Extraer resultados
         predicted_class = torch.argmax(probs, dim=-1).item()
-        confidence = probs[0][predicted_class].item()
+        confidence = probs[predicted_class].item()
         
         sentiment = self.id2label[predicted_class]
         
         # Convertir probabilidades a dict
         probabilities = {
-            self.id2label[i]: probs[0][i].item()
+            self.id2label[i]: probs[i].item()
             for i in range(len(self.id2label))
         }
         
@@ -122,18 +198,113 @@ class SentimentPredictor:
             'confidence': confidence,
             'probabilities': probabilities
         }
+
+
+class MicroBatcher:
+    """
+    Agrupa llamadas concurrentes a un predictor en micro-lotes
+    
+    Cada hilo que llama a predict() encola su texto y espera su resultado.
+    Un único hilo de fondo toma el primer texto pendiente, espera hasta
+    max_wait_ms por más textos (hasta max_batch_size) y los resuelve todos
+    con una sola llamada a predictor.predict_batch().
+    """
+    
+    def __init__(self, predictor, max_batch_size=16, max_wait_ms=5, metrics=None, model_name='sentiment'):
+        """
+        Args:
+            predictor: Objeto con método predict_batch(texts) -> list
+            max_batch_size: Máximo de textos por lote
+            max_wait_ms: Tiempo máximo (ms) que se espera para llenar un lote
+            metrics: Registro de métricas opcional (src.metrics.MetricsRegistry);
+                publica inference_batch_size{model} e inference_latency_seconds{model}
+            model_name: Valor del label model en esas métricas
+        """
+        self.predictor = predictor
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        
+        # Estadísticas simples (lotes servidos y textos procesados)
+        self.batches_served = 0
+        self.items_served = 0
+        
+        self.model_name = model_name
+        self.batch_size_metric = None
+        self.latency_metric = None
+        if metrics is not None:
+            self.batch_size_metric = metrics.histogram(
+                'inference_batch_size', 'Texts per model forward pass', ('model',),
+                buckets=(1, 2, 4, 8, 16, 32, 64)
+            )
+            self.latency_metric = metrics.histogram(
+                'inference_latency_seconds', 'Model forward pass time per batch', ('model',)
+            )
     
-    def predict_batch(self, texts):
+    def predict(self, text, timeout=None):
         """
-        Predice el sentimiento de múltiples textos
+        Predice el sentimiento de un texto compartiendo forward pass con otros hilos
         
         Args:
-            texts (list): Lista de textos
+            text (str): Texto a analizar
+            timeout: Segundos máximos de espera (None = sin límite)
             
         Returns:
-            list: Lista de diccionarios con predicciones
+            dict: Predicción (mismo formato que SentimentPredictor.predict)
         """
-        return [self.predict(text) for text in texts]
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future.result(timeout=timeout)
+    
+    def _ensure_worker(self):
+        """Inicia el hilo de fondo en el primer uso"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="sentiment-microbatcher", daemon=True
+                )
+                self._worker.start()
+    
+    def _collect_batch(self):
+        """Bloquea hasta el primer texto y junta los que lleguen dentro de max_wait"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        """Bucle del hilo de fondo"""
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            start = time.perf_counter()
+            try:
+                predictions = self.predictor.predict_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            if self.latency_metric is not None:
+                self.latency_metric.observe(time.perf_counter() - start, model=self.model_name)
+                self.batch_size_metric.observe(len(texts), model=self.model_name)
+            self.batches_served += 1
+            self.items_served += len(batch)
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
 
 
 def demo():
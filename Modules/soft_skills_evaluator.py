@@ -22,6 +22,11 @@ Usage:
     overall_score = evaluator.calculate_overall_soft_skills_score(skills)
 """
 
+try:
+    from Modules.keyword_matcher import KeywordMatcher
+except ImportError:  # Ejecutado como script desde Modules/
+    from keyword_matcher import KeywordMatcher
+
 class SoftSkillsEvaluator:
     """
     Evaluates soft skills based on text analysis (description + responses)
@@ -62,6 +67,9 @@ class SoftSkillsEvaluator:
             ]
         }
         
+        # Todas las categorías en una sola pasada sobre el texto
+        self._keyword_matcher = KeywordMatcher(self.soft_skills_keywords)
+        
         # Pesos por skill (todos iguales por ahora)
         self.skill_weights = {
             "communication": 1.0,
@@ -85,12 +93,12 @@ class SoftSkillsEvaluator:
             # Texto muy corto, retornar scores neutros
             return {skill: 0.5 for skill in self.soft_skills_keywords.keys()}
         
-        text_lower = text.lower()
+        keyword_counts = self._keyword_matcher.count(text)
         scores = {}
         
         for skill, keywords in self.soft_skills_keywords.items():
             # Count keyword matches
-            matches = sum(1 for keyword in keywords if keyword in text_lower)
+            matches = keyword_counts[skill]
             
             # Normalize to 0.0-1.0
             # Más keywords = mejor score, pero con tope
@@ -0,0 +1,217 @@
+"""
+Stack Matching Engine - TRS Engine Core
+Vectorized profile x vacancy scoring for the emotional inference engine
+
+Key Innovation:
+- Profiles and vacancies are encoded once as binary technology matrices
+  (sparse CSR when SciPy is installed, dense NumPy otherwise)
+- The shared-stack counts of a whole block of profiles against every
+  vacancy come out of ONE matrix product, instead of two set() builds and
+  one intersection per pair
+- Penalties depend only on the profile's (modality, zone) pair, so they are
+  precomputed per distinct pair and gathered per block
+- top_k() keeps only the best k vacancies of each profile block by block:
+  memory stays at one block of scores, never the full P x V matrix
+
+Scores are bit-identical to calculate_match_score / apply_penalties
+(same divisions, same order of penalty additions), so rounding and ranking
+match the nested loop.
+
+Usage:
+    engine = StackMatchEngine(vacancies)
+    indices, match, penalty = engine.top_k(profiles, k=10)
+    for start, match, penalty in engine.iter_scores(profiles):
+        ...  # full block scores, in vacancy order
+"""
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # SciPy opcional: se usa el producto denso de NumPy
+    sparse = None
+
+MODALITY_PENALTY = 0.2
+ZONE_PENALTY = 0.2
+URGENCY_PENALTY = 0.1
+
+# Celdas (perfiles x vacantes) por bloque: ~32 MB de float64
+DEFAULT_BLOCK_CELLS = 4_000_000
+
+
+class StackMatchEngine:
+    """
+    Match scores and penalties of many profiles against a fixed set of vacancies
+
+    Args:
+        vacancies: Vacancy dicts (entries without "title", like the metadata
+            header of Vacancy.json, are skipped)
+        block_cells: Profile x vacancy cells scored per block
+        use_sparse: Use SciPy sparse matrices (None = when installed)
+    """
+
+    def __init__(self, vacancies, block_cells=DEFAULT_BLOCK_CELLS, use_sparse=None):
+        self.vacancies = [v for v in vacancies if "title" in v]
+        self.block_cells = block_cells
+        self.use_sparse = (sparse is not None) if use_sparse is None else (use_sparse and sparse is not None)
+
+        # Vocabulario: solo importan las tecnologías que pide alguna vacante
+        self.vocabulary = {}
+        rows, cols = [], []
+        for col, vacancy in enumerate(self.vacancies):
+            for tech in dict.fromkeys(vacancy["stack"]):
+                rows.append(self.vocabulary.setdefault(tech, len(self.vocabulary)))
+                cols.append(col)
+
+        shape = (len(self.vocabulary), len(self.vacancies))
+        if self.use_sparse:
+            self.vacancy_matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape
+            )
+        else:
+            self.vacancy_matrix = np.zeros(shape, dtype=np.float32)
+            self.vacancy_matrix[rows, cols] = 1.0
+
+        # The legacy score divides by len(stack), duplicates included
+        self.stack_sizes = np.array([len(v["stack"]) for v in self.vacancies], dtype=np.float64)
+
+        self.modality_codes = {}
+        self.zone_codes = {}
+        self.vacancy_modality = np.array(
+            [self.modality_codes.setdefault(v["modality"], len(self.modality_codes)) for v in self.vacancies],
+            dtype=np.int64
+        )
+        self.vacancy_zone = np.array(
+            [self.zone_codes.setdefault(v["zone"], len(self.zone_codes)) for v in self.vacancies],
+            dtype=np.int64
+        )
+        self.vacancy_urgent = np.array(
+            [v.get("urgency", "low") == "high" for v in self.vacancies], dtype=bool
+        )
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def encode_profiles(self, profiles):
+        """
+        Technology matrix and penalty class of each profile
+
+        Returns:
+            tuple: (profile matrix P x T, class index per profile,
+                    penalty table n_classes x V)
+        """
+        indptr = [0]
+        indices = []
+        for profile in profiles:
+            columns = {self.vocabulary[t] for t in profile["stack"] if t in self.vocabulary}
+            indices.extend(columns)
+            indptr.append(len(indices))
+
+        shape = (len(profiles), len(self.vocabulary))
+        data = np.ones(len(indices), dtype=np.float32)
+        if self.use_sparse:
+            matrix = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        else:
+            matrix = np.zeros(shape, dtype=np.float32)
+            row_index = np.repeat(np.arange(len(profiles)), np.diff(indptr))
+            matrix[row_index, np.asarray(indices, dtype=np.int64)] = 1.0
+
+        # Modalidad/zona que no aparece en ninguna vacante: código -1 (nunca coincide)
+        classes = {}
+        class_of = np.empty(len(profiles), dtype=np.int64)
+        for i, profile in enumerate(profiles):
+            pair = (self.modality_codes.get(profile["preferred_modality"], -1),
+                    self.zone_codes.get(profile["zone"], -1))
+            class_of[i] = classes.setdefault(pair, len(classes))
+
+        penalties = np.zeros((len(classes), len(self.vacancies)), dtype=np.float64)
+        for (modality, zone), row in classes.items():
+            # Same addition order as apply_penalties (0.2 + 0.2 + 0.1)
+            penalties[row] += np.where(self.vacancy_modality != modality, MODALITY_PENALTY, 0.0)
+            penalties[row] += np.where(self.vacancy_zone != zone, ZONE_PENALTY, 0.0)
+            penalties[row] += np.where(self.vacancy_urgent, URGENCY_PENALTY, 0.0)
+        return matrix, class_of, penalties
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _block_rows(self):
+        return max(1, self.block_cells // max(1, len(self.vacancies)))
+
+    def iter_scores(self, profiles, encoded=None):
+        """
+        Full scores, one block of profiles at a time
+
+        Args:
+            profiles: Profile dicts
+            encoded: Output of encode_profiles (to reuse it)
+
+        Yields:
+            tuple: (first profile index, match block, penalty block); blocks
+                are rows x V float64 arrays in vacancy order
+        """
+        matrix, class_of, penalties = encoded or self.encode_profiles(profiles)
+        step = self._block_rows()
+        for start in range(0, len(profiles), step):
+            stop = min(start + step, len(profiles))
+            shared = matrix[start:stop] @ self.vacancy_matrix
+            if self.use_sparse:
+                shared = shared.toarray()
+            # Vacancy without stack: the loop raised ZeroDivisionError, here it scores 0
+            match = np.divide(shared, self.stack_sizes, out=np.zeros(shared.shape, dtype=np.float64),
+                              where=self.stack_sizes > 0)
+            yield start, match, penalties[class_of[start:stop]]
+
+    def top_k(self, profiles, k=10):
+        """
+        Best k vacancies of each profile by adjusted score (match - penalty)
+
+        Ties keep vacancy order, i.e. the same result as a stable sort of the
+        nested loop's rows by adjusted score, descending.
+
+        Args:
+            profiles: Profile dicts
+            k: Vacancies kept per profile (capped at the number of vacancies)
+
+        Returns:
+            tuple: (vacancy indices, match scores, penalties), each P x k,
+                best first
+        """
+        n_vacancies = len(self.vacancies)
+        k = max(0, min(k, n_vacancies))
+        indices = np.zeros((len(profiles), k), dtype=np.int64)
+        match_out = np.zeros((len(profiles), k), dtype=np.float64)
+        penalty_out = np.zeros((len(profiles), k), dtype=np.float64)
+        if k == 0:
+            return indices, match_out, penalty_out
+
+        for start, match, penalty in self.iter_scores(profiles):
+            stop = start + match.shape[0]
+            adjusted = match - penalty
+
+            if k < n_vacancies:
+                # Valor k-ésimo de cada fila; los empates en el corte se
+                # resuelven por índice de vacante (como un sort estable)
+                kth = np.partition(adjusted, n_vacancies - k, axis=1)[:, n_vacancies - k]
+                rows, cols = np.nonzero(adjusted >= kth[:, None])
+                at_kth = adjusted[rows, cols] == kth[rows]
+                # Posición de cada empate dentro de su fila (rows viene ordenado)
+                tie_rank = np.cumsum(at_kth)
+                row_start = np.searchsorted(rows, np.arange(adjusted.shape[0]))
+                tie_rank -= np.concatenate(([0], tie_rank))[row_start][rows]
+                needed = k - np.bincount(rows[~at_kth], minlength=adjusted.shape[0])
+                keep = ~at_kth | (tie_rank <= needed[rows])
+                chosen = cols[keep].reshape(-1, k)
+            else:
+                chosen = np.broadcast_to(np.arange(n_vacancies), adjusted.shape)
+
+            chosen_adjusted = np.take_along_axis(adjusted, chosen, axis=1)
+            order = np.argsort(-chosen_adjusted, axis=1, kind='stable')
+            chosen = np.take_along_axis(chosen, order, axis=1)
+
+            indices[start:stop] = chosen
+            match_out[start:stop] = np.take_along_axis(match, chosen, axis=1)
+            penalty_out[start:stop] = np.take_along_axis(penalty, chosen, axis=1)
+        return indices, match_out, penalty_out
@@ -0,0 +1,320 @@
+"""
+Technology Index - TRS Engine Core
+Persistent inverted index technology -> vacancies / profiles
+
+Key Innovation:
+- A profile only has a non-zero match score with vacancies that share at
+  least one technology; the index keeps, per technology, the vacancies and
+  profiles that list it (posting sets)
+- "Best vacancies for this candidate" walks only the postings of the
+  candidate's technologies (and "best candidates for this vacancy" those of
+  the vacancy's), instead of scanning the whole catalog
+- add / remove update the postings of one record, so a changed profile or
+  vacancy never triggers a full cross-product recomputation
+- The records are saved to JSON; sync() applies only the differences
+  against the current Data/ files
+
+Vacancies are keyed by title and profiles by name, like the rest of the
+pipeline. Scores are the same as calculate_match_score / apply_penalties.
+
+Usage:
+    index = TechnologyIndex.load_or_build("Data/profiles.json", "Data/Vacancy.json")
+    index.best_vacancies("Luis", k=3)       # [(title, adjusted, match, penalty), ...]
+    index.best_candidates("Backend Developer", k=5)
+    index.add_profile(updated_profile)        # re-indexes only this profile
+    index.save()
+"""
+
+import heapq
+import json
+import os
+
+try:
+    from Modules.stack_matching_engine import MODALITY_PENALTY, ZONE_PENALTY, URGENCY_PENALTY
+except ImportError:
+    from stack_matching_engine import MODALITY_PENALTY, ZONE_PENALTY, URGENCY_PENALTY
+
+DEFAULT_INDEX_PATH = "Data/technology_index.json"
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def pair_scores(profile, vacancy, shared):
+    """
+    Match score and penalty of one pair
+
+    Args:
+        profile: Profile dict
+        vacancy: Vacancy dict
+        shared: Number of distinct technologies they share
+
+    Returns:
+        tuple: (match_score, penalty) as computed by the inference engine
+    """
+    match_score = shared / len(vacancy["stack"]) if vacancy["stack"] else 0.0
+    penalty = 0
+    if profile["preferred_modality"] != vacancy["modality"]:
+        penalty += MODALITY_PENALTY
+    if profile["zone"] != vacancy["zone"]:
+        penalty += ZONE_PENALTY
+    if vacancy.get("urgency", "low") == "high":
+        penalty += URGENCY_PENALTY
+    return match_score, penalty
+
+
+class TechnologyIndex:
+    """
+    Inverted index of vacancies and profiles by technology
+
+    Args:
+        path: JSON file used by save() / load()
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.vacancies = {}         # title -> vacancy dict
+        self.profiles = {}          # name -> profile dict
+        self.vacancy_postings = {}  # technology -> {title}
+        self.profile_postings = {}  # technology -> {name}
+        # Orden de inserción: desempata igual que el recorrido del catálogo
+        self._order = {}
+        self._sequence = 0
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _next_order(self, kind, key):
+        if (kind, key) not in self._order:
+            self._order[(kind, key)] = self._sequence
+            self._sequence += 1
+        return self._order[(kind, key)]
+
+    @staticmethod
+    def _post(postings, stack, key):
+        for tech in set(stack):
+            postings.setdefault(tech, set()).add(key)
+
+    @staticmethod
+    def _unpost(postings, stack, key):
+        for tech in set(stack):
+            keys = postings.get(tech)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del postings[tech]
+
+    def add_vacancy(self, vacancy):
+        """Index a vacancy (replaces the previous version with the same title)"""
+        title = vacancy["title"]
+        previous = self.vacancies.get(title)
+        if previous is not None:
+            self._unpost(self.vacancy_postings, previous["stack"], title)
+        self.vacancies[title] = vacancy
+        self._post(self.vacancy_postings, vacancy["stack"], title)
+        self._next_order('vacancy', title)
+
+    def remove_vacancy(self, title):
+        """Drop a vacancy; returns False if it was not indexed"""
+        vacancy = self.vacancies.pop(title, None)
+        if vacancy is None:
+            return False
+        self._unpost(self.vacancy_postings, vacancy["stack"], title)
+        self._order.pop(('vacancy', title), None)
+        return True
+
+    def add_profile(self, profile):
+        """Index a profile (replaces the previous version with the same name)"""
+        name = profile["name"]
+        previous = self.profiles.get(name)
+        if previous is not None:
+            self._unpost(self.profile_postings, previous["stack"], name)
+        self.profiles[name] = profile
+        self._post(self.profile_postings, profile["stack"], name)
+        self._next_order('profile', name)
+
+    def remove_profile(self, name):
+        """Drop a profile; returns False if it was not indexed"""
+        profile = self.profiles.pop(name, None)
+        if profile is None:
+            return False
+        self._unpost(self.profile_postings, profile["stack"], name)
+        self._order.pop(('profile', name), None)
+        return True
+
+    def sync(self, profiles=None, vacancies=None):
+        """
+        Bring the index in line with the current catalogs, touching only what changed
+
+        Args:
+            profiles: Current profile dicts (None = leave profiles as they are)
+            vacancies: Current vacancy dicts; entries without "title" are skipped
+
+        Returns:
+            dict: {'added': n, 'updated': n, 'removed': n}
+        """
+        changes = {'added': 0, 'updated': 0, 'removed': 0}
+        for records, current, key, add, remove in (
+            (vacancies, self.vacancies, "title", self.add_vacancy, self.remove_vacancy),
+            (profiles, self.profiles, "name", self.add_profile, self.remove_profile),
+        ):
+            if records is None:
+                continue
+            records = {r[key]: r for r in records if key in r}
+            for stale in [k for k in current if k not in records]:
+                remove(stale)
+                changes['removed'] += 1
+            for record_key, record in records.items():
+                existing = current.get(record_key)
+                if existing == record:
+                    continue
+                changes['updated' if existing is not None else 'added'] += 1
+                add(record)
+        return changes
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _shared_counts(stack, postings):
+        """{key: distinct technologies shared with stack} over the postings of stack only"""
+        counts = {}
+        for tech in set(stack):
+            for key in postings.get(tech, ()):
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def _resolve(self, record_or_key, records):
+        return records.get(record_or_key) if isinstance(record_or_key, str) else record_or_key
+
+    def vacancy_matches(self, profile):
+        """
+        Match score of every vacancy sharing a technology with the profile
+
+        Args:
+            profile: Profile dict or indexed profile name
+
+        Returns:
+            dict: {title: match_score} in catalog order; vacancies not
+                listed score 0
+        """
+        profile = self._resolve(profile, self.profiles)
+        if profile is None:
+            return {}
+        shared_counts = self._shared_counts(profile["stack"], self.vacancy_postings)
+        return {
+            title: pair_scores(profile, self.vacancies[title], shared_counts[title])[0]
+            for title in sorted(shared_counts, key=lambda title: self._order[('vacancy', title)])
+        }
+
+    def best_vacancies(self, profile, k=5, titles=None):
+        """
+        Best vacancies for a candidate by adjusted score (match - penalty)
+
+        Only vacancies sharing at least one technology are considered (the
+        rest have match score 0).
+
+        Args:
+            profile: Profile dict or indexed profile name
+            k: Results returned
+            titles: Optional iterable restricting the eligible vacancies
+
+        Returns:
+            list: (title, adjusted_score, match_score, penalty), best first
+        """
+        profile = self._resolve(profile, self.profiles)
+        if profile is None:
+            return []
+        allowed = set(titles) if titles is not None else None
+        scored = []
+        for title, shared in self._shared_counts(profile["stack"], self.vacancy_postings).items():
+            if allowed is not None and title not in allowed:
+                continue
+            match_score, penalty = pair_scores(profile, self.vacancies[title], shared)
+            scored.append((title, match_score - penalty, match_score, penalty))
+        return heapq.nsmallest(k, scored, key=lambda item: (-item[1], self._order[('vacancy', item[0])]))
+
+    def best_candidates(self, vacancy, k=5):
+        """
+        Best candidates for a vacancy by adjusted score (match - penalty)
+
+        Args:
+            vacancy: Vacancy dict or indexed vacancy title
+            k: Results returned
+
+        Returns:
+            list: (name, adjusted_score, match_score, penalty), best first
+        """
+        vacancy = self._resolve(vacancy, self.vacancies)
+        if vacancy is None:
+            return []
+        scored = []
+        for name, shared in self._shared_counts(vacancy["stack"], self.profile_postings).items():
+            match_score, penalty = pair_scores(self.profiles[name], vacancy, shared)
+            scored.append((name, match_score - penalty, match_score, penalty))
+        return heapq.nsmallest(k, scored, key=lambda item: (-item[1], self._order[('profile', item[0])]))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=None):
+        """Write the indexed records to JSON (postings are rebuilt on load)"""
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        order = sorted(self._order.items(), key=lambda item: item[1])
+        data = {
+            "vacancies": [self.vacancies[key] for (kind, key), _ in order if kind == 'vacancy'],
+            "profiles": [self.profiles[key] for (kind, key), _ in order if kind == 'profile'],
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Index saved with save(); an empty index if the file is missing or unreadable"""
+        index = cls(path)
+        if not os.path.exists(path):
+            return index
+        try:
+            data = _load_json(path)
+        except (OSError, ValueError) as e:
+            print(f"[INDEX] Índice ilegible en {path}, se reconstruye: {e}")
+            return index
+        for vacancy in data.get("vacancies", []):
+            index.add_vacancy(vacancy)
+        for profile in data.get("profiles", []):
+            index.add_profile(profile)
+        return index
+
+    @classmethod
+    def load_or_build(cls, profiles_path, vacancies_path, path=DEFAULT_INDEX_PATH, save=True):
+        """
+        Saved index brought up to date with the current profile and vacancy files
+
+        Args:
+            profiles_path: Profiles JSON
+            vacancies_path: Vacancies JSON
+            path: Index file
+            save: Write the index back when something changed
+
+        Returns:
+            TechnologyIndex
+        """
+        index = cls.load(path)
+        changes = index.sync(profiles=_load_json(profiles_path), vacancies=_load_json(vacancies_path))
+        if save and any(changes.values()):
+            try:
+                index.save()
+            except OSError as e:
+                print(f"[INDEX] No se pudo guardar el índice en {path}: {e}")
+        return index
@@ -5,34 +5,63 @@ Timezone Compatibility Module for TRS Engine Core
 Evaluates timezone compatibility between candidates and vacancies
 
 Features:
-- Resolve timezone from real location (city/country)
+- Resolve timezone from real location (city/country) with an offline gazetteer
+  and a persistent cache (geocoding optional, TIMEZONE_GEOCODING=true)
 - Calculate time offset and working hour overlap
 - Assess compatibility level and generate adaptive messages
 - Suggest optimal meeting times across zones
 - Export results to CSV
 """
 
+import os
+import threading
 from datetime import datetime, time
-from typing import Dict, List, Tuple
-from timezonefinderL import TimezoneFinder
-from geopy.geocoders import Nominatim
+from typing import Dict, List, Optional, Tuple
 import pytz
 import csv
 
+try:
+    from Modules.timezone_gazetteer import TimezoneResolver
+except ImportError:
+    from timezone_gazetteer import TimezoneResolver
+
 # Standard working hours (9 AM - 6 PM)
 STANDARD_WORK_START = time(9, 0)
 STANDARD_WORK_END = time(18, 0)
 
+# Geocoding (Nominatim, online) only for names missing from the offline gazetteer
+TIMEZONE_GEOCODING = os.getenv('TIMEZONE_GEOCODING', 'false').lower() == 'true'
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def geocode_timezone(location_name: str) -> Optional[str]:
+    """Timezone of a location via Nominatim + TimezoneFinder (network; None if not found)"""
+    from timezonefinderL import TimezoneFinder
+    from geopy.geocoders import Nominatim
 
-def resolve_timezone_from_location(location_name: str) -> str:
-    """Resolve timezone from real-world location name"""
     geolocator = Nominatim(user_agent="trs_timezone_resolver", timeout=10)
     location = geolocator.geocode(location_name)
     if not location:
-        return "UTC"
+        return None
     tf = TimezoneFinder()
-    tz = tf.timezone_at(lat=location.latitude, lng=location.longitude)
-    return tz or "UTC"
+    return tf.timezone_at(lat=location.latitude, lng=location.longitude)
+
+
+def get_timezone_resolver() -> TimezoneResolver:
+    """Shared resolver (gazetteer + persistent cache, geocoding if TIMEZONE_GEOCODING=true)"""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = TimezoneResolver(geocoder=geocode_timezone if TIMEZONE_GEOCODING else None)
+    return _resolver
+
+
+def resolve_timezone_from_location(location_name: str) -> str:
+    """Resolve timezone from real-world location name (offline gazetteer, cached; UTC if unknown)"""
+    return get_timezone_resolver().resolve(location_name)
 
 
 def calculate_time_offset(tz1_name: str, tz2_name: str) -> float:
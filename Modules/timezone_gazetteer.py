@@ -0,0 +1,326 @@
+"""
+Timezone Gazetteer - TRS Engine Core
+Offline location -> IANA timezone resolution with a persistent memo cache
+
+Key Innovation:
+- Data/timezone_gazetteer.json maps cities and regions (states, provinces;
+  with their country) and countries (plus aliases: "USA", "UK", "República
+  Dominicana", ...) to IANA zones, so resolving "Bogota, Colombia" needs no
+  network call
+- Names are normalized (case, accents, punctuation) and typos are matched
+  fuzzily ("Bogta, Colombia", "Santo Domingo, Dominican Rep.")
+- Results are memoized in memory and persisted to a JSON cache; geocoded
+  answers survive restarts, gazetteer answers are dropped when the
+  gazetteer changes
+- Geocoding (Nominatim + TimezoneFinder) is only an optional fallback for
+  names the gazetteer does not know
+
+Lookup order for "City, Region, Country":
+    1. the qualifier: the last part naming a country, or (after the first
+       part) a region or city, which stands for its country ("Paris, Texas"
+       -> united states)
+    2. a city listed for the qualifier's country (any comma part, or words
+       inside a part)
+    3. a region of that country, then the country's zone
+    4. fuzzy city match, then fuzzy country match
+    5. geocoder (when enabled), otherwise the default zone (UTC)
+
+Usage:
+    resolver = TimezoneResolver()
+    resolver.resolve("Santo Domingo, Dominican Republic")   # 'America/Santo_Domingo'
+"""
+
+import atexit
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+
+try:
+    from src.structured_log import get_logger
+except ImportError:  # Ejecutado como script desde Modules/: mismo logger raíz, sin src/
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(f"saori.{name}")
+
+log = get_logger('timezone')
+
+DATA_DIR = Path(__file__).parent.parent / "Data"
+GAZETTEER_PATH = DATA_DIR / "timezone_gazetteer.json"
+CACHE_PATH = DATA_DIR / "timezone_cache.json"
+
+DEFAULT_TIMEZONE = "UTC"
+FUZZY_CUTOFF = 0.85
+
+_PART_SEPARATORS = re.compile(r"[,;/|()]")
+
+
+def normalize_location(text):
+    """Lowercase, accents removed, punctuation turned into single spaces"""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+class TimezoneGazetteer:
+    """
+    City / country -> IANA timezone tables
+
+    Args:
+        path: Gazetteer JSON (countries, country_aliases, cities, regions)
+        fuzzy_cutoff: Minimum difflib similarity for typo matches (0-1)
+    """
+
+    def __init__(self, path=GAZETTEER_PATH, fuzzy_cutoff=FUZZY_CUTOFF):
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+        # Cualquier cambio en el archivo invalida las respuestas cacheadas del gazetteer
+        last_updated = data.get("_metadata", {}).get("last_updated", "")
+        self.version = f"{last_updated}-{hashlib.sha1(raw).hexdigest()[:12]}"
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.countries = {normalize_location(name): tz for name, tz in data["countries"].items()}
+        self.country_names = {}
+        for alias, country in data.get("country_aliases", {}).items():
+            self.country_names[normalize_location(alias)] = normalize_location(country)
+        for country in self.countries:
+            self.country_names[country] = country
+
+        # city -> {country: tz}; el primer país listado es el de por defecto
+        self.cities = {}
+        for city, country, tz in data["cities"]:
+            self.cities.setdefault(normalize_location(city), {})[normalize_location(country)] = tz
+        # region -> {country: tz} (estados, provincias)
+        self.regions = {}
+        for region, country, tz in data.get("regions", []):
+            self.regions.setdefault(normalize_location(region), {})[normalize_location(country)] = tz
+
+        self._max_words = max(
+            len(name.split()) for name in list(self.cities) + list(self.regions) + list(self.country_names)
+        )
+
+    # ------------------------------------------------------------------
+    # Exact lookups
+    # ------------------------------------------------------------------
+
+    def country_of(self, name):
+        """Canonical country for a normalized name or alias (None if unknown)"""
+        return self.country_names.get(name)
+
+    def _city_zone(self, name, country):
+        zones = self.cities.get(name)
+        if not zones:
+            return None
+        if country is None:
+            return next(iter(zones.values()))
+        # Ciudad conocida pero de otro país ("Cordoba, Spain"): decide el país
+        return zones.get(country)
+
+    def _qualifier_countries(self, parts):
+        """
+        Countries the location is qualified with, most explicit first
+
+        The last part that names something decides: a country name, or
+        (except for the first part) a region or city, which stands for its
+        countries ("Paris, Texas" -> united states). A name that is both
+        ("Atlanta, Georgia") yields every reading; the cities decide later.
+
+        Returns:
+            tuple: (countries, named) - candidate countries in order, and
+                the ones named as a country (not through a region or city)
+        """
+        for index in range(len(parts) - 1, -1, -1):
+            countries = []
+            named = set()
+            for name in [parts[index], *self._phrases(parts[index], self._max_words)]:
+                country = self.country_of(name)
+                if country:
+                    named.add(country)
+                found = [country]
+                if index > 0:
+                    found += list(self.regions.get(name, ())) + list(self.cities.get(name, ()))
+                countries += [c for c in found if c and c not in countries]
+            if countries:
+                return countries, named
+        return [], set()
+
+    @staticmethod
+    def _phrases(part, max_words):
+        """Word n-grams of a part, longest first ("remote from new york" -> "new york", ...)"""
+        words = part.split()
+        for size in range(min(max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield " ".join(words[start:start + size])
+
+    def lookup(self, location):
+        """
+        Timezone of a location string
+
+        Returns:
+            tuple: (timezone, how) where how is 'city', 'region', 'country',
+                'fuzzy-city' or 'fuzzy-country'; (None, None) if unknown
+        """
+        parts = [normalize_location(p) for p in _PART_SEPARATORS.split(str(location))]
+        parts = [p for p in parts if p]
+        if not parts:
+            return None, None
+
+        countries, named = self._qualifier_countries(parts)
+        # Tras la primera parte, una región califica: no se lee como ciudad ("Spokane, Washington")
+        city_parts = [p for i, p in enumerate(parts) if i == 0 or p not in self.regions]
+
+        for country in countries or [None]:
+            for part in city_parts:
+                zone = self._city_zone(part, country)
+                if zone:
+                    return zone, "city"
+            for part in city_parts:
+                for phrase in self._phrases(part, self._max_words):
+                    zone = self._city_zone(phrase, country)
+                    if zone:
+                        return zone, "city"
+
+        # Sin ciudad: la región del país candidato, o el país si fue nombrado como tal
+        for country in countries:
+            for part in parts[1:]:
+                for name in [part, *self._phrases(part, self._max_words)]:
+                    zone = self.regions.get(name, {}).get(country)
+                    if zone:
+                        return zone, "region"
+            if country in named:
+                return self.countries[country], "country"
+        if countries:
+            return self.countries[countries[0]], "country"
+
+        for part in parts:
+            match = difflib.get_close_matches(part, self.cities, n=1, cutoff=self.fuzzy_cutoff)
+            if match:
+                return self._city_zone(match[0], None), "fuzzy-city"
+        for part in reversed(parts):
+            match = difflib.get_close_matches(part, self.country_names, n=1, cutoff=self.fuzzy_cutoff)
+            if match:
+                return self.countries[self.country_of(match[0])], "fuzzy-country"
+        return None, None
+
+
+class TimezoneCache:
+    """
+    Persistent memo of resolved locations (normalized name -> zone and source)
+
+    Writes are batched: flush() saves the file (called at exit), so
+    resolving thousands of candidates does not rewrite it per entry.
+
+    Args:
+        path: JSON file (None = memory only)
+        gazetteer_version: Entries that came from another gazetteer version
+            are dropped on load (geocoded ones are kept)
+    """
+
+    def __init__(self, path=CACHE_PATH, gazetteer_version=""):
+        self.path = path
+        self.gazetteer_version = gazetteer_version
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Caché ilegible en %s, se ignora: %s", self.path, e)
+            return
+        same_version = data.get("gazetteer_version") == self.gazetteer_version
+        for key, entry in data.get("entries", {}).items():
+            if same_version or entry.get("source") == "geocoder":
+                self._entries[key] = entry
+        self._dirty = not same_version
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        return entry["timezone"] if entry else None
+
+    def set(self, key, timezone, source):
+        with self._lock:
+            self._entries[key] = {"timezone": timezone, "source": source}
+            self._dirty = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def flush(self):
+        """Write the cache file if something changed"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"gazetteer_version": self.gazetteer_version, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("No se pudo guardar la caché en %s: %s", self.path, e)
+
+
+class TimezoneResolver:
+    """
+    Location -> timezone: memo cache, then gazetteer, then optional geocoder
+
+    Args:
+        gazetteer: TimezoneGazetteer (default: Data/timezone_gazetteer.json)
+        cache: TimezoneCache (default: Data/timezone_cache.json)
+        geocoder: Callable(location) -> timezone or None, tried for names the
+            gazetteer does not know (None = offline only)
+        default: Zone returned when nothing matches
+    """
+
+    def __init__(self, gazetteer=None, cache=None, geocoder=None, default=DEFAULT_TIMEZONE):
+        self.gazetteer = gazetteer or TimezoneGazetteer()
+        self.cache = cache if cache is not None else TimezoneCache(CACHE_PATH, self.gazetteer.version)
+        self.geocoder = geocoder
+        self.default = default
+        self._misses = set()  # desconocidos: solo en memoria, no se persisten
+
+    def resolve(self, location):
+        """IANA timezone of a location name (the default zone if unknown)"""
+        if not location:
+            return self.default
+        key = normalize_location(location)
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        if key in self._misses:
+            return self.default
+
+        zone, _ = self.gazetteer.lookup(location)
+        if zone:
+            self.cache.set(key, zone, "gazetteer")
+            return zone
+
+        if self.geocoder is not None:
+            try:
+                zone = self.geocoder(location)
+            except Exception as e:
+                log.warning("Geocoding failed for '%s': %s", location, e)
+                zone = None
+            if zone:
+                self.cache.set(key, zone, "geocoder")
+                return zone
+
+        self._misses.add(key)
+        return self.default
@@ -0,0 +1,277 @@
+"""
+Export Script - Optimized CPU models
+Genera versiones int8 (torch dynamic quantization) y ONNX Runtime int8 del
+modelo de sentimiento y de los modelos de similitud, y verifica paridad
+contra las predicciones fp32 antes de habilitarlas
+
+Output (one directory per model, read by the runtime automatically):
+    Models/optimized/<model>/model-int8.pt       torch dynamic int8 weights
+    Models/optimized/<model>/model.int8.onnx     ONNX Runtime int8 graph
+    Models/optimized/<model>/manifest.json       parity + latency results
+
+An artifact is only used with backend 'auto' if its parity check passed:
+    sentiment:  label agreement with fp32 >= --min-agreement
+    similarity: min cosine(fp32 embedding, optimized embedding) >= --min-cosine
+
+Usage:
+    python export_optimized_models.py
+    python export_optimized_models.py --skip-similarity --backends onnx-int8
+Requires: torch, transformers, sentence-transformers; onnx + onnxruntime for ONNX
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+import torch
+
+from Modules.model_optimization import (
+    BACKENDS, optimized_dir_for, load_manifest, write_manifest,
+    quantize_dynamic_int8, load_torch_int8, OnnxSentenceEncoder
+)
+from Modules.sentiment_inference import SentimentPredictor
+
+SIMILARITY_MODELS = ('paraphrase-multilingual-MiniLM-L12-v2', 'paraphrase-MiniLM-L6-v2')
+CORPUS_PATH = Path('Data/sentiment_training/labeled_data.json')
+ONNX_OPSET = 14
+
+
+def load_corpus(samples):
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [item['text'] for item in data]
+    return texts[:samples] if samples else texts
+
+
+def file_size_mb(path):
+    return round(os.path.getsize(path) / 1e6, 1)
+
+
+def latency_ms(fn, texts, repeat=1):
+    """p50 / mean latency of fn(text) over texts, in ms"""
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            fn(text)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {'p50': round(statistics.median(timings), 2), 'mean': round(statistics.mean(timings), 2)}
+
+
+def export_onnx(module, example_inputs, input_names, output_name, onnx_path):
+    """Export to ONNX with dynamic batch/sequence axes, then quantize weights to int8"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    fp32_path = onnx_path.with_name('model.fp32.onnx')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes[output_name] = {0: 'batch'}
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            tuple(example_inputs[name] for name in input_names),
+            str(fp32_path),
+            input_names=list(input_names),
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET
+        )
+    quantize_dynamic(str(fp32_path), str(onnx_path), weight_type=QuantType.QInt8)
+    fp32_path.unlink()
+
+
+class _LogitsOnly(torch.nn.Module):
+    """HF classifier returning plain logits (traceable output for ONNX)"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids).logits
+
+
+class _LastHiddenState(torch.nn.Module):
+    """Transformer returning token embeddings (pooling is done by OnnxSentenceEncoder)"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, *extra):
+        kwargs = {'token_type_ids': extra[0]} if extra else {}
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, **kwargs).last_hidden_state
+
+
+# ----------------------------------------------------------------------
+# Sentiment
+# ----------------------------------------------------------------------
+
+def export_sentiment(model_path, backends, texts, min_agreement):
+    print(f"\n[SENTIMENT] Cargando modelo fp32 ({model_path})...")
+    reference = SentimentPredictor(model_path, backend='fp32', device='cpu')
+    out_dir = optimized_dir_for(reference.load_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'model': reference.load_path, 'artifacts': load_manifest(out_dir).get('artifacts', {})}
+
+    if 'torch-int8' in backends:
+        path = out_dir / 'model-int8.pt'
+        torch.save(quantize_dynamic_int8(copy.deepcopy(reference.model)).state_dict(), path)
+        manifest['artifacts']['torch-int8'] = {'file': path.name, 'size_mb': file_size_mb(path), 'parity_passed': False}
+        print(f"[SENTIMENT] torch-int8 exportado: {path}")
+
+    if 'onnx-int8' in backends:
+        path = out_dir / 'model.int8.onnx'
+        example = reference.tokenizer(["example input"], return_tensors='pt')
+        export_onnx(
+            _LogitsOnly(reference.model).eval(), example,
+            ('input_ids', 'attention_mask', 'token_type_ids'), 'logits', path
+        )
+        manifest['artifacts']['onnx-int8'] = {'file': path.name, 'size_mb': file_size_mb(path), 'parity_passed': False}
+        print(f"[SENTIMENT] onnx-int8 exportado: {path}")
+    write_manifest(out_dir, manifest)
+
+    # Paridad contra fp32
+    print(f"[SENTIMENT] Control de paridad sobre {len(texts)} textos...")
+    expected = reference.predict_batch(texts)
+    fp32_latency = latency_ms(reference.predict, texts[:50])
+    for backend in backends:
+        if backend not in manifest['artifacts']:
+            continue
+        candidate = SentimentPredictor(model_path, backend=backend, device='cpu')
+        actual = candidate.predict_batch(texts)
+        agreement = sum(a['sentiment'] == e['sentiment'] for a, e in zip(actual, expected)) / len(texts)
+        max_prob_diff = max(
+            abs(a['probabilities'][label] - e['probabilities'][label])
+            for a, e in zip(actual, expected) for label in e['probabilities']
+        )
+        entry = manifest['artifacts'][backend]
+        entry['parity'] = {
+            'samples': len(texts),
+            'label_agreement': round(agreement, 4),
+            'max_probability_diff': round(max_prob_diff, 4)
+        }
+        entry['latency_ms'] = {'fp32': fp32_latency, backend: latency_ms(candidate.predict, texts[:50])}
+        entry['parity_passed'] = agreement >= min_agreement
+        print(f"   {backend}: agreement={agreement:.2%} max_prob_diff={max_prob_diff:.4f} "
+              f"p50 {fp32_latency['p50']}ms -> {entry['latency_ms'][backend]['p50']}ms "
+              f"{'OK' if entry['parity_passed'] else 'FAILED (disabled)'}")
+
+    manifest['created_at'] = datetime.now().isoformat()
+    write_manifest(out_dir, manifest)
+
+
+# ----------------------------------------------------------------------
+# Similarity (SentenceTransformer)
+# ----------------------------------------------------------------------
+
+def sentence_pooling(model):
+    """(mean pooling?, normalize?) of a SentenceTransformer pipeline"""
+    modules = list(model)
+    pooling = modules[1].get_config_dict() if len(modules) > 1 else {}
+    mean_only = pooling.get('pooling_mode_mean_tokens', False) and not any(
+        value for key, value in pooling.items()
+        if key.startswith('pooling_mode_') and key != 'pooling_mode_mean_tokens'
+    )
+    normalize = any(type(module).__name__ == 'Normalize' for module in modules[2:])
+    supported = mean_only and len(modules) <= 3 and (len(modules) < 3 or normalize)
+    return supported, normalize
+
+
+def export_similarity(model_name, backends, texts, min_cosine):
+    from sentence_transformers import SentenceTransformer
+    import numpy as np
+
+    print(f"\n[SIMILARITY] Cargando modelo fp32 ({model_name})...")
+    reference = SentenceTransformer(model_name, device='cpu')
+    out_dir = optimized_dir_for(model_name)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'model': model_name, 'artifacts': load_manifest(out_dir).get('artifacts', {})}
+
+    if 'torch-int8' in backends:
+        path = out_dir / 'model-int8.pt'
+        torch.save(quantize_dynamic_int8(copy.deepcopy(reference)).state_dict(), path)
+        manifest['artifacts']['torch-int8'] = {'file': path.name, 'size_mb': file_size_mb(path), 'parity_passed': False}
+        print(f"[SIMILARITY] torch-int8 exportado: {path}")
+
+    if 'onnx-int8' in backends:
+        supported, normalize = sentence_pooling(reference)
+        if not supported:
+            print(f"[SIMILARITY] {model_name}: pooling no soportado por OnnxSentenceEncoder, omitiendo ONNX")
+        else:
+            path = out_dir / 'model.int8.onnx'
+            transformer = reference[0]
+            example = transformer.tokenizer(["example input"], return_tensors='pt')
+            input_names = tuple(name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in example)
+            export_onnx(_LastHiddenState(transformer.auto_model).eval(), example, input_names, 'last_hidden_state', path)
+            transformer.tokenizer.save_pretrained(str(out_dir))
+            manifest['artifacts']['onnx-int8'] = {
+                'file': path.name,
+                'size_mb': file_size_mb(path),
+                'max_seq_length': reference.max_seq_length,
+                'normalize': normalize,
+                'parity_passed': False
+            }
+            print(f"[SIMILARITY] onnx-int8 exportado: {path}")
+    write_manifest(out_dir, manifest)
+
+    # Paridad: cada embedding optimizado contra su embedding fp32
+    print(f"[SIMILARITY] Control de paridad sobre {len(texts)} textos...")
+    expected = reference.encode(texts, convert_to_numpy=True, batch_size=32, show_progress_bar=False)
+    encode_one = lambda text: reference.encode([text], convert_to_numpy=True, show_progress_bar=False)
+    fp32_latency = latency_ms(encode_one, texts[:50])
+    for backend in backends:
+        entry = manifest['artifacts'].get(backend)
+        if entry is None:
+            continue
+        if backend == 'onnx-int8':
+            candidate = OnnxSentenceEncoder(out_dir, entry)
+        else:
+            candidate = load_torch_int8(SentenceTransformer(model_name, device='cpu'), out_dir / entry['file'])
+        actual = candidate.encode(texts, convert_to_numpy=True, batch_size=32, show_progress_bar=False)
+        cosines = (actual * expected).sum(axis=1) / (
+            np.linalg.norm(actual, axis=1) * np.linalg.norm(expected, axis=1) + 1e-12
+        )
+        entry['parity'] = {
+            'samples': len(texts),
+            'min_cosine': round(float(cosines.min()), 4),
+            'mean_cosine': round(float(cosines.mean()), 4)
+        }
+        encode_candidate = lambda text: candidate.encode([text], convert_to_numpy=True, show_progress_bar=False)
+        entry['latency_ms'] = {'fp32': fp32_latency, backend: latency_ms(encode_candidate, texts[:50])}
+        entry['parity_passed'] = float(cosines.min()) >= min_cosine
+        print(f"   {backend}: min_cosine={cosines.min():.4f} mean_cosine={cosines.mean():.4f} "
+              f"p50 {fp32_latency['p50']}ms -> {entry['latency_ms'][backend]['p50']}ms "
+              f"{'OK' if entry['parity_passed'] else 'FAILED (disabled)'}")
+
+    manifest['created_at'] = datetime.now().isoformat()
+    write_manifest(out_dir, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export int8 / ONNX versions of the BERT models with parity checks")
+    parser.add_argument('--sentiment-model', default='Models/bert-sentiment-saori')
+    parser.add_argument('--similarity-models', nargs='*', default=list(SIMILARITY_MODELS))
+    parser.add_argument('--backends', nargs='*', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--skip-sentiment', action='store_true')
+    parser.add_argument('--skip-similarity', action='store_true')
+    parser.add_argument('--samples', type=int, default=500, help='Parity texts from the labeled corpus (0 = all)')
+    parser.add_argument('--min-agreement', type=float, default=0.98, help='Min sentiment label agreement with fp32')
+    parser.add_argument('--min-cosine', type=float, default=0.97, help='Min cosine between fp32 and optimized embeddings')
+    args = parser.parse_args()
+
+    texts = load_corpus(args.samples)
+    if not args.skip_sentiment:
+        export_sentiment(args.sentiment_model, args.backends, texts, args.min_agreement)
+    if not args.skip_similarity:
+        for model_name in args.similarity_models:
+            export_similarity(model_name, args.backends, texts, args.min_cosine)
+    print("\n[DONE] Artefactos en Models/optimized/ (SENTIMENT_BACKEND / SIMILARITY_BACKEND=auto los usan)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Conversation Lock - Per-phone-number FIFO serialization
+=======================================================
+
+Messages from the same candidate must be processed strictly in arrival
+order, while different candidates are processed in parallel by Flask
+threads. ConversationLocks hands out one ticket per incoming message and
+lets tickets for the same phone number through one at a time, in order.
+Entries are removed when a conversation has no pending messages, so memory
+tracks only conversations with in-flight messages.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from src.metrics import registry
+
+
+class _ConversationQueue:
+    """Ticket dispenser for one conversation"""
+
+    __slots__ = ('next_ticket', 'now_serving', 'cond')
+
+    def __init__(self, lock):
+        self.next_ticket = 0
+        self.now_serving = 0
+        # Shares the registry lock; only this conversation's waiters are woken
+        self.cond = threading.Condition(lock)
+
+
+class ConversationLocks:
+    """
+    Keyed FIFO lock: one in-flight message per conversation
+
+    Metrics:
+        conversation_queue_depth: messages waiting (all conversations)
+        conversation_active: conversations currently being processed
+        conversation_lock_wait_seconds: time each message waited for its turn
+    """
+
+    def __init__(self, metrics=registry):
+        self._lock = threading.Lock()
+        self._queues = {}
+        self.queue_depth = metrics.gauge(
+            'conversation_queue_depth', 'Messages waiting for their conversation lock'
+        )
+        self.active = metrics.gauge(
+            'conversation_active', 'Conversations with a message being processed'
+        )
+        self.wait_seconds = metrics.histogram(
+            'conversation_lock_wait_seconds', 'Time a message waited for its conversation lock'
+        )
+        self.max_depth = metrics.gauge(
+            'conversation_queue_max_depth', 'Largest per-conversation backlog seen'
+        )
+
+    def depth(self, key):
+        """Number of messages queued or in flight for key"""
+        with self._lock:
+            entry = self._queues.get(key)
+            return entry.next_ticket - entry.now_serving if entry else 0
+
+    @contextmanager
+    def hold(self, key):
+        """Wait for key's turn, run the block, then let the next message through"""
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._queues.get(key)
+            if entry is None:
+                entry = _ConversationQueue(self._lock)
+                self._queues[key] = entry
+            ticket = entry.next_ticket
+            entry.next_ticket += 1
+            backlog = entry.next_ticket - entry.now_serving
+            if backlog > self.max_depth.value():
+                self.max_depth.set(backlog)
+            waiting = ticket != entry.now_serving
+            if waiting:
+                self.queue_depth.inc()
+                while ticket != entry.now_serving:
+                    entry.cond.wait()
+                self.queue_depth.dec()
+            self.active.inc()
+        self.wait_seconds.observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active.dec()
+                entry.now_serving += 1
+                if entry.now_serving == entry.next_ticket:
+                    del self._queues[key]
+                else:
+                    entry.cond.notify_all()
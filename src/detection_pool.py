@@ -0,0 +1,163 @@
+"""
+Detection Pool - Bounded, cancellable background jobs with late-result delivery
+===============================================================================
+
+Inconsistency detection used to run in a fresh daemon thread per final-stage
+request, joined with a timeout. On timeout the thread kept running and its
+result was discarded. DetectionPool instead:
+
+- runs jobs on a fixed number of worker threads (no thread per request),
+- rejects new jobs when workers + pending slots are full (caller falls back),
+- supports cooperative cancellation through a threading.Event,
+- hands results that finish after the caller stopped waiting to an
+  on_late callback, so no finished work is thrown away.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('detection')
+
+
+class DetectionJob:
+    """Handle for one submitted job"""
+
+    def __init__(self, key, on_late=None):
+        self.key = key
+        self.cancel_event = threading.Event()
+        self.on_late = on_late
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._abandoned = False
+        self.result = None
+        self.error = None
+        self.future = None
+
+    def cancel(self):
+        """Stop the job at its next checkpoint (or right away if not started)"""
+        # The future itself is not cancelled: _run must execute to free the slot
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds for the result
+
+        Returns:
+            tuple: (finished, result). If not finished, the job is marked as
+            abandoned and its result will go to on_late when it completes.
+        """
+        self._finished.wait(timeout)
+        with self._lock:
+            if self._finished.is_set():
+                return True, self.result
+            self._abandoned = True
+            return False, None
+
+    def _complete(self, result, error):
+        with self._lock:
+            self.result = result
+            self.error = error
+            self._finished.set()
+            deliver_late = self._abandoned and error is None and not self.cancelled
+        return deliver_late
+
+
+class DetectionPool:
+    """
+    Fixed-size worker pool for detection jobs keyed by conversation
+
+    Metrics:
+        detection_jobs_total{outcome}: completed / late / cancelled / failed / rejected
+        detection_jobs_in_flight: jobs running or waiting for a worker
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, metrics=registry):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detection")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.jobs_total = metrics.counter(
+            'detection_jobs_total', 'Inconsistency detection jobs by outcome', ('outcome',)
+        )
+        self.in_flight = metrics.gauge(
+            'detection_jobs_in_flight', 'Detection jobs running or queued'
+        )
+
+    def submit(self, key, fn, *args, on_late=None, **kwargs):
+        """
+        Schedule fn(*args, cancel_event=..., **kwargs)
+
+        Any previous job for the same key is cancelled first.
+
+        Returns:
+            DetectionJob, or None if the pool is saturated
+        """
+        if not self._slots.acquire(blocking=False):
+            self.jobs_total.inc(outcome='rejected')
+            return None
+
+        job = DetectionJob(key, on_late=on_late)
+        with self._lock:
+            previous = self._jobs.get(key)
+            self._jobs[key] = job
+        if previous is not None:
+            previous.cancel()
+
+        self.in_flight.inc()
+        try:
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        except Exception:
+            self._release(job)
+            raise
+        return job
+
+    def cancel(self, key):
+        """Cancel the running/pending job for key, if any"""
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is not None:
+            job.cancel()
+
+    def _release(self, job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        self.in_flight.dec()
+        self._slots.release()
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            if job.cancelled:
+                job._complete(None, None)
+                self.jobs_total.inc(outcome='cancelled')
+                return
+            try:
+                result = fn(*args, cancel_event=job.cancel_event, **kwargs)
+                error = None
+            except Exception as e:
+                result, error = None, e
+
+            deliver_late = job._complete(result, error)
+            if job.cancelled:
+                self.jobs_total.inc(outcome='cancelled')
+            elif error is not None:
+                self.jobs_total.inc(outcome='failed')
+                log.error("Detection job for %s failed: %s", job.key, error, exc_info=error)
+            elif deliver_late:
+                self.jobs_total.inc(outcome='late')
+                if job.on_late is not None:
+                    try:
+                        job.on_late(result)
+                    except Exception as e:
+                        log.error("Late detection delivery for %s failed: %s", job.key, e, exc_info=True)
+            else:
+                self.jobs_total.inc(outcome='completed')
+        finally:
+            self._release(job)
@@ -0,0 +1,306 @@
+"""
+Grammar Service - Shared LanguageTool server, pooled clients, cached results
+============================================================================
+
+evaluate_english_level() used to start a LanguageTool JVM in every worker
+process and call check() synchronously in the webhook. GrammarService
+instead:
+
+- talks to ONE LanguageTool server shared by all workers:
+    * LANGUAGETOOL_URL=http://host:8081 uses an external server, or
+    * autostart: the first worker to take the lockfile starts a local
+      server and publishes its URL; the other workers connect to it (if the
+      owner dies, the next worker to notice takes over)
+- runs checks on a bounded pool of HTTP clients (busy -> no grammar penalty)
+- caches results by content hash (InferenceCache: LRU/TTL, optionally on disk)
+- gives every check a timeout; None means "use the base score"
+"""
+
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+from src.inference_cache import InferenceCache
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('grammar')
+
+# Only the fields evaluate_english_level() uses (same names as language_tool_python.Match)
+GrammarIssue = namedtuple('GrammarIssue', ['message', 'offset', 'errorLength'])
+
+
+def _try_lock(handle):
+    """Non-blocking exclusive lock on an open file (released when the process exits)"""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class GrammarService:
+    """
+    Grammar checks against a shared LanguageTool server
+
+    Args:
+        language: LanguageTool language code
+        server_url: External server (e.g. http://localhost:8081); None = autostart
+        pool_size: Concurrent checks per process (one HTTP client each)
+        timeout: Seconds a caller waits for a result before falling back
+        cache_size: Cached results (by text hash)
+        cache_ttl: Seconds a cached result stays valid (None = no expiry)
+        cache_path: JSON file to persist cached results across restarts
+        state_dir: Where the autostart lockfile and URL file live
+        startup_timeout: Seconds a worker waits for another worker's server
+    """
+
+    def __init__(self, language='en-US', server_url=None, pool_size=2, timeout=3.0,
+                 cache_size=2048, state_dir=None, startup_timeout=60.0, cache_ttl=None,
+                 cache_path=None, metrics=registry):
+        self.language = language
+        self.configured_url = server_url.rstrip('/') if server_url else None
+        self.server_url = self.configured_url
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.state_dir = Path(state_dir) if state_dir else Path(tempfile.gettempdir())
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="grammar")
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._clients = queue.LifoQueue()
+        self.cache = InferenceCache(
+            'grammar', max_size=cache_size, ttl_seconds=cache_ttl, persist_path=cache_path,
+            decode=lambda issues: [GrammarIssue(*issue) for issue in issues], metrics=metrics
+        )
+        self._server_lock = threading.Lock()
+        self._lock_handle = None
+        self._server_tool = None
+        # True while the local server object is lent out as the only client
+        self._server_tool_lent = False
+        self._available = True
+
+        self.checks_total = metrics.counter(
+            'grammar_checks_total', 'Grammar checks by outcome', ('outcome',)
+        )
+        self.check_seconds = metrics.histogram(
+            'grammar_check_seconds', 'LanguageTool check latency (cache misses)'
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def check(self, text):
+        """
+        Grammar issues for text
+
+        Returns:
+            list: GrammarIssue items, or None if no result is available in time
+            (service missing, pool busy, timeout or error)
+        """
+        if not self._available:
+            self.checks_total.inc(outcome='unavailable')
+            return None
+
+        key = hashlib.sha1(f"{self.language}\x00{text}".encode('utf-8')).hexdigest()
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.checks_total.inc(outcome='hit')
+            return cached
+
+        if not self._slots.acquire(blocking=False):
+            self.checks_total.inc(outcome='busy')
+            log.warning("Grammar service busy, using base score only")
+            return None
+
+        try:
+            future = self._executor.submit(self._run_check, key, text)
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The check keeps running and fills the cache for the next time
+            self.checks_total.inc(outcome='timeout')
+            log.warning("Grammar check timed out after %ss, using base score only", self.timeout)
+            return None
+        except Exception as e:
+            self.checks_total.inc(outcome='error')
+            log.warning("Grammar check failed: %s, using base score only", e)
+            return None
+
+        self.checks_total.inc(outcome='miss' if result is not None else 'unavailable')
+        return result
+
+    def start(self):
+        """
+        Start (or connect to) the server and open one client now
+
+        Returns:
+            GrammarService: self (usable as a model registry loader)
+
+        Raises:
+            RuntimeError: if LanguageTool is not available
+        """
+        client = self._acquire_client()
+        if client is None:
+            raise RuntimeError("LanguageTool not available")
+        self._clients.put(client)
+        return self
+
+    def warmup(self):
+        """Start the server/client in the background so the first check is fast"""
+        if not self._slots.acquire(blocking=False):
+            return
+        self._executor.submit(self._run_check, None, "This is a warm-up sentence.")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self._server_tool is not None:
+            try:
+                self._server_tool.close()
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------
+    # Internals (run on the grammar pool threads)
+    # ------------------------------------------------------------------
+
+    def _run_check(self, key, text):
+        try:
+            client = self._acquire_client()
+            if client is None:
+                return None
+            start = time.perf_counter()
+            try:
+                matches = client.check(text)
+            except Exception:
+                # Server gone (e.g. owner worker restarted): drop client, re-resolve next time
+                with self._server_lock:
+                    if self._server_tool is None:
+                        self.server_url = self.configured_url
+                    if client is self._server_tool:
+                        self._server_tool_lent = False
+                raise
+            self.check_seconds.observe(time.perf_counter() - start)
+            self._clients.put(client)
+
+            result = [GrammarIssue(m.message, m.offset, m.errorLength) for m in matches]
+            if key is not None:
+                self.cache.set(key, result)
+            return result
+        finally:
+            self._slots.release()
+
+    def _acquire_client(self):
+        try:
+            return self._clients.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            import language_tool_python
+        except ImportError:
+            log.warning("language-tool-python not installed. Grammar checking disabled.")
+            log.info("Install with: pip install language-tool-python")
+            self._available = False
+            return None
+
+        try:
+            url = self._resolve_server_url()
+            if url:
+                return language_tool_python.LanguageTool(self.language, remote_server=url)
+        except Exception as e:
+            log.warning("Failed to initialize LanguageTool: %s", e)
+            return None
+
+        # Server URL unknown: the local server object is the only client and it
+        # is not thread-safe, so the pool shrinks to that one client
+        with self._server_lock:
+            if self._server_tool is None:
+                return None
+            if not self._server_tool_lent:
+                self._server_tool_lent = True
+                return self._server_tool
+        try:
+            # Wait for the check using it to put it back
+            return self._clients.get(timeout=self.timeout)
+        except queue.Empty:
+            return None
+
+    def _resolve_server_url(self):
+        """URL of the shared server, starting it if this process wins the lockfile"""
+        with self._server_lock:
+            if self.server_url:
+                return self.server_url
+
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            url_file = self.state_dir / "saori-languagetool.url"
+
+            if self._lock_handle is None:
+                handle = open(self.state_dir / "saori-languagetool.lock", 'a+')
+                if _try_lock(handle):
+                    self._lock_handle = handle
+                    # Toma de control: la URL que quede es de un dueño anterior (ya muerto)
+                    try:
+                        url_file.unlink()
+                    except OSError:
+                        pass
+                else:
+                    handle.close()
+
+            if self._lock_handle is not None:
+                # This process owns the shared server
+                return self._start_local_server(url_file)
+
+        # Another worker owns (or is starting) the server: wait for its URL without
+        # holding _server_lock, so failing checks can still reset server_url meanwhile
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            try:
+                url = url_file.read_text(encoding='utf-8').strip()
+            except OSError:
+                url = ''
+            if url:
+                with self._server_lock:
+                    if not self.server_url:
+                        self.server_url = url
+                        log.info("Using shared LanguageTool server at %s", url)
+                    return self.server_url
+            time.sleep(0.5)
+        with self._server_lock:
+            if self.server_url:
+                return self.server_url
+            log.warning("Shared LanguageTool server not available, starting a private one")
+            return self._start_local_server(None)
+
+    def _start_local_server(self, url_file):
+        """Start a LanguageTool server in this process; publish its URL if url_file is given"""
+        if self._server_tool is None:
+            import language_tool_python
+            log.info("Starting LanguageTool server...")
+            self._server_tool = language_tool_python.LanguageTool(self.language)
+        url = getattr(self._server_tool, '_url', '').rstrip('/')
+        if url.endswith('/v2'):
+            url = url[:-3]
+        if not url:
+            # Server URL not exposed by this language_tool_python version
+            return None
+        if url_file is not None:
+            url_file.write_text(url, encoding='utf-8')
+        self.server_url = url
+        log.info("LanguageTool server running at %s", url)
+        return url
@@ -0,0 +1,84 @@
+"""
+Hot Reload - Opt-in reloading of rule modules without dropping loaded models
+===========================================================================
+
+Production requests never reload code. Operators can swap detector rules at
+runtime either through the admin endpoint (POST /admin/reload-detector) or,
+in development, with a file watcher (DETECTOR_HOT_RELOAD=1).
+
+A module lists the globals that must survive a reload (loaded models,
+caches) in _RELOAD_PRESERVE; they are copied back after importlib.reload().
+"""
+
+import importlib
+import os
+import threading
+import time
+
+from src.structured_log import get_logger
+
+log = get_logger('reload')
+
+_reload_lock = threading.Lock()
+
+
+def reload_preserving_state(module):
+    """
+    Reload module, keeping the globals listed in its _RELOAD_PRESERVE
+
+    Args:
+        module: Module object to reload (callers keep the same object)
+
+    Returns:
+        list: Names of the preserved globals
+    """
+    with _reload_lock:
+        preserve = getattr(module, '_RELOAD_PRESERVE', ())
+        saved = {name: getattr(module, name) for name in preserve if hasattr(module, name)}
+        try:
+            importlib.reload(module)
+        finally:
+            # Restore even if the new code failed half-way through executing
+            for name, value in saved.items():
+                setattr(module, name, value)
+        log.info("Reloaded %s (preserved: %s)", module.__name__, ', '.join(saved) or 'nothing')
+        return list(saved)
+
+
+class ModuleFileWatcher:
+    """
+    Development helper: reload a module when its source file changes
+
+    Polls the file modification time every interval seconds from a daemon
+    thread (no extra dependencies).
+    """
+
+    def __init__(self, module, interval=2.0):
+        self.module = module
+        self.interval = interval
+        self.path = module.__file__
+        self._mtime = self._current_mtime()
+        self._thread = threading.Thread(target=self._run, name="module-watcher", daemon=True)
+
+    def _current_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def start(self):
+        self._thread.start()
+        log.info("Watching %s for changes", self.path)
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            mtime = self._current_mtime()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                try:
+                    reload_preserving_state(self.module)
+                except Exception as e:
+                    # Keep serving with the previous rules if the new code is broken
+                    log.error("Reload of %s failed: %s", self.module.__name__, e)
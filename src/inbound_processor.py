@@ -0,0 +1,123 @@
+"""
+Inbound Processor - Background processing of webhook messages, in order per phone
+==================================================================================
+
+In fast-ack mode the webhook only enqueues the incoming message and returns
+an empty TwiML right away; the interview logic (sessions, BERT, langdetect,
+LanguageTool, inconsistency detection) runs here and the reply goes out
+through the outbound dispatcher.
+
+Each conversation key has its own FIFO mailbox. A conversation with pending
+messages is drained by one worker at a time, so messages from the same phone
+are processed strictly in arrival order while different phones run in
+parallel on the shared pool (no head-of-line blocking between phones).
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('inbound')
+
+
+class InboundProcessor:
+    """
+    Worker pool with one ordered mailbox per conversation
+
+    Args:
+        handler: Callable(key, *args) run for every message
+        workers: Worker threads shared by all conversations
+        max_pending: Max messages waiting across all conversations;
+            submit() returns False beyond it
+
+    Metrics:
+        inbound_queue_depth: messages waiting to be processed
+        inbound_messages_total{outcome}: processed / failed / rejected
+        inbound_queue_wait_seconds: time from webhook to processing start
+        inbound_processing_seconds: handler run time
+    """
+
+    def __init__(self, handler, workers=4, max_pending=1000, metrics=registry):
+        self.handler = handler
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="inbound")
+        self._mailboxes = {}  # key -> deque of (enqueued_at, args); present while being drained
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        self.queue_depth = metrics.gauge('inbound_queue_depth', 'Inbound messages waiting to be processed')
+        self.messages_total = metrics.counter(
+            'inbound_messages_total', 'Inbound messages by outcome', ('outcome',)
+        )
+        self.queue_wait = metrics.histogram(
+            'inbound_queue_wait_seconds', 'Time between webhook ack and processing start'
+        )
+        self.processing_seconds = metrics.histogram(
+            'inbound_processing_seconds', 'Background processing time per inbound message'
+        )
+
+    def submit(self, key, *args):
+        """
+        Queue one message for key
+
+        Returns:
+            bool: False if the processor is stopped or saturated (caller handles it)
+        """
+        with self._lock:
+            if self._stopped or self._pending >= self.max_pending:
+                self.messages_total.inc(outcome='rejected')
+                return False
+            self._pending += 1
+            mailbox = self._mailboxes.get(key)
+            start_drain = mailbox is None
+            if start_drain:
+                mailbox = deque()
+                self._mailboxes[key] = mailbox
+            mailbox.append((time.monotonic(), args))
+        self.queue_depth.inc()
+
+        if start_drain:
+            self._executor.submit(self._drain, key)
+        return True
+
+    def pending(self, key=None):
+        """Messages waiting (for one key, or in total)"""
+        with self._lock:
+            if key is None:
+                return self._pending
+            mailbox = self._mailboxes.get(key)
+            return len(mailbox) if mailbox else 0
+
+    def _drain(self, key):
+        while True:
+            with self._lock:
+                mailbox = self._mailboxes[key]
+                if not mailbox:
+                    # Nothing left: the next submit() for key starts a new drain
+                    del self._mailboxes[key]
+                    return
+                enqueued_at, args = mailbox.popleft()
+                self._pending -= 1
+            self.queue_depth.dec()
+            self.queue_wait.observe(time.monotonic() - enqueued_at)
+
+            start = time.perf_counter()
+            try:
+                self.handler(key, *args)
+                self.messages_total.inc(outcome='processed')
+            except Exception as e:
+                self.messages_total.inc(outcome='failed')
+                log.error("Background processing failed for %s: %s", key, e, exc_info=True)
+            finally:
+                self.processing_seconds.observe(time.perf_counter() - start)
+
+    def close(self, wait=True):
+        """Stop accepting messages; optionally wait for the queued ones"""
+        with self._lock:
+            self._stopped = True
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,212 @@
+"""
+Inference Cache - Thread-safe LRU/TTL cache for model results
+=============================================================
+
+Caches the output of expensive, deterministic calls (sentiment, language
+detection, grammar checks) keyed by their input text:
+
+- LRU eviction once max_size entries are held,
+- optional TTL (entries older than ttl_seconds are treated as missing),
+- one lock per cache, safe for concurrent Flask threads,
+- optional persistence to a JSON file (loaded at start, written at exit or
+  on save()), so a restart does not start from a cold cache,
+- hit / miss / eviction counters, per cache and in the metrics registry.
+
+Usage:
+    cache = InferenceCache('sentiment', max_size=1024, ttl_seconds=3600)
+    result = cache.get(text)
+    if result is None:
+        result = predictor.predict(text)
+        cache.set(text, result)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('cache')
+
+
+class InferenceCache:
+    """
+    Bounded LRU cache with optional TTL and JSON persistence
+
+    Args:
+        name: Cache name (metric label and default file name)
+        max_size: Max entries kept (least recently used evicted first)
+        ttl_seconds: Entry lifetime in seconds; None or 0 = no expiry
+        persist_path: JSON file to load from / save to; None = memory only
+        decode: Optional callable applied to values loaded from disk
+            (e.g. to rebuild tuples that JSON stored as lists)
+
+    Metrics:
+        inference_cache_requests_total{cache,outcome}: hit / miss
+        inference_cache_evictions_total{cache,reason}: size / ttl
+        inference_cache_entries{cache}: entries currently held
+    """
+
+    def __init__(self, name, max_size=1024, ttl_seconds=None, persist_path=None,
+                 decode=None, metrics=registry):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or None
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.decode = decode
+        self._data = OrderedDict()  # key -> (value, stored_at), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.requests_total = metrics.counter(
+            'inference_cache_requests_total', 'Inference cache lookups by outcome', ('cache', 'outcome')
+        )
+        self.evictions_total = metrics.counter(
+            'inference_cache_evictions_total', 'Inference cache evictions by reason', ('cache', 'reason')
+        )
+        self.entries = metrics.gauge('inference_cache_entries', 'Entries held by each inference cache', ('cache',))
+
+        if self.persist_path is not None:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, key, default=None):
+        """Cached value for key (default if missing or expired)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._expired(entry, time.time()):
+                del self._data[key]
+                self._count_eviction('ttl')
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self.requests_total.inc(cache=self.name, outcome='miss')
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+        self.requests_total.inc(cache=self.name, outcome='hit')
+        return entry[0]
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used entries if full"""
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while self.max_size and len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._count_eviction('size')
+            self.entries.set(len(self._data), cache=self.name)
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached value for key, computing and storing it on a miss
+
+        Concurrent misses for the same key may compute it more than once;
+        exceptions from compute() propagate and nothing is cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry, time.time())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.entries.set(0, cache=self.name)
+
+    def stats(self):
+        """Counters for /health and logs"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Load non-expired entries from persist_path (missing/corrupt file = empty cache)"""
+        if self.persist_path is None or not self.persist_path.exists():
+            return 0
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Could not load %s cache from %s: %s", self.name, self.persist_path, e)
+            return 0
+
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            # Oldest first, so the most recent entries survive the size limit
+            for key, value, stored_at in entries[-self.max_size:] if self.max_size else entries:
+                if self._expired((value, stored_at), now):
+                    continue
+                if self.decode is not None:
+                    value = self.decode(value)
+                self._data[key] = (value, stored_at)
+                loaded += 1
+            self.entries.set(len(self._data), cache=self.name)
+        log.info("Loaded %s cached %s results from %s", loaded, self.name, self.persist_path)
+        return loaded
+
+    def save(self):
+        """Write the current entries to persist_path (atomic replace)"""
+        if self.persist_path is None:
+            return 0
+        with self._lock:
+            now = time.time()
+            entries = [
+                [key, value, stored_at]
+                for key, (value, stored_at) in self._data.items()
+                if not self._expired((value, stored_at), now)
+            ]
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_name(f"{self.persist_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+        except (OSError, TypeError, ValueError) as e:
+            log.warning("Could not save %s cache to %s: %s", self.name, self.persist_path, e)
+            return 0
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Internals (called with the lock held)
+    # ------------------------------------------------------------------
+
+    def _expired(self, entry, now):
+        return self.ttl_seconds is not None and now - entry[1] > self.ttl_seconds
+
+    def _count_eviction(self, reason):
+        self.evictions += 1
+        self.evictions_total.inc(cache=self.name, reason=reason)
+        self.entries.set(len(self._data), cache=self.name)
+
+
+_MISSING = object()
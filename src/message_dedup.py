@@ -0,0 +1,150 @@
+"""
+Message Dedup - Idempotent webhook handling keyed by Twilio MessageSid
+======================================================================
+
+Twilio re-sends a webhook when the first delivery is slow or fails. Without
+deduplication the retry runs process_message() again: model work is doubled,
+the interview can skip a stage and answers get recorded twice.
+
+MessageDedupIndex remembers each MessageSid for window_seconds (bounded to
+max_entries) together with the reply produced for it:
+
+- first delivery: claim() returns a new entry, the caller processes the
+  message and calls complete() with the reply,
+- retry after completion: the cached reply is returned, nothing is recomputed,
+- retry while the first delivery is still running: wait() blocks until the
+  original finishes (up to a timeout) and returns its reply. If the retry
+  gives up first, complete() tells the original to deliver its reply some
+  other way (Twilio has already discarded the original HTTP response),
+- retry of a delivery that failed: wait() returns ORIGINAL_FAILED and the
+  sid is forgotten, so the retry claims it again and is processed normally.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from src.metrics import registry
+
+# wait() result when the first delivery raised: the retry must process the message itself
+ORIGINAL_FAILED = object()
+
+
+class DedupEntry:
+    """State of one MessageSid"""
+
+    __slots__ = ('sid', 'created_at', 'done', 'reply', 'orphaned', 'failed')
+
+    def __init__(self, sid, created_at):
+        self.sid = sid
+        self.created_at = created_at
+        self.done = threading.Event()
+        self.reply = None
+        self.orphaned = False
+        self.failed = False
+
+
+class MessageDedupIndex:
+    """
+    Bounded, time-windowed index of processed messages
+
+    Args:
+        window_seconds: How long a MessageSid is remembered
+        max_entries: Max remembered messages (oldest dropped first)
+
+    Metrics:
+        webhook_duplicates_total{outcome}: retries absorbed (cached / waited)
+            or not absorbed (timeout / failed)
+        webhook_dedup_entries: messages currently remembered
+    """
+
+    def __init__(self, window_seconds=600.0, max_entries=10000, metrics=registry):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # sid -> DedupEntry, oldest first
+        self._lock = threading.Lock()
+
+        self.duplicates_total = metrics.counter(
+            'webhook_duplicates_total', 'Duplicate webhook deliveries by outcome', ('outcome',)
+        )
+        self.entries = metrics.gauge('webhook_dedup_entries', 'MessageSids remembered for deduplication')
+
+    def claim(self, sid):
+        """
+        Register a delivery of sid
+
+        Returns:
+            tuple: (entry, is_new). is_new is False for a duplicate delivery.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire_locked(now)
+            entry = self._entries.get(sid)
+            if entry is not None:
+                return entry, False
+            entry = DedupEntry(sid, now)
+            self._entries[sid] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.entries.set(len(self._entries))
+            return entry, True
+
+    def complete(self, entry, reply):
+        """
+        Store the reply of the first delivery and wake up waiting duplicates
+
+        Returns:
+            bool: True if a duplicate stopped waiting for this reply, so the
+            caller should send it out of band
+        """
+        with self._lock:
+            entry.reply = reply
+            entry.done.set()
+            return entry.orphaned
+
+    def fail(self, entry):
+        """First delivery failed: forget sid so a retry is processed normally"""
+        with self._lock:
+            entry.failed = True
+            if self._entries.get(entry.sid) is entry:
+                del self._entries[entry.sid]
+                self.entries.set(len(self._entries))
+        entry.done.set()
+
+    def wait(self, entry, timeout):
+        """
+        Reply of the original delivery for a duplicate
+
+        Returns:
+            The reply passed to complete(), None if the original is still
+            running after timeout seconds, or ORIGINAL_FAILED if it failed
+            (claim() the sid again and process the retry)
+        """
+        outcome = 'cached' if entry.done.is_set() else 'waited'
+        if not entry.done.wait(timeout):
+            with self._lock:
+                if not entry.done.is_set():
+                    entry.orphaned = True
+            if entry.orphaned:
+                self.duplicates_total.inc(outcome='timeout')
+                return None
+        if entry.failed:
+            self.duplicates_total.inc(outcome='failed')
+            return ORIGINAL_FAILED
+        self.duplicates_total.inc(outcome=outcome)
+        return entry.reply
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _expire_locked(self, now):
+        expired = False
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if now - entry.created_at <= self.window_seconds:
+                break
+            self._entries.popitem(last=False)
+            expired = True
+        if expired:
+            self.entries.set(len(self._entries))
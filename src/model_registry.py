@@ -0,0 +1,338 @@
+"""
+Model Registry - One place to load, share and account for the models
+====================================================================
+
+Every model (BERT sentiment, sentence embeddings per language, LanguageTool)
+is registered with a loader and obtained through get():
+
+- each model is loaded once; concurrent callers wait on a condition
+  variable (no sleep polling) up to their timeout,
+- per-model state (not_loaded / loading / ready / failed / evicted), load
+  time and estimated size are reported by status(),
+- preload() loads models on a background thread, so startup is not blocked,
+- variants (e.g. per-language embedding models) are separate entries of the
+  same registered model,
+- an optional memory budget evicts the least recently used unpinned models
+  after a load pushes the total over it; they are reloaded on next use.
+
+Usage:
+    model_registry.register('sentiment', lambda: SentimentPredictor(...), pinned=True)
+    model_registry.register('similarity', load_similarity_model, variants=('es', 'en'))
+    model_registry.preload(['sentiment'])
+    checker = model_registry.get('similarity', variant='en', timeout=3.0)
+"""
+
+import os
+import threading
+import time
+
+from src.metrics import registry as metrics_registry
+from src.structured_log import get_logger
+
+log = get_logger('models')
+
+NOT_LOADED = 'not_loaded'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+EVICTED = 'evicted'
+
+
+def estimate_size_bytes(model, _seen=None):
+    """
+    Approximate memory held by a model
+
+    Counts torch tensors in the state dict (quantized packed weights
+    included), ONNX files by size, and follows the usual wrapper attributes
+    (model / onnx_model). Objects it does not understand count as 0.
+    """
+    if model is None:
+        return 0
+    seen = _seen if _seen is not None else set()
+    if id(model) in seen:
+        return 0
+    seen.add(id(model))
+
+    state_dict = getattr(model, 'state_dict', None)
+    if callable(state_dict):
+        try:
+            return sum(_tensor_bytes(value) for value in state_dict().values())
+        except Exception:
+            return 0
+
+    path = getattr(model, 'path', None)
+    if isinstance(path, (str, os.PathLike)) and os.path.isfile(path):
+        return os.path.getsize(path)
+
+    return sum(
+        estimate_size_bytes(getattr(model, attr), seen)
+        for attr in ('model', 'onnx_model')
+        if getattr(model, attr, None) is not None
+    )
+
+
+def _tensor_bytes(value):
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in value)
+    try:
+        return value.numel() * value.element_size()
+    except Exception:
+        return 0
+
+
+class ModelEntry:
+    """One loadable model (or one variant of it)"""
+
+    def __init__(self, key, loader, pinned=False):
+        self.key = key
+        self.loader = loader
+        self.pinned = pinned
+        self.state = NOT_LOADED
+        self.model = None
+        self.error = None
+        self.size_bytes = 0
+        self.load_seconds = None
+        self.loads = 0
+        self.last_used = 0.0
+
+    def describe(self):
+        return {
+            'state': self.state,
+            'size_mb': round(self.size_bytes / 1e6, 1),
+            'load_seconds': round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            'loads': self.loads,
+            'pinned': self.pinned,
+            'error': str(self.error) if self.error else None
+        }
+
+
+class ModelRegistry:
+    """
+    Thread-safe registry of lazily loaded models
+
+    Args:
+        memory_budget_mb: Max estimated size of loaded models (None = no limit)
+
+    Metrics:
+        model_load_seconds{model}: load time
+        model_loads_total{model,outcome}: loaded / failed
+        model_evictions_total{model}: evictions due to the memory budget
+        model_loaded_bytes{model}: estimated size of each loaded model
+    """
+
+    def __init__(self, memory_budget_mb=None, metrics=metrics_registry):
+        self.memory_budget_mb = memory_budget_mb
+        self._entries = {}
+        self._condition = threading.Condition()
+
+        self.load_seconds = metrics.histogram(
+            'model_load_seconds', 'Model load time', ('model',),
+            buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+        )
+        self.loads_total = metrics.counter('model_loads_total', 'Model loads by outcome', ('model', 'outcome'))
+        self.evictions_total = metrics.counter(
+            'model_evictions_total', 'Models unloaded to stay within the memory budget', ('model',)
+        )
+        self.loaded_bytes = metrics.gauge('model_loaded_bytes', 'Estimated memory of loaded models', ('model',))
+
+    @staticmethod
+    def _key(name, variant=None):
+        return f"{name}:{variant}" if variant is not None else name
+
+    def register(self, name, loader, variants=None, pinned=False):
+        """
+        Register a model loader
+
+        Args:
+            name: Model name
+            loader: Callable() -> model, or Callable(variant) -> model when
+                variants are given. It may raise; the model is then marked failed.
+            variants: Optional variant names (one entry each)
+            pinned: Never evicted by the memory budget
+
+        Registering an existing name again replaces the loader but keeps an
+        already loaded model (module hot reload re-registers its loaders).
+        """
+        keys = {self._key(name, v): (lambda v=v: loader(v)) for v in variants} if variants else {name: loader}
+        with self._condition:
+            for key, entry_loader in keys.items():
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = ModelEntry(key, entry_loader, pinned)
+                else:
+                    entry.loader = entry_loader
+                    entry.pinned = pinned
+
+    def get(self, name, variant=None, timeout=None):
+        """
+        Loaded model, loading it in this thread if nobody else is
+
+        Args:
+            name: Registered model name
+            variant: Variant name (for models registered with variants)
+            timeout: Max seconds to wait for a load started by another
+                thread (None = wait until it finishes)
+
+        Returns:
+            The model, or None if it failed to load or is still loading
+            after timeout
+        """
+        key = self._key(name, variant)
+        with self._condition:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Model '{key}' is not registered")
+            if entry.state == LOADING:
+                self._condition.wait_for(lambda: entry.state != LOADING, timeout)
+            if entry.state == READY:
+                entry.last_used = time.monotonic()
+                return entry.model
+            if entry.state in (FAILED, LOADING):
+                return None
+            entry.state = LOADING
+        return self._load(entry)
+
+    def handle(self, name, variant=None):
+        """Proxy that resolves the model on every attribute access (waits for the load)"""
+        return ModelHandle(self, name, variant)
+
+    def preload(self, names, background=True):
+        """
+        Load models ahead of first use
+
+        Args:
+            names: Keys to load ('sentiment', 'similarity:es', ...)
+            background: Load on a daemon thread (True) or now
+
+        Returns:
+            threading.Thread or None
+        """
+        names = [name for name in names if name]
+
+        def run():
+            for key in names:
+                name, _, variant = key.partition(':')
+                try:
+                    self.get(name, variant or None)
+                except KeyError as e:
+                    log.warning("Cannot preload: %s", e)
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def state(self, name, variant=None):
+        with self._condition:
+            entry = self._entries.get(self._key(name, variant))
+            return entry.state if entry else None
+
+    def status(self):
+        """Per-model state, size and load time (for /health)"""
+        with self._condition:
+            return {key: entry.describe() for key, entry in self._entries.items()}
+
+    def loaded_mb(self):
+        with self._condition:
+            return sum(e.size_bytes for e in self._entries.values() if e.state == READY) / 1e6
+
+    def reset(self, name, variant=None):
+        """Forget a model (including a failed load) so the next get() loads it again"""
+        with self._condition:
+            entry = self._entries.get(self._key(name, variant))
+            if entry is not None and entry.state != LOADING:
+                self._unload_locked(entry, NOT_LOADED)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load(self, entry):
+        log.info("Loading %s...", entry.key)
+        start = time.perf_counter()
+        try:
+            model = entry.loader()
+            if model is None:
+                raise RuntimeError("loader returned None")
+            error = None
+        except Exception as e:
+            model = None
+            error = e
+        elapsed = time.perf_counter() - start
+        size = estimate_size_bytes(model) if model is not None else 0
+
+        with self._condition:
+            entry.load_seconds = elapsed
+            entry.loads += 1
+            if error is None:
+                entry.model = model
+                entry.error = None
+                entry.size_bytes = size
+                entry.state = READY
+                entry.last_used = time.monotonic()
+                self.loaded_bytes.set(size, model=entry.key)
+                self._enforce_budget_locked(entry)
+            else:
+                entry.error = error
+                entry.state = FAILED
+            self._condition.notify_all()
+
+        self.load_seconds.observe(elapsed, model=entry.key)
+        self.loads_total.inc(model=entry.key, outcome='loaded' if error is None else 'failed')
+        if error is None:
+            log.info("%s ready in %.1fs (~%.0f MB)", entry.key, elapsed, size / 1e6)
+        else:
+            log.error("%s failed to load: %s", entry.key, error)
+        return model
+
+    def _enforce_budget_locked(self, just_loaded):
+        if not self.memory_budget_mb:
+            return
+        budget = self.memory_budget_mb * 1e6
+        loaded = [e for e in self._entries.values() if e.state == READY]
+        total = sum(e.size_bytes for e in loaded)
+        candidates = sorted(
+            (e for e in loaded if not e.pinned and e is not just_loaded),
+            key=lambda e: e.last_used
+        )
+        for entry in candidates:
+            if total <= budget:
+                break
+            total -= entry.size_bytes
+            log.info("Evicting %s (~%.0f MB) to stay within %s MB",
+                     entry.key, entry.size_bytes / 1e6, self.memory_budget_mb)
+            self._unload_locked(entry, EVICTED)
+            self.evictions_total.inc(model=entry.key)
+        if total > budget:
+            log.warning("Loaded models (~%.0f MB) exceed the %s MB budget", total / 1e6, self.memory_budget_mb)
+
+    def _unload_locked(self, entry, state):
+        # Callers already holding the model keep using it; memory is freed after them
+        entry.model = None
+        entry.size_bytes = 0
+        entry.error = None
+        entry.state = state
+        self.loaded_bytes.set(0, model=entry.key)
+
+
+class ModelHandle:
+    """Attribute access delegated to the registry's current model (loaded on demand)"""
+
+    def __init__(self, registry, name, variant=None):
+        self._registry = registry
+        self._name = name
+        self._variant = variant
+
+    def __getattr__(self, attr):
+        model = self._registry.get(self._name, self._variant)
+        if model is None:
+            raise RuntimeError(f"Model '{self._registry._key(self._name, self._variant)}' is not available")
+        return getattr(model, attr)
+
+
+# Process-wide registry (MODEL_MEMORY_BUDGET_MB caps the loaded models)
+model_registry = ModelRegistry(
+    memory_budget_mb=float(os.getenv('MODEL_MEMORY_BUDGET_MB', '0')) or None
+)
@@ -0,0 +1,477 @@
+"""
+Outbound Dispatcher - Queued, rate-limited WhatsApp delivery through Twilio
+==========================================================================
+
+All messages sent outside the webhook response (extra parts of long
+messages, follow-ups, late detection results) go through one dispatcher:
+
+- a fixed pool of worker threads instead of a thread per response,
+- per-recipient ordering: each recipient hashes to one worker queue,
+- token-bucket rate limiting per sender number,
+- retry with exponential backoff, only when Twilio certainly did not
+  create the message (429 / 503, or the connection was never established),
+  so a retry can never send a duplicate,
+- one pooled HTTP session (keep-alive) shared by every send,
+- scheduled delivery (not_before) instead of sleeping in request threads,
+- a recipient waiting for a retry, a Retry-After or a rate-limit token is
+  parked in its worker's schedule; the other recipients of that worker keep
+  being served meanwhile.
+
+TWILIO_API_BASE can point the sender at a local fake Twilio endpoint for
+testing.
+"""
+
+import atexit
+import heapq
+import itertools
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import deque
+
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('outbound')
+
+# WhatsApp limit is 1600 chars per message, but Twilio may concatenate, so use smaller limit
+MAX_MESSAGE_LENGTH = 1000
+ABSOLUTE_MAX_LENGTH = 1600
+SECTION_SEPARATOR = "━━━━━━━━━━━━━━━━━━"
+
+
+def split_message(text, max_length=MAX_MESSAGE_LENGTH):
+    """
+    Split a long response into WhatsApp-sized parts
+
+    Splits at section separators first and then at line breaks. When there
+    is more than one part, each one gets a "[Parte i/n]" indicator (which
+    also keeps Twilio from concatenating them).
+
+    Args:
+        text: Sanitized response text
+        max_length: Maximum characters per part
+
+    Returns:
+        list: Message parts (a single element if the text already fits)
+    """
+    if len(text) <= max_length:
+        return [text]
+
+    parts = []
+    current_part = ""
+
+    # Try to split at section separators first
+    sections = re.split(rf'({SECTION_SEPARATOR}[^\n]*)', text)
+
+    for section in sections:
+        if len(current_part) + len(section) <= max_length:
+            current_part += section
+            continue
+
+        if current_part.strip():
+            parts.append(current_part.strip())
+        if len(section) <= max_length:
+            current_part = section
+            continue
+
+        # A single section is too long: split it by newlines
+        temp_part = ""
+        for line in section.split('\n'):
+            if len(temp_part) + len(line) + 1 <= max_length:
+                temp_part += line + '\n'
+            else:
+                if temp_part.strip():
+                    parts.append(temp_part.strip())
+                temp_part = line + '\n'
+        current_part = temp_part.strip()
+
+    if current_part.strip():
+        parts.append(current_part.strip())
+
+    # Add part indicators and verify every part is within the limit
+    verified_parts = []
+    for i, part in enumerate(parts, start=1):
+        part_indicator = f"[Parte {i}/{len(parts)}]\n\n"
+        if len(part) + len(part_indicator) <= max_length:
+            verified_part = part_indicator + part
+        else:
+            max_part_length = max_length - len(part_indicator) - 10
+            verified_part = part_indicator + part[:max_part_length] + "\n... (continúa)"
+
+        if len(verified_part) > max_length:
+            log.warning("Part %s still too long (%s chars), truncating", i, len(verified_part))
+            verified_part = verified_part[:max_length - 20] + "\n... (truncado)"
+        verified_parts.append(verified_part)
+
+    return verified_parts
+
+
+class SendError(Exception):
+    """Delivery attempt failed"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class TwilioRestSender:
+    """
+    Sends messages through the Twilio REST API over one pooled HTTP session
+
+    Args:
+        account_sid: Twilio account SID
+        auth_token: Twilio auth token
+        api_base: API root (override to point at a fake endpoint in tests)
+        pool_size: Max keep-alive connections (match the dispatcher workers)
+        timeout: Per-request timeout in seconds
+    """
+
+    # Twilio rejected the request without creating a message
+    RETRYABLE_STATUS = (429, 503)
+
+    def __init__(self, account_sid, auth_token, api_base="https://api.twilio.com",
+                 pool_size=4, timeout=10.0):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = f"{api_base.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.timeout = timeout
+        self._requests = requests
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def send(self, from_, to, body):
+        """
+        Create one message
+
+        Returns:
+            str: Message SID
+
+        Raises:
+            SendError: retryable only if the request never reached Twilio
+                (connection not established) or Twilio answered 429 / 503
+        """
+        try:
+            response = self.session.post(
+                self.url,
+                data={'From': from_, 'To': to, 'Body': body},
+                timeout=self.timeout
+            )
+        except self._requests.RequestException as e:
+            # A read timeout or a dropped connection may come after Twilio
+            # accepted the message: retrying could deliver it twice
+            raise SendError(f"Network error: {e}", retryable=self._never_sent(e))
+
+        if response.status_code in (200, 201):
+            try:
+                return response.json().get('sid')
+            except ValueError:
+                return None
+
+        retry_after = response.headers.get('Retry-After')
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        retryable = response.status_code in self.RETRYABLE_STATUS
+        raise SendError(
+            f"Twilio returned {response.status_code}: {response.text[:200]}",
+            retryable=retryable,
+            retry_after=retry_after
+        )
+
+    def _never_sent(self, error):
+        """True if the error happened before the request was written to Twilio"""
+        if isinstance(error, self._requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(error, self._requests.exceptions.ConnectionError):
+            return False
+        from urllib3.exceptions import NewConnectionError
+        # requests wraps urllib3's MaxRetryError; its reason says what failed
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def close(self):
+        self.session.close()
+
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token
+
+        Returns:
+            float: Seconds the caller must wait before using it (0 if available now)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class OutboundMessage:
+    """One queued message"""
+
+    __slots__ = ('to', 'body', 'from_', 'not_before', 'attempts', 'enqueued_at', 'has_token')
+
+    def __init__(self, to, body, from_, not_before):
+        self.to = to
+        self.body = body
+        self.from_ = from_
+        self.not_before = not_before
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+        self.has_token = False  # rate-limit token already reserved for not_before
+
+
+class OutboundDispatcher:
+    """
+    Worker pool delivering queued messages in order per recipient
+
+    Args:
+        sender: Object with send(from_, to, body) raising SendError on failure
+        default_from: Sender number used when send() gets no from_
+        workers: Worker threads (messages for one recipient always use the same one)
+        rate_per_second: Sustained sends per second per sender number
+        burst: Token bucket capacity per sender number
+        max_retries: Retries after the first attempt for retryable errors
+        backoff_base: First retry delay in seconds (doubles each retry)
+        max_retry_after: Cap in seconds on a Retry-After asked by Twilio
+        max_queue: Max queued messages per worker; send() returns False beyond it
+
+    Metrics:
+        outbound_queue_depth: messages waiting to be sent
+        outbound_messages_total{outcome}: sent / retried / failed / dropped
+        outbound_send_seconds: Twilio API call latency
+    """
+
+    def __init__(self, sender, default_from, workers=4, rate_per_second=10.0, burst=10,
+                 max_retries=3, backoff_base=0.5, max_retry_after=30.0, max_queue=10000,
+                 metrics=registry):
+        self.sender = sender
+        self.default_from = default_from
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_retry_after = max_retry_after
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._stopped = False
+        self._close_deadline = None
+
+        # Metrics exist before any worker can touch them
+        self.queue_depth = metrics.gauge('outbound_queue_depth', 'Outbound messages waiting to be sent')
+        self.messages_total = metrics.counter(
+            'outbound_messages_total', 'Outbound messages by outcome', ('outcome',)
+        )
+        self.send_seconds = metrics.histogram('outbound_send_seconds', 'Twilio send latency')
+
+        self._queues = [queue.Queue(maxsize=max_queue) for _ in range(max(1, workers))]
+        self._threads = []
+        for i, q in enumerate(self._queues):
+            thread = threading.Thread(target=self._run, args=(q,), name=f"outbound-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.close)
+
+    def send(self, to, body, from_=None, delay=0.0):
+        """
+        Queue one message
+
+        Args:
+            to: Recipient (whatsapp:+...)
+            body: Message text
+            from_: Sender number (default_from if omitted)
+            delay: Seconds to wait before sending (scheduled, nobody sleeps)
+
+        Returns:
+            bool: False if the dispatcher is stopped or the queue is full
+        """
+        if self._stopped:
+            return False
+        if len(body) > ABSOLUTE_MAX_LENGTH:
+            log.error("Outbound message exceeds %s chars (%s chars), truncating", ABSOLUTE_MAX_LENGTH, len(body))
+            body = body[:ABSOLUTE_MAX_LENGTH - 30] + "\n... (mensaje truncado)"
+        message = OutboundMessage(to, body, from_ or self.default_from, time.monotonic() + delay)
+        try:
+            self._queue_for(to).put_nowait(message)
+        except queue.Full:
+            self.messages_total.inc(outcome='dropped')
+            log.error("Outbound queue full, dropping message to %s", to)
+            return False
+        self.queue_depth.inc()
+        return True
+
+    def send_parts(self, to, parts, from_=None, initial_delay=0.0, spacing=0.3):
+        """
+        Queue several parts of one response, spaced so they arrive separately
+
+        Returns:
+            int: Number of parts queued
+        """
+        queued = 0
+        for i, part in enumerate(parts):
+            if not self.send(to, part, from_=from_, delay=initial_delay + i * spacing):
+                break
+            queued += 1
+        return queued
+
+    def _queue_for(self, to):
+        return self._queues[zlib.crc32(to.encode('utf-8')) % len(self._queues)]
+
+    def _bucket_for(self, from_):
+        with self._buckets_lock:
+            bucket = self._buckets.get(from_)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_second, self.burst)
+                self._buckets[from_] = bucket
+            return bucket
+
+    def _run(self, q):
+        # Cola de cada destinatario (en orden) y agenda de sus mensajes de cabeza:
+        # solo se duerme hasta la próxima cabeza lista o hasta que llegue algo nuevo
+        pending = {}
+        schedule = []  # (ready_at, seq, to)
+        seq = itertools.count()
+        while True:
+            if self._stopped:
+                if time.monotonic() >= self._close_deadline:
+                    # close() timed out: drop the rest instead of delaying shutdown
+                    self._drop(pending, q)
+                    return
+                if not pending and q.empty():
+                    return
+
+            timeout = None
+            if schedule:
+                timeout = max(0.0, schedule[0][0] - time.monotonic())
+            if self._stopped:
+                # After close() the sentinel may be missing (queue was full): keep checking
+                timeout = 0.1 if timeout is None else min(timeout, 0.1)
+            try:
+                message = q.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                if message.to in pending:
+                    pending[message.to].append(message)
+                else:
+                    pending[message.to] = deque([message])
+                    heapq.heappush(schedule, (message.not_before, next(seq), message.to))
+
+            while schedule and schedule[0][0] <= time.monotonic():
+                if self._stopped and time.monotonic() >= self._close_deadline:
+                    break
+                _, _, to = heapq.heappop(schedule)
+                messages = pending[to]
+                retry_at = self._attempt(messages[0])
+                if retry_at is None:
+                    messages.popleft()
+                    if not messages:
+                        del pending[to]
+                        continue
+                    # Next message of this recipient, never before the previous one
+                    retry_at = messages[0].not_before
+                heapq.heappush(schedule, (retry_at, next(seq), to))
+
+    def _drop(self, pending, q):
+        dropped = [m for messages in pending.values() for m in messages]
+        while True:
+            try:
+                message = q.get_nowait()
+            except queue.Empty:
+                break
+            if message is not None:
+                dropped.append(message)
+        for message in dropped:
+            if message.attempts == 0:
+                self.queue_depth.dec()
+            self.messages_total.inc(outcome='dropped')
+
+    def _attempt(self, message):
+        """
+        One delivery step for the first queued message of a recipient
+
+        Returns:
+            float: monotonic time of the next step (rate-limit wait or retry
+            backoff), or None once the message was sent or given up
+        """
+        if not message.has_token:
+            wait = self._bucket_for(message.from_).reserve()
+            if wait > 0:
+                # The token is ours at now + wait; the worker serves others meanwhile
+                message.has_token = True
+                return time.monotonic() + wait
+        message.has_token = False
+
+        if message.attempts == 0:
+            self.queue_depth.dec()
+        message.attempts += 1
+        start = time.perf_counter()
+        try:
+            self.sender.send(message.from_, message.to, message.body)
+            self.send_seconds.observe(time.perf_counter() - start)
+            self.messages_total.inc(outcome='sent')
+            log.info("Sent outbound message to %s (%s chars)", message.to, len(message.body))
+            return None
+        except SendError as e:
+            self.send_seconds.observe(time.perf_counter() - start)
+            retryable = e.retryable
+            retry_after = e.retry_after
+            error = e
+        except Exception as e:
+            self.send_seconds.observe(time.perf_counter() - start)
+            retryable = False
+            retry_after = None
+            error = e
+
+        if not retryable or message.attempts > self.max_retries:
+            self.messages_total.inc(outcome='failed')
+            log.error("Failed to send message to %s after %s attempt(s): %s", message.to, message.attempts, error)
+            return None
+
+        backoff = self.backoff_base * (2 ** (message.attempts - 1))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_retry_after))
+        self.messages_total.inc(outcome='retried')
+        log.warning("Send to %s failed (%s), retrying in %.1fs", message.to, error, backoff)
+        return time.monotonic() + backoff
+
+    def close(self, timeout=5.0):
+        """Send what is already queued (up to timeout) and stop the workers"""
+        if self._stopped:
+            return
+        deadline = time.monotonic() + timeout
+        self._close_deadline = deadline
+        self._stopped = True
+        for q in self._queues:
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass  # Never block here: that worker stops by itself once drained
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        close_sender = getattr(self.sender, 'close', None)
+        if close_sender:
+            close_sender()
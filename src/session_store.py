@@ -0,0 +1,741 @@
+"""
+Session Store - Pluggable persistence for WhatsApp interview sessions
+=====================================================================
+
+Backends:
+- memory:  InMemorySessionStore (no persistence, useful for tests/demos)
+- json:    JsonFileSessionStore (one session_*.json file per candidate)
+- journal: JournalSessionStore (append-only JSONL journal with periodic compaction)
+- sqlite:  SQLiteSessionStore (single SQLite file in WAL mode)
+
+WriteBehindWriter coalesces saves in memory and flushes them to the store from
+a background thread, so the webhook request path never touches the disk.
+
+SessionCache holds only the active working set in memory (LRU + idle TTL);
+sessions are loaded from the store on first access.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from src.structured_log import get_logger
+
+log = get_logger('sessions')
+
+
+# Version tag carried by every encoded filename token; tokens without it are
+# legacy replace(':', '_') names
+ENCODED_KEY_TAG = "v2_"
+
+
+def encode_session_key(key):
+    """
+    Encode a session key (e.g. 'whatsapp:+18099121128') as a filename token
+
+    The token is ENCODED_KEY_TAG + the percent-encoded key ('v2_whatsapp%3A+1809...').
+    Percent-encoding is reversible, unlike the legacy replace(':', '_'), and
+    the tag tells both layouts apart even when nothing needed encoding.
+    """
+    return ENCODED_KEY_TAG + quote(key, safe='+')
+
+
+def is_encoded_session_token(token):
+    """True if token was produced by encode_session_key"""
+    return token.startswith(ENCODED_KEY_TAG)
+
+
+def decode_session_key(token):
+    """
+    Decode a filename token back into the session key
+
+    Only tagged tokens are percent-decoded. Untagged tokens come from the
+    legacy replace(':', '_') layout; for those only the first '_' (the one
+    after the channel prefix) is restored.
+    """
+    if is_encoded_session_token(token):
+        return unquote(token[len(ENCODED_KEY_TAG):])
+    return token.replace('_', ':', 1)
+
+
+class SessionStore:
+    """Base interface for session persistence backends"""
+
+    def load(self, key):
+        """Return the stored session dict for key, or None if it does not exist"""
+        raise NotImplementedError
+
+    def save(self, key, session):
+        """Persist a single session"""
+        self.save_many({key: session})
+
+    def save_many(self, items):
+        """
+        Persist several sessions at once
+
+        Args:
+            items: dict {key: serialized_session_json}
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove a session from the store (no-op if missing)"""
+        raise NotImplementedError
+
+    def keys(self):
+        """Return the list of stored session keys"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release backend resources"""
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """Keeps serialized sessions in a dict (lost on restart)"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            raw = self._data.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def save_many(self, items):
+        with self._lock:
+            self._data.update(items)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+
+def _atomic_write(path, text):
+    """Write text to path atomically (tmp file + fsync + rename)"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonFileSessionStore(SessionStore):
+    """
+    One JSON file per session in Logs/whatsapp_sessions
+
+    Files are written atomically, so a crash mid-write leaves the previous
+    version of the session intact instead of a truncated JSON file. An index
+    of key -> file is built from the directory listing (no file is parsed
+    until its session is requested). Legacy session_whatsapp_+1809.json files
+    are still read and are migrated to the encoded name
+    (session_v2_whatsapp%3A+1809.json) on their next save.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = {}
+        for path in self.directory.glob("session_*.json"):
+            token = path.stem[len("session_"):]
+            key = decode_session_key(token)
+            # Prefer the encoded file if both layouts exist for the same key
+            if key not in self._index or is_encoded_session_token(token):
+                self._index[key] = path
+
+    def _path(self, key):
+        return self.directory / f"session_{encode_session_key(key)}.json"
+
+    def load(self, key):
+        with self._lock:
+            path = self._index.get(key)
+        if path is None:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_many(self, items):
+        for key, raw in items.items():
+            path = self._path(key)
+            _atomic_write(path, raw)
+            with self._lock:
+                previous = self._index.get(key)
+                self._index[key] = path
+            if previous is not None and previous != path:
+                # Migrated from the legacy filename
+                try:
+                    previous.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def delete(self, key):
+        with self._lock:
+            path = self._index.pop(key, None)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def keys(self):
+        with self._lock:
+            return list(self._index.keys())
+
+
+class JournalSessionStore(SessionStore):
+    """
+    Append-only JSONL journal with periodic compaction
+
+    Every flush appends one line per session and fsyncs the file. On startup
+    the journal is replayed; a torn last line (crash during append) is
+    ignored, so the previous version of that session survives. When the
+    journal grows past compact_ratio x live sessions it is rewritten with only
+    the latest record per key and atomically swapped in.
+    """
+
+    def __init__(self, directory, filename="sessions.journal", compact_ratio=4, min_compact_records=200):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / filename
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+        self._lock = threading.Lock()
+        self._latest = {}  # key -> raw session json
+        self._records = 0
+        self._replay()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        """Rebuild the in-memory index from the journal"""
+        if not self.path.exists():
+            return
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn write at the tail
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except (ValueError, UnicodeDecodeError):
+                    break
+                valid_bytes += len(line)
+                self._records += 1
+                if record.get('deleted'):
+                    self._latest.pop(record['key'], None)
+                else:
+                    self._latest[record['key']] = record['session']
+        # Drop any torn tail so new appends start on a clean line
+        if valid_bytes != self.path.stat().st_size:
+            log.warning("Journal tail truncated at byte %s (incomplete write recovered)", valid_bytes)
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _append(self, records):
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+            for record in records
+        )
+        self._file.write(lines)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records += len(records)
+
+    def load(self, key):
+        with self._lock:
+            raw = self._latest.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def save_many(self, items):
+        with self._lock:
+            self._append([{'key': key, 'session': raw} for key, raw in items.items()])
+            self._latest.update(items)
+            self._maybe_compact()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._latest:
+                self._append([{'key': key, 'deleted': True}])
+                del self._latest[key]
+
+    def keys(self):
+        with self._lock:
+            return list(self._latest.keys())
+
+    def _maybe_compact(self):
+        live = max(len(self._latest), 1)
+        if self._records >= self.min_compact_records and self._records > live * self.compact_ratio:
+            self._compact_locked()
+
+    def compact(self):
+        """Rewrite the journal with only the latest record per session"""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        tmp_path = self.path.with_name(self.path.name + ".compact")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, raw in self._latest.items():
+                record = {'key': key, 'session': raw}
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._records = len(self._latest)
+        log.info("Journal compacted to %s records", self._records)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in a single SQLite database using WAL mode
+
+    WAL lets readers proceed while the flusher writes, and each flush is a
+    single transaction, so a crash never leaves a half-written batch.
+
+    Every row carries a version number that is bumped on each write. Together
+    with the lease table this is what SharedSessionCoordinator uses to share
+    sessions safely between several gunicorn workers.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " version INTEGER NOT NULL DEFAULT 1)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")]
+        if 'version' not in columns:
+            # Database created before versioning was added
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_leases ("
+            " key TEXT PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def load(self, key):
+        session, _ = self.load_versioned(key)
+        return session
+
+    def load_versioned(self, key):
+        """
+        Return (session, version) for key
+
+        Returns:
+            tuple: (dict, int) or (None, 0) if the session does not exist
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data, version FROM sessions WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None, 0
+        return json.loads(row[0]), row[1]
+
+    def save_many(self, items):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO sessions (key, data, updated_at, version) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at, "
+                    "version = sessions.version + 1",
+                    [(key, raw, now) for key, raw in items.items()]
+                )
+
+    def compare_and_set(self, key, raw, expected_version):
+        """
+        Write a session only if nobody else wrote it since expected_version
+
+        Args:
+            key: Session key
+            raw: Serialized session JSON
+            expected_version: Version returned by load_versioned (0 = new session)
+
+        Returns:
+            int: New version, or None if the stored version changed (conflict)
+        """
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                if expected_version == 0:
+                    cursor = self._conn.execute(
+                        "INSERT INTO sessions (key, data, updated_at, version) VALUES (?, ?, ?, 1) "
+                        "ON CONFLICT(key) DO NOTHING",
+                        (key, raw, now)
+                    )
+                else:
+                    cursor = self._conn.execute(
+                        "UPDATE sessions SET data = ?, updated_at = ?, version = version + 1 "
+                        "WHERE key = ? AND version = ?",
+                        (raw, now, key, expected_version)
+                    )
+        return expected_version + 1 if cursor.rowcount == 1 else None
+
+    def try_acquire_lease(self, key, owner, lease_seconds):
+        """
+        Take the cross-process lease for key if it is free or expired
+
+        Returns:
+            bool: True if owner now holds the lease
+        """
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM session_leases WHERE key = ? AND expires_at < ?", (key, now)
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO session_leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, owner, now + lease_seconds)
+                )
+                row = self._conn.execute(
+                    "SELECT owner FROM session_leases WHERE key = ?", (key,)
+                ).fetchone()
+        return bool(row) and row[0] == owner
+
+    def release_lease(self, key, owner):
+        """Release the lease for key if owner still holds it"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM session_leases WHERE key = ? AND owner = ?", (key, owner)
+                )
+
+    def delete(self, key):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def keys(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM sessions")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SharedSessionCoordinator:
+    """
+    Multi-worker session sharing on top of SQLiteSessionStore
+
+    Each conversation runs inside conversation(key), which:
+    1. takes a cross-process lease on the phone number (other workers wait),
+    2. drops the local cached copy so the session is re-read from the store,
+    3. on exit writes the session back with compare-and-set against the
+       version that was read, then releases the lease.
+
+    A version conflict (another worker wrote after a lease expired) is
+    reported and the stored version is kept, so stage transitions are never
+    silently overwritten.
+    """
+
+    def __init__(self, store, cache, lease_seconds=30.0, acquire_timeout=10.0, poll_interval=0.02):
+        self.store = store
+        self.cache = cache
+        self.lease_seconds = lease_seconds
+        self.acquire_timeout = acquire_timeout
+        self.poll_interval = poll_interval
+        self._versions = {}
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self.conflicts = 0
+        self.lock_timeouts = 0
+
+    def _owner(self):
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def acquire(self, key):
+        """Wait for the lease on key; returns False on timeout"""
+        owner = self._owner()
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            if self.store.try_acquire_lease(key, owner, self.lease_seconds):
+                return True
+            if time.monotonic() >= deadline:
+                self.lock_timeouts += 1
+                return False
+            time.sleep(self.poll_interval)
+
+    def release(self, key):
+        self.store.release_lease(key, self._owner())
+
+    def load(self, key):
+        """Read the latest session from the store and remember its version"""
+        session, version = self.store.load_versioned(key)
+        with self._lock:
+            self._versions[key] = version
+        return session
+
+    def mark_dirty(self, key, session):
+        """Schedule session to be committed when the conversation scope ends"""
+        with self._lock:
+            self._dirty[key] = session
+
+    def pending(self, key):
+        with self._lock:
+            return self._dirty.get(key)
+
+    def commit(self, key):
+        """
+        Compare-and-set the dirty session for key
+
+        Returns:
+            bool: False if another writer changed the session meanwhile
+        """
+        with self._lock:
+            session = self._dirty.pop(key, None)
+            expected = self._versions.get(key, 0)
+        if session is None:
+            return True
+        new_version = self.store.compare_and_set(key, json.dumps(session, ensure_ascii=False), expected)
+        if new_version is None:
+            self.conflicts += 1
+            log.warning("Session version conflict for %s (expected v%s); keeping stored version", key, expected)
+            del self.cache[key]
+            return False
+        with self._lock:
+            self._versions[key] = new_version
+        return True
+
+    @contextmanager
+    def conversation(self, key):
+        """Serialize one conversation across workers and commit its session on exit"""
+        locked = self.acquire(key)
+        if not locked:
+            log.warning("Timed out waiting for session lease on %s; continuing with optimistic versioning", key)
+        try:
+            # Always start from the shared copy, never a stale local one
+            del self.cache[key]
+            yield
+        finally:
+            try:
+                self.commit(key)
+            finally:
+                if locked:
+                    self.release(key)
+
+
+def create_session_store(backend, directory):
+    """
+    Build a session store from a backend name
+
+    Args:
+        backend: 'memory', 'json', 'journal' or 'sqlite'
+        directory: Directory where persistent backends keep their files
+
+    Returns:
+        SessionStore instance
+    """
+    backend = (backend or 'json').lower()
+    if backend == 'memory':
+        return InMemorySessionStore()
+    if backend == 'journal':
+        return JournalSessionStore(directory)
+    if backend == 'sqlite':
+        return SQLiteSessionStore(Path(directory) / "sessions.db")
+    if backend != 'json':
+        log.warning("Unknown SESSION_STORE '%s', using 'json'", backend)
+    return JsonFileSessionStore(directory)
+
+
+class SessionCache:
+    """
+    In-memory working set of sessions with LRU and idle-TTL eviction
+
+    Behaves like the dict it replaces (get / in / [] / del / len), but keeps
+    at most max_size sessions and drops sessions idle for more than
+    ttl_seconds. Evicted sessions are reloaded from the store on next access,
+    so memory tracks the active interview population only.
+    """
+
+    def __init__(self, max_size=1000, ttl_seconds=1800):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (session, last_access), oldest first
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict_locked(self, now):
+        # Idle entries sit at the front (least recently used first)
+        if self.ttl_seconds:
+            while self._data:
+                key, (_, last_access) = next(iter(self._data.items()))
+                if now - last_access <= self.ttl_seconds:
+                    break
+                del self._data[key]
+                self.evictions += 1
+        while self.max_size and len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            now = time.monotonic()
+            self._data[key] = (entry[0], now)
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, session):
+        with self._lock:
+            now = time.monotonic()
+            self._data[key] = (session, now)
+            self._data.move_to_end(key)
+            self._evict_locked(now)
+
+    def __delitem__(self, key):
+        # Tolerant delete: the session may already have been evicted
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def keys(self):
+        """Snapshot of the keys in memory (does not refresh their last access)"""
+        with self._lock:
+            return list(self._data)
+
+    def expire_idle(self):
+        """Evict idle sessions now (also happens on every insert)"""
+        with self._lock:
+            self._evict_locked(time.monotonic())
+
+
+_MISSING = object()
+
+
+class WriteBehindWriter:
+    """
+    Coalesces session saves and flushes them from a background thread
+
+    mark_dirty() takes a JSON snapshot of the session in the caller's thread,
+    while the conversation is still serialized by its lock, so the flusher
+    never reads a dict that a request is in the middle of updating. Only the
+    latest snapshot per key is kept; every flush_interval seconds the flusher
+    writes the whole batch with store.save_many(), so the request path does
+    no disk I/O. A batch stays readable through pending() until save_many()
+    returns, so a session evicted from memory meanwhile is not reloaded
+    from its previous stored version.
+    """
+
+    def __init__(self, store, flush_interval=1.0):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._dirty = {}  # key -> serialized session json
+        self._inflight = {}  # batch being written by flush()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="session-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self, key, session):
+        """
+        Snapshot session for persistence on the next flush
+
+        Call it while holding the conversation's lock (save_session does),
+        so the snapshot is a consistent state of the session.
+
+        Raises:
+            TypeError, ValueError: If the session is not JSON serializable
+        """
+        raw = json.dumps(session, ensure_ascii=False)
+        with self._lock:
+            self._dirty[key] = raw
+
+    def pending(self, key):
+        """Return a copy of the not-yet-flushed session for key, or None"""
+        with self._lock:
+            raw = self._dirty.get(key)
+            if raw is None:
+                raw = self._inflight.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def discard(self, key):
+        """Drop a pending write (used when the session is deleted)"""
+        with self._lock:
+            self._dirty.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def flush(self):
+        """Persist all dirty sessions"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._dirty = self._dirty, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+            try:
+                self.store.save_many(batch)
+            except Exception as e:
+                log.error("Failed to flush %s sessions: %s", len(batch), e)
+                # Re-queue unless a newer snapshot arrived meanwhile (or it was discarded)
+                with self._lock:
+                    for key, raw in self._inflight.items():
+                        self._dirty.setdefault(key, raw)
+                    self._inflight = {}
+                return 0
+            with self._lock:
+                self._inflight = {}
+            return len(batch)
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """Flush pending writes and stop the background thread"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self.store.close()
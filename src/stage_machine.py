@@ -0,0 +1,122 @@
+"""
+Stage Machine - Table-driven dispatch of interview stages
+=========================================================
+
+Each interview stage (welcome, privacy, name, ..., closing) is a handler
+registered under its stage key. process_message() looks the handler up in a
+dict instead of walking an if/elif chain, and every call is timed into the
+stage_latency_seconds histogram.
+
+Handlers declare the stages they may move the session to. An undeclared
+transition is still applied (the handler owns the session) but is logged
+and counted, so a wrong jump shows up immediately.
+
+Usage:
+    stage_machine = StageMachine()
+
+    @stage_machine.stage(1, 'name', transitions=(2,))
+    def handle_name_stage(phone_number, message_text, session):
+        ...
+        return response_text
+"""
+
+import time
+
+from src.metrics import registry
+from src.structured_log import get_logger
+
+log = get_logger('stages')
+
+
+class StageHandler:
+    """
+    One interview stage
+
+    Args:
+        stage: Stage key stored in session['stage'] (int or float)
+        name: Readable name used in logs and metric labels
+        handle: Callable(phone_number, message_text, session) -> response text
+        transitions: Stages this handler may move the session to
+    """
+
+    def __init__(self, stage, name, handle, transitions=()):
+        self.stage = stage
+        self.name = name
+        self.handle = handle
+        self.transitions = frozenset(transitions)
+
+    def allows(self, next_stage):
+        return next_stage == self.stage or next_stage in self.transitions
+
+    def __repr__(self):
+        return f"StageHandler({self.stage!r}, {self.name!r})"
+
+
+class StageMachine:
+    """
+    Registry of stage handlers with O(1) dispatch and per-stage timing
+
+    Metrics:
+        stage_latency_seconds{stage}: handler run time
+        stage_invalid_transitions_total{stage}: transitions not declared by the handler
+    """
+
+    def __init__(self, fallback=None, metrics=registry):
+        self._handlers = {}
+        self.fallback = fallback
+        self.latency = metrics.histogram(
+            'stage_latency_seconds', 'Time spent in each interview stage handler', ('stage',)
+        )
+        self.invalid_transitions = metrics.counter(
+            'stage_invalid_transitions_total', 'Stage changes not declared by the handler', ('stage',)
+        )
+
+    def add(self, handler):
+        """Register a StageHandler (one per stage key)"""
+        if handler.stage in self._handlers:
+            raise ValueError(f"Stage {handler.stage!r} already registered ({self._handlers[handler.stage].name})")
+        self._handlers[handler.stage] = handler
+        return handler
+
+    def stage(self, stage, name, transitions=()):
+        """Decorator form of add()"""
+        def decorator(fn):
+            self.add(StageHandler(stage, name, fn, transitions))
+            return fn
+        return decorator
+
+    def handler_for(self, stage):
+        return self._handlers.get(stage)
+
+    def stages(self):
+        return list(self._handlers.values())
+
+    def dispatch(self, stage, phone_number, message_text, session):
+        """
+        Run the handler for stage
+
+        Args:
+            stage: Current (normalized) session stage
+            phone_number: Conversation key
+            message_text: Incoming message
+            session: Session dict (mutated by the handler)
+
+        Returns:
+            str: Response text for the candidate
+        """
+        handler = self._handlers.get(stage)
+        if handler is None:
+            log.warning("No handler registered for stage %r", stage)
+            if self.fallback is None:
+                return ""
+            return self.fallback(phone_number, message_text, session)
+
+        start = time.perf_counter()
+        try:
+            return handler.handle(phone_number, message_text, session)
+        finally:
+            self.latency.observe(time.perf_counter() - start, stage=handler.name)
+            next_stage = session.get('stage', stage)
+            if not handler.allows(next_stage):
+                self.invalid_transitions.inc(stage=handler.name)
+                log.warning("Undeclared stage transition %s: %r -> %r", handler.name, stage, next_stage)
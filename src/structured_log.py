@@ -0,0 +1,215 @@
+"""
+Structured Log - Leveled, non-blocking logging with optional JSON output
+========================================================================
+
+The request threads only build a LogRecord and put it on a bounded queue;
+one background listener formats and writes it to stdout. Disabled levels
+cost a cached level check (use %-style arguments, not f-strings, so nothing
+is formatted either), and a full queue drops records instead of blocking.
+
+Records carry the conversation context set with log_context() (phone and
+stage of the message being handled) plus any extra= fields (timings).
+JSON output replaces the phone with a salted hash.
+
+Environment:
+    LOG_LEVEL: DEBUG / INFO (default) / WARNING / ERROR
+    LOG_FORMAT: text (default, same look as the old print lines) or json
+    LOG_DEBUG_SAMPLE_RATE: fraction of DEBUG records kept (default 1.0)
+    LOG_QUEUE_SIZE: records buffered before dropping (default 10000)
+    LOG_PHONE_SALT: salt for the phone hash in JSON output
+
+Usage:
+    from src.structured_log import configure_logging, get_logger, log_context
+    configure_logging()
+    log = get_logger('bot')
+    with log_context(phone=from_number, stage='7'):
+        log.debug("Word count: %s", word_count)
+        log.info("Message handled", extra={'elapsed_ms': 42.0})
+"""
+
+import atexit
+import contextvars
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.metrics import registry
+
+ROOT_LOGGER = 'saori'
+
+_context = contextvars.ContextVar('log_context', default=None)
+_configure_lock = threading.Lock()
+_listener = None
+
+# Attributes every LogRecord has; anything else on a record is an extra field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def hash_phone(phone, salt=''):
+    """Stable, non-reversible id of a phone number (12 hex chars)"""
+    return hashlib.sha256(f"{salt}{phone}".encode('utf-8')).hexdigest()[:12]
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields (phone, stage, ...) to every record logged inside the block"""
+    current = _context.get()
+    token = _context.set({**current, **fields} if current else fields)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def get_logger(name):
+    """Logger under the bot's root logger ('bot' -> 'saori.bot')"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class ContextFilter(logging.Filter):
+    """Copies the log_context() fields onto the record (explicit extra= wins)"""
+
+    def filter(self, record):
+        context = _context.get()
+        if context:
+            for key, value in context.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the verbose records
+
+    Args:
+        rate: Fraction kept (1.0 keeps all)
+        max_level: Records at or below this level are sampled; higher levels always pass
+    """
+
+    def __init__(self, rate=1.0, max_level=logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+
+    def filter(self, record):
+        if self.rate >= 1.0 or record.levelno > self.max_level:
+            return True
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: when the queue is full the record is dropped and counted"""
+
+    def __init__(self, log_queue, metrics=registry):
+        super().__init__(log_queue)
+        self.dropped_total = metrics.counter(
+            'log_records_dropped_total', 'Log records dropped because the log queue was full'
+        )
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_total.inc()
+
+
+def _extra_fields(record):
+    return {key: value for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith('_')}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, phone_hash, stage and extra fields"""
+
+    def __init__(self, phone_salt=''):
+        super().__init__()
+        self.phone_salt = phone_salt
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in _extra_fields(record).items():
+            if key == 'phone':
+                entry['phone_hash'] = hash_phone(value, self.phone_salt)
+            elif key != 'user_name':  # PII stays out of the structured logs
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """[HH:MM:SS] [LEVEL] [USER: phone | name] [STAGE: s] message key=value..."""
+
+    def format(self, record):
+        fields = _extra_fields(record)
+        parts = [datetime.fromtimestamp(record.created).strftime('[%H:%M:%S]'), f"[{record.levelname}]"]
+        phone = fields.pop('phone', None)
+        user_name = fields.pop('user_name', None)
+        if phone:
+            user_id = str(phone).replace('whatsapp:', '')
+            parts.append(f"[USER: {user_id} | {user_name}]" if user_name else f"[USER: {user_id}]")
+        stage = fields.pop('stage', None)
+        if stage is not None:
+            parts.append(f"[STAGE: {stage}]")
+        parts.append(record.getMessage())
+        parts.extend(f"{key}={value}" for key, value in fields.items())
+        text = ' '.join(parts)
+        if record.exc_info:
+            text += '\n' + self.formatException(record.exc_info)
+        return text
+
+
+def configure_logging(level=None, fmt=None, sample_rate=None, queue_size=None, stream=None):
+    """
+    Set up the root 'saori' logger once (later calls return it unchanged)
+
+    Arguments default to the LOG_* environment variables.
+
+    Returns:
+        logging.Logger: The root logger
+    """
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    with _configure_lock:
+        if _listener is not None:
+            return root
+
+        level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+        fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+        if sample_rate is None:
+            sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+        if queue_size is None:
+            queue_size = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(
+            JsonFormatter(os.getenv('LOG_PHONE_SALT', '')) if fmt == 'json' else TextFormatter()
+        )
+
+        log_queue = queue.Queue(maxsize=queue_size)
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(sample_rate))  # cheapest check first
+        handler.addFilter(ContextFilter())
+
+        root.setLevel(getattr(logging, level, logging.INFO))
+        root.handlers = [handler]
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        atexit.register(_listener.stop)  # flush what is queued at exit
+    return root
@@ -27,11 +27,13 @@ if sys.platform == "win32":
 
 from flask import Flask, request, make_response
 from twilio.twiml.messaging_response import MessagingResponse
-from twilio.rest import Client
 import json
+import hmac
 from datetime import datetime
-import threading
 import time
+import copy
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path (parent of src/)
 project_root = Path(__file__).parent.parent
@@ -51,17 +53,45 @@ except ImportError:
 except Exception as e:
     print(f"[WARNING] Failed to load .env file: {e}")
 
-from Modules.sentiment_inference import SentimentPredictor
+from Modules.sentiment_inference import SentimentPredictor, MicroBatcher
 from Modules.english_level_evaluator import EnglishLevelEvaluator
 from Modules.soft_skills_evaluator import SoftSkillsEvaluator
 from Modules.questions_bank import questions_bank
-import importlib
-import src.whatsapp_inconsistency_detector
-importlib.reload(src.whatsapp_inconsistency_detector)  # Force reload to get latest changes
-from src.whatsapp_inconsistency_detector import detect_whatsapp_inconsistencies, generate_inconsistency_report, calculate_trust_score
+from Modules.keyword_matcher import KeywordMatcher
+# Detector is always used through the module object so an opt-in hot reload
+# (admin endpoint / DETECTOR_HOT_RELOAD) swaps rules for every caller
+import src.whatsapp_inconsistency_detector as detector_module
+from src.hot_reload import reload_preserving_state, ModuleFileWatcher
+from src.session_store import (
+    create_session_store, WriteBehindWriter, SessionCache,
+    SQLiteSessionStore, SharedSessionCoordinator
+)
+from src.conversation_lock import ConversationLocks
+from src.detection_pool import DetectionPool
+from src.stage_machine import StageMachine
+from src.grammar_service import GrammarService
+from src.model_registry import model_registry
+from src.inference_cache import InferenceCache
+from src.outbound_dispatcher import OutboundDispatcher, TwilioRestSender, split_message
+from src.inbound_processor import InboundProcessor
+from src.message_dedup import MessageDedupIndex, ORIGINAL_FAILED
+from src.metrics import registry as metrics_registry
+from contextlib import contextmanager, nullcontext
 from langdetect import detect, DetectorFactory
 import random
 import re
+import logging
+from src.structured_log import configure_logging, get_logger, log_context
+
+# Structured logging (LOG_LEVEL, LOG_FORMAT=text|json, LOG_DEBUG_SAMPLE_RATE; see
+# src/structured_log.py): records are queued to a background writer and disabled
+# levels cost one level check (pass %-style args, not f-strings)
+configure_logging()
+log = get_logger('bot')
+scoring_log = get_logger('bot.scoring')
+grammar_log = get_logger('bot.grammar')
+inference_log = get_logger('bot.inference')
+webhook_log = get_logger('bot.webhook')
 
 # Fuzzy matching for command tolerance (typo correction)
 try:
@@ -69,11 +99,32 @@ try:
     FUZZY_MATCHING_AVAILABLE = True
 except ImportError:
     FUZZY_MATCHING_AVAILABLE = False
-    print("[WARNING] rapidfuzz not available. Install with: pip install rapidfuzz")
+    log.warning("rapidfuzz not available. Install with: pip install rapidfuzz")
 
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+# Inference result caches (thread-safe LRU + optional TTL, hit/miss/eviction counters)
+# INFERENCE_CACHE_PERSIST=1 keeps them in Logs/inference_cache across restarts
+INFERENCE_CACHE_DIR = (
+    project_root / "Logs" / "inference_cache"
+    if os.getenv('INFERENCE_CACHE_PERSIST', '').lower() in ('1', 'true', 'yes') else None
+)
+
+def inference_cache_path(name):
+    """Persistence file for an inference cache (None when persistence is off)"""
+    return INFERENCE_CACHE_DIR / f"{name}.json" if INFERENCE_CACHE_DIR else None
+
+language_cache = InferenceCache(
+    'language',
+    max_size=int(os.getenv('LANGUAGE_CACHE_SIZE', '2048')),
+    ttl_seconds=float(os.getenv('LANGUAGE_CACHE_TTL', '0')),
+    persist_path=inference_cache_path('language')
+)
+langdetect_latency = metrics_registry.histogram(
+    'inference_latency_seconds', 'Model forward pass time per batch', ('model',)
+)
+
 # Utility function: Detect language from user message using NLP
 def detect_language(text):
     """
@@ -89,15 +140,20 @@ def detect_language(text):
         spanish_greetings = ['hola', 'buenos dias', 'buenas tardes', 'buenas noches', 'sí', 'si', 'no', 'buenas', 'acepto', 'ok', 'reiniciar', 'nuevo']
         
         if text_lower in english_greetings:
-            print(f"[INFO] Detected English greeting: '{text_lower}'")
+            log.info("Detected English greeting: '%s'", text_lower)
             return 'en'
         elif text_lower in spanish_greetings:
-            print(f"[INFO] Detected Spanish greeting: '{text_lower}'")
+            log.info("Detected Spanish greeting: '%s'", text_lower)
             return 'es'
         
-        # Use NLP to detect language for longer text
-        detected_lang = detect(text)
-        print(f"[INFO] NLP detected language: '{detected_lang}' from text: '{text[:30]}...'")
+        # Use NLP to detect language for longer text (deterministic with the seed, so cacheable)
+        detected_lang = language_cache.get(text)
+        if detected_lang is None:
+            start = time.perf_counter()
+            detected_lang = detect(text)
+            langdetect_latency.observe(time.perf_counter() - start, model='langdetect')
+            language_cache.set(text, detected_lang)
+        log.info("NLP detected language: '%s' from text: '%s...'", detected_lang, text[:30])
         
         # Map to supported languages (currently EN/ES)
         if detected_lang == 'en':
@@ -107,12 +163,12 @@ def detect_language(text):
         else:
             # For other languages, default to Spanish
             # Future: can expand to more languages
-            print(f"[INFO] Detected language '{detected_lang}', defaulting to Spanish")
+            log.info("Detected language '%s', defaulting to Spanish", detected_lang)
             return 'es'
             
     except Exception as e:
         # Fallback: if detection fails, default to Spanish
-        print(f"[WARNING] Language detection failed: {e}, defaulting to Spanish")
+        log.warning("Language detection failed: %s, defaulting to Spanish", e)
         return 'es'
 
 # Utility function: Check if response makes sense and is coherent
@@ -198,7 +254,7 @@ def is_response_makes_sense(response, min_words=8, min_length=30):
         return (True, "valid")
         
     except Exception as e:
-        print(f"[WARNING] Error in is_response_makes_sense: {e}")
+        log.warning("Error in is_response_makes_sense: %s", e)
         # On error, be lenient and accept the response
         return (True, "error_fallback")
 
@@ -262,7 +318,7 @@ def is_copied_from_previous(session, current_response, threshold=0.7):
         
         return (False, None)
     except Exception as e:
-        print(f"[WARNING] Error in is_copied_from_previous: {e}")
+        log.warning("Error in is_copied_from_previous: %s", e)
         return (False, None)
 
 # Utility function: Detect if user just repeats the question
@@ -385,7 +441,7 @@ def is_question_repetition(question_text, user_response, threshold=0.65):
         
         return False
     except Exception as e:
-        print(f"[WARNING] Error in is_question_repetition: {e}")
+        log.warning("Error in is_question_repetition: %s", e)
         return False
 
 # Utility function: Fuzzy command matching (for typo tolerance)
@@ -488,25 +544,20 @@ def extract_name(text):
     return text.title() if text else text
 
 # Simple wrapper for English level evaluation
-# Grammar checker (lazy initialization)
-_grammar_tool = None
-
-def get_grammar_tool():
-    """Get or initialize LanguageTool grammar checker"""
-    global _grammar_tool
-    if _grammar_tool is None:
-        try:
-            import language_tool_python
-            _grammar_tool = language_tool_python.LanguageTool('en-US')
-            print("[INFO] LanguageTool grammar checker initialized")
-        except ImportError:
-            print("[WARNING] language-tool-python not installed. Grammar checking disabled.")
-            print("[INFO] Install with: pip install language-tool-python")
-            _grammar_tool = False  # Mark as unavailable
-        except Exception as e:
-            print(f"[WARNING] Failed to initialize LanguageTool: {e}")
-            _grammar_tool = False
-    return _grammar_tool
+# Grammar checker: one LanguageTool server shared by all workers (LANGUAGETOOL_URL
+# or autostarted by the first worker), pooled clients, cached results, timeout
+grammar_service = GrammarService(
+    'en-US',
+    server_url=os.getenv('LANGUAGETOOL_URL') or None,
+    pool_size=int(os.getenv('GRAMMAR_POOL_SIZE', '2')),
+    timeout=float(os.getenv('GRAMMAR_TIMEOUT', '3.0')),
+    cache_size=int(os.getenv('GRAMMAR_CACHE_SIZE', '2048')),
+    cache_ttl=float(os.getenv('GRAMMAR_CACHE_TTL', '0')),
+    cache_path=inference_cache_path('grammar'),
+    state_dir=project_root / "Logs"
+)
+# Registered so its readiness shows up with the models (preload with MODEL_PRELOAD=grammar)
+model_registry.register('grammar', grammar_service.start, pinned=True)
 
 def evaluate_english_level(text):
     """
@@ -528,13 +579,12 @@ def evaluate_english_level(text):
     # Base score from 0-5
     base_score = min(5.0, (word_count * 0.15) + (avg_word_length * 0.35))
     
-    # Grammar validation (if available)
-    grammar_tool = get_grammar_tool()
+    # Grammar validation (if available; None = unavailable/busy/timeout -> base score only)
     grammar_penalty = 0.0
+    errors = grammar_service.check(text)
     
-    if grammar_tool and grammar_tool is not False:
+    if errors is not None:
         try:
-            errors = grammar_tool.check(text)
             # Filter out style warnings (not real grammar errors)
             STYLE_WARNINGS_TO_IGNORE = [
                 "three successive sentences begin",
@@ -579,25 +629,115 @@ def evaluate_english_level(text):
                 # Log errors for debugging (first 5 errors for better visibility)
                 style_warnings_count = len(errors) - error_count
                 if style_warnings_count > 0:
-                    print(f"[DEBUG GRAMMAR] Found {error_count} real grammar/spelling errors + {style_warnings_count} style warnings (ignored)")
+                    grammar_log.debug("Found %s real grammar/spelling errors + %s style warnings (ignored)", error_count, style_warnings_count)
                 else:
-                    print(f"[DEBUG GRAMMAR] Found {error_count} grammar/spelling errors (density: {error_density:.1f}%)")
-                print(f"[DEBUG GRAMMAR] Grammar penalty applied: {grammar_penalty:.2f}")
-                for error in real_errors[:5]:
-                    error_text = text[max(0, error.offset-10):error.offset+error.errorLength+10]
-                    print(f"  - {error.message} | Context: '...{error_text}...'")
+                    grammar_log.debug("Found %s grammar/spelling errors (density: %.1f%%)", error_count, error_density)
+                grammar_log.debug("Grammar penalty applied: %.2f", grammar_penalty)
+                if grammar_log.isEnabledFor(logging.DEBUG):
+                    for error in real_errors[:5]:
+                        error_text = text[max(0, error.offset-10):error.offset+error.errorLength+10]
+                        grammar_log.debug("  - %s | Context: '...%s...'", error.message, error_text)
             elif len(errors) > 0:
                 # Only style warnings, no real errors
-                print(f"[DEBUG GRAMMAR] Found {len(errors)} style warnings (ignored, no penalty applied)")
+                grammar_log.debug("Found %s style warnings (ignored, no penalty applied)", len(errors))
                 
         except Exception as e:
-            print(f"[WARNING] Grammar check failed: {e}, using base score only")
+            log.warning("Grammar check failed: %s, using base score only", e)
     
     # Apply penalty and ensure minimum score
     final_score = max(1.0, base_score - grammar_penalty)
     
     return round(final_score, 1)
 
+# Comprehensive soft skill keyword categories with Spanish/English
+SOFT_SKILLS_KEYWORDS = {
+    'teamwork': ['equipo', 'team', 'colabor', 'coordin', 'trabajar', 'collaborate', 'together'],
+    'leadership': ['lider', 'lead', 'coordin', 'manage', 'organiz', 'dirigir', 'guiar', 'mentor'],
+    'problem_solving': ['problema', 'problem', 'solucion', 'solution', 'resolver', 'solve', 'implement', 'fix', 'diagnos', 'analiz'],
+    'communication': ['comunicar', 'communicate', 'document', 'explain', 'present', 'feedback', 'reunión', 'meeting'],
+    'adaptability': ['aprend', 'learn', 'adapt', 'flexible', 'change', 'nuevo', 'new', 'rápid', 'quick', 'fast'],
+    'results': ['logr', 'achieve', 'éxito', 'success', 'complet', 'deliver', 'result', 'terminamos', 'finish'],
+    'time_management': ['tiempo', 'time', 'hora', 'hour', 'deadline', 'plazo', 'rápid', 'quick', 'eficien', 'efficient'],
+    'proactive': ['iniciativa', 'initiative', 'proactiv', 'mejorar', 'improve', 'optimiz', 'prevenir', 'prevent']
+}
+
+# Enhanced technical keywords (Backend + Data Engineering + General) - EXPANDED
+TECHNICAL_KEYWORDS = [
+    # Backend/API keywords
+    'rest', 'restful', 'graphql', 'http', 'https', 'api', 'apis', 'endpoint', 'endpoints', 
+    'docker', 'container', 'containers', 'compose', 'docker-compose', 'dockerfile', 
+    'ci/cd', 'cicd', 'continuous', 'integration', 'deployment', 'deploy', 'deploying',
+    'server', 'servers', 'client', 'clients', 'framework', 'frameworks', 
+    'jenkins', 'github', 'gitlab', 'actions', 'pipeline', 'pipelines', 'testing', 'tests',
+    'kubernetes', 'k8s', 'stateless', 'stateful', 'endpoint', 'fetching', 'fetch', 
+    'orchestrate', 'orchestration', 'bug', 'bugs', 'automated', 'automates', 'automation',
+    'microservices', 'microservice', 'monolith', 'monolithic',
+    
+    # Django/Backend Development keywords
+    'django', 'djangorestframework', 'drf', 'models', 'model', 'orm', 'object-relational',
+    'serializer', 'serializers', 'serialization', 'view', 'views', 'viewset', 'viewsets',
+    'listapi', 'apiview', 'apiviews', 'queryset', 'querysets', 'query', 'queries',
+    'json', 'xml', 'format', 'formats', 'postgresql', 'postgres', 'mysql', 'sqlite',
+    'table', 'tables', 'column', 'columns', 'row', 'rows', 'record', 'records',
+    'attributes', 'attribute', 'field', 'fields', 'class', 'classes', 'object', 'objects',
+    'maps', 'mapping', 'mappings', 'translate', 'translation', 'sql', 'nosql',
+    'packages', 'packaging', 'package', 'consistent', 'consistency', 'environment', 'environments',
+    'services', 'service', 'orchestration', 'orchestrate', 'middleware',
+    'migration', 'migrations', 'admin', 'authentication', 'authorization', 'permissions',
+    
+    # Data Engineering keywords (SQL, Python, Spark, ETL) - EXPANDED
+    'pyspark', 'spark', 'apache spark', 'airflow', 'apache airflow', 'etl', 'elt',
+    'processing', 'process', 'scalable', 'scalability', 'infrastructure', 'reliability', 
+    'coordinate', 'coordinated', 'coordination',
+    'normalization', 'normalize', 'normalized', 'normalizing', 'denormalization',
+    'redundancy', 'redundant', 'integrity', 'schema', 'schemas', '1nf', '2nf', '3nf', 
+    'first normal form', 'second normal form', 'third normal form',
+    'dependencies', 'dependency', 'dependent', 'relational', 'relation', 'relations',
+    'tables', 'relationships', 'relationship', 'foreign key', 'primary key', 'index', 'indexes',
+    'dynamic', 'dynamically', 'static', 'statically', 'typed', 'typing', 'type', 'types',
+    'runtime', 'compile-time', 'declare', 'declaring', 'declaration', 'flexibility', 'flexible',
+    'advantages', 'disadvantages', 'benefits', 'drawbacks', 'pros', 'cons',
+    'variables', 'variable', 'constant', 'constants',
+    'rdd', 'rdds', 'dataframe', 'dataframes', 'dataset', 'datasets',
+    'lineage', 'transformations', 'transformation', 'transform', 'transforms',
+    'fault', 'faults', 'tolerance', 'tolerant', 'resilient', 'resilience',
+    'distributed', 'distribute', 'distribution', 'reconstruct', 'reconstruction',
+    'node', 'nodes', 'cluster', 'clusters', 'origin', 'origins', 'source', 'sources',
+    'dbt', 'data build tool', 'mlflow', 'kafka', 'apache kafka', 'terraform', 
+    'aws', 'amazon web services', 'cloud', 'cloud computing',
+    'data warehouse', 'data lake', 'data pipeline', 'pipelines',
+    'batch', 'streaming', 'real-time', 'realtime', 'latency', 'throughput',
+    
+    # Python-specific keywords
+    'python', 'pythonic', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
+    'list', 'lists', 'dict', 'dictionary', 'dictionaries', 'tuple', 'tuples',
+    'function', 'functions', 'method', 'methods', 'module', 'modules', 'package',
+    'import', 'imports', 'exception', 'exceptions', 'error', 'errors', 'try', 'except',
+    'decorator', 'decorators', 'generator', 'generators', 'iterator', 'iterators',
+    
+    # Database keywords
+    'database', 'databases', 'db', 'rdbms', 'transaction', 'transactions', 'commit', 'rollback',
+    'join', 'joins', 'inner join', 'left join', 'right join', 'union', 'group by', 'order by',
+    'select', 'insert', 'update', 'delete', 'where', 'having', 'aggregate', 'aggregation',
+    'constraint', 'constraints', 'unique', 'not null', 'check', 'default',
+    
+    # General quality keywords - EXPANDED
+    'data', 'information', 'system', 'systems', 'algorithm', 'algorithms', 
+    'experience', 'experiences', 'project', 'projects', 'implement', 'implementation',
+    'design', 'designs', 'optimize', 'optimization', 'optimized', 'solve', 'solution', 'solutions',
+    'build', 'building', 'built', 'develop', 'development', 'developer',
+    'coordinated', 'coordination', 'architected', 'architecture', 'architect',
+    'efficient', 'efficiency', 'performance', 'performant', 'scalable', 'scalability',
+    'maintainable', 'maintainability', 'readable', 'readability', 'clean', 'code',
+    'best practices', 'best practice', 'pattern', 'patterns', 'principle', 'principles',
+    'refactor', 'refactoring', 'test', 'testing', 'unit test', 'integration test',
+    'documentation', 'document', 'comment', 'comments', 'readme'
+]
+
+# Compiled once; every scorer call is a single pass over the text
+_soft_skills_matcher = KeywordMatcher(SOFT_SKILLS_KEYWORDS)
+_technical_keywords_matcher = KeywordMatcher(TECHNICAL_KEYWORDS)
+
 # Enhanced soft skills evaluation
 def evaluate_soft_skills(text):
     """Enhanced soft skills evaluation with comprehensive keyword detection"""
@@ -617,25 +757,8 @@ def evaluate_soft_skills(text):
     else:
         base_score = 4.0
     
-    # Comprehensive keyword categories with Spanish/English
-    keywords = {
-        'teamwork': ['equipo', 'team', 'colabor', 'coordin', 'trabajar', 'collaborate', 'together'],
-        'leadership': ['lider', 'lead', 'coordin', 'manage', 'organiz', 'dirigir', 'guiar', 'mentor'],
-        'problem_solving': ['problema', 'problem', 'solucion', 'solution', 'resolver', 'solve', 'implement', 'fix', 'diagnos', 'analiz'],
-        'communication': ['comunicar', 'communicate', 'document', 'explain', 'present', 'feedback', 'reunión', 'meeting'],
-        'adaptability': ['aprend', 'learn', 'adapt', 'flexible', 'change', 'nuevo', 'new', 'rápid', 'quick', 'fast'],
-        'results': ['logr', 'achieve', 'éxito', 'success', 'complet', 'deliver', 'result', 'terminamos', 'finish'],
-        'time_management': ['tiempo', 'time', 'hora', 'hour', 'deadline', 'plazo', 'rápid', 'quick', 'eficien', 'efficient'],
-        'proactive': ['iniciativa', 'initiative', 'proactiv', 'mejorar', 'improve', 'optimiz', 'prevenir', 'prevent']
-    }
-    
-    # Count keyword matches
-    total_matches = 0
-    for category, words in keywords.items():
-        for keyword in words:
-            if keyword in text_lower:
-                total_matches += 1
-                break  # Count category only once
+    # Count categories with at least one keyword (single pass over the text)
+    total_matches = len(_soft_skills_matcher.categories_hit(text_lower))
     
     # Keyword bonus (more generous)
     if total_matches >= 6:
@@ -652,7 +775,7 @@ def evaluate_soft_skills(text):
     # Calculate final score
     final_score = min(5.0, base_score + keyword_bonus)
     
-    print(f"[DEBUG SOFT SKILLS] Word count: {word_count}, Categories matched: {total_matches}/8, Base: {base_score}, Bonus: {keyword_bonus}, Final: {final_score}")
+    scoring_log.debug("Word count: %s, Categories matched: %s/8, Base: %s, Bonus: %s, Final: %s", word_count, total_matches, base_score, keyword_bonus, final_score)
     
     return round(final_score, 1)
 
@@ -673,16 +796,16 @@ def evaluate_response(question, response, position="General", expects_brief=Fals
         position: The position being applied for
         expects_brief: If True, the question asked for a brief response (2-3 lines, breve explicación)
     """
-    print(f"[DEBUG SCORING V2.0] Evaluating response with {len(response.split())} words, expects_brief={expects_brief}")
+    scoring_log.debug("Evaluating response with %s words, expects_brief=%s", len(response.split()), expects_brief)
     
     if not response or len(response) < 10:
-        print(f"[DEBUG SCORING V2.0] Response too short, returning 1.5")
+        scoring_log.debug("Response too short, returning 1.5")
         return 1.5
     
     # Word count analysis
     words = response.split()
     word_count = len(words)
-    print(f"[DEBUG SCORING V2.0] Word count: {word_count}")
+    scoring_log.debug("Word count: %s", word_count)
     
     # Base score by length - adjusted for brief vs detailed responses
     if expects_brief:
@@ -709,81 +832,8 @@ def evaluate_response(question, response, position="General", expects_brief=Fals
         else:
             base_score = 4.0
     
-    # Enhanced technical keywords (Backend + Data Engineering + General) - EXPANDED
-    technical_keywords = [
-        # Backend/API keywords
-        'rest', 'restful', 'graphql', 'http', 'https', 'api', 'apis', 'endpoint', 'endpoints', 
-        'docker', 'container', 'containers', 'compose', 'docker-compose', 'dockerfile', 
-        'ci/cd', 'cicd', 'continuous', 'integration', 'deployment', 'deploy', 'deploying',
-        'server', 'servers', 'client', 'clients', 'framework', 'frameworks', 
-        'jenkins', 'github', 'gitlab', 'actions', 'pipeline', 'pipelines', 'testing', 'tests',
-        'kubernetes', 'k8s', 'stateless', 'stateful', 'endpoint', 'fetching', 'fetch', 
-        'orchestrate', 'orchestration', 'bug', 'bugs', 'automated', 'automates', 'automation',
-        'microservices', 'microservice', 'monolith', 'monolithic',
-        
-        # Django/Backend Development keywords
-        'django', 'djangorestframework', 'drf', 'models', 'model', 'orm', 'object-relational',
-        'serializer', 'serializers', 'serialization', 'view', 'views', 'viewset', 'viewsets',
-        'listapi', 'apiview', 'apiviews', 'queryset', 'querysets', 'query', 'queries',
-        'json', 'xml', 'format', 'formats', 'postgresql', 'postgres', 'mysql', 'sqlite',
-        'table', 'tables', 'column', 'columns', 'row', 'rows', 'record', 'records',
-        'attributes', 'attribute', 'field', 'fields', 'class', 'classes', 'object', 'objects',
-        'maps', 'mapping', 'mappings', 'translate', 'translation', 'sql', 'nosql',
-        'packages', 'packaging', 'package', 'consistent', 'consistency', 'environment', 'environments',
-        'services', 'service', 'orchestration', 'orchestrate', 'middleware',
-        'migration', 'migrations', 'admin', 'authentication', 'authorization', 'permissions',
-        
-        # Data Engineering keywords (SQL, Python, Spark, ETL) - EXPANDED
-        'pyspark', 'spark', 'apache spark', 'airflow', 'apache airflow', 'etl', 'elt',
-        'processing', 'process', 'scalable', 'scalability', 'infrastructure', 'reliability', 
-        'coordinate', 'coordinated', 'coordination',
-        'normalization', 'normalize', 'normalized', 'normalizing', 'denormalization',
-        'redundancy', 'redundant', 'integrity', 'schema', 'schemas', '1nf', '2nf', '3nf', 
-        'first normal form', 'second normal form', 'third normal form',
-        'dependencies', 'dependency', 'dependent', 'relational', 'relation', 'relations',
-        'tables', 'relationships', 'relationship', 'foreign key', 'primary key', 'index', 'indexes',
-        'dynamic', 'dynamically', 'static', 'statically', 'typed', 'typing', 'type', 'types',
-        'runtime', 'compile-time', 'declare', 'declaring', 'declaration', 'flexibility', 'flexible',
-        'advantages', 'disadvantages', 'benefits', 'drawbacks', 'pros', 'cons',
-        'variables', 'variable', 'constant', 'constants',
-        'rdd', 'rdds', 'dataframe', 'dataframes', 'dataset', 'datasets',
-        'lineage', 'transformations', 'transformation', 'transform', 'transforms',
-        'fault', 'faults', 'tolerance', 'tolerant', 'resilient', 'resilience',
-        'distributed', 'distribute', 'distribution', 'reconstruct', 'reconstruction',
-        'node', 'nodes', 'cluster', 'clusters', 'origin', 'origins', 'source', 'sources',
-        'dbt', 'data build tool', 'mlflow', 'kafka', 'apache kafka', 'terraform', 
-        'aws', 'amazon web services', 'cloud', 'cloud computing',
-        'data warehouse', 'data lake', 'data pipeline', 'pipelines',
-        'batch', 'streaming', 'real-time', 'realtime', 'latency', 'throughput',
-        
-        # Python-specific keywords
-        'python', 'pythonic', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
-        'list', 'lists', 'dict', 'dictionary', 'dictionaries', 'tuple', 'tuples',
-        'function', 'functions', 'method', 'methods', 'module', 'modules', 'package',
-        'import', 'imports', 'exception', 'exceptions', 'error', 'errors', 'try', 'except',
-        'decorator', 'decorators', 'generator', 'generators', 'iterator', 'iterators',
-        
-        # Database keywords
-        'database', 'databases', 'db', 'rdbms', 'transaction', 'transactions', 'commit', 'rollback',
-        'join', 'joins', 'inner join', 'left join', 'right join', 'union', 'group by', 'order by',
-        'select', 'insert', 'update', 'delete', 'where', 'having', 'aggregate', 'aggregation',
-        'constraint', 'constraints', 'unique', 'not null', 'check', 'default',
-        
-        # General quality keywords - EXPANDED
-        'data', 'information', 'system', 'systems', 'algorithm', 'algorithms', 
-        'experience', 'experiences', 'project', 'projects', 'implement', 'implementation',
-        'design', 'designs', 'optimize', 'optimization', 'optimized', 'solve', 'solution', 'solutions',
-        'build', 'building', 'built', 'develop', 'development', 'developer',
-        'coordinated', 'coordination', 'architected', 'architecture', 'architect',
-        'efficient', 'efficiency', 'performance', 'performant', 'scalable', 'scalability',
-        'maintainable', 'maintainability', 'readable', 'readability', 'clean', 'code',
-        'best practices', 'best practice', 'pattern', 'patterns', 'principle', 'principles',
-        'refactor', 'refactoring', 'test', 'testing', 'unit test', 'integration test',
-        'documentation', 'document', 'comment', 'comments', 'readme'
-    ]
-    
-    # Count unique keywords
-    keyword_count = sum(1 for keyword in technical_keywords if keyword.lower() in response.lower())
+    # Count keywords (duplicated entries count twice, as before) in one pass
+    keyword_count = _technical_keywords_matcher.total(response)
     
     # Keyword bonus (more generous for data-rich responses)
     if keyword_count >= 10:
@@ -800,7 +850,7 @@ def evaluate_response(question, response, position="General", expects_brief=Fals
     # Calculate final score
     final_score = min(5.0, base_score + keyword_bonus)
     
-    print(f"[DEBUG SCORING V2.0] Base: {base_score}, Keyword bonus: {keyword_bonus}, Keywords found: {keyword_count}, Final score: {final_score}")
+    scoring_log.debug("Base: %s, Keyword bonus: %s, Keywords found: %s, Final score: %s", base_score, keyword_bonus, keyword_count, final_score)
     
     return round(final_score, 1)
 
@@ -814,32 +864,103 @@ TWILIO_WHATSAPP_NUMBER = os.getenv('TWILIO_WHATSAPP_NUMBER', 'whatsapp:+14155238
 
 # Validate Twilio credentials
 if TWILIO_ACCOUNT_SID == 'your_account_sid' or TWILIO_AUTH_TOKEN == 'your_auth_token':
-    print(f"[WARNING] Twilio credentials not configured properly!")
-    print(f"[WARNING] TWILIO_ACCOUNT_SID: {'Not set' if TWILIO_ACCOUNT_SID == 'your_account_sid' else 'Set'}")
-    print(f"[WARNING] TWILIO_AUTH_TOKEN: {'Not set' if TWILIO_AUTH_TOKEN == 'your_auth_token' else 'Set'}")
-    print(f"[WARNING] Multi-part messages will not work. Configure credentials in .env file.")
+    log.warning("Twilio credentials not configured properly!")
+    log.warning("TWILIO_ACCOUNT_SID: %s", 'Not set' if TWILIO_ACCOUNT_SID == 'your_account_sid' else 'Set')
+    log.warning("TWILIO_AUTH_TOKEN: %s", 'Not set' if TWILIO_AUTH_TOKEN == 'your_auth_token' else 'Set')
+    log.warning("Multi-part messages will not work. Configure credentials in .env file.")
 else:
-    print(f"[INFO] Twilio credentials loaded successfully")
+    log.info("Twilio credentials loaded successfully")
 
-# Initialize Twilio client (will fail gracefully if credentials are invalid)
-try:
-    client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-    print(f"[INFO] Twilio client initialized")
-except Exception as e:
-    print(f"[ERROR] Failed to initialize Twilio client: {e}")
-    client = None
+# Outbound messages sent outside the webhook response (extra parts, follow-ups)
+# go through one dispatcher: worker pool, pooled HTTP session, per-sender rate
+# limit, retries, in-order delivery per recipient. None if not configured.
+OUTBOUND_WORKERS = int(os.getenv('OUTBOUND_WORKERS', '4'))
+outbound = None
+if TWILIO_ACCOUNT_SID != 'your_account_sid' and TWILIO_AUTH_TOKEN != 'your_auth_token':
+    try:
+        outbound = OutboundDispatcher(
+            TwilioRestSender(
+                TWILIO_ACCOUNT_SID,
+                TWILIO_AUTH_TOKEN,
+                api_base=os.getenv('TWILIO_API_BASE', 'https://api.twilio.com'),
+                pool_size=OUTBOUND_WORKERS
+            ),
+            default_from=TWILIO_WHATSAPP_NUMBER,
+            workers=OUTBOUND_WORKERS,
+            rate_per_second=float(os.getenv('OUTBOUND_RATE_PER_SECOND', '10')),
+            burst=int(os.getenv('OUTBOUND_BURST', '10')),
+            max_retries=int(os.getenv('OUTBOUND_MAX_RETRIES', '3'))
+        )
+        log.info("Outbound dispatcher initialized (%s workers)", OUTBOUND_WORKERS)
+    except Exception as e:
+        log.error("Failed to initialize outbound dispatcher: %s", e)
+        outbound = None
+
+# AI Sentiment Model: loaded once through the model registry (background preload
+# at startup, see MODEL_PRELOAD); the first prediction waits for it if needed
+# SENTIMENT_BACKEND: auto (optimized artifact if exported, see export_optimized_models.py) | fp32 | onnx-int8 | torch-int8
+model_registry.register(
+    'sentiment',
+    lambda: SentimentPredictor(
+        "Models/bert-sentiment-saori",
+        backend=os.getenv('SENTIMENT_BACKEND', 'auto')
+    ),
+    pinned=True
+)
+sentiment_predictor = model_registry.handle('sentiment')
 
-# Load AI Sentiment Model
-print("[INFO] Loading BERT sentiment model...")
-sentiment_predictor = SentimentPredictor("Models/bert-sentiment-saori")
-print("[INFO] Model loaded successfully!")
+# Micro-batching: concurrent webhook requests share one BERT forward pass
+SENTIMENT_BATCH_MAX_SIZE = int(os.getenv('SENTIMENT_BATCH_MAX_SIZE', '16'))
+SENTIMENT_BATCH_WAIT_MS = float(os.getenv('SENTIMENT_BATCH_WAIT_MS', '5'))
+sentiment_batcher = MicroBatcher(
+    sentiment_predictor,
+    max_batch_size=SENTIMENT_BATCH_MAX_SIZE,
+    max_wait_ms=SENTIMENT_BATCH_WAIT_MS,
+    metrics=metrics_registry,
+    model_name='sentiment'
+)
 
-# Session storage (in production, use Redis or database)
-sessions = {}
+# Session storage (in-memory working set; persisted through the session store)
+# Sessions are loaded lazily on first access and evicted when idle (LRU + TTL)
+SESSION_CACHE_MAX_SIZE = int(os.getenv('SESSION_CACHE_MAX_SIZE', '1000'))
+SESSION_IDLE_TTL = float(os.getenv('SESSION_IDLE_TTL', '1800'))
+sessions = SessionCache(max_size=SESSION_CACHE_MAX_SIZE, ttl_seconds=SESSION_IDLE_TTL)
+
+# Persistent session store: memory | json | journal | sqlite
+# Writes are coalesced and flushed in background (request path only mutates memory)
+SESSION_STORE_BACKEND = os.getenv('SESSION_STORE', 'json')
+SESSION_FLUSH_INTERVAL = float(os.getenv('SESSION_FLUSH_INTERVAL', '1.0'))
+
+# Shared mode (several gunicorn workers): one SQLite file, per-phone leases and
+# optimistic versioning; sessions are re-read and committed once per request
+SESSION_SHARED = os.getenv('SESSION_SHARED', '').lower() in ('1', 'true', 'yes')
+if SESSION_SHARED:
+    SESSION_STORE_BACKEND = 'sqlite (shared)'
+    session_store = SQLiteSessionStore(
+        os.getenv('SESSION_SHARED_DB', str(project_root / "Logs" / "whatsapp_sessions" / "sessions.db"))
+    )
+    shared_sessions = SharedSessionCoordinator(
+        session_store,
+        sessions,
+        lease_seconds=float(os.getenv('SESSION_LEASE_SECONDS', '30')),
+        acquire_timeout=float(os.getenv('SESSION_LOCK_TIMEOUT', '10'))
+    )
+else:
+    session_store = create_session_store(SESSION_STORE_BACKEND, project_root / "Logs" / "whatsapp_sessions")
+    shared_sessions = None
+session_writer = WriteBehindWriter(session_store, flush_interval=SESSION_FLUSH_INTERVAL)
+log.info("Session store: %s (flush every %ss)", SESSION_STORE_BACKEND, SESSION_FLUSH_INTERVAL)
+
+# Per-conversation FIFO serialization (same phone -> in order, others in parallel)
+conversation_locks = ConversationLocks()
 
 # Cache para análisis de emociones (evitar recalcular respuestas similares)
-_emotion_cache = {}
-_emotion_cache_max_size = 100  # Máximo 100 entradas en cache
+emotion_cache = InferenceCache(
+    'sentiment',
+    max_size=int(os.getenv('EMOTION_CACHE_SIZE', '1000')),
+    ttl_seconds=float(os.getenv('EMOTION_CACHE_TTL', '0')),
+    persist_path=inference_cache_path('sentiment')
+)
 
 # Enhanced logging function for multi-user support
 def log_user_action(phone_number, action, message="", session=None, level="INFO"):
@@ -853,36 +974,26 @@ def log_user_action(phone_number, action, message="", session=None, level="INFO"
         session: Optional session object to extract user name and stage
         level: Log level (INFO, DEBUG, ERROR, WARNING)
     """
-    # Get user identifier
-    user_id = phone_number.replace('whatsapp:', '')  # Clean phone number
-    
-    # Try to get user name from session
-    user_name = ""
-    if session and 'data' in session and 'name' in session['data']:
-        user_name = session['data']['name']
-    
-    # Format user identifier
-    if user_name:
-        user_identifier = f"{user_id} | {user_name}"
-    else:
-        user_identifier = user_id
-    
-    # Get stage info if available
-    stage_info = ""
-    if session and 'stage' in session:
-        stage_name = STAGES.get(session['stage'], 'unknown')
-        stage_info = f" [STAGE: {stage_name}]"
+    levelno = logging.getLevelName(level) if isinstance(level, str) else level
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    if not log.isEnabledFor(levelno):
+        return
     
-    # Format log message
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    log_message = f"[{timestamp}] [{level}] [USER: {user_identifier}]{stage_info} {action}"
+    # Phone, name and stage travel as fields (JSON output hashes the phone, drops the name)
+    extra = {'phone': phone_number}
+    if session:
+        if session.get('data', {}).get('name'):
+            extra['user_name'] = session['data']['name']
+        if 'stage' in session:
+            extra['stage'] = stage_label(session)
     
     if message:
         # Limit message length and clean for logging
         msg_preview = message[:100].replace('\n', ' ').replace('\r', ' ')
-        log_message += f": {msg_preview}"
-    
-    print(log_message)
+        log.log(levelno, "%s: %s", action, msg_preview, extra=extra)
+    else:
+        log.log(levelno, "%s", action, extra=extra)
 
 # Conversation stages
 STAGES = {
@@ -962,19 +1073,20 @@ def get_progress_info(stage):
 def get_session(phone_number):
     """Get or create session for phone number"""
     if phone_number not in sessions:
-        # Try to load from file first
-        session_file = project_root / "Logs" / "whatsapp_sessions" / f"session_{phone_number.replace(':', '_')}.json"
-        if session_file.exists():
-            try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    loaded_session = json.load(f)
-                    sessions[phone_number] = loaded_session
-                    print(f"[INFO] Loaded existing session for {phone_number} from file (stage: {loaded_session.get('stage', 0)})")
-                    return sessions[phone_number]
-            except Exception as e:
-                print(f"[WARNING] Failed to load session from {session_file}: {e}")
+        # Try to load from store first (a pending, not yet flushed write wins)
+        try:
+            if shared_sessions:
+                loaded_session = shared_sessions.pending(phone_number) or shared_sessions.load(phone_number)
+            else:
+                loaded_session = session_writer.pending(phone_number) or session_store.load(phone_number)
+            if loaded_session is not None:
+                sessions[phone_number] = loaded_session
+                log.info("Loaded existing session for %s from store (stage: %s)", phone_number, loaded_session.get('stage', 0))
+                return sessions[phone_number]
+        except Exception as e:
+            log.warning("Failed to load session for %s: %s", phone_number, e)
         
-        # Create new session if file doesn't exist or loading failed
+        # Create new session if it doesn't exist or loading failed
         sessions[phone_number] = {
             'stage': 0,
             'data': {},
@@ -989,96 +1101,211 @@ def get_session(phone_number):
         }
     return sessions[phone_number]
 
-def save_session(phone_number, session):
-    """Save session data"""
-    sessions[phone_number] = session
+def peek_session(phone_number):
+    """
+    Session for phone number without creating, caching or versioning one
     
-    # Save to file for persistence (use project root)
+    Returns:
+        dict or None: The in-memory session, else the pending or stored one
+    """
+    session = sessions.get(phone_number)
+    if session is not None:
+        return session
     try:
-        log_dir = project_root / "Logs" / "whatsapp_sessions"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        filename = log_dir / f"session_{phone_number.replace(':', '_')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session, f, indent=2, ensure_ascii=False)
-        
-        print(f"[INFO] Session saved for {phone_number} (stage: {session.get('stage', 0)})")
+        if shared_sessions:
+            return shared_sessions.pending(phone_number) or shared_sessions.store.load(phone_number)
+        return session_writer.pending(phone_number) or session_store.load(phone_number)
     except Exception as e:
-        print(f"[ERROR] Failed to save session for {phone_number}: {e}")
-        # ⚠️ CRITICAL: Session in memory but not persisted
-        # Session will be lost if bot restarts
+        log.warning("Failed to peek session for %s: %s", phone_number, e)
+        return None
 
-def load_all_sessions():
-    """Load all sessions from JSON files at startup"""
-    log_dir = project_root / "Logs" / "whatsapp_sessions"
-    if not log_dir.exists():
-        print("[INFO] No sessions directory found, starting with empty sessions")
-        return
+def save_session(phone_number, session):
+    """
+    Save session data (persisted asynchronously by the write-behind flusher)
     
+    Must run inside conversation_scope(phone_number): the write-behind
+    snapshot is taken here, while no other message can modify the session.
+    """
+    sessions[phone_number] = session
+    try:
+        if shared_sessions:
+            # Committed with compare-and-set when the conversation scope ends
+            shared_sessions.mark_dirty(phone_number, session)
+        else:
+            session_writer.mark_dirty(phone_number, session)
+    except (TypeError, ValueError) as e:
+        log.error("Failed to save session for %s: %s", phone_number, e)
+        return
+    log.debug("Session saved for %s (stage: %s)", phone_number, session.get('stage', 0))
+
+def load_all_sessions():
+    """Load all sessions from the session store (optional warm-up, see SESSION_PRELOAD)"""
     loaded_count = 0
     failed_count = 0
     
-    for file_path in log_dir.glob("session_*.json"):
+    for phone_number in session_store.keys():
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
-                # Extract phone number from filename
-                # Format: session_whatsapp_+18099121128.json -> whatsapp:+18099121128
-                phone_number = file_path.stem.replace('session_whatsapp_', 'whatsapp:').replace('_', ':')
-                sessions[phone_number] = session_data
-                loaded_count += 1
-                stage = session_data.get('stage', 0)
-                print(f"[INFO] Loaded session for {phone_number} (stage: {stage})")
+            session_data = session_store.load(phone_number)
+            if session_data is None:
+                continue
+            sessions[phone_number] = session_data
+            loaded_count += 1
+            stage = session_data.get('stage', 0)
+            log.info("Loaded session for %s (stage: %s)", phone_number, stage)
         except json.JSONDecodeError as e:
-            print(f"[ERROR] Invalid JSON in {file_path}: {e}")
+            log.error("Invalid JSON for session %s: %s", phone_number, e)
             failed_count += 1
         except Exception as e:
-            print(f"[ERROR] Failed to load session from {file_path}: {e}")
+            log.error("Failed to load session %s: %s", phone_number, e)
             failed_count += 1
     
-    print(f"[INFO] Loaded {loaded_count} sessions from files" + (f", {failed_count} failed" if failed_count > 0 else ""))
+    log.info("Loaded %s sessions from store%s", loaded_count, f", {failed_count} failed" if failed_count > 0 else "")
 
 def analyze_emotion(text):
     """Analyze emotion using AI model with caching for performance"""
-    global _emotion_cache
-    
     # Normalizar texto para cache (lowercase, strip)
     text_normalized = text.lower().strip()[:200]  # Limitar longitud para cache
     
-    # Verificar cache primero
-    if text_normalized in _emotion_cache:
-        cached_result = _emotion_cache[text_normalized]
-        # Actualizar posición en cache (LRU simple)
-        del _emotion_cache[text_normalized]
-        _emotion_cache[text_normalized] = cached_result
+    # Verificar cache primero (LRU, thread-safe)
+    cached_result = emotion_cache.get(text_normalized)
+    if cached_result is not None:
         return cached_result
     
     # No está en cache, calcular
     try:
-        result = sentiment_predictor.predict(text)
+        result = sentiment_batcher.predict(text)
         emotion_result = {
             'emotion': result['emotion'],
             'confidence': result['confidence'],
             'emoji': EMOTION_EMOJIS.get(result['emotion'], '😐')
         }
         
-        # Guardar en cache (con límite de tamaño)
-        if len(_emotion_cache) >= _emotion_cache_max_size:
-            # Eliminar entrada más antigua (FIFO simple)
-            oldest_key = next(iter(_emotion_cache))
-            del _emotion_cache[oldest_key]
-        
-        _emotion_cache[text_normalized] = emotion_result
+        # Guardar en cache (con límite de tamaño; errores no se cachean)
+        emotion_cache.set(text_normalized, emotion_result)
         return emotion_result
         
     except Exception as e:
-        print(f"[ERROR] Sentiment prediction failed: {e}")
+        log.error("Sentiment prediction failed: %s", e)
         return {
             'emotion': 'neutral',
             'confidence': 0.5,
             'emoji': '😐'
         }
 
+# Embeddings computed incrementally as answers arrive (stages 7-13), so the
+# final inconsistency detection only does matrix math
+_embedding_warmup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-warmup")
+
+def warm_answer_embeddings(session, answer):
+    """Schedule background encoding of a candidate answer for the final detection"""
+    try:
+        _embedding_warmup_executor.submit(
+            detector_module.warm_answer_embeddings,
+            answer,
+            session.get('language', 'es')
+        )
+    except Exception as e:
+        log.warning("Could not schedule embedding warm-up: %s", e)
+
+# Inconsistency detection (stage 13) runs on a bounded worker pool. Stage 13
+# waits DETECTION_TIMEOUT seconds; a result that arrives later is written into
+# the session and sent to the candidate as a follow-up message
+DETECTION_WORKERS = int(os.getenv('DETECTION_WORKERS', '2'))
+DETECTION_MAX_PENDING = int(os.getenv('DETECTION_MAX_PENDING', '8'))
+DETECTION_TIMEOUT = float(os.getenv('DETECTION_TIMEOUT', '2.0'))
+detection_pool = DetectionPool(max_workers=DETECTION_WORKERS, max_pending=DETECTION_MAX_PENDING)
+detection_fallbacks = metrics_registry.counter(
+    'detection_fallbacks_total', 'Stage 13 replies sent without the detection result', ('reason',)
+)
+
+def run_inconsistency_detection(session_snapshot, lang, cancel_event=None):
+    """
+    Detection job: inconsistencies, trust score and report for one interview
+
+    Args:
+        session_snapshot: Deep copy of the session (the live one keeps changing)
+        lang: Report language
+        cancel_event: threading.Event checked between detector sections
+
+    Returns:
+        tuple: (inconsistencies, trust_score, inconsistency_report)
+    """
+    inconsistencies = detector_module.detect_whatsapp_inconsistencies(
+        session_snapshot, language=lang, use_bert=True, cancel_event=cancel_event
+    )
+    trust_score = detector_module.calculate_trust_score(inconsistencies)
+    inconsistency_report = detector_module.generate_inconsistency_report(inconsistencies, language=lang)
+    return inconsistencies, trust_score, inconsistency_report
+
+def cancel_detection(phone_number, session=None):
+    """Cancel pending detection for a conversation that is being restarted"""
+    detection_pool.cancel(phone_number)
+    if session is not None:
+        session.pop('detection_token', None)
+
+def deliver_late_detection(phone_number, token, lang, result, job=None):
+    """
+    Store a detection result that finished after stage 13 stopped waiting
+
+    Runs in the detection worker thread, under the conversation lock so it
+    does not interleave with the candidate's own messages.
+    """
+    inconsistencies, trust_score, inconsistency_report = result
+    with conversation_scope(phone_number):
+        session = get_session(phone_number)
+        if (job is not None and job.cancelled) or session.get('detection_token') != token:
+            # Interview restarted meanwhile: result belongs to an old session
+            log.info("Discarding late detection for %s (session restarted)", phone_number)
+            return
+        session.pop('detection_token', None)
+        session['inconsistencies'] = {
+            'issues': inconsistencies,
+            'trust_score': trust_score,
+            'report': inconsistency_report,
+            'delivered_late': True
+        }
+        level = None
+        final_results = session.get('final_results')
+        if final_results is not None:
+            # Penalties, level and decision were computed with the fallback trust score
+            level = rescore_final_results(final_results, trust_score, len(inconsistencies)).get('inferred_level')
+        save_session(phone_number, session)
+    log.info("Late detection stored for %s (Trust Score: %s)", phone_number, trust_score)
+
+    if outbound is None:
+        return
+    if lang == 'en':
+        body = (
+            f"🔍 *Reliability analysis updated*\n\n"
+            f"Trust Score: {trust_score}/100\n"
+            + (f"📊 Inferred level: {level}\n" if level else "")
+            + f"{inconsistency_report}"
+        )
+    else:
+        body = (
+            f"🔍 *Análisis de confiabilidad actualizado*\n\n"
+            f"Trust Score: {trust_score}/100\n"
+            + (f"📊 Nivel inferido: {level}\n" if level else "")
+            + f"{inconsistency_report}"
+        )
+    outbound.send(phone_number, body)
+
+def finish_stage(phone_number, session, response_text):
+    """Common end of a stage: persist the session and return the reply"""
+    # Save session
+    save_session(phone_number, session)
+    
+    log.debug("Returning response_text, length: %s", len(response_text))
+    log.debug("First 100 chars: %s", response_text[:100] if response_text else 'EMPTY')
+    
+    return response_text
+
+# Interview stages: one handler per session['stage'] value, dispatched by dict
+# lookup and timed per stage (stage_latency_seconds). Unknown stages just save.
+stage_machine = StageMachine(
+    fallback=lambda phone_number, message_text, session: finish_stage(phone_number, session, "")
+)
+
 def process_message(phone_number, message_text):
     """Process incoming message and generate response"""
     session = get_session(phone_number)
@@ -1107,90 +1334,157 @@ def process_message(phone_number, message_text):
             'confidence': emotion_data['confidence']
         })
     
-    # Generate response based on stage
+    # Generate response based on stage (table-driven, see stage handlers below)
+    log.debug("About to check stage, stage == %s", stage)
+    return stage_machine.dispatch(stage, phone_number, message_text, session)
+
+@stage_machine.stage(0, 'welcome', transitions=(0.6, 3))
+def handle_welcome_stage(phone_number, message_text, session):
+    """Stage 0: Welcome + Privacy Notice"""
     response_text = ""
     
-    print(f"[DEBUG] About to check stage, stage == {stage}")
+    log.debug("Entering welcome stage response")
+    
+    # Get language from session (should be set in stage -1 or from demo mode)
+    if session.get('language_locked', False):
+        detected_lang = session['language']
+        log.info("Language LOCKED: %s", detected_lang)
+    else:
+        # If language not locked, detect from message (fallback for non-join-code flows)
+        detected_lang = detect_language(message_text)
+        session['language'] = detected_lang
+        log.info("Language detected: %s", detected_lang)
     
-    # Stage -1 is handled below after stage 0.6 to avoid conflicts
+    # Check if this is a demo profile with pre-loaded data
+    profile_name = session.get('profile_name', '')
+    referrer = session.get('referrer', '')
     
-    if stage == 0:  # Welcome + Privacy Notice
-        print(f"[DEBUG] Entering welcome stage response")
-        
-        # Get language from session (should be set in stage -1 or from demo mode)
-        if session.get('language_locked', False):
-            detected_lang = session['language']
-            print(f"[INFO] Language LOCKED: {detected_lang}")
+    if detected_lang == 'en':
+        # Personalized welcome if profile data available
+        if profile_name and referrer:
+            greeting = f"🌸 Hi *{profile_name}*!\n\n"
+            referral_line = f"*{referrer}* told me about you! "
         else:
-            # If language not locked, detect from message (fallback for non-join-code flows)
-            detected_lang = detect_language(message_text)
-            session['language'] = detected_lang
-            print(f"[INFO] Language detected: {detected_lang}")
+            greeting = "🌸 *Hello!*\n\n"
+            referral_line = ""
         
-        # Check if this is a demo profile with pre-loaded data
-        profile_name = session.get('profile_name', '')
-        referrer = session.get('referrer', '')
+        response_text = (
+            f"{greeting}"
+            f"I'm *Saori 🌸* — an AI-powered recruitment assistant.\n\n"
+            f"{referral_line}I'll guide you through a short evaluation designed to understand your *skills* and *how you feel today*.\n\n"
+            f"Let's make this process *simple, respectful, and human*. ✨\n\n"
+            f"In the next *10 minutes*, I'll ask about:\n\n"
+            "✅ Your technical superpowers  \n"
+            "✅ Your English fluency  \n"
+            "✅ How you work with teams  \n"
+            "✅ Your emotional state (yes, I can sense that! 😊)\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "🔐 *Quick Privacy Note*\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Before we start, I need your permission to process:\n"
+            "• Your name & responses\n"
+            "• Your salary expectations\n\n"
+            "📁 Everything stays confidential — used *only* for your recruitment process, *never* shared.\n\n"
+            "*Ready to begin this journey together?* ✨"
+        )
+    else:
+        # Personalized welcome if profile data available (Spanish)
+        if profile_name and referrer:
+            greeting = f"🌸 ¡Hola *{profile_name}*!\n\n"
+            referral_line = f"*{referrer}* me habló de ti! "
+        else:
+            greeting = "🌸 *¡Hola!*\n\n"
+            referral_line = ""
         
-        if detected_lang == 'en':
-            # Personalized welcome if profile data available
-            if profile_name and referrer:
-                greeting = f"🌸 Hi *{profile_name}*!\n\n"
-                referral_line = f"*{referrer}* told me about you! "
-            else:
-                greeting = "🌸 *Hello!*\n\n"
-                referral_line = ""
-            
+        response_text = (
+            f"{greeting}"
+            f"Soy *Saori 🌸* — tu asistente de reclutamiento con IA.\n\n"
+            f"{referral_line}Te guiaré en una breve evaluación diseñada para entender tus *habilidades* y *cómo te sientes hoy*.\n\n"
+            f"Hagamos este proceso *simple, respetuoso y humano*. ✨\n\n"
+            f"En los próximos *10 minutos*, te preguntaré sobre:\n\n"
+            "✅ Tus superpoderes técnicos  \n"
+            "✅ Tu fluidez en inglés  \n"
+            "✅ Cómo trabajas en equipo  \n"
+            "✅ Tu estado emocional (¡sí, puedo percibirlo! 😊)\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "🔐 *Nota Rápida de Privacidad*\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Antes de empezar, necesito tu permiso para procesar:\n"
+            "• Tu nombre y respuestas\n"
+            "• Tus expectativas salariales\n\n"
+            "📁 Todo es confidencial — usado *solo* para tu proceso de reclutamiento, *nunca* compartido.\n\n"
+            "*¿Lista/o para comenzar este viaje juntos?* ✨"
+        )
+    
+    # Auto-accept privacy and skip directly to DEMO/Free Mode selection
+    session['data']['privacy_accepted'] = True
+    lang = session.get('language', 'es')
+    
+    # Check if we're in demo mode - if so, continue directly with interview
+    if session.get('demo_mode') == 'full_interview':
+        # In demo mode, profile data (name, position) is already loaded
+        # Skip directly to availability stage since name and position are pre-configured
+        session['stage'] = 3
+        if lang == 'en':
             response_text = (
-                f"{greeting}"
-                f"I'm *Saori 🌸* — an AI-powered recruitment assistant.\n\n"
-                f"{referral_line}I'll guide you through a short evaluation designed to understand your *skills* and *how you feel today*.\n\n"
-                f"Let's make this process *simple, respectful, and human*. ✨\n\n"
-                f"In the next *10 minutes*, I'll ask about:\n\n"
-                "✅ Your technical superpowers  \n"
-                "✅ Your English fluency  \n"
-                "✅ How you work with teams  \n"
-                "✅ Your emotional state (yes, I can sense that! 😊)\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "🔐 *Quick Privacy Note*\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Before we start, I need your permission to process:\n"
-                "• Your name & responses\n"
-                "• Your salary expectations\n\n"
-                "📁 Everything stays confidential — used *only* for your recruitment process, *never* shared.\n\n"
-                "*Ready to begin this journey together?* ✨"
+                "✨ *Great! Thank you for trusting me.* 🌸\n\n"
+                "📅 *What's your availability?*\n"
+                "(Example: Immediate, 15 days, 1 month, 2 months)"
             )
         else:
-            # Personalized welcome if profile data available (Spanish)
-            if profile_name and referrer:
-                greeting = f"🌸 ¡Hola *{profile_name}*!\n\n"
-                referral_line = f"*{referrer}* me habló de ti! "
-            else:
-                greeting = "🌸 *¡Hola!*\n\n"
-                referral_line = ""
-            
             response_text = (
-                f"{greeting}"
-                f"Soy *Saori 🌸* — tu asistente de reclutamiento con IA.\n\n"
-                f"{referral_line}Te guiaré en una breve evaluación diseñada para entender tus *habilidades* y *cómo te sientes hoy*.\n\n"
-                f"Hagamos este proceso *simple, respetuoso y humano*. ✨\n\n"
-                f"En los próximos *10 minutos*, te preguntaré sobre:\n\n"
-                "✅ Tus superpoderes técnicos  \n"
-                "✅ Tu fluidez en inglés  \n"
-                "✅ Cómo trabajas en equipo  \n"
-                "✅ Tu estado emocional (¡sí, puedo percibirlo! 😊)\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "🔐 *Nota Rápida de Privacidad*\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Antes de empezar, necesito tu permiso para procesar:\n"
-                "• Tu nombre y respuestas\n"
-                "• Tus expectativas salariales\n\n"
-                "📁 Todo es confidencial — usado *solo* para tu proceso de reclutamiento, *nunca* compartido.\n\n"
-                "*¿Lista/o para comenzar este viaje juntos?* ✨"
+                "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
+                "📅 *¿Cuál es tu disponibilidad?*\n"
+                "(Ejemplo: Inmediata, 15 días, 1 mes, 2 meses)"
             )
-        
-        # Auto-accept privacy and skip directly to DEMO/Free Mode selection
+        save_session(phone_number, session)
+        return response_text
+    else:
+        # Not in demo mode, ask if user wants DEMO or free mode
+        if lang == 'en':
+            response_text = (
+                "✨ *Great! Thank you for trusting me.* 🌸\n\n"
+                "Now, how would you like to proceed?\n\n"
+                "1️⃣ *DEMO Mode* 🎬\n"
+                "   Test with sample profiles (Ana or Luis)\n\n"
+                "2️⃣ *Free Mode* 🆓\n"
+                "   Start your own interview\n\n"
+                "Which option? Reply *1* or *2* 😊\n\n"
+                "💡 *Tip:* Type *RESTART* anytime to start over."
+            )
+        else:
+            response_text = (
+                "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
+                "Ahora, ¿cómo te gustaría proceder?\n\n"
+                "1️⃣ *Modo DEMO* 🎬\n"
+                "   Probar con perfiles de ejemplo (Ana o Luis)\n\n"
+                "2️⃣ *Modo Libre* 🆓\n"
+                "   Iniciar tu propia entrevista\n\n"
+                "¿Qué opción? Responde *1* o *2* 😊\n\n"
+                "💡 *Tip:* Puedes escribir *REINICIAR* en cualquier momento para empezar de nuevo."
+            )
+        session['stage'] = 0.6  # New stage: DEMO or Free mode selection
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(0.5, 'privacy_authorization', transitions=(0.6, 3, 15))
+def handle_privacy_authorization_stage(phone_number, message_text, session):
+    """Stage 0.5: Privacy Authorization (for DEMO mode)"""
+    response_text = ""
+    
+    # Check if user accepts
+    user_response = message_text.strip().upper()
+    lang = session.get('language', 'es')
+    
+    # Debug log
+    log.debug("Stage 0.5 - User response: '%s', Original: '%s'", user_response, message_text)
+    log.debug("Demo mode: %s", session.get('demo_mode'))
+    
+    # Check for acceptance (more comprehensive list)
+    accepted_responses = ['SÍ', 'SI', 'SÍ', 'YES', 'Y', 'ACEPTO', 'OK', 'OKAY', 'ACCEPT', 'AGREE']
+    if user_response in accepted_responses:
         session['data']['privacy_accepted'] = True
-        lang = session.get('language', 'es')
+        log.debug("Privacy accepted: YES")
         
         # Check if we're in demo mode - if so, continue directly with interview
         if session.get('demo_mode') == 'full_interview':
@@ -1216,2674 +1510,2767 @@ def process_message(phone_number, message_text):
             if lang == 'en':
                 response_text = (
                     "✨ *Great! Thank you for trusting me.* 🌸\n\n"
-                    "Now, how would you like to proceed?\n\n"
-                    "1️⃣ *DEMO Mode* 🎬\n"
-                    "   Test with sample profiles (Ana or Luis)\n\n"
-                    "2️⃣ *Free Mode* 🆓\n"
-                    "   Start your own interview\n\n"
-                    "Which option? Reply *1* or *2* 😊\n\n"
-                    "💡 *Tip:* Type *RESTART* anytime to start over."
-                )
-            else:
-                response_text = (
-                    "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
-                    "Ahora, ¿cómo te gustaría proceder?\n\n"
-                    "1️⃣ *Modo DEMO* 🎬\n"
-                    "   Probar con perfiles de ejemplo (Ana o Luis)\n\n"
-                    "2️⃣ *Modo Libre* 🆓\n"
-                    "   Iniciar tu propia entrevista\n\n"
-                    "¿Qué opción? Responde *1* o *2* 😊\n\n"
-                    "💡 *Tip:* Puedes escribir *REINICIAR* en cualquier momento para empezar de nuevo."
-                )
-            session['stage'] = 0.6  # New stage: DEMO or Free mode selection
-    
-    elif stage == 0.5:  # Privacy Authorization (for DEMO mode)
-        # Check if user accepts
-        user_response = message_text.strip().upper()
-        lang = session.get('language', 'es')
-        
-        # Debug log
-        print(f"[DEBUG] Stage 0.5 - User response: '{user_response}', Original: '{message_text}'")
-        print(f"[DEBUG] Demo mode: {session.get('demo_mode')}")
-        
-        # Check for acceptance (more comprehensive list)
-        accepted_responses = ['SÍ', 'SI', 'SÍ', 'YES', 'Y', 'ACEPTO', 'OK', 'OKAY', 'ACCEPT', 'AGREE']
-        if user_response in accepted_responses:
-            session['data']['privacy_accepted'] = True
-            print(f"[DEBUG] Privacy accepted: YES")
-            
-            # Check if we're in demo mode - if so, continue directly with interview
-            if session.get('demo_mode') == 'full_interview':
-                # In demo mode, profile data (name, position) is already loaded
-                # Skip directly to availability stage since name and position are pre-configured
-                session['stage'] = 3
-                if lang == 'en':
-                    response_text = (
-                        "✨ *Great! Thank you for trusting me.* 🌸\n\n"
-                        "📅 *What's your availability?*\n"
-                        "(Example: Immediate, 15 days, 1 month, 2 months)"
-                    )
-                else:
-                    response_text = (
-                        "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
-                        "📅 *¿Cuál es tu disponibilidad?*\n"
-                        "(Ejemplo: Inmediata, 15 días, 1 mes, 2 meses)"
-                    )
-                save_session(phone_number, session)
-                return response_text
-            else:
-                # Not in demo mode, ask if user wants DEMO or free mode
-                if lang == 'en':
-                    response_text = (
-                        "✨ *Great! Thank you for trusting me.* 🌸\n\n"
-                        "🎬 *RECOMMENDED FOR JUDGES:*\n"
-                        "Send *DEMO* to test with pre-configured profiles (Ana or Luis)\n\n"
-                        "Or choose a mode:\n"
-                        "1️⃣ *DEMO Mode* 🎬 - Test with sample profiles (Ana/Luis)\n"
-                        "   → You'll see suggested answers with *ANSWERS*\n"
-                        "   → Perfect for demonstration\n"
-                        "   → Estimated time: 5-7 minutes\n\n"
-                        "2️⃣ *Free Mode* 🆓 - Start your own interview\n"
-                        "   → You'll answer all questions yourself\n"
-                        "   → Estimated time: 10-15 minutes\n\n"
-                        "💡 *Tip for judges:* Use *DEMO* to see the system in action quickly\n\n"
-                        "━━━━━━━━━━━━━━━━━━\n"
-                        "💡 *Quick commands:*\n"
-                        "• *HELP* - Help | *RESTART* - Restart\n"
-                        "━━━━━━━━━━━━━━━━━━\n\n"
-                        "Reply *DEMO*, *1* or *2* 😊"
-                    )
-                else:
-                    response_text = (
-                        "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
-                        "🎬 *RECOMENDADO PARA JUECES:*\n"
-                        "Envía *DEMO* para probar con perfiles pre-configurados (Ana o Luis)\n\n"
-                        "O elige un modo:\n"
-                        "1️⃣ *Modo DEMO* 🎬 - Probar con perfiles de ejemplo (Ana/Luis)\n"
-                        "   → Verás respuestas sugeridas con *RESPUESTAS*\n"
-                        "   → Perfecto para demostración\n"
-                        "   → Tiempo estimado: 5-7 minutos\n\n"
-                        "2️⃣ *Modo Libre* 🆓 - Iniciar tu propia entrevista\n"
-                        "   → Responderás todas las preguntas tú mismo\n"
-                        "   → Tiempo estimado: 10-15 minutos\n\n"
-                        "💡 *Tip para jueces:* Usa *DEMO* para ver el sistema en acción rápidamente\n\n"
-                        "━━━━━━━━━━━━━━━━━━\n"
-                        "💡 *Comandos rápidos:*\n"
-                        "• *AYUDA* - Ayuda | *REINICIAR* - Reiniciar\n"
-                        "━━━━━━━━━━━━━━━━━━\n\n"
-                        "Responde *DEMO*, *1* o *2* 😊"
-                    )
-                session['stage'] = 0.6  # New stage: DEMO or Free mode selection
-                save_session(phone_number, session)
-                return response_text
-        else:
-            # User declined or invalid response
-            print(f"[DEBUG] Privacy NOT accepted or invalid response: '{user_response}'")
-            session['data']['privacy_accepted'] = False
-            
-            if lang == 'en':
-                response_text = (
-                    "💙 *I totally understand.*\n\n"
-                    "Your privacy is important, and I respect your decision.\n\n"
-                    "If you change your mind later, just send *RESTART* and we can start fresh. 🌸\n\n"
-                    "Have questions? I'm here: hello@saoriai.com"
-                )
-            else:
-                response_text = (
-                    "💙 *Te entiendo completamente.*\n\n"
-                    "Tu privacidad es importante, y respeto tu decisión.\n\n"
-                    "Si cambias de opinión más tarde, solo envía *REINICIAR* y podemos empezar de nuevo. 🌸\n\n"
-                    "¿Tienes preguntas? Aquí estoy: hello@saoriai.com"
-                )
-            session['stage'] = 15  # Skip to closing
-            save_session(phone_number, session)
-            return response_text
-    
-    elif stage == 0.6:  # DEMO or Free Mode Selection
-        user_choice = message_text.strip()
-        lang = session.get('language', 'es')
-        
-        if user_choice in ['1', 'DEMO', 'demo', 'Demo']:
-            # User wants DEMO mode - redirect to demo mode handler
-            session['demo_mode'] = 'select_language'
-            session['data'] = {}  # Clear any previous data
-            session['stage'] = 0
-            save_session(phone_number, session)
-            
-            if lang == 'en':
-                response_text = (
-                    "✅ *DEMO Mode activated* 🎬\n\n"
-                    "Perfect for demonstration! 🌸\n\n"
-                    "📋 *What you'll see:*\n"
-                    "• Pre-configured profiles (Ana García or Luis Martínez)\n"
-                    "• Suggested answers available with *ANSWERS*\n"
-                    "• Complete evaluation with expected scores\n"
-                    "• Trust Score and emotional analysis\n\n"
-                    "👤 *Available profiles:*\n"
-                    "• Ana García - Senior Data Engineer (Expected score: 4.87/5.0)\n"
-                    "• Luis Martínez - Junior Backend Developer (Expected score: 2.9/5.0)\n\n"
-                    "💡 *Tip:* At any time during the interview, send *ANSWERS* to see suggested answers.\n\n"
+                    "🎬 *RECOMMENDED FOR JUDGES:*\n"
+                    "Send *DEMO* to test with pre-configured profiles (Ana or Luis)\n\n"
+                    "Or choose a mode:\n"
+                    "1️⃣ *DEMO Mode* 🎬 - Test with sample profiles (Ana/Luis)\n"
+                    "   → You'll see suggested answers with *ANSWERS*\n"
+                    "   → Perfect for demonstration\n"
+                    "   → Estimated time: 5-7 minutes\n\n"
+                    "2️⃣ *Free Mode* 🆓 - Start your own interview\n"
+                    "   → You'll answer all questions yourself\n"
+                    "   → Estimated time: 10-15 minutes\n\n"
+                    "💡 *Tip for judges:* Use *DEMO* to see the system in action quickly\n\n"
                     "━━━━━━━━━━━━━━━━━━\n"
                     "💡 *Quick commands:*\n"
                     "• *HELP* - Help | *RESTART* - Restart\n"
                     "━━━━━━━━━━━━━━━━━━\n\n"
-                    "Now choose your language:\n"
-                    "1️⃣ *English* 🇬🇧\n"
-                    "2️⃣ *Español* 🇪🇸\n\n"
-                    "Which language? Reply *1* or *2* 😊"
+                    "Reply *DEMO*, *1* or *2* 😊"
                 )
             else:
                 response_text = (
-                    "✅ *Modo DEMO activado* 🎬\n\n"
-                    "¡Perfecto para demostración! 🌸\n\n"
-                    "📋 *Lo que verás:*\n"
-                    "• Perfiles pre-configurados (Ana García o Luis Martínez)\n"
-                    "• Respuestas sugeridas disponibles con *RESPUESTAS*\n"
-                    "• Evaluación completa con scores esperados\n"
-                    "• Trust Score y análisis emocional\n\n"
-                    "👤 *Perfiles disponibles:*\n"
-                    "• Ana García - Data Engineer Senior (Score esperado: 4.87/5.0)\n"
-                    "• Luis Martínez - Backend Developer Junior (Score esperado: 2.9/5.0)\n\n"
-                    "💡 *Tip:* En cualquier momento durante la entrevista, envía *RESPUESTAS* para ver respuestas sugeridas.\n\n"
+                    "✨ *¡Genial! Gracias por confiar en mí.* 🌸\n\n"
+                    "🎬 *RECOMENDADO PARA JUECES:*\n"
+                    "Envía *DEMO* para probar con perfiles pre-configurados (Ana o Luis)\n\n"
+                    "O elige un modo:\n"
+                    "1️⃣ *Modo DEMO* 🎬 - Probar con perfiles de ejemplo (Ana/Luis)\n"
+                    "   → Verás respuestas sugeridas con *RESPUESTAS*\n"
+                    "   → Perfecto para demostración\n"
+                    "   → Tiempo estimado: 5-7 minutos\n\n"
+                    "2️⃣ *Modo Libre* 🆓 - Iniciar tu propia entrevista\n"
+                    "   → Responderás todas las preguntas tú mismo\n"
+                    "   → Tiempo estimado: 10-15 minutos\n\n"
+                    "💡 *Tip para jueces:* Usa *DEMO* para ver el sistema en acción rápidamente\n\n"
                     "━━━━━━━━━━━━━━━━━━\n"
                     "💡 *Comandos rápidos:*\n"
                     "• *AYUDA* - Ayuda | *REINICIAR* - Reiniciar\n"
                     "━━━━━━━━━━━━━━━━━━\n\n"
-                    "Ahora elige tu idioma:\n"
-                    "1️⃣ *English* 🇬🇧\n"
-                    "2️⃣ *Español* 🇪🇸\n\n"
-                    "¿Qué idioma? Responde *1* o *2* 😊"
+                    "Responde *DEMO*, *1* o *2* 😊"
                 )
-        elif user_choice in ['2', 'LIBRE', 'libre', 'Libre', 'FREE', 'free', 'Free']:
-            # User wants free mode - first select language for consistency
-            # Remove demo_mode key completely to ensure clean free mode
-            if 'demo_mode' in session:
-                del session['demo_mode']
-            # Set a flag to indicate this is Free Mode language selection
-            session['free_mode_language_selection'] = True
-            session['stage'] = -1  # Go to language selection first (same as DEMO mode)
-            save_session(phone_number, session)  # CRITICAL: Save before returning
-            
-            # Show language selection for Free Mode
+            session['stage'] = 0.6  # New stage: DEMO or Free mode selection
+            save_session(phone_number, session)
+            return response_text
+    else:
+        # User declined or invalid response
+        log.debug("Privacy NOT accepted or invalid response: '%s'", user_response)
+        session['data']['privacy_accepted'] = False
+        
+        if lang == 'en':
             response_text = (
-                "✅ *Free Mode activated* 🆓\n\n"
-                "Perfect! Let's start your interview. 🌸\n\n"
-                "First, choose your language / Primero, elige tu idioma:\n\n"
-                "1️⃣ *English* 🇬🇧\n"
-                "2️⃣ *Español* 🇪🇸\n\n"
-                "Which language? / ¿Qué idioma? Reply *1* or *2* 😊"
+                "💙 *I totally understand.*\n\n"
+                "Your privacy is important, and I respect your decision.\n\n"
+                "If you change your mind later, just send *RESTART* and we can start fresh. 🌸\n\n"
+                "Have questions? I'm here: hello@saoriai.com"
             )
         else:
-            # Invalid choice
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Invalid option.*\n\n"
-                    "Please choose:\n"
-                    "1️⃣ *DEMO Mode* 🎬\n"
-                    "2️⃣ *Free Mode* 🆓\n\n"
-                    "Reply *1* or *2* 😊"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Opción inválida.*\n\n"
-                    "Por favor elige:\n"
-                    "1️⃣ *Modo DEMO* 🎬\n"
-                    "2️⃣ *Modo Libre* 🆓\n\n"
-                    "Responde *1* o *2* 😊"
-                )
-    
-    elif stage == -1:  # Language Selection (for both DEMO and Free Mode)
-        # CRITICAL FIX: If language is already set and locked, skip language selection
-        if session.get('language_locked', False) and session.get('language'):
-            print(f"[DEBUG] Stage -1: Language already set ({session.get('language')}), skipping selection and proceeding")
-            lang = session.get('language')
-            # Check if this is DEMO mode or Free Mode
-            is_demo_mode = session.get('demo_mode') == 'select_language'
-            is_free_mode = session.get('free_mode_language_selection', False)
-            
-            if is_demo_mode:
-                session['stage'] = 0
-                save_session(phone_number, session)
-                # Process with empty message to trigger profile selection
-                return process_message(phone_number, "")
-            elif is_free_mode or not is_demo_mode:
-                session['stage'] = 1
-                if 'demo_mode' in session:
-                    del session['demo_mode']
-                if 'free_mode_language_selection' in session:
-                    del session['free_mode_language_selection']
-                save_session(phone_number, session)
-                # Process with empty message to trigger name question
-                return process_message(phone_number, "")
-        
-        user_choice = message_text.strip()
-        lang = None
-        
-        # Debug: Log current session state
-        print(f"[DEBUG] Stage -1: Processing language selection for {phone_number}")
-        print(f"[DEBUG] Session state: demo_mode={session.get('demo_mode')}, free_mode_flag={session.get('free_mode_language_selection')}, stage={session.get('stage')}, language_locked={session.get('language_locked')}")
-        
-        if user_choice in ['1', 'ENGLISH', 'english', 'English', 'EN', 'en']:
-            lang = 'en'
-        elif user_choice in ['2', 'ESPAÑOL', 'español', 'Español', 'ESPAÑOL', 'ES', 'es']:
-            lang = 'es'
-        else:
-            # Invalid language choice - stay in stage -1
-            print(f"[DEBUG] Invalid language choice: '{user_choice}', staying in stage -1")
             response_text = (
-                "⚠️ *Invalid option.*\n\n"
-                "Please choose:\n"
-                "1️⃣ *English* 🇬🇧\n"
-                "2️⃣ *Español* 🇪🇸\n\n"
-                "Reply *1* or *2* 😊\n\n"
-                "⚠️ *Opción inválida.*\n\n"
-                "Por favor elige:\n"
-                "1️⃣ *English* 🇬🇧\n"
-                "2️⃣ *Español* 🇪🇸\n\n"
-                "Responde *1* o *2* 😊"
+                "💙 *Te entiendo completamente.*\n\n"
+                "Tu privacidad es importante, y respeto tu decisión.\n\n"
+                "Si cambias de opinión más tarde, solo envía *REINICIAR* y podemos empezar de nuevo. 🌸\n\n"
+                "¿Tienes preguntas? Aquí estoy: hello@saoriai.com"
             )
-            return response_text
+        session['stage'] = 15  # Skip to closing
+        save_session(phone_number, session)
+        return response_text
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(0.6, 'mode_selection', transitions=(-1, 0))
+def handle_mode_selection_stage(phone_number, message_text, session):
+    """Stage 0.6: DEMO or Free Mode Selection"""
+    response_text = ""
+    
+    user_choice = message_text.strip()
+    lang = session.get('language', 'es')
+    
+    if user_choice in ['1', 'DEMO', 'demo', 'Demo']:
+        # User wants DEMO mode - redirect to demo mode handler
+        session['demo_mode'] = 'select_language'
+        session['data'] = {}  # Clear any previous data
+        session['stage'] = 0
+        save_session(phone_number, session)
         
-        # Language selected - set it and proceed
-        session['language'] = lang
-        session['language_locked'] = True
+        if lang == 'en':
+            response_text = (
+                "✅ *DEMO Mode activated* 🎬\n\n"
+                "Perfect for demonstration! 🌸\n\n"
+                "📋 *What you'll see:*\n"
+                "• Pre-configured profiles (Ana García or Luis Martínez)\n"
+                "• Suggested answers available with *ANSWERS*\n"
+                "• Complete evaluation with expected scores\n"
+                "• Trust Score and emotional analysis\n\n"
+                "👤 *Available profiles:*\n"
+                "• Ana García - Senior Data Engineer (Expected score: 4.87/5.0)\n"
+                "• Luis Martínez - Junior Backend Developer (Expected score: 2.9/5.0)\n\n"
+                "💡 *Tip:* At any time during the interview, send *ANSWERS* to see suggested answers.\n\n"
+                "━━━━━━━━━━━━━━━━━━\n"
+                "💡 *Quick commands:*\n"
+                "• *HELP* - Help | *RESTART* - Restart\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "Now choose your language:\n"
+                "1️⃣ *English* 🇬🇧\n"
+                "2️⃣ *Español* 🇪🇸\n\n"
+                "Which language? Reply *1* or *2* 😊"
+            )
+        else:
+            response_text = (
+                "✅ *Modo DEMO activado* 🎬\n\n"
+                "¡Perfecto para demostración! 🌸\n\n"
+                "📋 *Lo que verás:*\n"
+                "• Perfiles pre-configurados (Ana García o Luis Martínez)\n"
+                "• Respuestas sugeridas disponibles con *RESPUESTAS*\n"
+                "• Evaluación completa con scores esperados\n"
+                "• Trust Score y análisis emocional\n\n"
+                "👤 *Perfiles disponibles:*\n"
+                "• Ana García - Data Engineer Senior (Score esperado: 4.87/5.0)\n"
+                "• Luis Martínez - Backend Developer Junior (Score esperado: 2.9/5.0)\n\n"
+                "💡 *Tip:* En cualquier momento durante la entrevista, envía *RESPUESTAS* para ver respuestas sugeridas.\n\n"
+                "━━━━━━━━━━━━━━━━━━\n"
+                "💡 *Comandos rápidos:*\n"
+                "• *AYUDA* - Ayuda | *REINICIAR* - Reiniciar\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "Ahora elige tu idioma:\n"
+                "1️⃣ *English* 🇬🇧\n"
+                "2️⃣ *Español* 🇪🇸\n\n"
+                "¿Qué idioma? Responde *1* o *2* 😊"
+            )
+    elif user_choice in ['2', 'LIBRE', 'libre', 'Libre', 'FREE', 'free', 'Free']:
+        # User wants free mode - first select language for consistency
+        # Remove demo_mode key completely to ensure clean free mode
+        if 'demo_mode' in session:
+            del session['demo_mode']
+        # Set a flag to indicate this is Free Mode language selection
+        session['free_mode_language_selection'] = True
+        session['stage'] = -1  # Go to language selection first (same as DEMO mode)
+        save_session(phone_number, session)  # CRITICAL: Save before returning
         
+        # Show language selection for Free Mode
+        response_text = (
+            "✅ *Free Mode activated* 🆓\n\n"
+            "Perfect! Let's start your interview. 🌸\n\n"
+            "First, choose your language / Primero, elige tu idioma:\n\n"
+            "1️⃣ *English* 🇬🇧\n"
+            "2️⃣ *Español* 🇪🇸\n\n"
+            "Which language? / ¿Qué idioma? Reply *1* or *2* 😊"
+        )
+    else:
+        # Invalid choice
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Invalid option.*\n\n"
+                "Please choose:\n"
+                "1️⃣ *DEMO Mode* 🎬\n"
+                "2️⃣ *Free Mode* 🆓\n\n"
+                "Reply *1* or *2* 😊"
+            )
+        else:
+            response_text = (
+                "⚠️ *Opción inválida.*\n\n"
+                "Por favor elige:\n"
+                "1️⃣ *Modo DEMO* 🎬\n"
+                "2️⃣ *Modo Libre* 🆓\n\n"
+                "Responde *1* o *2* 😊"
+            )
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(-1, 'language_selection', transitions=(0, 0.6, 1, 2, 3))
+def handle_language_selection_stage(phone_number, message_text, session):
+    """Stage -1: Language Selection (for both DEMO and Free Mode)"""
+    response_text = ""
+    
+    # CRITICAL FIX: If language is already set and locked, skip language selection
+    if session.get('language_locked', False) and session.get('language'):
+        log.debug("Stage -1: Language already set (%s), skipping selection and proceeding", session.get('language'))
+        lang = session.get('language')
         # Check if this is DEMO mode or Free Mode
-        # IMPORTANT: Check flags BEFORE clearing them
         is_demo_mode = session.get('demo_mode') == 'select_language'
         is_free_mode = session.get('free_mode_language_selection', False)
         
-        # Debug log BEFORE clearing flags
-        print(f"[DEBUG] Stage -1: Language '{lang}' selected. is_demo_mode={is_demo_mode}, is_free_mode={is_free_mode}")
-        
-        # Clear the flag after checking (but save it first for debugging)
-        free_mode_flag_was_set = is_free_mode
-        if 'free_mode_language_selection' in session:
-            del session['free_mode_language_selection']
-        
         if is_demo_mode:
-            # DEMO mode - continue to profile selection
             session['stage'] = 0
             save_session(phone_number, session)
-            
-            if lang == 'en':
-                response_text = (
-                    "✅ *Language selected: English* 🇬🇧\n\n"
-                    "Now choose a profile:\n\n"
-                    "1️⃣ *Ana García*\n"
-                    "   Senior Data Engineer\n"
-                    "   Expected score: 4.87/5.0\n\n"
-                    "2️⃣ *Luis Martínez*\n"
-                    "   Junior Backend Developer\n"
-                    "   Expected score: 2.9/5.0\n\n"
-                    "Which profile? Reply *1* or *2* 😊"
-                )
-            else:
-                response_text = (
-                    "✅ *Idioma seleccionado: Español* 🇪🇸\n\n"
-                    "Ahora elige un perfil:\n\n"
-                    "1️⃣ *Ana García*\n"
-                    "   Data Engineer Senior\n"
-                    "   Score esperado: 4.87/5.0\n\n"
-                    "2️⃣ *Luis Martínez*\n"
-                    "   Backend Developer Junior\n"
-                    "   Score esperado: 2.9/5.0\n\n"
-                    "¿Qué perfil? Responde *1* o *2* 😊"
-                )
+            # Process with empty message to trigger profile selection
+            return process_message(phone_number, "")
         elif is_free_mode or not is_demo_mode:
-            # Free Mode - start interview
-            # Use is_free_mode OR check if demo_mode is not set (fallback for Free Mode)
-            print(f"[DEBUG] Stage -1: Entering Free Mode branch. Setting stage to 1")
             session['stage'] = 1
-            # Ensure demo_mode is cleared
             if 'demo_mode' in session:
                 del session['demo_mode']
-            # CRITICAL: Save session BEFORE generating response to ensure stage is persisted
+            if 'free_mode_language_selection' in session:
+                del session['free_mode_language_selection']
             save_session(phone_number, session)
-            print(f"[DEBUG] Stage -1: Session saved with stage={session.get('stage')}, language={session.get('language')}")
-            
-            if lang == 'en':
-                response_text = (
-                    "✅ *Language selected: English* 🇬🇧\n\n"
-                    "✨ *Welcome to SAORI AI!* 🌸\n\n"
-                    "I'm *Saori* — your AI-powered recruitment assistant.\n\n"
-                    "I'll guide you through a quick evaluation (about 13 minutes) where I'll ask about:\n\n"
-                    "✅ Your technical skills (3 questions)\n"
-                    "✅ Your English level (2 questions)\n"
-                    "✅ Your teamwork experience (1 question)\n"
-                    "✅ Your professional background\n\n"
-                    "Everything is confidential and used only for your recruitment process.\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "👤 *Let's start! What's your full name?*\n\n"
-                    "💡 *Example:* John Smith, María García\n"
-                    "💡 *Tip:* Type *RESTART* anytime to start over."
-                )
-            else:
-                response_text = (
-                    "✅ *Idioma seleccionado: Español* 🇪🇸\n\n"
-                    "✨ *¡Bienvenido a SAORI AI!* 🌸\n\n"
-                    "Soy *Saori* — tu asistente de reclutamiento con IA.\n\n"
-                    "Te guiaré en una evaluación rápida (aproximadamente 13 minutos) donde preguntaré sobre:\n\n"
-                    "✅ Tus habilidades técnicas (3 preguntas)\n"
-                    "✅ Tu nivel de inglés (2 preguntas)\n"
-                    "✅ Tu experiencia en equipo (1 pregunta)\n"
-                    "✅ Tu experiencia profesional\n\n"
-                    "Todo es confidencial y se usa solo para tu proceso de reclutamiento.\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "👤 *¡Empecemos! ¿Cuál es tu nombre completo?*\n\n"
-                    "💡 *Ejemplo:* Juan Pérez, María García\n"
-                    "💡 *Tip:* Escribe *REINICIAR* en cualquier momento para empezar de nuevo."
-                )
+            # Process with empty message to trigger name question
+            return process_message(phone_number, "")
+    
+    user_choice = message_text.strip()
+    lang = None
+    
+    # Debug: Log current session state
+    log.debug("Stage -1: Processing language selection for %s", phone_number)
+    log.debug("Session state: demo_mode=%s, free_mode_flag=%s, stage=%s, language_locked=%s", session.get('demo_mode'), session.get('free_mode_language_selection'), session.get('stage'), session.get('language_locked'))
+    
+    if user_choice in ['1', 'ENGLISH', 'english', 'English', 'EN', 'en']:
+        lang = 'en'
+    elif user_choice in ['2', 'ESPAÑOL', 'español', 'Español', 'ESPAÑOL', 'ES', 'es']:
+        lang = 'es'
+    else:
+        # Invalid language choice - stay in stage -1
+        log.debug("Invalid language choice: '%s', staying in stage -1", user_choice)
+        response_text = (
+            "⚠️ *Invalid option.*\n\n"
+            "Please choose:\n"
+            "1️⃣ *English* 🇬🇧\n"
+            "2️⃣ *Español* 🇪🇸\n\n"
+            "Reply *1* or *2* 😊\n\n"
+            "⚠️ *Opción inválida.*\n\n"
+            "Por favor elige:\n"
+            "1️⃣ *English* 🇬🇧\n"
+            "2️⃣ *Español* 🇪🇸\n\n"
+            "Responde *1* o *2* 😊"
+        )
+        return response_text
+    
+    # Language selected - set it and proceed
+    session['language'] = lang
+    session['language_locked'] = True
+    
+    # Check if this is DEMO mode or Free Mode
+    # IMPORTANT: Check flags BEFORE clearing them
+    is_demo_mode = session.get('demo_mode') == 'select_language'
+    is_free_mode = session.get('free_mode_language_selection', False)
     
-    elif stage == 1:  # Name
-        # Extract name intelligently (remove "mi nombre es", "me llamo", etc.)
-        name = extract_name(message_text)
-        session['data']['name'] = name
-        emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
-        lang = session.get('language', 'es')
+    # Debug log BEFORE clearing flags
+    log.debug("Stage -1: Language '%s' selected. is_demo_mode=%s, is_free_mode=%s", lang, is_demo_mode, is_free_mode)
+    
+    # Clear the flag after checking (but save it first for debugging)
+    free_mode_flag_was_set = is_free_mode
+    if 'free_mode_language_selection' in session:
+        del session['free_mode_language_selection']
+    
+    if is_demo_mode:
+        # DEMO mode - continue to profile selection
+        session['stage'] = 0
+        save_session(phone_number, session)
         
-        # Build positions list (use session-specific positions if available)
-        positions = session.get('available_positions', AVAILABLE_POSITIONS)
-        positions_text = ""
-        for i, pos in enumerate(positions, 1):
-            positions_text += f"{i}️⃣ {pos}\n"
+        if lang == 'en':
+            response_text = (
+                "✅ *Language selected: English* 🇬🇧\n\n"
+                "Now choose a profile:\n\n"
+                "1️⃣ *Ana García*\n"
+                "   Senior Data Engineer\n"
+                "   Expected score: 4.87/5.0\n\n"
+                "2️⃣ *Luis Martínez*\n"
+                "   Junior Backend Developer\n"
+                "   Expected score: 2.9/5.0\n\n"
+                "Which profile? Reply *1* or *2* 😊"
+            )
+        else:
+            response_text = (
+                "✅ *Idioma seleccionado: Español* 🇪🇸\n\n"
+                "Ahora elige un perfil:\n\n"
+                "1️⃣ *Ana García*\n"
+                "   Data Engineer Senior\n"
+                "   Score esperado: 4.87/5.0\n\n"
+                "2️⃣ *Luis Martínez*\n"
+                "   Backend Developer Junior\n"
+                "   Score esperado: 2.9/5.0\n\n"
+                "¿Qué perfil? Responde *1* o *2* 😊"
+            )
+    elif is_free_mode or not is_demo_mode:
+        # Free Mode - start interview
+        # Use is_free_mode OR check if demo_mode is not set (fallback for Free Mode)
+        log.debug("Stage -1: Entering Free Mode branch. Setting stage to 1")
+        session['stage'] = 1
+        # Ensure demo_mode is cleared
+        if 'demo_mode' in session:
+            del session['demo_mode']
+        # CRITICAL: Save session BEFORE generating response to ensure stage is persisted
+        save_session(phone_number, session)
+        log.debug("Stage -1: Session saved with stage=%s, language=%s", session.get('stage'), session.get('language'))
         
-        # In demo mode, automatically use pre-configured position
-        demo_mode = session.get('demo_mode', '')
-        if demo_mode == 'full_interview':
-            # Get pre-configured position (already set when profile was loaded)
-            preconfigured_position = session['data'].get('position', '')
-            
-            # Find which number corresponds to pre-configured position
-            position_number = None
-            for i, pos in enumerate(positions, 1):
-                if pos == preconfigured_position:
-                    position_number = i
-                    break
-            
-            if lang == 'en':
-                response_text = (
-                    f"Nice to meet you, *{name}*! 🎉\n\n"
-                    f"💼 *Great news! Based on your profile, here are the positions that fit perfectly:*\n\n"
-                    f"{positions_text}\n"
-                    f"✨ *Perfect match: Position {position_number} - {preconfigured_position}*\n\n"
-                    f"Let's proceed with this position! 😊\n\n"
-                    "📅 *What's your availability?*\n"
-                    "(Example: Immediate, 15 days, 1 month, 2 months)"
-                )
-            else:
-                response_text = (
-                    f"¡Encantado de conocerte, *{name}*! 🎉\n\n"
-                    f"💼 *¡Excelente! Estas son las posiciones disponibles:*\n\n"
-                    f"{positions_text}\n"
-                    f"✨ *Match perfecto: Posición {position_number} - {preconfigured_position}*\n\n"
-                    f"¡Procedamos con esta posición! 😊\n\n"
-                    "📅 *¿Cuál es tu disponibilidad?*\n"
-                    "(Ejemplo: Inmediata, 15 días, 1 mes, 2 meses)"
-                )
-            # Automatically set position and skip to availability stage
-            session['data']['position'] = preconfigured_position
-            session['stage'] = 3
+        if lang == 'en':
+            response_text = (
+                "✅ *Language selected: English* 🇬🇧\n\n"
+                "✨ *Welcome to SAORI AI!* 🌸\n\n"
+                "I'm *Saori* — your AI-powered recruitment assistant.\n\n"
+                "I'll guide you through a quick evaluation (about 13 minutes) where I'll ask about:\n\n"
+                "✅ Your technical skills (3 questions)\n"
+                "✅ Your English level (2 questions)\n"
+                "✅ Your teamwork experience (1 question)\n"
+                "✅ Your professional background\n\n"
+                "Everything is confidential and used only for your recruitment process.\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "👤 *Let's start! What's your full name?*\n\n"
+                "💡 *Example:* John Smith, María García\n"
+                "💡 *Tip:* Type *RESTART* anytime to start over."
+            )
         else:
-            # Normal flow: ask user to select position (Free Mode)
-            # Enhanced message with position descriptions
-            position_descriptions = {
-                "Backend Developer (Python/Django)": "→ Technical questions about Django, APIs, databases",
-                "Full Stack Developer (Python/React)": "→ Technical questions about React, frontend/backend integration",
-                "API Developer (REST/GraphQL)": "→ Technical questions about API design, REST, GraphQL",
-                "Backend Engineer (Node.js/Express)": "→ Technical questions about Node.js, Express, async programming",
-                "Software Engineer (Python/FastAPI)": "→ Technical questions about FastAPI, async/await, Python",
-                "Data Engineer (AWS/Spark)": "→ Technical questions about data pipelines, Spark, AWS"
-            }
-            
-            positions_text_enhanced = ""
-            for i, pos in enumerate(positions, 1):
-                desc = position_descriptions.get(pos, "")
-                if desc:
-                    positions_text_enhanced += f"{i}️⃣ {pos}\n   {desc}\n\n"
-                else:
-                    positions_text_enhanced += f"{i}️⃣ {pos}\n"
-            
-            if lang == 'en':
-                response_text = (
-                    f"Nice to meet you, *{name}*! 🎉\n\n"
-                    f"💼 *These are the available positions 😊*\n\n"
-                    f"{positions_text_enhanced}"
-                    f"Which position would you like to apply for?\n"
-                    f"_(Reply with the number or position name)_\n\n"
-                    f"💡 *Tip:* Choose the position that best matches your experience"
-                )
-            else:
-                response_text = (
-                    f"¡Encantado de conocerte, *{name}*! 🎉\n\n"
-                    f"💼 *Estas son las posiciones disponibles 😊*\n\n"
-                    f"{positions_text_enhanced}"
-                    f"¿A cuál posición te gustaría aplicar?\n"
-                    f"_(Responde con el número o el nombre de la posición)_\n\n"
-                    f"💡 *Tip:* Elige la posición que mejor coincida con tu experiencia"
-                )
-            session['stage'] = 2
+            response_text = (
+                "✅ *Idioma seleccionado: Español* 🇪🇸\n\n"
+                "✨ *¡Bienvenido a SAORI AI!* 🌸\n\n"
+                "Soy *Saori* — tu asistente de reclutamiento con IA.\n\n"
+                "Te guiaré en una evaluación rápida (aproximadamente 13 minutos) donde preguntaré sobre:\n\n"
+                "✅ Tus habilidades técnicas (3 preguntas)\n"
+                "✅ Tu nivel de inglés (2 preguntas)\n"
+                "✅ Tu experiencia en equipo (1 pregunta)\n"
+                "✅ Tu experiencia profesional\n\n"
+                "Todo es confidencial y se usa solo para tu proceso de reclutamiento.\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "👤 *¡Empecemos! ¿Cuál es tu nombre completo?*\n\n"
+                "💡 *Ejemplo:* Juan Pérez, María García\n"
+                "💡 *Tip:* Escribe *REINICIAR* en cualquier momento para empezar de nuevo."
+            )
     
-    elif stage == 2:  # Position
-        # Parse position (accept number or text)
-        selected_position = message_text
-        lang = session.get('language', 'es')
-        
-        # Get positions list (use session-specific positions if available)
-        positions = session.get('available_positions', AVAILABLE_POSITIONS)
-        
-        # Check if user sent a number
-        if message_text.strip().isdigit():
-            position_index = int(message_text.strip()) - 1
-            if 0 <= position_index < len(positions):
-                selected_position = positions[position_index]
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(1, 'name', transitions=(2, 3))
+def handle_name_stage(phone_number, message_text, session):
+    """Stage 1: Name"""
+    response_text = ""
+    
+    # Extract name intelligently (remove "mi nombre es", "me llamo", etc.)
+    name = extract_name(message_text)
+    session['data']['name'] = name
+    emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
+    lang = session.get('language', 'es')
+    
+    # Build positions list (use session-specific positions if available)
+    positions = session.get('available_positions', AVAILABLE_POSITIONS)
+    positions_text = ""
+    for i, pos in enumerate(positions, 1):
+        positions_text += f"{i}️⃣ {pos}\n"
+    
+    # In demo mode, automatically use pre-configured position
+    demo_mode = session.get('demo_mode', '')
+    if demo_mode == 'full_interview':
+        # Get pre-configured position (already set when profile was loaded)
+        preconfigured_position = session['data'].get('position', '')
         
-        session['data']['position'] = selected_position
-        emotion = session['emotions'][-1]
+        # Find which number corresponds to pre-configured position
+        position_number = None
+        for i, pos in enumerate(positions, 1):
+            if pos == preconfigured_position:
+                position_number = i
+                break
         
         if lang == 'en':
             response_text = (
-                f"Excellent! You're applying for *{selected_position}* 😊\n\n"
+                f"Nice to meet you, *{name}*! 🎉\n\n"
+                f"💼 *Great news! Based on your profile, here are the positions that fit perfectly:*\n\n"
+                f"{positions_text}\n"
+                f"✨ *Perfect match: Position {position_number} - {preconfigured_position}*\n\n"
+                f"Let's proceed with this position! 😊\n\n"
                 "📅 *What's your availability?*\n"
                 "(Example: Immediate, 15 days, 1 month, 2 months)"
             )
         else:
             response_text = (
-                f"Excelente! Estás aplicando para *{selected_position}* 😊\n\n"
+                f"¡Encantado de conocerte, *{name}*! 🎉\n\n"
+                f"💼 *¡Excelente! Estas son las posiciones disponibles:*\n\n"
+                f"{positions_text}\n"
+                f"✨ *Match perfecto: Posición {position_number} - {preconfigured_position}*\n\n"
+                f"¡Procedamos con esta posición! 😊\n\n"
                 "📅 *¿Cuál es tu disponibilidad?*\n"
                 "(Ejemplo: Inmediata, 15 días, 1 mes, 2 meses)"
             )
+        # Automatically set position and skip to availability stage
+        session['data']['position'] = preconfigured_position
         session['stage'] = 3
-    
-    elif stage == 3:  # Availability
-        session['data']['availability'] = message_text
-        lang = session.get('language', 'es')
+    else:
+        # Normal flow: ask user to select position (Free Mode)
+        # Enhanced message with position descriptions
+        position_descriptions = {
+            "Backend Developer (Python/Django)": "→ Technical questions about Django, APIs, databases",
+            "Full Stack Developer (Python/React)": "→ Technical questions about React, frontend/backend integration",
+            "API Developer (REST/GraphQL)": "→ Technical questions about API design, REST, GraphQL",
+            "Backend Engineer (Node.js/Express)": "→ Technical questions about Node.js, Express, async programming",
+            "Software Engineer (Python/FastAPI)": "→ Technical questions about FastAPI, async/await, Python",
+            "Data Engineer (AWS/Spark)": "→ Technical questions about data pipelines, Spark, AWS"
+        }
+        
+        positions_text_enhanced = ""
+        for i, pos in enumerate(positions, 1):
+            desc = position_descriptions.get(pos, "")
+            if desc:
+                positions_text_enhanced += f"{i}️⃣ {pos}\n   {desc}\n\n"
+            else:
+                positions_text_enhanced += f"{i}️⃣ {pos}\n"
         
         if lang == 'en':
             response_text = (
-                "💰 *What's your monthly salary expectation?*\n"
-                "(Example: $3000 USD, $50,000 MXN, Negotiable)"
+                f"Nice to meet you, *{name}*! 🎉\n\n"
+                f"💼 *These are the available positions 😊*\n\n"
+                f"{positions_text_enhanced}"
+                f"Which position would you like to apply for?\n"
+                f"_(Reply with the number or position name)_\n\n"
+                f"💡 *Tip:* Choose the position that best matches your experience"
             )
         else:
             response_text = (
-                "💰 *¿Cuál es tu expectativa salarial mensual?*\n"
-                "(Ejemplo: $3000 USD, $50,000 MXN, Negociable)"
+                f"¡Encantado de conocerte, *{name}*! 🎉\n\n"
+                f"💼 *Estas son las posiciones disponibles 😊*\n\n"
+                f"{positions_text_enhanced}"
+                f"¿A cuál posición te gustaría aplicar?\n"
+                f"_(Responde con el número o el nombre de la posición)_\n\n"
+                f"💡 *Tip:* Elige la posición que mejor coincida con tu experiencia"
             )
-        session['stage'] = 4
+        session['stage'] = 2
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(2, 'position', transitions=(3,))
+def handle_position_stage(phone_number, message_text, session):
+    """Stage 2: Position"""
+    response_text = ""
+    
+    # Parse position (accept number or text)
+    selected_position = message_text
+    lang = session.get('language', 'es')
+    
+    # Get positions list (use session-specific positions if available)
+    positions = session.get('available_positions', AVAILABLE_POSITIONS)
+    
+    # Check if user sent a number
+    if message_text.strip().isdigit():
+        position_index = int(message_text.strip()) - 1
+        if 0 <= position_index < len(positions):
+            selected_position = positions[position_index]
+    
+    session['data']['position'] = selected_position
+    emotion = session['emotions'][-1]
+    
+    if lang == 'en':
+        response_text = (
+            f"Excellent! You're applying for *{selected_position}* 😊\n\n"
+            "📅 *What's your availability?*\n"
+            "(Example: Immediate, 15 days, 1 month, 2 months)"
+        )
+    else:
+        response_text = (
+            f"Excelente! Estás aplicando para *{selected_position}* 😊\n\n"
+            "📅 *¿Cuál es tu disponibilidad?*\n"
+            "(Ejemplo: Inmediata, 15 días, 1 mes, 2 meses)"
+        )
+    session['stage'] = 3
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(3, 'availability', transitions=(4,))
+def handle_availability_stage(phone_number, message_text, session):
+    """Stage 3: Availability"""
+    response_text = ""
+    
+    session['data']['availability'] = message_text
+    lang = session.get('language', 'es')
+    
+    if lang == 'en':
+        response_text = (
+            "💰 *What's your monthly salary expectation?*\n"
+            "(Example: $3000 USD, $50,000 MXN, Negotiable)"
+        )
+    else:
+        response_text = (
+            "💰 *¿Cuál es tu expectativa salarial mensual?*\n"
+            "(Ejemplo: $3000 USD, $50,000 MXN, Negociable)"
+        )
+    session['stage'] = 4
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(4, 'salary_expectation', transitions=(5,))
+def handle_salary_expectation_stage(phone_number, message_text, session):
+    """Stage 4: Salary"""
+    response_text = ""
+    
+    session['data']['salary'] = message_text
+    lang = session.get('language', 'es')
+    
+    if lang == 'en':
+        response_text = (
+            "🏢 *What work modality do you prefer?*\n\n"
+            "1️⃣ Remote\n"
+            "2️⃣ Hybrid\n"
+            "3️⃣ On-site\n\n"
+            "Reply with number only (1, 2, or 3)."
+        )
+    else:
+        response_text = (
+            "🏢 *¿Qué modalidad prefieres?*\n\n"
+            "1️⃣ Remoto\n"
+            "2️⃣ Híbrido\n"
+            "3️⃣ Presencial\n\n"
+            "Responde solo con el número (1, 2 o 3)."
+        )
+    session['stage'] = 5
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(5, 'modality', transitions=(6,))
+def handle_modality_stage(phone_number, message_text, session):
+    """Stage 5: Modality"""
+    response_text = ""
     
-    elif stage == 4:  # Salary
-        session['data']['salary'] = message_text
-        lang = session.get('language', 'es')
+    user_choice = message_text.strip().upper()
+    lang = session.get('language', 'es')
+    
+    # Valid options for modality - ONLY NUMBERS
+    valid_options = ['1', '2', '3']
+    
+    # Check if valid (only numbers accepted)
+    is_valid = user_choice in valid_options
+    modality_value = None
+    
+    if is_valid:
+        if lang == 'en':
+            if user_choice == '1':
+                modality_value = 'Remote'
+            elif user_choice == '2':
+                modality_value = 'Hybrid'
+            elif user_choice == '3':
+                modality_value = 'On-site'
+        else:
+            if user_choice == '1':
+                modality_value = 'Remoto'
+            elif user_choice == '2':
+                modality_value = 'Híbrido'
+            elif user_choice == '3':
+                modality_value = 'Presencial'
+    
+    if is_valid:
+        session['data']['modality'] = modality_value if modality_value else message_text
         
         if lang == 'en':
             response_text = (
-                "🏢 *What work modality do you prefer?*\n\n"
+                "🌍 *What's your timezone?*\n"
+                "(Example: Mexico City, Buenos Aires, Madrid, New York)"
+            )
+        else:
+            response_text = (
+                "🌍 *¿En qué zona horaria estás?*\n"
+                "(Ejemplo: Ciudad de México, Buenos Aires, Madrid, New York)"
+            )
+        session['stage'] = 6
+    else:
+        # Invalid option - repeat question
+        if lang == 'en':
+            response_text = (
+                "❌ *Invalid option.* Please choose:\n\n"
                 "1️⃣ Remote\n"
                 "2️⃣ Hybrid\n"
                 "3️⃣ On-site\n\n"
-                "Reply with number only (1, 2, or 3)."
+                "Reply with number or name."
             )
         else:
             response_text = (
-                "🏢 *¿Qué modalidad prefieres?*\n\n"
+                "❌ *Opción inválida.* Por favor elige:\n\n"
                 "1️⃣ Remoto\n"
                 "2️⃣ Híbrido\n"
                 "3️⃣ Presencial\n\n"
-                "Responde solo con el número (1, 2 o 3)."
+                "Responde con el número o nombre."
             )
-        session['stage'] = 5
+        # Stay in same stage
     
-    elif stage == 5:  # Modality
-        user_choice = message_text.strip().upper()
-        lang = session.get('language', 'es')
-        
-        # Valid options for modality - ONLY NUMBERS
-        valid_options = ['1', '2', '3']
-        
-        # Check if valid (only numbers accepted)
-        is_valid = user_choice in valid_options
-        modality_value = None
-        
-        if is_valid:
-            if lang == 'en':
-                if user_choice == '1':
-                    modality_value = 'Remote'
-                elif user_choice == '2':
-                    modality_value = 'Hybrid'
-                elif user_choice == '3':
-                    modality_value = 'On-site'
-            else:
-                if user_choice == '1':
-                    modality_value = 'Remoto'
-                elif user_choice == '2':
-                    modality_value = 'Híbrido'
-                elif user_choice == '3':
-                    modality_value = 'Presencial'
-        
-        if is_valid:
-            session['data']['modality'] = modality_value if modality_value else message_text
-            
-            if lang == 'en':
-                response_text = (
-                    "🌍 *What's your timezone?*\n"
-                    "(Example: Mexico City, Buenos Aires, Madrid, New York)"
-                )
-            else:
-                response_text = (
-                    "🌍 *¿En qué zona horaria estás?*\n"
-                    "(Ejemplo: Ciudad de México, Buenos Aires, Madrid, New York)"
-                )
-            session['stage'] = 6
-        else:
-            # Invalid option - repeat question
-            if lang == 'en':
-                response_text = (
-                    "❌ *Invalid option.* Please choose:\n\n"
-                    "1️⃣ Remote\n"
-                    "2️⃣ Hybrid\n"
-                    "3️⃣ On-site\n\n"
-                    "Reply with number or name."
-                )
-            else:
-                response_text = (
-                    "❌ *Opción inválida.* Por favor elige:\n\n"
-                    "1️⃣ Remoto\n"
-                    "2️⃣ Híbrido\n"
-                    "3️⃣ Presencial\n\n"
-                    "Responde con el número o nombre."
-                )
-            # Stay in same stage
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(6, 'zone', transitions=(7,))
+def handle_zone_stage(phone_number, message_text, session):
+    """Stage 6: Zone"""
+    response_text = ""
     
-    elif stage == 6:  # Zone
-        lang = session.get('language', 'es')
-        
-        # Validate that response is not a command
-        message_upper = message_text.strip().upper()
-        if message_upper in ['RESTART', 'REINICIAR', 'HELP', 'AYUDA', 'RESET', 'NUEVO', 'NEW']:
-            # Process as command - let webhook handle it
-            # For now, just accept it as timezone to avoid breaking flow
-            pass
-        
-        # Validate minimum length
-        if len(message_text.strip()) < 2:
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please provide a valid timezone.*\n\n"
-                    "Example: Mexico City, Buenos Aires, Madrid, New York\n\n"
-                    "🌍 *What's your timezone?*"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor proporciona una zona horaria válida.*\n\n"
-                    "Ejemplo: Ciudad de México, Buenos Aires, Madrid, New York\n\n"
-                    "🌍 *¿En qué zona horaria estás?*"
-                )
-            save_session(phone_number, session)
-            return response_text
-        
-        session['data']['zone'] = message_text
-        emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
-        position = session['data'].get('position', '').lower()
-        
-        # Select technical questions based on position
-        if 'data engineer' in position:
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What is normalization in relational databases and why is it important in schema design?\n"
-                    "(Explain the first three normal forms with conceptual examples)\n\n"
-                    "💡 *Hint:* Mention concepts like: redundancy, integrity, 1NF, 2NF, 3NF, tables, relationships, dependencies"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Qué es la normalización en bases de datos relacionales y por qué es importante en el diseño de esquemas?\n"
-                    "(Explica las primeras tres formas normales con ejemplos conceptuales)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: redundancia, integridad, 1NF, 2NF, 3NF, tablas, relaciones, dependencias"
-                )
-        elif 'backend developer' in position and 'django' in position:
-            # Backend Developer (Python/Django)
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What are Django models and how do they relate to the database?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: Python classes, database tables, ORM, attributes, columns"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Qué son los modelos de Django y cómo se relacionan con la base de datos?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: clases Python, tablas de base de datos, ORM, atributos, columnas"
-                )
-        elif 'full stack' in position and 'react' in position:
-            # Full Stack Developer (Python/React)
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What is the difference between server-side rendering (SSR) and client-side rendering (CSR) in React applications?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: Next.js, hydration, SEO, performance, initial load"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Cuál es la diferencia entre renderizado del lado del servidor (SSR) y renderizado del lado del cliente (CSR) en aplicaciones React?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: Next.js, hidratación, SEO, rendimiento, carga inicial"
-                )
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            # API Developer (REST/GraphQL)
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What's the difference between REST and GraphQL? When would you choose one over the other?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: endpoints, queries, over-fetching, under-fetching, flexibility"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Cuál es la diferencia entre REST y GraphQL? ¿Cuándo elegirías uno sobre el otro?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: endpoints, queries, sobre-fetching, sub-fetching, flexibilidad"
-                )
-        elif 'backend engineer' in position and 'node.js' in position:
-            # Backend Engineer (Node.js/Express)
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What is the event loop in Node.js and how does it enable asynchronous operations?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: call stack, callback queue, non-blocking I/O, single-threaded"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Qué es el event loop en Node.js y cómo permite operaciones asíncronas?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: call stack, cola de callbacks, I/O no bloqueante, single-threaded"
-                )
-        elif 'software engineer' in position and 'fastapi' in position:
-            # Software Engineer (Python/FastAPI)
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What are the main advantages of FastAPI over other Python web frameworks like Flask or Django?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: async/await, type hints, automatic documentation, performance"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Cuáles son las principales ventajas de FastAPI sobre otros frameworks web de Python como Flask o Django?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: async/await, type hints, documentación automática, rendimiento"
-                )
-        elif 'backend' in position:
-            # Fallback for other backend positions
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What are Django models and how do they relate to the database?\n"
-                    "(Explain in your own words)\n\n"
-                    "💡 *Hint:* Mention concepts like: Python classes, database tables, ORM, attributes, columns"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Qué son los modelos de Django y cómo se relacionan con la base de datos?\n"
-                    "(Explica con tus propias palabras)\n\n"
-                    "💡 *Hint:* Menciona conceptos como: clases Python, tablas de base de datos, ORM, atributos, columnas"
-                )
+    lang = session.get('language', 'es')
+    
+    # Validate that response is not a command
+    message_upper = message_text.strip().upper()
+    if message_upper in ['RESTART', 'REINICIAR', 'HELP', 'AYUDA', 'RESET', 'NUEVO', 'NEW']:
+        # Process as command - let webhook handle it
+        # For now, just accept it as timezone to avoid breaking flow
+        pass
+    
+    # Validate minimum length
+    if len(message_text.strip()) < 2:
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Please provide a valid timezone.*\n\n"
+                "Example: Mexico City, Buenos Aires, Madrid, New York\n\n"
+                "🌍 *What's your timezone?*"
+            )
         else:
-            # Default questions for other positions
-            if lang == 'en':
-                tech_q1 = (
-                    "🔧 *Question 1 of 3:*\n"
-                    "What's the difference between REST and GraphQL?\n"
-                    "(Explain in your own words)"
-                )
-            else:
-                tech_q1 = (
-                    "🔧 *Pregunta 1 de 3:*\n"
-                    "¿Qué diferencia hay entre REST y GraphQL?\n"
-                    "(Explica con tus propias palabras)"
-                )
-        
-        # Check if we're in demo mode to show ANSWERS tip
-        is_demo_mode = session.get('demo_mode') == 'full_interview'
-        
-        # Get position for enhanced message
-        position = session['data'].get('position', 'your selected position')
-        
-        # Get progress info
-        current_q, total_q = get_progress_info(7)
-        progress_bar = get_progress_bar(current_q, total_q)
-        
+            response_text = (
+                "⚠️ *Por favor proporciona una zona horaria válida.*\n\n"
+                "Ejemplo: Ciudad de México, Buenos Aires, Madrid, New York\n\n"
+                "🌍 *¿En qué zona horaria estás?*"
+            )
+        save_session(phone_number, session)
+        return response_text
+    
+    session['data']['zone'] = message_text
+    emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
+    position = session['data'].get('position', '').lower()
+    
+    # Select technical questions based on position
+    if 'data engineer' in position:
         if lang == 'en':
-            answers_tip = ""
-            if is_demo_mode:
-                answers_tip = "💡 *TIP:* At any time, send ANSWERS to see suggested responses\n\n"
-            
-            if not is_demo_mode:
-                # Enhanced message for Free Mode
-                response_text = (
-                    f"{progress_bar}\n\n"
-                    "Perfect! 😊\n\n"
-                    f"⚡ *Now come 3 technical questions about {position}.*\n\n"
-                    "💡 *What I'm evaluating:*\n"
-                    "• Depth of technical knowledge\n"
-                    "• Real-world experience\n"
-                    "• Problem-solving approach\n"
-                    "• Communication clarity\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n"
-                    "💻 *Technical Section* (3 questions)\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "📊 *Progress: Question 1 of 3*\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "📖 Or send HELP and I'll be here to assist you! 🌸\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{tech_q1}"
-                )
-            else:
-                # Enhanced message for Demo Mode
-                response_text = (
-                    f"{progress_bar}\n\n"
-                    "Perfect! 😊\n\n"
-                    "⚡ *Now come 3 technical questions.*\n\n"
-                    "💡 *What I'm evaluating:*\n"
-                    "• Depth of technical knowledge\n"
-                    "• Real-world experience\n"
-                    "• Problem-solving approach\n"
-                    "• Communication clarity\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n"
-                    "💻 *Technical Section* (3 questions)\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "💡 *Tip:* Answer honestly based on your real experience.\n"
-                    "There are no wrong answers — I just want to understand your current level. 🌸\n"
-                    "*Be as detailed as possible - show me what you know!*\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{answers_tip}"
-                    "📖 Or send HELP and I'll be here to assist you! 🌸\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{tech_q1}"
-                )
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What is normalization in relational databases and why is it important in schema design?\n"
+                "(Explain the first three normal forms with conceptual examples)\n\n"
+                "💡 *Hint:* Mention concepts like: redundancy, integrity, 1NF, 2NF, 3NF, tables, relationships, dependencies"
+            )
         else:
-            answers_tip = ""
-            if is_demo_mode:
-                answers_tip = "💡 *TIP:* En cualquier momento, envía RESPUESTAS para ver respuestas sugeridas\n\n"
-            
-            if not is_demo_mode:
-                # Enhanced message for Free Mode
-                response_text = (
-                    "Perfecto! 😊\n\n"
-                    f"⚡ *Ahora vienen 3 preguntas técnicas sobre {position}.*\n\n"
-                    "💡 *Qué esperar:*\n"
-                    "• Cada pregunta evalúa tu conocimiento técnico\n"
-                    "• No hay respuestas incorrectas — sé honesto sobre tu experiencia\n"
-                    "• Puedes dar respuestas detalladas (sin restricciones de longitud)\n"
-                    "• Tus respuestas se evaluarán basándose en keywords técnicos y detalle\n\n"
-                    "💡 *Tips para mejores scores:*\n"
-                    "• Sé específico y detallado\n"
-                    "• Menciona tecnologías y conceptos relevantes\n"
-                    "• Explica tu proceso de pensamiento\n"
-                    "• Comparte ejemplos reales de tu experiencia\n\n"
-                    "📊 *Progreso: Pregunta 1 de 3*\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "📖 O envía AYUDA y estaré aquí para asistirte 🌸\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{tech_q1}"
-                )
-            else:
-                # Original message for Demo Mode
-                response_text = (
-                    "Perfecto! 😊\n\n"
-                    "⚡ *Ahora vienen 3 preguntas técnicas.*\n\n"
-                    "💡 *Tip:* Responde con honestidad basándote en tu experiencia real.\n"
-                    "No hay respuestas incorrectas — solo quiero conocer tu nivel actual. 🌸\n"
-                    "*¡Sé lo más detallado posible - demuéstranos lo que sabes!*\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{answers_tip}"
-                    "📖 O envía AYUDA y estaré aquí para asistirte 🌸\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"{tech_q1}"
-                )
-        session['data']['tech_questions'] = []
-        # Store the full question text for validation
-        session['data']['current_tech_question'] = tech_q1
-        session['stage'] = 7
-        save_session(phone_number, session)  # CRITICAL: Save before returning
-    
-    elif stage == 7:  # Tech Question 1
-        # Validate response - check if user just repeated the question
-        current_question = session['data'].get('current_tech_question', '')
-        lang = session.get('language', 'es')
-        
-        if current_question and is_question_repetition(current_question, message_text):
-            # User just repeated the question, ask them to answer properly
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please provide your own answer to the question.*\n\n"
-                    "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
-                    f"{current_question}"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
-                    "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
-                    f"{current_question}"
-                )
-            # Stay in same stage
-            save_session(phone_number, session)
-            return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
-        if not is_valid:
-            # Response doesn't make sense, ask for a better answer
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            
-            if lang == 'en':
-                response_text = (
-                    f"⚠️ *{msg_en}*\n\n"
-                    f"{current_question}"
-                )
-            else:
-                response_text = (
-                    f"⚠️ *{msg_es}*\n\n"
-                    f"{current_question}"
-                )
-            # Stay in same stage
-            save_session(phone_number, session)
-            return response_text
-        
-        # Evaluate response
-        position = session['data'].get('position', '').lower()
-        if 'data engineer' in position:
-            question_topic = "Normalization"
-        elif 'backend developer' in position and 'django' in position:
-            question_topic = "Django Models"
-        elif 'full stack' in position and 'react' in position:
-            question_topic = "React SSR vs CSR"
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            question_topic = "REST vs GraphQL"
-        elif 'backend engineer' in position and 'node.js' in position:
-            question_topic = "Node.js Event Loop"
-        elif 'software engineer' in position and 'fastapi' in position:
-            question_topic = "FastAPI Advantages"
-        elif 'backend' in position:
-            question_topic = "Django Models"
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Qué es la normalización en bases de datos relacionales y por qué es importante en el diseño de esquemas?\n"
+                "(Explica las primeras tres formas normales con ejemplos conceptuales)\n\n"
+                "💡 *Hint:* Menciona conceptos como: redundancia, integridad, 1NF, 2NF, 3NF, tablas, relaciones, dependencias"
+            )
+    elif 'backend developer' in position and 'django' in position:
+        # Backend Developer (Python/Django)
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What are Django models and how do they relate to the database?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: Python classes, database tables, ORM, attributes, columns"
+            )
         else:
-            question_topic = "REST vs GraphQL"
-        
-        score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q1 asks for detailed response
-        log_user_action(phone_number, f"Tech Q1 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
-        session['data']['tech_questions'].append({
-            'question': question_topic,
-            'answer': message_text,
-            'score': score
-        })
-        session['scores']['technical'] += score
-        
-        emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
-        lang = session.get('language', 'es')
-        
-        # Select question 2 based on position
-        if 'data engineer' in position:
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "What does it mean that Python is a dynamically typed language? "
-                    "What are the advantages and disadvantages in data engineering?\n\n"
-                    "💡 *Hint:* Mention concepts like: runtime, type declaration, flexibility, performance"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Qué significa que Python es un lenguaje de tipado dinámico? "
-                    "¿Cuáles son las ventajas y desventajas en ingeniería de datos?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: runtime, declaración de tipo, flexibilidad, rendimiento"
-                )
-        elif 'backend developer' in position and 'django' in position:
-            # Backend Developer (Python/Django)
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "How would you design an API endpoint in Django to return a list of users in JSON format?\n\n"
-                    "💡 *Hint:* Mention concepts like: Django REST Framework, serializer, view, JSON"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Cómo diseñarías un endpoint de API en Django para devolver una lista de usuarios en formato JSON?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: Django REST Framework, serializer, view, JSON"
-                )
-        elif 'full stack' in position and 'react' in position:
-            # Full Stack Developer (Python/React)
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "How does React's virtual DOM improve performance compared to direct DOM manipulation?\n\n"
-                    "💡 *Hint:* Mention concepts like: diffing algorithm, reconciliation, batch updates, re-rendering"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Cómo mejora el virtual DOM de React el rendimiento comparado con la manipulación directa del DOM?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: algoritmo de diffing, reconciliación, actualizaciones en lote, re-renderizado"
-                )
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            # API Developer (REST/GraphQL)
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "What is API versioning and what strategies would you use to version a REST API?\n\n"
-                    "💡 *Hint:* Mention concepts like: URL versioning, header versioning, semantic versioning, backward compatibility"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Qué es la versionado de APIs y qué estrategias usarías para versionar una API REST?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: versionado en URL, versionado en headers, versionado semántico, compatibilidad hacia atrás"
-                )
-        elif 'backend engineer' in position and 'node.js' in position:
-            # Backend Engineer (Node.js/Express)
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "What is middleware in Express.js and how would you use it to handle authentication?\n\n"
-                    "💡 *Hint:* Mention concepts like: request/response cycle, next(), JWT, session management"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Qué es middleware en Express.js y cómo lo usarías para manejar autenticación?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: ciclo request/response, next(), JWT, gestión de sesiones"
-                )
-        elif 'software engineer' in position and 'fastapi' in position:
-            # Software Engineer (Python/FastAPI)
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "How does FastAPI handle dependency injection and why is it useful for building APIs?\n\n"
-                    "💡 *Hint:* Mention concepts like: Depends(), dependency tree, database connections, authentication"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Cómo maneja FastAPI la inyección de dependencias y por qué es útil para construir APIs?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: Depends(), árbol de dependencias, conexiones de base de datos, autenticación"
-                )
-        elif 'backend' in position:
-            # Fallback for other backend positions
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "How would you design an API endpoint in Django to return a list of users in JSON format?\n\n"
-                    "💡 *Hint:* Mention concepts like: Django REST Framework, serializer, view, JSON"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Cómo diseñarías un endpoint de API en Django para devolver una lista de usuarios en formato JSON?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: Django REST Framework, serializer, view, JSON"
-                )
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Qué son los modelos de Django y cómo se relacionan con la base de datos?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: clases Python, tablas de base de datos, ORM, atributos, columnas"
+            )
+    elif 'full stack' in position and 'react' in position:
+        # Full Stack Developer (Python/React)
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What is the difference between server-side rendering (SSR) and client-side rendering (CSR) in React applications?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: Next.js, hydration, SEO, performance, initial load"
+            )
         else:
-            if lang == 'en':
-                tech_q2 = (
-                    "🔧 *Question 2 of 3:*\n"
-                    "What is Docker and what is it used for?"
-                )
-            else:
-                tech_q2 = (
-                    "🔧 *Pregunta 2 de 3:*\n"
-                    "¿Qué es Docker y para qué se usa?"
-                )
-        
-        # Add progress indicator and confirmation message
-        is_demo_mode = session.get('demo_mode') == 'full_interview'
-        current_q, total_q = get_progress_info(8)
-        progress_bar = get_progress_bar(current_q, total_q)
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Cuál es la diferencia entre renderizado del lado del servidor (SSR) y renderizado del lado del cliente (CSR) en aplicaciones React?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: Next.js, hidratación, SEO, rendimiento, carga inicial"
+            )
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        # API Developer (REST/GraphQL)
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What's the difference between REST and GraphQL? When would you choose one over the other?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: endpoints, queries, over-fetching, under-fetching, flexibility"
+            )
+        else:
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Cuál es la diferencia entre REST y GraphQL? ¿Cuándo elegirías uno sobre el otro?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: endpoints, queries, sobre-fetching, sub-fetching, flexibilidad"
+            )
+    elif 'backend engineer' in position and 'node.js' in position:
+        # Backend Engineer (Node.js/Express)
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What is the event loop in Node.js and how does it enable asynchronous operations?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: call stack, callback queue, non-blocking I/O, single-threaded"
+            )
+        else:
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Qué es el event loop en Node.js y cómo permite operaciones asíncronas?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: call stack, cola de callbacks, I/O no bloqueante, single-threaded"
+            )
+    elif 'software engineer' in position and 'fastapi' in position:
+        # Software Engineer (Python/FastAPI)
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What are the main advantages of FastAPI over other Python web frameworks like Flask or Django?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: async/await, type hints, automatic documentation, performance"
+            )
+        else:
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Cuáles son las principales ventajas de FastAPI sobre otros frameworks web de Python como Flask o Django?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: async/await, type hints, documentación automática, rendimiento"
+            )
+    elif 'backend' in position:
+        # Fallback for other backend positions
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What are Django models and how do they relate to the database?\n"
+                "(Explain in your own words)\n\n"
+                "💡 *Hint:* Mention concepts like: Python classes, database tables, ORM, attributes, columns"
+            )
+        else:
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Qué son los modelos de Django y cómo se relacionan con la base de datos?\n"
+                "(Explica con tus propias palabras)\n\n"
+                "💡 *Hint:* Menciona conceptos como: clases Python, tablas de base de datos, ORM, atributos, columnas"
+            )
+    else:
+        # Default questions for other positions
+        if lang == 'en':
+            tech_q1 = (
+                "🔧 *Question 1 of 3:*\n"
+                "What's the difference between REST and GraphQL?\n"
+                "(Explain in your own words)"
+            )
+        else:
+            tech_q1 = (
+                "🔧 *Pregunta 1 de 3:*\n"
+                "¿Qué diferencia hay entre REST y GraphQL?\n"
+                "(Explica con tus propias palabras)"
+            )
+    
+    # Check if we're in demo mode to show ANSWERS tip
+    is_demo_mode = session.get('demo_mode') == 'full_interview'
+    
+    # Get position for enhanced message
+    position = session['data'].get('position', 'your selected position')
+    
+    # Get progress info
+    current_q, total_q = get_progress_info(7)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if lang == 'en':
+        answers_tip = ""
+        if is_demo_mode:
+            answers_tip = "💡 *TIP:* At any time, send ANSWERS to see suggested responses\n\n"
         
         if not is_demo_mode:
-            if lang == 'en':
-                response_text = (
-                    "✅ Got it! Moving to the next question...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progress: Question 2 of 3*\n\n"
-                    f"{tech_q2}"
-                )
-            else:
-                response_text = (
-                    "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progreso: Pregunta 2 de 3*\n\n"
-                    f"{tech_q2}"
-                )
+            # Enhanced message for Free Mode
+            response_text = (
+                f"{progress_bar}\n\n"
+                "Perfect! 😊\n\n"
+                f"⚡ *Now come 3 technical questions about {position}.*\n\n"
+                "💡 *What I'm evaluating:*\n"
+                "• Depth of technical knowledge\n"
+                "• Real-world experience\n"
+                "• Problem-solving approach\n"
+                "• Communication clarity\n\n"
+                "━━━━━━━━━━━━━━━━━━\n"
+                "💻 *Technical Section* (3 questions)\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "📊 *Progress: Question 1 of 3*\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "📖 Or send HELP and I'll be here to assist you! 🌸\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{tech_q1}"
+            )
         else:
-            if lang == 'en':
-                response_text = (
-                    "✅ Got it! Moving to the next question...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progress: Question 2 of 3*\n\n"
-                    f"{tech_q2}"
-                )
-            else:
-                response_text = (
-                    "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progreso: Pregunta 2 de 3*\n\n"
-                    f"{tech_q2}"
-                )
-        # Store the full question text for validation
-        session['data']['current_tech_question'] = tech_q2
-        session['stage'] = 8
-    
-    elif stage == 8:  # Tech Question 2
-        # Validate response - check if user just repeated the question
-        current_question = session['data'].get('current_tech_question', '')
-        lang = session.get('language', 'es')
-        
-        if current_question and is_question_repetition(current_question, message_text):
-            # User just repeated the question, ask them to answer properly
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please provide your own answer to the question.*\n\n"
-                    "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
-                    f"{current_question}"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
-                    "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
-                    f"{current_question}"
-                )
-            # Stay in same stage
-            save_session(phone_number, session)
-            return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
-        if not is_valid:
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            if lang == 'en':
-                response_text = f"⚠️ *{msg_en}*\n\n{current_question}"
-            else:
-                response_text = f"⚠️ *{msg_es}*\n\n{current_question}"
-            save_session(phone_number, session)
-            return response_text
+            # Enhanced message for Demo Mode
+            response_text = (
+                f"{progress_bar}\n\n"
+                "Perfect! 😊\n\n"
+                "⚡ *Now come 3 technical questions.*\n\n"
+                "💡 *What I'm evaluating:*\n"
+                "• Depth of technical knowledge\n"
+                "• Real-world experience\n"
+                "• Problem-solving approach\n"
+                "• Communication clarity\n\n"
+                "━━━━━━━━━━━━━━━━━━\n"
+                "💻 *Technical Section* (3 questions)\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "💡 *Tip:* Answer honestly based on your real experience.\n"
+                "There are no wrong answers — I just want to understand your current level. 🌸\n"
+                "*Be as detailed as possible - show me what you know!*\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{answers_tip}"
+                "📖 Or send HELP and I'll be here to assist you! 🌸\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{tech_q1}"
+            )
+    else:
+        answers_tip = ""
+        if is_demo_mode:
+            answers_tip = "💡 *TIP:* En cualquier momento, envía RESPUESTAS para ver respuestas sugeridas\n\n"
         
-        position = session['data'].get('position', '').lower()
-        if 'data engineer' in position:
-            question_topic = "Python Dynamic Typing"
-        elif 'backend developer' in position and 'django' in position:
-            question_topic = "Django API Endpoint"
-        elif 'full stack' in position and 'react' in position:
-            question_topic = "React Virtual DOM"
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            question_topic = "API Versioning"
-        elif 'backend engineer' in position and 'node.js' in position:
-            question_topic = "Express Middleware"
-        elif 'software engineer' in position and 'fastapi' in position:
-            question_topic = "FastAPI Dependency Injection"
-        elif 'backend' in position:
-            question_topic = "Django API Endpoint"
+        if not is_demo_mode:
+            # Enhanced message for Free Mode
+            response_text = (
+                "Perfecto! 😊\n\n"
+                f"⚡ *Ahora vienen 3 preguntas técnicas sobre {position}.*\n\n"
+                "💡 *Qué esperar:*\n"
+                "• Cada pregunta evalúa tu conocimiento técnico\n"
+                "• No hay respuestas incorrectas — sé honesto sobre tu experiencia\n"
+                "• Puedes dar respuestas detalladas (sin restricciones de longitud)\n"
+                "• Tus respuestas se evaluarán basándose en keywords técnicos y detalle\n\n"
+                "💡 *Tips para mejores scores:*\n"
+                "• Sé específico y detallado\n"
+                "• Menciona tecnologías y conceptos relevantes\n"
+                "• Explica tu proceso de pensamiento\n"
+                "• Comparte ejemplos reales de tu experiencia\n\n"
+                "📊 *Progreso: Pregunta 1 de 3*\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "📖 O envía AYUDA y estaré aquí para asistirte 🌸\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{tech_q1}"
+            )
         else:
-            question_topic = "Docker"
-        
-        score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q2 now expects detailed response like Q1
-        log_user_action(phone_number, f"Tech Q2 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
-        session['data']['tech_questions'].append({
-            'question': question_topic,
-            'answer': message_text,
-            'score': score
-        })
-        session['scores']['technical'] += score
+            # Original message for Demo Mode
+            response_text = (
+                "Perfecto! 😊\n\n"
+                "⚡ *Ahora vienen 3 preguntas técnicas.*\n\n"
+                "💡 *Tip:* Responde con honestidad basándote en tu experiencia real.\n"
+                "No hay respuestas incorrectas — solo quiero conocer tu nivel actual. 🌸\n"
+                "*¡Sé lo más detallado posible - demuéstranos lo que sabes!*\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{answers_tip}"
+                "📖 O envía AYUDA y estaré aquí para asistirte 🌸\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"{tech_q1}"
+            )
+    session['data']['tech_questions'] = []
+    # Store the full question text for validation
+    session['data']['current_tech_question'] = tech_q1
+    session['stage'] = 7
+    save_session(phone_number, session)  # CRITICAL: Save before returning
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(7, 'tech_question_1', transitions=(8,))
+def handle_tech_question_1_stage(phone_number, message_text, session):
+    """Stage 7: Tech Question 1"""
+    response_text = ""
+    
+    # Validate response - check if user just repeated the question
+    current_question = session['data'].get('current_tech_question', '')
+    lang = session.get('language', 'es')
+    
+    if current_question and is_question_repetition(current_question, message_text):
+        # User just repeated the question, ask them to answer properly
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Please provide your own answer to the question.*\n\n"
+                "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
+                f"{current_question}"
+            )
+        else:
+            response_text = (
+                "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
+                "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
+                f"{current_question}"
+            )
+        # Stay in same stage
+        save_session(phone_number, session)
+        return response_text
+    
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
+    if not is_valid:
+        # Response doesn't make sense, ask for a better answer
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
         
-        emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
-        lang = session.get('language', 'es')
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
         
-        # Select question 3 based on position
-        if 'data engineer' in position:
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "How does Apache Spark handle fault tolerance in a distributed environment?\n\n"
-                    "💡 *Hint:* Mention concepts like: RDDs, lineage, transformations, node failure, reconstruction"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Cómo maneja Apache Spark la tolerancia a fallos en un entorno distribuido?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: RDDs, lineage, transformaciones, fallo de nodo, reconstrucción"
-                )
-        elif 'backend developer' in position and 'django' in position:
-            # Backend Developer (Python/Django)
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is Docker and how would you use it to deploy a Django backend application?\n\n"
-                    "💡 *Hint:* Mention concepts like: containers, Dockerfile, docker-compose, images, port mapping"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Qué es Docker y cómo lo usarías para desplegar una aplicación backend Django?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: contenedores, Dockerfile, docker-compose, imágenes, mapeo de puertos"
-                )
-        elif 'full stack' in position and 'react' in position:
-            # Full Stack Developer (Python/React)
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "How would you manage state in a large React application? Compare different state management approaches.\n\n"
-                    "💡 *Hint:* Mention concepts like: Context API, Redux, Zustand, prop drilling, local vs global state"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Cómo manejarías el estado en una aplicación React grande? Compara diferentes enfoques de gestión de estado.\n\n"
-                    "💡 *Hint:* Menciona conceptos como: Context API, Redux, Zustand, prop drilling, estado local vs global"
-                )
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            # API Developer (REST/GraphQL)
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is rate limiting and how would you implement it to protect an API from abuse?\n\n"
-                    "💡 *Hint:* Mention concepts like: token bucket, sliding window, Redis, throttling, DDoS protection"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Qué es el rate limiting y cómo lo implementarías para proteger una API del abuso?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: token bucket, ventana deslizante, Redis, throttling, protección DDoS"
-                )
-        elif 'backend engineer' in position and 'node.js' in position:
-            # Backend Engineer (Node.js/Express)
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is the difference between callback functions, Promises, and async/await in Node.js? When would you use each?\n\n"
-                    "💡 *Hint:* Mention concepts like: callback hell, error handling, readability, asynchronous flow"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Cuál es la diferencia entre funciones callback, Promises y async/await en Node.js? ¿Cuándo usarías cada una?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: callback hell, manejo de errores, legibilidad, flujo asíncrono"
-                )
-        elif 'software engineer' in position and 'fastapi' in position:
-            # Software Engineer (Python/FastAPI)
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is Pydantic and how does FastAPI use it for request/response validation?\n\n"
-                    "💡 *Hint:* Mention concepts like: data validation, type coercion, automatic documentation, serialization"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Qué es Pydantic y cómo lo usa FastAPI para validación de request/response?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: validación de datos, coerción de tipos, documentación automática, serialización"
-                )
-        elif 'backend' in position:
-            # Fallback for other backend positions
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is Docker and how would you use it to deploy a Django backend application?\n\n"
-                    "💡 *Hint:* Mention concepts like: containers, Dockerfile, docker-compose, images, port mapping"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Qué es Docker y cómo lo usarías para desplegar una aplicación backend Django?\n\n"
-                    "💡 *Hint:* Menciona conceptos como: contenedores, Dockerfile, docker-compose, imágenes, mapeo de puertos"
-                )
+        if lang == 'en':
+            response_text = (
+                f"⚠️ *{msg_en}*\n\n"
+                f"{current_question}"
+            )
+        else:
+            response_text = (
+                f"⚠️ *{msg_es}*\n\n"
+                f"{current_question}"
+            )
+        # Stay in same stage
+        save_session(phone_number, session)
+        return response_text
+    
+    # Evaluate response
+    position = session['data'].get('position', '').lower()
+    if 'data engineer' in position:
+        question_topic = "Normalization"
+    elif 'backend developer' in position and 'django' in position:
+        question_topic = "Django Models"
+    elif 'full stack' in position and 'react' in position:
+        question_topic = "React SSR vs CSR"
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        question_topic = "REST vs GraphQL"
+    elif 'backend engineer' in position and 'node.js' in position:
+        question_topic = "Node.js Event Loop"
+    elif 'software engineer' in position and 'fastapi' in position:
+        question_topic = "FastAPI Advantages"
+    elif 'backend' in position:
+        question_topic = "Django Models"
+    else:
+        question_topic = "REST vs GraphQL"
+    
+    score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q1 asks for detailed response
+    log_user_action(phone_number, f"Tech Q1 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
+    session['data']['tech_questions'].append({
+        'question': question_topic,
+        'answer': message_text,
+        'score': score
+    })
+    session['scores']['technical'] += score
+    warm_answer_embeddings(session, message_text)
+    
+    emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
+    lang = session.get('language', 'es')
+    
+    # Select question 2 based on position
+    if 'data engineer' in position:
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "What does it mean that Python is a dynamically typed language? "
+                "What are the advantages and disadvantages in data engineering?\n\n"
+                "💡 *Hint:* Mention concepts like: runtime, type declaration, flexibility, performance"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Qué significa que Python es un lenguaje de tipado dinámico? "
+                "¿Cuáles son las ventajas y desventajas en ingeniería de datos?\n\n"
+                "💡 *Hint:* Menciona conceptos como: runtime, declaración de tipo, flexibilidad, rendimiento"
+            )
+    elif 'backend developer' in position and 'django' in position:
+        # Backend Developer (Python/Django)
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "How would you design an API endpoint in Django to return a list of users in JSON format?\n\n"
+                "💡 *Hint:* Mention concepts like: Django REST Framework, serializer, view, JSON"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Cómo diseñarías un endpoint de API en Django para devolver una lista de usuarios en formato JSON?\n\n"
+                "💡 *Hint:* Menciona conceptos como: Django REST Framework, serializer, view, JSON"
+            )
+    elif 'full stack' in position and 'react' in position:
+        # Full Stack Developer (Python/React)
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "How does React's virtual DOM improve performance compared to direct DOM manipulation?\n\n"
+                "💡 *Hint:* Mention concepts like: diffing algorithm, reconciliation, batch updates, re-rendering"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Cómo mejora el virtual DOM de React el rendimiento comparado con la manipulación directa del DOM?\n\n"
+                "💡 *Hint:* Menciona conceptos como: algoritmo de diffing, reconciliación, actualizaciones en lote, re-renderizado"
+            )
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        # API Developer (REST/GraphQL)
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "What is API versioning and what strategies would you use to version a REST API?\n\n"
+                "💡 *Hint:* Mention concepts like: URL versioning, header versioning, semantic versioning, backward compatibility"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Qué es la versionado de APIs y qué estrategias usarías para versionar una API REST?\n\n"
+                "💡 *Hint:* Menciona conceptos como: versionado en URL, versionado en headers, versionado semántico, compatibilidad hacia atrás"
+            )
+    elif 'backend engineer' in position and 'node.js' in position:
+        # Backend Engineer (Node.js/Express)
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "What is middleware in Express.js and how would you use it to handle authentication?\n\n"
+                "💡 *Hint:* Mention concepts like: request/response cycle, next(), JWT, session management"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Qué es middleware en Express.js y cómo lo usarías para manejar autenticación?\n\n"
+                "💡 *Hint:* Menciona conceptos como: ciclo request/response, next(), JWT, gestión de sesiones"
+            )
+    elif 'software engineer' in position and 'fastapi' in position:
+        # Software Engineer (Python/FastAPI)
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "How does FastAPI handle dependency injection and why is it useful for building APIs?\n\n"
+                "💡 *Hint:* Mention concepts like: Depends(), dependency tree, database connections, authentication"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Cómo maneja FastAPI la inyección de dependencias y por qué es útil para construir APIs?\n\n"
+                "💡 *Hint:* Menciona conceptos como: Depends(), árbol de dependencias, conexiones de base de datos, autenticación"
+            )
+    elif 'backend' in position:
+        # Fallback for other backend positions
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "How would you design an API endpoint in Django to return a list of users in JSON format?\n\n"
+                "💡 *Hint:* Mention concepts like: Django REST Framework, serializer, view, JSON"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Cómo diseñarías un endpoint de API en Django para devolver una lista de usuarios en formato JSON?\n\n"
+                "💡 *Hint:* Menciona conceptos como: Django REST Framework, serializer, view, JSON"
+            )
+    else:
+        if lang == 'en':
+            tech_q2 = (
+                "🔧 *Question 2 of 3:*\n"
+                "What is Docker and what is it used for?"
+            )
+        else:
+            tech_q2 = (
+                "🔧 *Pregunta 2 de 3:*\n"
+                "¿Qué es Docker y para qué se usa?"
+            )
+    
+    # Add progress indicator and confirmation message
+    is_demo_mode = session.get('demo_mode') == 'full_interview'
+    current_q, total_q = get_progress_info(8)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if not is_demo_mode:
+        if lang == 'en':
+            response_text = (
+                "✅ Got it! Moving to the next question...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progress: Question 2 of 3*\n\n"
+                f"{tech_q2}"
+            )
+        else:
+            response_text = (
+                "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progreso: Pregunta 2 de 3*\n\n"
+                f"{tech_q2}"
+            )
+    else:
+        if lang == 'en':
+            response_text = (
+                "✅ Got it! Moving to the next question...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progress: Question 2 of 3*\n\n"
+                f"{tech_q2}"
+            )
+        else:
+            response_text = (
+                "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progreso: Pregunta 2 de 3*\n\n"
+                f"{tech_q2}"
+            )
+    # Store the full question text for validation
+    session['data']['current_tech_question'] = tech_q2
+    session['stage'] = 8
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(8, 'tech_question_2', transitions=(9,))
+def handle_tech_question_2_stage(phone_number, message_text, session):
+    """Stage 8: Tech Question 2"""
+    response_text = ""
+    
+    # Validate response - check if user just repeated the question
+    current_question = session['data'].get('current_tech_question', '')
+    lang = session.get('language', 'es')
+    
+    if current_question and is_question_repetition(current_question, message_text):
+        # User just repeated the question, ask them to answer properly
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Please provide your own answer to the question.*\n\n"
+                "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
+                f"{current_question}"
+            )
+        else:
+            response_text = (
+                "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
+                "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
+                f"{current_question}"
+            )
+        # Stay in same stage
+        save_session(phone_number, session)
+        return response_text
+    
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
+    if not is_valid:
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
+        if lang == 'en':
+            response_text = f"⚠️ *{msg_en}*\n\n{current_question}"
+        else:
+            response_text = f"⚠️ *{msg_es}*\n\n{current_question}"
+        save_session(phone_number, session)
+        return response_text
+    
+    position = session['data'].get('position', '').lower()
+    if 'data engineer' in position:
+        question_topic = "Python Dynamic Typing"
+    elif 'backend developer' in position and 'django' in position:
+        question_topic = "Django API Endpoint"
+    elif 'full stack' in position and 'react' in position:
+        question_topic = "React Virtual DOM"
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        question_topic = "API Versioning"
+    elif 'backend engineer' in position and 'node.js' in position:
+        question_topic = "Express Middleware"
+    elif 'software engineer' in position and 'fastapi' in position:
+        question_topic = "FastAPI Dependency Injection"
+    elif 'backend' in position:
+        question_topic = "Django API Endpoint"
+    else:
+        question_topic = "Docker"
+    
+    score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q2 now expects detailed response like Q1
+    log_user_action(phone_number, f"Tech Q2 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
+    session['data']['tech_questions'].append({
+        'question': question_topic,
+        'answer': message_text,
+        'score': score
+    })
+    session['scores']['technical'] += score
+    warm_answer_embeddings(session, message_text)
+    
+    emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
+    lang = session.get('language', 'es')
+    
+    # Select question 3 based on position
+    if 'data engineer' in position:
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "How does Apache Spark handle fault tolerance in a distributed environment?\n\n"
+                "💡 *Hint:* Mention concepts like: RDDs, lineage, transformations, node failure, reconstruction"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Cómo maneja Apache Spark la tolerancia a fallos en un entorno distribuido?\n\n"
+                "💡 *Hint:* Menciona conceptos como: RDDs, lineage, transformaciones, fallo de nodo, reconstrucción"
+            )
+    elif 'backend developer' in position and 'django' in position:
+        # Backend Developer (Python/Django)
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is Docker and how would you use it to deploy a Django backend application?\n\n"
+                "💡 *Hint:* Mention concepts like: containers, Dockerfile, docker-compose, images, port mapping"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Qué es Docker y cómo lo usarías para desplegar una aplicación backend Django?\n\n"
+                "💡 *Hint:* Menciona conceptos como: contenedores, Dockerfile, docker-compose, imágenes, mapeo de puertos"
+            )
+    elif 'full stack' in position and 'react' in position:
+        # Full Stack Developer (Python/React)
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "How would you manage state in a large React application? Compare different state management approaches.\n\n"
+                "💡 *Hint:* Mention concepts like: Context API, Redux, Zustand, prop drilling, local vs global state"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Cómo manejarías el estado en una aplicación React grande? Compara diferentes enfoques de gestión de estado.\n\n"
+                "💡 *Hint:* Menciona conceptos como: Context API, Redux, Zustand, prop drilling, estado local vs global"
+            )
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        # API Developer (REST/GraphQL)
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is rate limiting and how would you implement it to protect an API from abuse?\n\n"
+                "💡 *Hint:* Mention concepts like: token bucket, sliding window, Redis, throttling, DDoS protection"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Qué es el rate limiting y cómo lo implementarías para proteger una API del abuso?\n\n"
+                "💡 *Hint:* Menciona conceptos como: token bucket, ventana deslizante, Redis, throttling, protección DDoS"
+            )
+    elif 'backend engineer' in position and 'node.js' in position:
+        # Backend Engineer (Node.js/Express)
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is the difference between callback functions, Promises, and async/await in Node.js? When would you use each?\n\n"
+                "💡 *Hint:* Mention concepts like: callback hell, error handling, readability, asynchronous flow"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Cuál es la diferencia entre funciones callback, Promises y async/await en Node.js? ¿Cuándo usarías cada una?\n\n"
+                "💡 *Hint:* Menciona conceptos como: callback hell, manejo de errores, legibilidad, flujo asíncrono"
+            )
+    elif 'software engineer' in position and 'fastapi' in position:
+        # Software Engineer (Python/FastAPI)
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is Pydantic and how does FastAPI use it for request/response validation?\n\n"
+                "💡 *Hint:* Mention concepts like: data validation, type coercion, automatic documentation, serialization"
+            )
+        else:
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Qué es Pydantic y cómo lo usa FastAPI para validación de request/response?\n\n"
+                "💡 *Hint:* Menciona conceptos como: validación de datos, coerción de tipos, documentación automática, serialización"
+            )
+    elif 'backend' in position:
+        # Fallback for other backend positions
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is Docker and how would you use it to deploy a Django backend application?\n\n"
+                "💡 *Hint:* Mention concepts like: containers, Dockerfile, docker-compose, images, port mapping"
+            )
         else:
-            if lang == 'en':
-                tech_q3 = (
-                    "🔧 *Question 3 of 3:*\n"
-                    "What is CI/CD? Why is it important?"
-                )
-            else:
-                tech_q3 = (
-                    "🔧 *Pregunta 3 de 3:*\n"
-                    "¿Qué es CI/CD? ¿Por qué es importante?"
-                )
-        
-        # Add progress indicator and confirmation message
-        is_demo_mode = session.get('demo_mode') == 'full_interview'
-        current_q, total_q = get_progress_info(9)
-        progress_bar = get_progress_bar(current_q, total_q)
-        
-        if not is_demo_mode:
-            if lang == 'en':
-                response_text = (
-                    "✅ Got it! Moving to the next question...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progress: Question 3 of 3*\n\n"
-                    f"{tech_q3}"
-                )
-            else:
-                response_text = (
-                    "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progreso: Pregunta 3 de 3*\n\n"
-                    f"{tech_q3}"
-                )
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Qué es Docker y cómo lo usarías para desplegar una aplicación backend Django?\n\n"
+                "💡 *Hint:* Menciona conceptos como: contenedores, Dockerfile, docker-compose, imágenes, mapeo de puertos"
+            )
+    else:
+        if lang == 'en':
+            tech_q3 = (
+                "🔧 *Question 3 of 3:*\n"
+                "What is CI/CD? Why is it important?"
+            )
         else:
-            if lang == 'en':
-                response_text = (
-                    "✅ Got it! Moving to the next question...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progress: Question 3 of 3*\n\n"
-                    f"{tech_q3}"
-                )
-            else:
-                response_text = (
-                    "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
-                    f"{progress_bar}\n\n"
-                    "📊 *Progreso: Pregunta 3 de 3*\n\n"
-                    f"{tech_q3}"
-                )
-        # Store the full question text for validation
-        session['data']['current_tech_question'] = tech_q3
-        session['stage'] = 9
-    
-    elif stage == 9:  # Tech Question 3
-        # Validate response - check if user just repeated the question
-        current_question = session['data'].get('current_tech_question', '')
-        lang = session.get('language', 'es')
-        
-        if current_question and is_question_repetition(current_question, message_text):
-            # User just repeated the question, ask them to answer properly
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please provide your own answer to the question.*\n\n"
-                    "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
-                    f"{current_question}"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
-                    "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
-                    f"{current_question}"
-                )
-            # Stay in same stage
-            save_session(phone_number, session)
-            return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
-        if not is_valid:
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            if lang == 'en':
-                response_text = f"⚠️ *{msg_en}*\n\n{current_question}"
-            else:
-                response_text = f"⚠️ *{msg_es}*\n\n{current_question}"
-            save_session(phone_number, session)
-            return response_text
-        
-        position = session['data'].get('position', '').lower()
-        if 'data engineer' in position:
-            question_topic = "Apache Spark Fault Tolerance"
-        elif 'backend developer' in position and 'django' in position:
-            question_topic = "Docker Django Backend"
-        elif 'full stack' in position and 'react' in position:
-            question_topic = "React State Management"
-        elif 'api developer' in position or ('rest' in position and 'graphql' in position):
-            question_topic = "API Rate Limiting"
-        elif 'backend engineer' in position and 'node.js' in position:
-            question_topic = "Node.js Async Patterns"
-        elif 'software engineer' in position and 'fastapi' in position:
-            question_topic = "FastAPI Pydantic"
-        elif 'backend' in position:
-            question_topic = "Docker Django Backend"
+            tech_q3 = (
+                "🔧 *Pregunta 3 de 3:*\n"
+                "¿Qué es CI/CD? ¿Por qué es importante?"
+            )
+    
+    # Add progress indicator and confirmation message
+    is_demo_mode = session.get('demo_mode') == 'full_interview'
+    current_q, total_q = get_progress_info(9)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if not is_demo_mode:
+        if lang == 'en':
+            response_text = (
+                "✅ Got it! Moving to the next question...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progress: Question 3 of 3*\n\n"
+                f"{tech_q3}"
+            )
         else:
-            question_topic = "CI/CD"
-        
-        score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q3 now expects detailed response like Q1
-        log_user_action(phone_number, f"Tech Q3 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
-        session['data']['tech_questions'].append({
-            'question': question_topic,
-            'answer': message_text,
-            'score': score
-        })
-        session['scores']['technical'] += score
-        
-        # Calculate average technical score
-        avg_tech = session['scores']['technical'] / 3
-        log_user_action(phone_number, f"Technical average: {avg_tech:.1f}/5.0", "", session, "INFO")
-        
-        # Get position-specific technology for English question
-        position = session['data'].get('position', '').lower()
-        lang = session.get('language', 'es')
+            response_text = (
+                "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progreso: Pregunta 3 de 3*\n\n"
+                f"{tech_q3}"
+            )
+    else:
+        if lang == 'en':
+            response_text = (
+                "✅ Got it! Moving to the next question...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progress: Question 3 of 3*\n\n"
+                f"{tech_q3}"
+            )
+        else:
+            response_text = (
+                "✅ ¡Entendido! Pasando a la siguiente pregunta...\n\n"
+                f"{progress_bar}\n\n"
+                "📊 *Progreso: Pregunta 3 de 3*\n\n"
+                f"{tech_q3}"
+            )
+    # Store the full question text for validation
+    session['data']['current_tech_question'] = tech_q3
+    session['stage'] = 9
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(9, 'tech_question_3', transitions=(10,))
+def handle_tech_question_3_stage(phone_number, message_text, session):
+    """Stage 9: Tech Question 3"""
+    response_text = ""
+    
+    # Validate response - check if user just repeated the question
+    current_question = session['data'].get('current_tech_question', '')
+    lang = session.get('language', 'es')
+    
+    if current_question and is_question_repetition(current_question, message_text):
+        # User just repeated the question, ask them to answer properly
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Please provide your own answer to the question.*\n\n"
+                "It looks like you might have copied the question. Please explain your answer in your own words.\n\n"
+                f"{current_question}"
+            )
+        else:
+            response_text = (
+                "⚠️ *Por favor proporciona tu propia respuesta a la pregunta.*\n\n"
+                "Parece que copiaste la pregunta. Por favor explica tu respuesta con tus propias palabras.\n\n"
+                f"{current_question}"
+            )
+        # Stay in same stage
+        save_session(phone_number, session)
+        return response_text
+    
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
+    if not is_valid:
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain your answer in at least 8 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica tu respuesta en al menos 8 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your answer.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu respuesta.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your thoughts clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tus pensamientos.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
+        if lang == 'en':
+            response_text = f"⚠️ *{msg_en}*\n\n{current_question}"
+        else:
+            response_text = f"⚠️ *{msg_es}*\n\n{current_question}"
+        save_session(phone_number, session)
+        return response_text
+    
+    position = session['data'].get('position', '').lower()
+    if 'data engineer' in position:
+        question_topic = "Apache Spark Fault Tolerance"
+    elif 'backend developer' in position and 'django' in position:
+        question_topic = "Docker Django Backend"
+    elif 'full stack' in position and 'react' in position:
+        question_topic = "React State Management"
+    elif 'api developer' in position or ('rest' in position and 'graphql' in position):
+        question_topic = "API Rate Limiting"
+    elif 'backend engineer' in position and 'node.js' in position:
+        question_topic = "Node.js Async Patterns"
+    elif 'software engineer' in position and 'fastapi' in position:
+        question_topic = "FastAPI Pydantic"
+    elif 'backend' in position:
+        question_topic = "Docker Django Backend"
+    else:
+        question_topic = "CI/CD"
+    
+    score = evaluate_response(question_topic, message_text, expects_brief=False)  # Q3 now expects detailed response like Q1
+    log_user_action(phone_number, f"Tech Q3 scored: {score}/5.0", f"Question: {question_topic}", session, "INFO")
+    session['data']['tech_questions'].append({
+        'question': question_topic,
+        'answer': message_text,
+        'score': score
+    })
+    session['scores']['technical'] += score
+    warm_answer_embeddings(session, message_text)
+    
+    # Calculate average technical score
+    avg_tech = session['scores']['technical'] / 3
+    log_user_action(phone_number, f"Technical average: {avg_tech:.1f}/5.0", "", session, "INFO")
+    
+    # Get position-specific technology for English question
+    position = session['data'].get('position', '').lower()
+    lang = session.get('language', 'es')
+    tech_stack = "Python"  # Default
+    
+    if 'data engineer' in position:
+        tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
+    elif 'backend' in position:
+        tech_stack = "backend development (Python, Node.js, databases, etc.)"
+    elif 'frontend' in position:
+        tech_stack = "frontend development (React, TypeScript, UI/UX, etc.)"
+    elif 'devops' in position:
+        tech_stack = "DevOps and infrastructure (Docker, Kubernetes, CI/CD, etc.)"
+    elif 'full stack' in position:
+        tech_stack = "full stack development (frontend and backend technologies)"
+    
+    # Get progress info
+    current_q, total_q = get_progress_info(10)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if lang == 'en':
+        response_text = (
+            "✅ Got it! Moving to the next section...\n\n"
+            f"{progress_bar}\n\n"
+            f"✅ Technical questions completed! 📊 Your technical score: {avg_tech:.1f}/5.0\n\n"
+            "🗣️ Now let's evaluate your English.\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "🇬🇧 *English Evaluation* (2 questions)\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "💡 *What I'm evaluating:*\n"
+            "• Grammar and vocabulary\n"
+            "• Fluency and naturalness\n"
+            "• Professional communication\n"
+            "• Clarity of expression\n\n"
+            "📊 *Progress: Question 1 of 2*\n\n"
+            "🇬🇧 *Question 1:*\n"
+            f"Describe your experience with {tech_stack}.\n"
+            "(Answer in English please)"
+        )
+    else:
+        response_text = (
+            "✅ ¡Entendido! Pasando a la siguiente sección...\n\n"
+            f"{progress_bar}\n\n"
+            f"✅ Preguntas técnicas completadas! 📊 Tu score técnico: {avg_tech:.1f}/5.0\n\n"
+            "🗣️ Ahora evaluemos tu inglés.\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "🇬🇧 *Evaluación de Inglés* (2 preguntas)\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "💡 *Qué estoy evaluando:*\n"
+            "• Gramática y vocabulario\n"
+            "• Fluidez y naturalidad\n"
+            "• Comunicación profesional\n"
+            "• Claridad de expresión\n\n"
+            "📊 *Progreso: Pregunta 1 de 2*\n\n"
+            "🇬🇧 *Question 1:*\n"
+            f"Describe your experience with {tech_stack}.\n"
+            "(Answer in English please)"
+        )
+    session['data']['english_questions'] = []
+    session['stage'] = 10
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(10, 'english_question_1', transitions=(11,))
+def handle_english_question_1_stage(phone_number, message_text, session):
+    """Stage 10: English Question 1"""
+    response_text = ""
+    
+    # Validate that response is in English
+    detected_lang = detect_language(message_text)
+    lang = session.get('language', 'es')
+    
+    if detected_lang != 'en':
+        # Response is not in English, ask to answer in English
+        # Get tech_stack for the question
+        position = session.get('data', {}).get('position', '').lower()
         tech_stack = "Python"  # Default
-        
-        if 'data engineer' in position:
+        if 'data' in position or 'engineer' in position:
             tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
-        elif 'backend' in position:
+        elif 'backend' in position or 'developer' in position:
             tech_stack = "backend development (Python, Node.js, databases, etc.)"
-        elif 'frontend' in position:
-            tech_stack = "frontend development (React, TypeScript, UI/UX, etc.)"
-        elif 'devops' in position:
-            tech_stack = "DevOps and infrastructure (Docker, Kubernetes, CI/CD, etc.)"
-        elif 'full stack' in position:
-            tech_stack = "full stack development (frontend and backend technologies)"
-        
-        # Get progress info
-        current_q, total_q = get_progress_info(10)
-        progress_bar = get_progress_bar(current_q, total_q)
         
         if lang == 'en':
             response_text = (
-                "✅ Got it! Moving to the next section...\n\n"
-                f"{progress_bar}\n\n"
-                f"✅ Technical questions completed! 📊 Your technical score: {avg_tech:.1f}/5.0\n\n"
-                "🗣️ Now let's evaluate your English.\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "🇬🇧 *English Evaluation* (2 questions)\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "💡 *What I'm evaluating:*\n"
-                "• Grammar and vocabulary\n"
-                "• Fluency and naturalness\n"
-                "• Professional communication\n"
-                "• Clarity of expression\n\n"
-                "📊 *Progress: Question 1 of 2*\n\n"
+                "⚠️ *Please answer in English.*\n\n"
+                "This question evaluates your English level. Please respond in English.\n\n"
                 "🇬🇧 *Question 1:*\n"
                 f"Describe your experience with {tech_stack}.\n"
                 "(Answer in English please)"
             )
         else:
             response_text = (
-                "✅ ¡Entendido! Pasando a la siguiente sección...\n\n"
-                f"{progress_bar}\n\n"
-                f"✅ Preguntas técnicas completadas! 📊 Tu score técnico: {avg_tech:.1f}/5.0\n\n"
-                "🗣️ Ahora evaluemos tu inglés.\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "🇬🇧 *Evaluación de Inglés* (2 preguntas)\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "💡 *Qué estoy evaluando:*\n"
-                "• Gramática y vocabulario\n"
-                "• Fluidez y naturalidad\n"
-                "• Comunicación profesional\n"
-                "• Claridad de expresión\n\n"
-                "📊 *Progreso: Pregunta 1 de 2*\n\n"
+                "⚠️ *Por favor responde en inglés.*\n\n"
+                "Esta pregunta evalúa tu nivel de inglés. Por favor responde en inglés.\n\n"
                 "🇬🇧 *Question 1:*\n"
                 f"Describe your experience with {tech_stack}.\n"
                 "(Answer in English please)"
             )
-        session['data']['english_questions'] = []
-        session['stage'] = 10
+        # Stay in same stage, don't advance
+        save_session(phone_number, session)
+        return response_text
     
-    elif stage == 10:  # English Question 1
-        # Validate that response is in English
-        detected_lang = detect_language(message_text)
-        lang = session.get('language', 'es')
-        
-        if detected_lang != 'en':
-            # Response is not in English, ask to answer in English
-            # Get tech_stack for the question
-            position = session.get('data', {}).get('position', '').lower()
-            tech_stack = "Python"  # Default
-            if 'data' in position or 'engineer' in position:
-                tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
-            elif 'backend' in position or 'developer' in position:
-                tech_stack = "backend development (Python, Node.js, databases, etc.)"
-            
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please answer in English.*\n\n"
-                    "This question evaluates your English level. Please respond in English.\n\n"
-                    "🇬🇧 *Question 1:*\n"
-                    f"Describe your experience with {tech_stack}.\n"
-                    "(Answer in English please)"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor responde en inglés.*\n\n"
-                    "Esta pregunta evalúa tu nivel de inglés. Por favor responde en inglés.\n\n"
-                    "🇬🇧 *Question 1:*\n"
-                    f"Describe your experience with {tech_stack}.\n"
-                    "(Answer in English please)"
-                )
-            # Stay in same stage, don't advance
-            save_session(phone_number, session)
-            return response_text
-        
-        # Check if response is copied from previous English answers only (not technical)
-        # For English Question 1, we only check against other English answers, not technical
-        # This allows users to copy suggested answers without issues
-        print(f"[DEBUG] Checking if response is copied from previous English answers...")
-        english_questions = session.get('data', {}).get('english_questions', [])
-        print(f"[DEBUG] Found {len(english_questions)} previous English answers")
-        if len(english_questions) > 0:
-            # Check if this response matches any previous English answer
-            current_lower = message_text.lower().strip()
-            current_words = set(current_lower.split())
-            
-            for eng_q in english_questions:
-                if 'answer' in eng_q:
-                    prev_answer = eng_q['answer'].lower().strip()
-                    if len(prev_answer) >= 20:
-                        prev_words = set(prev_answer.split())
-                        if len(current_words) > 0 and len(prev_words) > 0:
-                            overlap = len(current_words & prev_words)
-                            similarity = overlap / min(len(current_words), len(prev_words))
-                            if similarity > 0.7:  # 70% similarity threshold
-                                # Get tech_stack for error message
-                                position = session.get('data', {}).get('position', '').lower()
-                                tech_stack = "Python"  # Default
-                                if 'data' in position or 'engineer' in position:
-                                    tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
-                                elif 'backend' in position or 'developer' in position:
-                                    tech_stack = "backend development (Python, Node.js, databases, etc.)"
-                                
-                                if lang == 'en':
-                                    response_text = (
-                                        "⚠️ *Please provide your own answer to this question.*\n\n"
-                                        "It looks like you might have copied a previous answer. This question asks about your experience, please answer specifically.\n\n"
-                                        "🇬🇧 *Question 1:*\n"
-                                        f"Describe your experience with {tech_stack}.\n"
-                                        "(Answer in English please)"
-                                    )
-                                else:
-                                    response_text = (
-                                        "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
-                                        "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre tu experiencia, por favor responde específicamente.\n\n"
-                                        "🇬🇧 *Question 1:*\n"
-                                        f"Describe your experience with {tech_stack}.\n"
-                                        "(Answer in English please)"
-                                    )
-                                save_session(phone_number, session)
-                                return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=5, min_length=20)
-        if not is_valid:
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 20 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 20 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain in at least 5 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica en al menos 5 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your experience clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tu experiencia.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            position = session.get('data', {}).get('position', '').lower()
-            tech_stack = "Python"
-            if 'data' in position or 'engineer' in position:
-                tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
-            elif 'backend' in position or 'developer' in position:
-                tech_stack = "backend development (Python, Node.js, databases, etc.)"
-            if lang == 'en':
-                response_text = f"⚠️ *{msg_en}*\n\n🇬🇧 *Question 1:*\nDescribe your experience with {tech_stack}.\n(Answer in English please)"
-            else:
-                response_text = f"⚠️ *{msg_es}*\n\n🇬🇧 *Question 1:*\nDescribe your experience with {tech_stack}.\n(Answer in English please)"
-            save_session(phone_number, session)
-            return response_text
-        
-        # Response is in English, evaluate normally
-        print(f"[DEBUG] Response is valid English, evaluating...")
-        english_score = evaluate_english_level(message_text)
-        print(f"[DEBUG] English score: {english_score:.1f}/5.0")
-        session['data']['english_questions'].append({
-            'question': 'Python experience',
-            'answer': message_text,
-            'score': english_score
-        })
-        session['scores']['english'] += english_score
-        print(f"[DEBUG] Total English score: {session['scores']['english']:.1f}")
-        
-        emotion = session['emotions'][-1]
-        
-        # Log that we're proceeding to question 2
-        print(f"[INFO] English Question 1 answered successfully. Score: {english_score:.1f}/5.0")
-        print(f"[INFO] Moving to stage 11 (English Question 2)")
+    # Check if response is copied from previous English answers only (not technical)
+    # For English Question 1, we only check against other English answers, not technical
+    # This allows users to copy suggested answers without issues
+    log.debug("Checking if response is copied from previous English answers...")
+    english_questions = session.get('data', {}).get('english_questions', [])
+    log.debug("Found %s previous English answers", len(english_questions))
+    if len(english_questions) > 0:
+        # Check if this response matches any previous English answer
+        current_lower = message_text.lower().strip()
+        current_words = set(current_lower.split())
         
-        response_text = (
-            "Good! 😊\n\n"
-            "🇬🇧 *Question 2:*\n"
-            "What's your biggest professional achievement?\n"
-            "(Answer in English please)"
-        )
-        session['stage'] = 11
-        save_session(phone_number, session)  # CRITICAL: Save before returning
-        print(f"[INFO] Response text generated (length: {len(response_text)} chars), returning...")
-        print(f"[DEBUG] Response text content: {repr(response_text)}")
+        for eng_q in english_questions:
+            if 'answer' in eng_q:
+                prev_answer = eng_q['answer'].lower().strip()
+                if len(prev_answer) >= 20:
+                    prev_words = set(prev_answer.split())
+                    if len(current_words) > 0 and len(prev_words) > 0:
+                        overlap = len(current_words & prev_words)
+                        similarity = overlap / min(len(current_words), len(prev_words))
+                        if similarity > 0.7:  # 70% similarity threshold
+                            # Get tech_stack for error message
+                            position = session.get('data', {}).get('position', '').lower()
+                            tech_stack = "Python"  # Default
+                            if 'data' in position or 'engineer' in position:
+                                tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
+                            elif 'backend' in position or 'developer' in position:
+                                tech_stack = "backend development (Python, Node.js, databases, etc.)"
+                            
+                            if lang == 'en':
+                                response_text = (
+                                    "⚠️ *Please provide your own answer to this question.*\n\n"
+                                    "It looks like you might have copied a previous answer. This question asks about your experience, please answer specifically.\n\n"
+                                    "🇬🇧 *Question 1:*\n"
+                                    f"Describe your experience with {tech_stack}.\n"
+                                    "(Answer in English please)"
+                                )
+                            else:
+                                response_text = (
+                                    "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
+                                    "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre tu experiencia, por favor responde específicamente.\n\n"
+                                    "🇬🇧 *Question 1:*\n"
+                                    f"Describe your experience with {tech_stack}.\n"
+                                    "(Answer in English please)"
+                                )
+                            save_session(phone_number, session)
+                            return response_text
+    
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=5, min_length=20)
+    if not is_valid:
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 20 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 20 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain in at least 5 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica en al menos 5 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your experience clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tu experiencia.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
+        position = session.get('data', {}).get('position', '').lower()
+        tech_stack = "Python"
+        if 'data' in position or 'engineer' in position:
+            tech_stack = "data engineering and ETL pipelines (PySpark, Airflow, etc.)"
+        elif 'backend' in position or 'developer' in position:
+            tech_stack = "backend development (Python, Node.js, databases, etc.)"
+        if lang == 'en':
+            response_text = f"⚠️ *{msg_en}*\n\n🇬🇧 *Question 1:*\nDescribe your experience with {tech_stack}.\n(Answer in English please)"
+        else:
+            response_text = f"⚠️ *{msg_es}*\n\n🇬🇧 *Question 1:*\nDescribe your experience with {tech_stack}.\n(Answer in English please)"
+        save_session(phone_number, session)
         return response_text
     
-    elif stage == 11:  # English Question 2
-        # Check if user already answered this question
-        english_questions = session.get('data', {}).get('english_questions', [])
-        if len(english_questions) >= 2:
-            # User already answered question 2, check if this is a short non-answer message
-            message_stripped = message_text.strip().upper()
-            # Common greetings/short messages that shouldn't be processed as answers
-            short_messages = ['HOLA', 'HI', 'HELLO', 'HOLA!', 'HI!', 'HELLO!', 'OK', 'OKAY', 'SI', 'YES', 'NO', 'GRACIAS', 'THANKS', 'THANK YOU']
+    # Response is in English, evaluate normally
+    log.debug("Response is valid English, evaluating...")
+    english_score = evaluate_english_level(message_text)
+    log.debug("English score: %.1f/5.0", english_score)
+    session['data']['english_questions'].append({
+        'question': 'Python experience',
+        'answer': message_text,
+        'score': english_score
+    })
+    session['scores']['english'] += english_score
+    warm_answer_embeddings(session, message_text)
+    log.debug("Total English score: %.1f", session['scores']['english'])
+    
+    emotion = session['emotions'][-1]
+    
+    # Log that we're proceeding to question 2
+    log.info("English Question 1 answered successfully. Score: %.1f/5.0", english_score)
+    log.info("Moving to stage 11 (English Question 2)")
+    
+    response_text = (
+        "Good! 😊\n\n"
+        "🇬🇧 *Question 2:*\n"
+        "What's your biggest professional achievement?\n"
+        "(Answer in English please)"
+    )
+    session['stage'] = 11
+    save_session(phone_number, session)  # CRITICAL: Save before returning
+    log.info("Response text generated (length: %s chars), returning...", len(response_text))
+    log.debug("Response text content: %r", response_text)
+    return response_text
+
+@stage_machine.stage(11, 'english_question_2', transitions=(12,))
+def handle_english_question_2_stage(phone_number, message_text, session):
+    """Stage 11: English Question 2"""
+    response_text = ""
+    
+    # Check if user already answered this question
+    english_questions = session.get('data', {}).get('english_questions', [])
+    if len(english_questions) >= 2:
+        # User already answered question 2, check if this is a short non-answer message
+        message_stripped = message_text.strip().upper()
+        # Common greetings/short messages that shouldn't be processed as answers
+        short_messages = ['HOLA', 'HI', 'HELLO', 'HOLA!', 'HI!', 'HELLO!', 'OK', 'OKAY', 'SI', 'YES', 'NO', 'GRACIAS', 'THANKS', 'THANK YOU']
+        
+        if message_stripped in short_messages or len(message_text.strip()) < 10:
+            # This is a greeting or short message, not an answer - continue to next stage
+            lang = session.get('language', 'es')
+            avg_english = session['scores']['english'] / 2
             
-            if message_stripped in short_messages or len(message_text.strip()) < 10:
-                # This is a greeting or short message, not an answer - continue to next stage
-                lang = session.get('language', 'es')
-                avg_english = session['scores']['english'] / 2
-                
-                if lang == 'en':
-                    response_text = (
-                        f"Excellent! ✅\n\n"
-                        f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
-                        "💼 *Last section: Soft Skills*\n\n"
-                        "🤝 Tell me about a time you worked in a team to solve a difficult problem."
-                    )
-                else:
-                    response_text = (
-                        f"Excellent! ✅\n\n"
-                        f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
-                        "💼 *Última sección: Soft Skills*\n\n"
-                        "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
-                    )
-                session['stage'] = 12
-                save_session(phone_number, session)
-                return response_text
-        
-        # Validate that response is in English
-        detected_lang = detect_language(message_text)
-        lang = session.get('language', 'es')
-        
-        if detected_lang != 'en':
-            # Response is not in English, ask to answer in English
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please answer in English.*\n\n"
-                    "This question evaluates your English level. Please respond in English.\n\n"
-                    "🇬🇧 *Question 2:*\n"
-                    "What's your biggest professional achievement?\n"
-                    "(Answer in English please)"
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor responde en inglés.*\n\n"
-                    "Esta pregunta evalúa tu nivel de inglés. Por favor responde en inglés.\n\n"
-                    "🇬🇧 *Question 2:*\n"
-                    "What's your biggest professional achievement?\n"
-                    "(Answer in English please)"
-                )
-            # Stay in same stage, don't advance
-            save_session(phone_number, session)
-            return response_text
-        
-        # Check if response is copied from previous answers
-        is_copied, source = is_copied_from_previous(session, message_text)
-        if is_copied:
             if lang == 'en':
                 response_text = (
-                    "⚠️ *Please provide your own answer to this question.*\n\n"
-                    "It looks like you might have copied a previous answer. This question asks about your achievement, please answer specifically.\n\n"
-                    "🇬🇧 *Question 2:*\n"
-                    "What's your biggest professional achievement?\n"
-                    "(Answer in English please)"
+                    f"Excellent! ✅\n\n"
+                    f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
+                    "💼 *Last section: Soft Skills*\n\n"
+                    "🤝 Tell me about a time you worked in a team to solve a difficult problem."
                 )
             else:
                 response_text = (
-                    "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
-                    "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre tu logro, por favor responde específicamente.\n\n"
-                    "🇬🇧 *Question 2:*\n"
-                    "What's your biggest professional achievement?\n"
-                    "(Answer in English please)"
+                    f"Excellent! ✅\n\n"
+                    f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
+                    "💼 *Última sección: Soft Skills*\n\n"
+                    "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
                 )
+            session['stage'] = 12
             save_session(phone_number, session)
             return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=5, min_length=20)
-        if not is_valid:
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 20 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 20 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain in at least 5 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica en al menos 5 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your achievement clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tu logro.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            if lang == 'en':
-                response_text = f"⚠️ *{msg_en}*\n\n🇬🇧 *Question 2:*\nWhat's your biggest professional achievement?\n(Answer in English please)"
-            else:
-                response_text = f"⚠️ *{msg_es}*\n\n🇬🇧 *Question 2:*\nWhat's your biggest professional achievement?\n(Answer in English please)"
-            save_session(phone_number, session)
-            return response_text
-        
-        # Response is in English, evaluate normally
-        english_score = evaluate_english_level(message_text)
-        session['data']['english_questions'].append({
-            'question': 'Professional achievement',
-            'answer': message_text,
-            'score': english_score
-        })
-        session['scores']['english'] += english_score
-        
-        # Calculate average English score
-        avg_english = session['scores']['english'] / 2
-        lang = session.get('language', 'es')
-        
-        # Get progress info for soft skills stage
-        current_q, total_q = get_progress_info(12)
-        progress_bar = get_progress_bar(current_q, total_q)
-        
+    
+    # Validate that response is in English
+    detected_lang = detect_language(message_text)
+    lang = session.get('language', 'es')
+    
+    if detected_lang != 'en':
+        # Response is not in English, ask to answer in English
         if lang == 'en':
             response_text = (
-                "✅ Great! Your English is being evaluated...\n\n"
-                f"{progress_bar}\n\n"
-                f"Excellent! ✅\n\n"
-                f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "💼 *Soft Skills Section* (1 question)\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "💡 *What I'm evaluating:*\n"
-                "• Teamwork and collaboration\n"
-                "• Problem-solving approach\n"
-                "• Communication skills\n"
-                "• Leadership potential\n\n"
-                "📊 *Progress: Question 12 of 13*\n\n"
-                "💼 *Last section: Soft Skills*\n\n"
-                "🤝 Tell me about a time you worked in a team to solve a difficult problem."
+                "⚠️ *Please answer in English.*\n\n"
+                "This question evaluates your English level. Please respond in English.\n\n"
+                "🇬🇧 *Question 2:*\n"
+                "What's your biggest professional achievement?\n"
+                "(Answer in English please)"
             )
         else:
             response_text = (
-                "✅ ¡Genial! Tu inglés está siendo evaluado...\n\n"
-                f"{progress_bar}\n\n"
-                f"Excellent! ✅\n\n"
-                f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "💼 *Sección Soft Skills* (1 pregunta)\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "💡 *Qué estoy evaluando:*\n"
-                "• Trabajo en equipo y colaboración\n"
-                "• Enfoque de resolución de problemas\n"
-                "• Habilidades de comunicación\n"
-                "• Potencial de liderazgo\n\n"
-                "📊 *Progreso: Pregunta 12 de 13*\n\n"
-                "💼 *Última sección: Soft Skills*\n\n"
-                "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
+                "⚠️ *Por favor responde en inglés.*\n\n"
+                "Esta pregunta evalúa tu nivel de inglés. Por favor responde en inglés.\n\n"
+                "🇬🇧 *Question 2:*\n"
+                "What's your biggest professional achievement?\n"
+                "(Answer in English please)"
             )
-        session['stage'] = 12
+        # Stay in same stage, don't advance
+        save_session(phone_number, session)
+        return response_text
     
-    elif stage == 12:  # Soft Skills
-        lang = session.get('language', 'es')
-        
-        # Check if response is copied from previous answers
-        is_copied, source = is_copied_from_previous(session, message_text)
-        if is_copied:
-            if lang == 'en':
-                response_text = (
-                    "⚠️ *Please provide your own answer to this question.*\n\n"
-                    "It looks like you might have copied a previous answer. This question asks about teamwork, please answer specifically.\n\n"
-                    "🤝 Tell me about a time you worked in a team to solve a difficult problem."
-                )
-            else:
-                response_text = (
-                    "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
-                    "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre trabajo en equipo, por favor responde específicamente.\n\n"
-                    "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
-                )
-            save_session(phone_number, session)
-            return response_text
-        
-        # Validate that response makes sense
-        is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
-        if not is_valid:
-            reason_messages = {
-                'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
-                'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
-                             'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
-                'too_few_words': ('Your answer needs more words. Please explain in at least 8 words.', 
-                                 'Tu respuesta necesita más palabras. Por favor explica en al menos 8 palabras.'),
-                'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your experience.', 
-                                'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu experiencia.'),
-                'no_coherence': ('Please provide a more detailed answer that explains your teamwork experience clearly.', 
-                               'Por favor proporciona una respuesta más detallada que explique claramente tu experiencia de trabajo en equipo.'),
-                'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
-                              'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
-            }
-            msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
-            if lang == 'en':
-                response_text = f"⚠️ *{msg_en}*\n\n🤝 Tell me about a time you worked in a team to solve a difficult problem."
-            else:
-                response_text = f"⚠️ *{msg_es}*\n\n🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
-            save_session(phone_number, session)
-            return response_text
-        
-        # Evaluate soft skills
-        soft_score = evaluate_soft_skills(message_text)
-        session['data']['soft_skills_answer'] = message_text
-        session['scores']['soft_skills'] = soft_score
-        
-        emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
-        lang = session.get('language', 'es')
-        
-        # Get progress info for final question stage
-        current_q, total_q = get_progress_info(13)
-        progress_bar = get_progress_bar(current_q, total_q)
-        
+    # Check if response is copied from previous answers
+    is_copied, source = is_copied_from_previous(session, message_text)
+    if is_copied:
+        if lang == 'en':
+            response_text = (
+                "⚠️ *Please provide your own answer to this question.*\n\n"
+                "It looks like you might have copied a previous answer. This question asks about your achievement, please answer specifically.\n\n"
+                "🇬🇧 *Question 2:*\n"
+                "What's your biggest professional achievement?\n"
+                "(Answer in English please)"
+            )
+        else:
+            response_text = (
+                "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
+                "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre tu logro, por favor responde específicamente.\n\n"
+                "🇬🇧 *Question 2:*\n"
+                "What's your biggest professional achievement?\n"
+                "(Answer in English please)"
+            )
+        save_session(phone_number, session)
+        return response_text
+    
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=5, min_length=20)
+    if not is_valid:
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 20 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 20 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain in at least 5 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica en al menos 5 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your achievement clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tu logro.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
+        if lang == 'en':
+            response_text = f"⚠️ *{msg_en}*\n\n🇬🇧 *Question 2:*\nWhat's your biggest professional achievement?\n(Answer in English please)"
+        else:
+            response_text = f"⚠️ *{msg_es}*\n\n🇬🇧 *Question 2:*\nWhat's your biggest professional achievement?\n(Answer in English please)"
+        save_session(phone_number, session)
+        return response_text
+    
+    # Response is in English, evaluate normally
+    english_score = evaluate_english_level(message_text)
+    session['data']['english_questions'].append({
+        'question': 'Professional achievement',
+        'answer': message_text,
+        'score': english_score
+    })
+    session['scores']['english'] += english_score
+    warm_answer_embeddings(session, message_text)
+    
+    # Calculate average English score
+    avg_english = session['scores']['english'] / 2
+    lang = session.get('language', 'es')
+    
+    # Get progress info for soft skills stage
+    current_q, total_q = get_progress_info(12)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if lang == 'en':
+        response_text = (
+            "✅ Great! Your English is being evaluated...\n\n"
+            f"{progress_bar}\n\n"
+            f"Excellent! ✅\n\n"
+            f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "💼 *Soft Skills Section* (1 question)\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "💡 *What I'm evaluating:*\n"
+            "• Teamwork and collaboration\n"
+            "• Problem-solving approach\n"
+            "• Communication skills\n"
+            "• Leadership potential\n\n"
+            "📊 *Progress: Question 12 of 13*\n\n"
+            "💼 *Last section: Soft Skills*\n\n"
+            "🤝 Tell me about a time you worked in a team to solve a difficult problem."
+        )
+    else:
+        response_text = (
+            "✅ ¡Genial! Tu inglés está siendo evaluado...\n\n"
+            f"{progress_bar}\n\n"
+            f"Excellent! ✅\n\n"
+            f"📊 English level: *{avg_english:.1f}/5.0*\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "💼 *Sección Soft Skills* (1 pregunta)\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "💡 *Qué estoy evaluando:*\n"
+            "• Trabajo en equipo y colaboración\n"
+            "• Enfoque de resolución de problemas\n"
+            "• Habilidades de comunicación\n"
+            "• Potencial de liderazgo\n\n"
+            "📊 *Progreso: Pregunta 12 de 13*\n\n"
+            "💼 *Última sección: Soft Skills*\n\n"
+            "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
+        )
+    session['stage'] = 12
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(12, 'soft_skills_question', transitions=(13,))
+def handle_soft_skills_question_stage(phone_number, message_text, session):
+    """Stage 12: Soft Skills"""
+    response_text = ""
+    
+    lang = session.get('language', 'es')
+    
+    # Check if response is copied from previous answers
+    is_copied, source = is_copied_from_previous(session, message_text)
+    if is_copied:
         if lang == 'en':
             response_text = (
-                "✅ Thank you! Processing your response...\n\n"
-                f"📊 Soft Skills score: *{soft_score:.1f}/5.0*\n\n"
-                f"{progress_bar}\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "📊 *Almost done!*\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Very good! 😊\n\n"
-                "📊 *Progress: Question 13 of 13*\n\n"
-                "❓ *Last question:*\n"
-                "Why should we hire you and not another candidate?\n"
-                "(Be honest and specific)"
+                "⚠️ *Please provide your own answer to this question.*\n\n"
+                "It looks like you might have copied a previous answer. This question asks about teamwork, please answer specifically.\n\n"
+                "🤝 Tell me about a time you worked in a team to solve a difficult problem."
             )
         else:
             response_text = (
-                "✅ ¡Gracias! Procesando tu respuesta...\n\n"
-                f"📊 Soft Skills score: *{soft_score:.1f}/5.0*\n\n"
-                f"{progress_bar}\n\n"
-                "━━━━━━━━━━━━━━━━━━\n"
-                "📊 *¡Casi terminamos!*\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "¡Muy bien! 😊\n\n"
-                "📊 *Progreso: Pregunta 13 de 13*\n\n"
-                "❓ *Última pregunta:*\n"
-                "¿Por qué deberíamos contratarte a ti y no a otro candidato?\n"
-                "(Se honesto y específico)"
+                "⚠️ *Por favor proporciona tu propia respuesta a esta pregunta.*\n\n"
+                "Parece que copiaste una respuesta anterior. Esta pregunta pregunta sobre trabajo en equipo, por favor responde específicamente.\n\n"
+                "🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
             )
-        session['stage'] = 13
+        save_session(phone_number, session)
+        return response_text
     
-    elif stage == 13:  # Final Question
-        session['data']['final_answer'] = message_text
-        
-        # Calculate final scores
-        tech_avg = session['scores']['technical'] / 3
-        english_avg = session['scores']['english'] / 2
-        soft_skills = session['scores']['soft_skills']
-        
-        # Overall score (weighted average)
-        final_score = (tech_avg * 0.4) + (english_avg * 0.3) + (soft_skills * 0.3)
-        log_user_action(phone_number, f"Final score calculated: {final_score:.2f}/5.0", 
-                       f"Tech: {tech_avg:.1f}, English: {english_avg:.1f}, Soft: {soft_skills:.1f}", 
-                       session, "INFO")
-        
-        # Emotional analysis
-        avg_confidence = sum(e['confidence'] for e in session['emotions']) / len(session['emotions'])
-        dominant_emotion = max(set(e['emotion'] for e in session['emotions']), 
-                             key=lambda x: sum(1 for e in session['emotions'] if e['emotion'] == x))
-        
-        # Emotional journey (start → end)
-        first_emotion = session['emotions'][0]
-        last_emotion = session['emotions'][-1]
-        confidence_diff = last_emotion['confidence'] - first_emotion['confidence']
-        
-        # Determine trend
-        # If same emotion, always show stable (regardless of confidence change)
-        if first_emotion['emotion'] == last_emotion['emotion']:
-            trend_emoji = "➡️"
-            trend_text_en = "Stable"
-            trend_text_es = "Estable"
-        elif confidence_diff > 0.05:  # >5% improvement
-            trend_emoji = "↗️"
-            trend_text_en = "Improving"
-            trend_text_es = "Mejorando"
-        elif confidence_diff < -0.05:  # >5% decline
-            trend_emoji = "↘️"
-            trend_text_en = "Declining"
-            trend_text_es = "Declinando"
-        else:  # Stable
-            trend_emoji = "➡️"
-            trend_text_en = "Stable"
-            trend_text_es = "Estable"
-        
-        journey_en = f"📊 Journey: {first_emotion['emotion']} (start) → {last_emotion['emotion']} (end) {trend_emoji} {trend_text_en}"
-        journey_es = f"📊 Trayectoria: {first_emotion['emotion']} (inicio) → {last_emotion['emotion']} (final) {trend_emoji} {trend_text_es}"
-        
-        # Infer technical level based on weighted score (80% technical, 15% english, 5% soft skills)
-        # This reflects how technical level is actually evaluated in the industry
-        inference_score = (tech_avg * 0.80) + (english_avg * 0.15) + (soft_skills * 0.05)
-        inference_percentage = (inference_score / 5.0) * 100
-        
-        # Keep final_percentage for overall assessment
-        final_percentage = (final_score / 5.0) * 100
-        tech_percentage = (tech_avg / 5.0) * 100  # Still needed for upgrade logic
-        
-        # NOTE: Penalties for trust_score, confidence, and inconsistencies will be applied
-        # AFTER trust_score and inconsistencies are calculated (see line ~2512)
-        # This ensures we have accurate data before applying penalties
-        
-        # Initial inferred level (will be recalculated after penalties are applied)
-        if inference_percentage >= 85:
-            inferred_level = "Senior"
-        elif inference_percentage >= 65:
-            inferred_level = "Mid-Level"
+    # Validate that response makes sense
+    is_valid, reason = is_response_makes_sense(message_text, min_words=8, min_length=30)
+    if not is_valid:
+        reason_messages = {
+            'empty': ('Please provide an answer.', 'Por favor proporciona una respuesta.'),
+            'too_short': ('Your answer is too short. Please provide more details (at least 30 characters).', 
+                         'Tu respuesta es muy corta. Por favor proporciona más detalles (al menos 30 caracteres).'),
+            'too_few_words': ('Your answer needs more words. Please explain in at least 8 words.', 
+                             'Tu respuesta necesita más palabras. Por favor explica en al menos 8 palabras.'),
+            'no_structure': ('Your answer seems incomplete. Please write complete sentences explaining your experience.', 
+                            'Tu respuesta parece incompleta. Por favor escribe oraciones completas explicando tu experiencia.'),
+            'no_coherence': ('Please provide a more detailed answer that explains your teamwork experience clearly.', 
+                           'Por favor proporciona una respuesta más detallada que explique claramente tu experiencia de trabajo en equipo.'),
+            'repetitive': ('Your answer seems repetitive. Please provide a more varied explanation.', 
+                          'Tu respuesta parece repetitiva. Por favor proporciona una explicación más variada.')
+        }
+        msg_en, msg_es = reason_messages.get(reason, ('Please provide a better answer.', 'Por favor proporciona una mejor respuesta.'))
+        if lang == 'en':
+            response_text = f"⚠️ *{msg_en}*\n\n🤝 Tell me about a time you worked in a team to solve a difficult problem."
         else:
-            inferred_level = "Junior"
-        
-        # Suggest upgrade if candidate exceeds expectations
-        # More strict criteria: must have good English and overall performance
-        upgrade_suggestion = None
-        upgrade_justification = []
-        
-        if inferred_level == "Junior" and tech_percentage >= 75 and english_avg >= 3.0 and final_score >= 3.5:
-            upgrade_suggestion = f"💡 *UPGRADE POTENTIAL: Mid-Level {session['data']['position']}*"
-            upgrade_justification.append(f"Technical score ({tech_avg:.1f}/5.0) supera nivel Junior")
-            if english_avg >= 3.5:
-                upgrade_justification.append(f"Inglés sólido ({english_avg:.1f}/5.0)")
-            if soft_skills >= 3.5:
-                upgrade_justification.append("Soft skills destacadas")
-        
-        elif inferred_level == "Mid-Level" and tech_percentage >= 80 and english_avg >= 3.5 and final_score >= 4.0:
-            upgrade_suggestion = f"🚀 *UPGRADE POTENTIAL: Senior {session['data']['position']}*"
-            upgrade_justification.append(f"Technical score ({tech_avg:.1f}/5.0) supera nivel Mid")
-            if english_avg >= 4.0:
-                upgrade_justification.append(f"Inglés avanzado ({english_avg:.1f}/5.0)")
-            if soft_skills >= 4.0:
-                upgrade_justification.append("Soft skills excepcionales")
-        
-        # Get language BEFORE using it (FIX: UnboundLocalError)
-        lang = session.get('language', 'es')
-        
-        # FORCE ENGLISH for demo profiles (CRITICAL FIX)
-        candidate_name = session['data'].get('name', '')
-        if candidate_name in ['Luis Martínez', 'Ana García']:
-            if candidate_name == 'Luis Martínez':
-                lang = 'en'  # FORCE ENGLISH for Luis
-                print(f"[FORCE] Language FORCED to 'en' for Luis Martínez")
-            # Ana García uses Spanish by default unless specified otherwise
-        
-        
-        # === INCONSISTENCY DETECTION ===
-        # FORCE RELOAD MODULE and use functions directly from module (CRITICAL FIX)
-        import importlib
-        import src.whatsapp_inconsistency_detector as detector_module
-        importlib.reload(detector_module)
-        
-        # Rename tech_questions to technical_questions to match detector expectations
-        session['data']['technical_questions'] = session['data'].get('tech_questions', [])
+            response_text = f"⚠️ *{msg_es}*\n\n🤝 Cuéntame sobre una vez que trabajaste en equipo para resolver un problema difícil."
+        save_session(phone_number, session)
+        return response_text
+    
+    # Evaluate soft skills
+    soft_score = evaluate_soft_skills(message_text)
+    session['data']['soft_skills_answer'] = message_text
+    session['scores']['soft_skills'] = soft_score
+    warm_answer_embeddings(session, message_text)
+    
+    emotion = session['emotions'][-1] if session['emotions'] else {'emotion': 'neutral', 'confidence': 0.5}
+    lang = session.get('language', 'es')
+    
+    # Get progress info for final question stage
+    current_q, total_q = get_progress_info(13)
+    progress_bar = get_progress_bar(current_q, total_q)
+    
+    if lang == 'en':
+        response_text = (
+            "✅ Thank you! Processing your response...\n\n"
+            f"📊 Soft Skills score: *{soft_score:.1f}/5.0*\n\n"
+            f"{progress_bar}\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "📊 *Almost done!*\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Very good! 😊\n\n"
+            "📊 *Progress: Question 13 of 13*\n\n"
+            "❓ *Last question:*\n"
+            "Why should we hire you and not another candidate?\n"
+            "(Be honest and specific)"
+        )
+    else:
+        response_text = (
+            "✅ ¡Gracias! Procesando tu respuesta...\n\n"
+            f"📊 Soft Skills score: *{soft_score:.1f}/5.0*\n\n"
+            f"{progress_bar}\n\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            "📊 *¡Casi terminamos!*\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "¡Muy bien! 😊\n\n"
+            "📊 *Progreso: Pregunta 13 de 13*\n\n"
+            "❓ *Última pregunta:*\n"
+            "¿Por qué deberíamos contratarte a ti y no a otro candidato?\n"
+            "(Se honesto y específico)"
+        )
+    session['stage'] = 13
+    
+    return finish_stage(phone_number, session, response_text)
+
+def infer_level(percentage):
+    """Technical level for an inference percentage (0-100)"""
+    if percentage >= 85:
+        return "Senior"
+    elif percentage >= 65:
+        return "Mid-Level"
+    return "Junior"
+
+def apply_reliability_penalties(inference_percentage, avg_confidence, trust_score, inconsistencies_count):
+    """
+    Stage-13 penalties for low trust score, low confidence and inconsistencies
+    
+    Candidates with vague answers and low confidence end up classified as Junior.
+    
+    Args:
+        inference_percentage: Weighted technical inference (0-100) before penalties
+        avg_confidence: Average emotional confidence (0-1)
+        trust_score: Inconsistency detector trust score (0-100)
+        inconsistencies_count: Number of inconsistencies detected
+    
+    Returns:
+        tuple: (adjusted_percentage, penalties dict {name: points})
+    """
+    penalties = {}
+    
+    # Penalty 1: Trust Score below 85 indicates inconsistencies/risks
+    # More aggressive penalty: -5% per 10 points below 85, minimum -5% if below 85
+    # This ensures Trust Score < 85 always triggers significant penalty
+    if trust_score < 85:
+        trust_penalty = ((85 - trust_score) / 10) * 5  # -5% per 10 points below 85
+        # Ensure minimum penalty of 5% for any Trust Score below 85 (more aggressive)
+        penalties['trust'] = max(5.0, trust_penalty)
+        inference_log.debug("Trust Score penalty: -%.1f%% (Trust Score: %s/100)", penalties['trust'], trust_score)
+    
+    # Penalty 2: Low emotional confidence indicates uncertainty/vague answers
+    if avg_confidence < 0.80:  # Below 80% confidence
+        penalties['confidence'] = 3.0
+        inference_log.debug("Low confidence penalty: -%.1f%% (Avg confidence: %.2f)", penalties['confidence'], avg_confidence)
+    
+    # Penalty 3: Inconsistencies detected
+    if inconsistencies_count >= 3:
+        # 3+ inconsistencies always trigger penalty
+        penalties['inconsistencies'] = 2.0
+        inference_log.debug("Inconsistencies penalty: -%.1f%% (%s detected)", penalties['inconsistencies'], inconsistencies_count)
+    elif inconsistencies_count >= 2 and trust_score < 85:
+        # If Trust Score is low (< 85), even 2 inconsistencies should trigger penalty
+        penalties['inconsistencies'] = 2.0
+        inference_log.debug("Inconsistencies penalty: -%.1f%% (%s detected, Trust Score %s < 85)", penalties['inconsistencies'], inconsistencies_count, trust_score)
+    elif inconsistencies_count >= 1 and trust_score < 85:
+        # If Trust Score is low (< 85), even 1 inconsistency should trigger penalty
+        penalties['inconsistencies'] = 1.5
+        inference_log.debug("Inconsistencies penalty: -%.1f%% (%s detected, Trust Score %s < 85)", penalties['inconsistencies'], inconsistencies_count, trust_score)
+    
+    # Penalty 4: Combined risk penalty (Trust Score < 85 AND inconsistencies >= 1)
+    # This reflects that the combination is riskier than each factor alone
+    if trust_score < 85 and inconsistencies_count >= 1:
+        penalties['combined'] = 2.0
+        inference_log.debug("Combined risk penalty: -%.1f%% (Trust Score %s < 85 AND %s inconsistencies)", penalties['combined'], trust_score, inconsistencies_count)
+    
+    # Ensure percentage doesn't go negative
+    adjusted = max(0, inference_percentage - sum(penalties.values()))
+    
+    if adjusted != inference_percentage:
+        inference_log.debug("Adjusted percentage: %.1f%% → %.1f%%", inference_percentage, adjusted)
+    else:
+        inference_log.debug("No penalties applied, percentage remains: %.1f%%", adjusted)
+    return adjusted, penalties
+
+# Advanced Decision Logic with 6 levels (OPTIMIZED thresholds), best first:
+# (minimum final score, key, decision, action, emoji)
+FINAL_DECISIONS = (
+    (4.3, 'highly_recommended', "🏆 *HIGHLY RECOMMENDED*", "Agendar entrevista final esta semana", "🌟"),
+    (3.8, 'recommended', "✅ *RECOMMENDED FOR HIRE*", "Proceder con proceso de contratación", "🎉"),
+    (3.3, 'training', "💡 *RECOMMENDED WITH TRAINING*", "Contratar con plan de capacitación inicial", "📚"),
+    (2.3, 'review', "⏳ *REVIEW IN 6 MONTHS*", "Sugerir áreas de mejora y re-contactar en 6 meses", "🔄"),
+    (float('-inf'), 'not_suitable', "❌ *NOT SUITABLE FOR THIS POSITION*",
+     "Considerar para otras posiciones o niveles más junior", "📝"),
+)
+
+def final_decision(final_score):
+    """
+    Hiring decision for a final score (0-5)
+    
+    Returns:
+        tuple: (key, decision, action, emoji) from FINAL_DECISIONS
+    """
+    for threshold, key, decision, action, emoji in FINAL_DECISIONS:
+        if final_score >= threshold:
+            return key, decision, action, emoji
+
+def rescore_final_results(final_results, trust_score, inconsistencies_count):
+    """
+    Re-apply the stage-13 scoring to stored final results with a new detection result
+    
+    Used when detection finishes after stage 13 stopped waiting (the report
+    was built with the trust score 100 fallback).
+    
+    Args:
+        final_results: session['final_results'] (updated in place)
+        trust_score: Detector trust score
+        inconsistencies_count: Number of inconsistencies detected
+    
+    Returns:
+        dict: final_results
+    """
+    final_results['trust_score'] = trust_score
+    final_results['inconsistencies_count'] = inconsistencies_count
+    if 'inference_percentage' not in final_results:
+        # Stored before the penalties were recorded: nothing else to recompute
+        return final_results
+    adjusted, penalties = apply_reliability_penalties(
+        final_results['inference_percentage'], final_results['avg_confidence'], trust_score, inconsistencies_count
+    )
+    _, decision, action, _ = final_decision(final_results['final_score'])
+    final_results.update({
+        'adjusted_percentage': adjusted,
+        'penalties': penalties,
+        'inferred_level': infer_level(adjusted),
+        'decision': decision,
+        'action': action,
+    })
+    return final_results
+
+@stage_machine.stage(13, 'final_question', transitions=(13.5, 14))
+def handle_final_question_stage(phone_number, message_text, session):
+    """Stage 13: Final Question"""
+    response_text = ""
+    
+    session['data']['final_answer'] = message_text
+    
+    # Calculate final scores
+    tech_avg = session['scores']['technical'] / 3
+    english_avg = session['scores']['english'] / 2
+    soft_skills = session['scores']['soft_skills']
+    
+    # Overall score (weighted average)
+    final_score = (tech_avg * 0.4) + (english_avg * 0.3) + (soft_skills * 0.3)
+    log_user_action(phone_number, f"Final score calculated: {final_score:.2f}/5.0", 
+                   f"Tech: {tech_avg:.1f}, English: {english_avg:.1f}, Soft: {soft_skills:.1f}", 
+                   session, "INFO")
+    
+    # Emotional analysis
+    avg_confidence = sum(e['confidence'] for e in session['emotions']) / len(session['emotions'])
+    dominant_emotion = max(set(e['emotion'] for e in session['emotions']), 
+                         key=lambda x: sum(1 for e in session['emotions'] if e['emotion'] == x))
+    
+    # Emotional journey (start → end)
+    first_emotion = session['emotions'][0]
+    last_emotion = session['emotions'][-1]
+    confidence_diff = last_emotion['confidence'] - first_emotion['confidence']
+    
+    # Determine trend
+    # If same emotion, always show stable (regardless of confidence change)
+    if first_emotion['emotion'] == last_emotion['emotion']:
+        trend_emoji = "➡️"
+        trend_text_en = "Stable"
+        trend_text_es = "Estable"
+    elif confidence_diff > 0.05:  # >5% improvement
+        trend_emoji = "↗️"
+        trend_text_en = "Improving"
+        trend_text_es = "Mejorando"
+    elif confidence_diff < -0.05:  # >5% decline
+        trend_emoji = "↘️"
+        trend_text_en = "Declining"
+        trend_text_es = "Declinando"
+    else:  # Stable
+        trend_emoji = "➡️"
+        trend_text_en = "Stable"
+        trend_text_es = "Estable"
+    
+    journey_en = f"📊 Journey: {first_emotion['emotion']} (start) → {last_emotion['emotion']} (end) {trend_emoji} {trend_text_en}"
+    journey_es = f"📊 Trayectoria: {first_emotion['emotion']} (inicio) → {last_emotion['emotion']} (final) {trend_emoji} {trend_text_es}"
+    
+    # Infer technical level based on weighted score (80% technical, 15% english, 5% soft skills)
+    # This reflects how technical level is actually evaluated in the industry
+    inference_score = (tech_avg * 0.80) + (english_avg * 0.15) + (soft_skills * 0.05)
+    inference_percentage = (inference_score / 5.0) * 100
+    
+    # Keep final_percentage for overall assessment
+    final_percentage = (final_score / 5.0) * 100
+    tech_percentage = (tech_avg / 5.0) * 100  # Still needed for upgrade logic
+    
+    # NOTE: Penalties for trust_score, confidence, and inconsistencies will be applied
+    # AFTER trust_score and inconsistencies are calculated (see line ~2512)
+    # This ensures we have accurate data before applying penalties
+    
+    # Initial inferred level (will be recalculated after penalties are applied)
+    inferred_level = infer_level(inference_percentage)
+    
+    # Suggest upgrade if candidate exceeds expectations
+    # More strict criteria: must have good English and overall performance
+    upgrade_suggestion = None
+    upgrade_justification = []
+    
+    if inferred_level == "Junior" and tech_percentage >= 75 and english_avg >= 3.0 and final_score >= 3.5:
+        upgrade_suggestion = f"💡 *UPGRADE POTENTIAL: Mid-Level {session['data']['position']}*"
+        upgrade_justification.append(f"Technical score ({tech_avg:.1f}/5.0) supera nivel Junior")
+        if english_avg >= 3.5:
+            upgrade_justification.append(f"Inglés sólido ({english_avg:.1f}/5.0)")
+        if soft_skills >= 3.5:
+            upgrade_justification.append("Soft skills destacadas")
+    
+    elif inferred_level == "Mid-Level" and tech_percentage >= 80 and english_avg >= 3.5 and final_score >= 4.0:
+        upgrade_suggestion = f"🚀 *UPGRADE POTENTIAL: Senior {session['data']['position']}*"
+        upgrade_justification.append(f"Technical score ({tech_avg:.1f}/5.0) supera nivel Mid")
+        if english_avg >= 4.0:
+            upgrade_justification.append(f"Inglés avanzado ({english_avg:.1f}/5.0)")
+        if soft_skills >= 4.0:
+            upgrade_justification.append("Soft skills excepcionales")
+    
+    # Get language BEFORE using it (FIX: UnboundLocalError)
+    lang = session.get('language', 'es')
+    
+    # FORCE ENGLISH for demo profiles (CRITICAL FIX)
+    candidate_name = session['data'].get('name', '')
+    if candidate_name in ['Luis Martínez', 'Ana García']:
+        if candidate_name == 'Luis Martínez':
+            lang = 'en'  # FORCE ENGLISH for Luis
+            log.info("Language FORCED to 'en' for Luis Martínez")
+        # Ana García uses Spanish by default unless specified otherwise
+    
+    
+    # === INCONSISTENCY DETECTION ===
+    # Module functions are looked up on detector_module at call time, so
+    # rules swapped by an admin hot reload are picked up without reloading here
+    
+    # Rename tech_questions to technical_questions to match detector expectations
+    session['data']['technical_questions'] = session['data'].get('tech_questions', [])
+    
+    # Detect inconsistencies on the detection pool (snapshot of the session)
+    # use_bert=True para activar mejoras con BERT (puede desactivarse si hay problemas)
+    # Si no termina a tiempo se usa el fallback y el resultado llega después
+    no_issues_report = "✅ No se detectaron inconsistencias significativas" if lang == 'es' else "✅ No significant inconsistencies detected"
+    inconsistencies = []
+    trust_score = 100  # Score por defecto
+    inconsistency_report = no_issues_report
+    detection_pending = False
+    try:
+        start_time = time.time()
+        token = uuid.uuid4().hex
+        session['detection_token'] = token
+        job = detection_pool.submit(
+            phone_number,
+            run_inconsistency_detection,
+            copy.deepcopy(session),
+            lang,
+            # job is bound by the time a late result can exist (after wait() below)
+            on_late=lambda result: deliver_late_detection(phone_number, token, lang, result, job)
+        )
         
-        # Detect inconsistencies (using module functions directly, not imported ones)
-        # use_bert=True para activar mejoras con BERT (puede desactivarse si hay problemas)
-        # Con timeout real y manejo robusto de errores para garantizar experiencia fluida
-        try:
-            # Use global threading and time modules (imported at top of file)
-            # Don't import locally to avoid scope conflicts
-            
-            # Variables para timeout multiplataforma
-            inconsistencies_result = [None]
-            trust_score_result = [None]
-            inconsistency_report_result = [None]
-            timeout_occurred = [False]
-            
-            def detect_with_timeout():
-                """Función que ejecuta la detección con timeout"""
-                try:
-                    inconsistencies_result[0] = detector_module.detect_whatsapp_inconsistencies(session, language=lang, use_bert=True)
-                    trust_score_result[0] = detector_module.calculate_trust_score(inconsistencies_result[0])
-                    inconsistency_report_result[0] = detector_module.generate_inconsistency_report(inconsistencies_result[0], language=lang)
-                except Exception as e:
-                    print(f"[ERROR] Error en detección dentro de thread: {e}")
-                    inconsistencies_result[0] = []
-                    trust_score_result[0] = 100
-                    inconsistency_report_result[0] = "✅ No se detectaron inconsistencias significativas" if lang == 'es' else "✅ No significant inconsistencies detected"
-            
-            start_time = time.time()
-            
-            # Ejecutar en thread con timeout de 2 segundos máximo
-            detection_thread = threading.Thread(target=detect_with_timeout)
-            detection_thread.daemon = True  # Thread muere si el programa principal termina
-            detection_thread.start()
-            detection_thread.join(timeout=2.0)  # Esperar máximo 2 segundos
-            
-            if detection_thread.is_alive():
-                # Thread aún corriendo después de timeout - usar fallback
-                elapsed = time.time() - start_time
-                print(f"[WARNING] Detección de inconsistencias timeout después de {elapsed:.2f}s - usando fallback rápido")
-                inconsistencies = []
-                trust_score = 100  # Score por defecto
-                inconsistency_report = "✅ No se detectaron inconsistencias significativas" if lang == 'es' else "✅ No significant inconsistencies detected"
+        if job is None:
+            log.warning("Detección de inconsistencias saturada - usando fallback rápido")
+            detection_fallbacks.inc(reason='saturated')
+            session.pop('detection_token', None)
+        else:
+            finished, result = job.wait(DETECTION_TIMEOUT)
+            elapsed = time.time() - start_time
+            if not finished:
+                # El job sigue en el pool; deliver_late_detection guardará el resultado
+                log.warning("Detección de inconsistencias timeout después de %.2fs - resultado se entregará al terminar", elapsed)
+                detection_fallbacks.inc(reason='timeout')
+                detection_pending = True
             else:
-                # Thread completó - usar resultados
-                inconsistencies = inconsistencies_result[0] if inconsistencies_result[0] is not None else []
-                trust_score = trust_score_result[0] if trust_score_result[0] is not None else 100
-                inconsistency_report = inconsistency_report_result[0] if inconsistency_report_result[0] is not None else ("✅ No se detectaron inconsistencias significativas" if lang == 'es' else "✅ No significant inconsistencies detected")
+                session.pop('detection_token', None)
+                if job.error is not None:
+                    log.error("Error en detección: %s", job.error)
+                elif result is not None:
+                    inconsistencies, trust_score, inconsistency_report = result
                 
                 # Verificar si tardó mucho
-                elapsed = time.time() - start_time
                 if elapsed > 1.5:  # Si tarda más de 1.5 segundos, log warning
-                    print(f"[WARNING] Detección de inconsistencias tardó {elapsed:.2f}s (considerar optimización)")
-            
-        except Exception as e:
-            # Fallback: continuar sin detección de inconsistencias si hay error
-            print(f"[ERROR] Error en detección de inconsistencias: {e}")
-            print("[FALLBACK] Continuando sin detección de inconsistencias para garantizar experiencia fluida")
-            inconsistencies = []
-            trust_score = 100  # Score por defecto
-            inconsistency_report = "✅ No se detectaron inconsistencias significativas" if lang == 'es' else "✅ No significant inconsistencies detected"
-        
-        # Store in session
-        session['inconsistencies'] = {
-            'issues': inconsistencies,
-            'trust_score': trust_score,
-            'report': inconsistency_report
-        }
-        
-        # Recalculate inferred_level with trust_score and inconsistencies now available
-        # Apply penalties for low confidence, trust score, and inconsistencies
-        # This ensures candidates with vague answers and low confidence are correctly classified as Junior
-        original_percentage = inference_percentage
-        
-        # Penalty 1: Trust Score below 85 indicates inconsistencies/risks
-        # More aggressive penalty: -5% per 10 points below 85, minimum -5% if below 85
-        # This ensures Trust Score < 85 always triggers significant penalty
-        if trust_score < 85:
-            trust_penalty = ((85 - trust_score) / 10) * 5  # -5% per 10 points below 85
-            # Ensure minimum penalty of 5% for any Trust Score below 85 (more aggressive)
-            trust_penalty = max(5.0, trust_penalty)
-            inference_percentage = inference_percentage - trust_penalty
-            print(f"[DEBUG INFERENCE] Trust Score penalty: -{trust_penalty:.1f}% (Trust Score: {trust_score}/100)")
-        
-        # Penalty 2: Low emotional confidence indicates uncertainty/vague answers
-        if avg_confidence < 0.80:  # Below 80% confidence
-            confidence_penalty = 3.0
-            inference_percentage = inference_percentage - confidence_penalty
-            print(f"[DEBUG INFERENCE] Low confidence penalty: -{confidence_penalty:.1f}% (Avg confidence: {avg_confidence:.2f})")
+                    log.warning("Detección de inconsistencias tardó %.2fs (considerar optimización)", elapsed)
         
-        # Penalty 3: Inconsistencies detected
-        inconsistencies_count = len(inconsistencies)
-        if inconsistencies_count >= 3:
-            # 3+ inconsistencies always trigger penalty
-            inconsistency_penalty = 2.0
-            inference_percentage = inference_percentage - inconsistency_penalty
-            print(f"[DEBUG INFERENCE] Inconsistencies penalty: -{inconsistency_penalty:.1f}% ({inconsistencies_count} detected)")
-        elif inconsistencies_count >= 2 and trust_score < 85:
-            # If Trust Score is low (< 85), even 2 inconsistencies should trigger penalty
-            inconsistency_penalty = 2.0
-            inference_percentage = inference_percentage - inconsistency_penalty
-            print(f"[DEBUG INFERENCE] Inconsistencies penalty: -{inconsistency_penalty:.1f}% ({inconsistencies_count} detected, Trust Score {trust_score} < 85)")
-        elif inconsistencies_count >= 1 and trust_score < 85:
-            # If Trust Score is low (< 85), even 1 inconsistency should trigger penalty
-            inconsistency_penalty = 1.5
-            inference_percentage = inference_percentage - inconsistency_penalty
-            print(f"[DEBUG INFERENCE] Inconsistencies penalty: -{inconsistency_penalty:.1f}% ({inconsistencies_count} detected, Trust Score {trust_score} < 85)")
-        
-        # Penalty 4: Combined risk penalty (Trust Score < 85 AND inconsistencies >= 1)
-        # This reflects that the combination is riskier than each factor alone
-        if trust_score < 85 and inconsistencies_count >= 1:
-            combined_penalty = 2.0
-            inference_percentage = inference_percentage - combined_penalty
-            print(f"[DEBUG INFERENCE] Combined risk penalty: -{combined_penalty:.1f}% (Trust Score {trust_score} < 85 AND {inconsistencies_count} inconsistencies)")
-        
-        # Ensure percentage doesn't go negative
-        inference_percentage = max(0, inference_percentage)
-        
-        if original_percentage != inference_percentage:
-            print(f"[DEBUG INFERENCE] Adjusted percentage: {original_percentage:.1f}% → {inference_percentage:.1f}%")
+    except Exception as e:
+        # Fallback: continuar sin detección de inconsistencias si hay error
+        log.error("Error en detección de inconsistencias: %s", e)
+        detection_fallbacks.inc(reason='error')
+        log.warning("Continuando sin detección de inconsistencias para garantizar experiencia fluida")
+        session.pop('detection_token', None)
+        inconsistencies = []
+        trust_score = 100  # Score por defecto
+        inconsistency_report = no_issues_report
+    
+    # Store in session
+    session['inconsistencies'] = {
+        'issues': inconsistencies,
+        'trust_score': trust_score,
+        'report': inconsistency_report,
+        'pending': detection_pending
+    }
+    
+    # Recalculate inferred_level with trust_score and inconsistencies now available
+    # (same scoring as rescore_final_results() when detection arrives late)
+    adjusted_percentage, penalties = apply_reliability_penalties(
+        inference_percentage, avg_confidence, trust_score, len(inconsistencies)
+    )
+    
+    # Re-infer level based on adjusted percentage
+    inferred_level = infer_level(adjusted_percentage)
+    
+    inference_log.debug("Final inferred_level: %s (percentage: %.1f%%)", inferred_level, adjusted_percentage)
+    
+    # Advanced Decision Logic with 6 levels (see FINAL_DECISIONS)
+    decision_key, decision, action, emoji = final_decision(final_score)
+    if decision_key == 'highly_recommended':
+        next_step_en = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Your technical responses show strong foundational knowledge and clear communication. "
+            "We believe you have great potential for this role.\n\n"
+            "📧 A recruiter will schedule your next interview in the next days.\n\n"
+            "Please be ready to discuss your experience in more depth and explore real-world scenarios.\n\n"
+            "🗓️ *Tip:* Review key concepts and prepare examples from past projects. "
+            "We're excited to learn more about your journey!"
+        )
+        next_step_es = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Tus respuestas técnicas muestran conocimiento sólido y comunicación clara. "
+            "Creemos que tienes gran potencial para este rol.\n\n"
+            "📧 Un recruiter agendará tu próxima entrevista en los próximos días.\n\n"
+            "Por favor prepárate para discutir tu experiencia en profundidad y explorar escenarios del mundo real.\n\n"
+            "🗓️ *Tip:* Revisa conceptos clave y prepara ejemplos de proyectos anteriores. "
+            "¡Estamos emocionados de conocer más sobre tu trayectoria!"
+        )
+    elif decision_key == 'recommended':
+        next_step_en = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Your technical responses show solid knowledge and good communication skills. "
+            "We believe you're a strong fit for this role.\n\n"
+            "📧 A recruiter will contact you in the next 48 hours.\n\n"
+            "Please be ready to discuss your experience and answer additional questions about your background.\n\n"
+            "🗓️ *Tip:* Review the job requirements and prepare examples from your past projects. "
+            "We look forward to learning more about you!"
+        )
+        next_step_es = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "Tus respuestas técnicas muestran conocimiento sólido y buenas habilidades de comunicación. "
+            "Creemos que eres una buena opción para este rol.\n\n"
+            "📧 Un recruiter se contactará contigo en las próximas 48 horas.\n\n"
+            "Por favor prepárate para discutir tu experiencia y responder preguntas adicionales sobre tu trayectoria.\n\n"
+            "🗓️ *Tip:* Revisa los requisitos del puesto y prepara ejemplos de tus proyectos anteriores. "
+            "¡Esperamos conocer más sobre ti!"
+        )
+    elif decision_key == 'training':
+        next_step_en = "📧 A recruiter will contact you to discuss a training plan."
+        next_step_es = "📧 Un recruiter te contactará para discutir un plan de capacitación."
+    elif decision_key == 'review':
+        # Build alternative positions list (excluding the one already selected)
+        current_position = session['data'].get('position', '')
+        available_positions = session.get('available_positions', AVAILABLE_POSITIONS)
+        other_positions = [pos for pos in available_positions if pos != current_position]
+        
+        positions_list_en = ""
+        positions_list_es = ""
+        if other_positions:
+            for idx, pos in enumerate(other_positions, start=2):  # Start at 2 since they already tried position 1
+                positions_list_en += f"{idx}. {pos}\n"
+                positions_list_es += f"{idx}. {pos}\n"
+        
+        next_step_en = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "🌸 I've reviewed your responses carefully.\n\n"
+            "Would you like to explore another position that might be a better fit?\n\n"
+            "💼 *AVAILABLE POSITIONS:*\n"
+            f"{positions_list_en}\n"
+            "Reply with the *NUMBER* or write *SKIP* to pass."
+        )
+        next_step_es = (
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "🌸 He revisado tus respuestas cuidadosamente.\n\n"
+            "¿Te gustaría explorar otra posición que podría ser mejor match?\n\n"
+            "💼 *POSICIONES DISPONIBLES:*\n"
+            f"{positions_list_es}\n"
+            "Responde con el *NÚMERO* o escribe *OMITIR* para saltar."
+        )
+    else:
+        next_step_en = "📋 We'll keep your profile for future opportunities in other positions."
+        next_step_es = "📋 Mantendremos tu perfil para futuras oportunidades en otras posiciones."
+    
+    # Build upgrade section if applicable
+    upgrade_section = ""
+    if upgrade_suggestion:
+        upgrade_section = f"\n{upgrade_suggestion}\n"
+        if upgrade_justification:
+            upgrade_section += "Razones:\n"
+            for reason in upgrade_justification:
+                upgrade_section += f"  - {reason}\n"
+        upgrade_section += "\n"
+    
+    # lang already defined above (line 1060)
+    
+    # === ENHANCED FEEDBACK FOR FREE MODE (JUDGES TESTING) ===
+    # Generate contextual feedback to help judges understand their scores
+    is_demo_mode = session.get('demo_mode') == 'full_interview'
+    free_mode_insights = ""
+    
+    if not is_demo_mode:  # Show enhanced insights in FREE MODE
+        # Benchmarks for comparison
+        BENCHMARK_TECH = 3.0
+        BENCHMARK_ENGLISH = 3.0
+        BENCHMARK_SOFT = 3.0
+        BENCHMARK_FINAL = 3.0
+        
+        # Generate insights based on scores
+        insights_parts = []
+        
+        # Technical score insights
+        if tech_avg >= 4.5:
+            tech_insight = "🌟 Excellent technical knowledge! Your responses show deep understanding and practical experience."
+        elif tech_avg >= 3.5:
+            tech_insight = "✅ Good technical foundation! You demonstrated solid knowledge with room for advanced concepts."
+        elif tech_avg >= 2.5:
+            tech_insight = "📚 Basic technical understanding. Consider diving deeper into core concepts for this role."
         else:
-            print(f"[DEBUG INFERENCE] No penalties applied, percentage remains: {inference_percentage:.1f}%")
-        
-        # Re-infer level based on adjusted percentage
-        if inference_percentage >= 85:
-            inferred_level = "Senior"
-        elif inference_percentage >= 65:
-            inferred_level = "Mid-Level"
+            tech_insight = "💡 Foundational level detected. Focus on building core technical skills for this position."
+        
+        # English score insights
+        if english_avg >= 4.5:
+            english_insight = "🌟 Fluent English! Your communication is clear and professional."
+        elif english_avg >= 3.5:
+            english_insight = "✅ Good English level! You can communicate effectively in professional settings."
+        elif english_avg >= 2.5:
+            english_insight = "📚 Intermediate English. Practice will help you express complex ideas more fluently."
         else:
-            inferred_level = "Junior"
+            english_insight = "💡 Basic English level. Consider focused practice for technical communication."
+        
+        # Soft skills insights
+        if soft_skills >= 4.5:
+            soft_insight = "🌟 Outstanding soft skills! You show strong leadership and collaboration abilities."
+        elif soft_skills >= 3.5:
+            soft_insight = "✅ Good interpersonal skills! You demonstrate teamwork and problem-solving."
+        elif soft_skills >= 2.5:
+            soft_insight = "📚 Developing soft skills. Focus on examples that show leadership and collaboration."
+        else:
+            soft_insight = "💡 Basic soft skills. Highlight specific examples of teamwork and communication."
         
-        print(f"[DEBUG INFERENCE] Final inferred_level: {inferred_level} (percentage: {inference_percentage:.1f}%)")
+        # Comparison with benchmarks
+        tech_vs_benchmark = tech_avg - BENCHMARK_TECH
+        english_vs_benchmark = english_avg - BENCHMARK_ENGLISH
+        soft_vs_benchmark = soft_skills - BENCHMARK_SOFT
         
-        # Advanced Decision Logic with 6 levels (OPTIMIZED thresholds)
-        if final_score >= 4.3:
-            decision = "🏆 *HIGHLY RECOMMENDED*"
-            action = "Agendar entrevista final esta semana"
-            emoji = "🌟"
-            next_step_en = (
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Your technical responses show strong foundational knowledge and clear communication. "
-                "We believe you have great potential for this role.\n\n"
-                "📧 A recruiter will schedule your next interview in the next days.\n\n"
-                "Please be ready to discuss your experience in more depth and explore real-world scenarios.\n\n"
-                "🗓️ *Tip:* Review key concepts and prepare examples from past projects. "
-                "We're excited to learn more about your journey!"
-            )
-            next_step_es = (
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Tus respuestas técnicas muestran conocimiento sólido y comunicación clara. "
-                "Creemos que tienes gran potencial para este rol.\n\n"
-                "📧 Un recruiter agendará tu próxima entrevista en los próximos días.\n\n"
-                "Por favor prepárate para discutir tu experiencia en profundidad y explorar escenarios del mundo real.\n\n"
-                "🗓️ *Tip:* Revisa conceptos clave y prepara ejemplos de proyectos anteriores. "
-                "¡Estamos emocionados de conocer más sobre tu trayectoria!"
-            )
-        elif final_score >= 3.8:
-            decision = "✅ *RECOMMENDED FOR HIRE*"
-            action = "Proceder con proceso de contratación"
-            emoji = "🎉"
-            next_step_en = (
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Your technical responses show solid knowledge and good communication skills. "
-                "We believe you're a strong fit for this role.\n\n"
-                "📧 A recruiter will contact you in the next 48 hours.\n\n"
-                "Please be ready to discuss your experience and answer additional questions about your background.\n\n"
-                "🗓️ *Tip:* Review the job requirements and prepare examples from your past projects. "
-                "We look forward to learning more about you!"
-            )
-            next_step_es = (
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "Tus respuestas técnicas muestran conocimiento sólido y buenas habilidades de comunicación. "
-                "Creemos que eres una buena opción para este rol.\n\n"
-                "📧 Un recruiter se contactará contigo en las próximas 48 horas.\n\n"
-                "Por favor prepárate para discutir tu experiencia y responder preguntas adicionales sobre tu trayectoria.\n\n"
-                "🗓️ *Tip:* Revisa los requisitos del puesto y prepara ejemplos de tus proyectos anteriores. "
-                "¡Esperamos conocer más sobre ti!"
-            )
-        elif final_score >= 3.3:
-            decision = "💡 *RECOMMENDED WITH TRAINING*"
-            action = "Contratar con plan de capacitación inicial"
-            emoji = "📚"
-            next_step_en = "📧 A recruiter will contact you to discuss a training plan."
-            next_step_es = "📧 Un recruiter te contactará para discutir un plan de capacitación."
-        elif final_score >= 2.3:
-            decision = "⏳ *REVIEW IN 6 MONTHS*"
-            action = "Sugerir áreas de mejora y re-contactar en 6 meses"
-            emoji = "🔄"
-            
-            # Build alternative positions list (excluding the one already selected)
-            current_position = session['data'].get('position', '')
-            available_positions = session.get('available_positions', AVAILABLE_POSITIONS)
-            other_positions = [pos for pos in available_positions if pos != current_position]
-            
-            positions_list_en = ""
-            positions_list_es = ""
-            if other_positions:
-                for idx, pos in enumerate(other_positions, start=2):  # Start at 2 since they already tried position 1
-                    positions_list_en += f"{idx}. {pos}\n"
-                    positions_list_es += f"{idx}. {pos}\n"
-            
-            next_step_en = (
-                "━━━━━━━━━━━━━━━━━━\n\n"
-                "🌸 I've reviewed your responses carefully.\n\n"
-                "Would you like to explore another position that might be a better fit?\n\n"
-                "💼 *AVAILABLE POSITIONS:*\n"
-                f"{positions_list_en}\n"
-                "Reply with the *NUMBER* or write *SKIP* to pass."
-            )
-            next_step_es = (
+        if lang == 'en':
+            free_mode_insights = (
+                "\n━━━━━━━━━━━━━━━━━━\n"
+                "💡 *YOUR PERFORMANCE INSIGHTS*\n"
                 "━━━━━━━━━━━━━━━━━━\n\n"
-                "🌸 He revisado tus respuestas cuidadosamente.\n\n"
-                "¿Te gustaría explorar otra posición que podría ser mejor match?\n\n"
-                "💼 *POSICIONES DISPONIBLES:*\n"
-                f"{positions_list_es}\n"
-                "Responde con el *NÚMERO* o escribe *OMITIR* para saltar."
+                f"🔧 *Technical ({tech_avg:.1f}/5.0):*\n"
+                f"{tech_insight}\n"
+                f"{'📈 Above average' if tech_vs_benchmark > 0 else '📊 Average' if tech_vs_benchmark == 0 else '📉 Below average'} "
+                f"(benchmark: {BENCHMARK_TECH:.1f}/5.0)\n\n"
+                f"🗣️ *English ({english_avg:.1f}/5.0):*\n"
+                f"{english_insight}\n"
+                f"{'📈 Above average' if english_vs_benchmark > 0 else '📊 Average' if english_vs_benchmark == 0 else '📉 Below average'} "
+                f"(benchmark: {BENCHMARK_ENGLISH:.1f}/5.0)\n\n"
+                f"💼 *Soft Skills ({soft_skills:.1f}/5.0):*\n"
+                f"{soft_insight}\n"
+                f"{'📈 Above average' if soft_vs_benchmark > 0 else '📊 Average' if soft_vs_benchmark == 0 else '📉 Below average'} "
+                f"(benchmark: {BENCHMARK_SOFT:.1f}/5.0)\n\n"
+                f"🎯 *Overall Assessment:*\n"
+                f"Your final score of {final_score:.2f}/5.0 places you in the "
+                f"{'top tier' if final_score >= 4.3 else 'strong candidate' if final_score >= 3.8 else 'developing' if final_score >= 3.3 else 'needs improvement'} "
+                f"category. This evaluation reflects your real-time responses and demonstrates how SAORI AI adapts to different candidate profiles.\n"
             )
-        else:
-            decision = "❌ *NOT SUITABLE FOR THIS POSITION*"
-            action = "Considerar para otras posiciones o niveles más junior"
-            emoji = "📝"
-            next_step_en = "📋 We'll keep your profile for future opportunities in other positions."
-            next_step_es = "📋 Mantendremos tu perfil para futuras oportunidades en otras posiciones."
-        
-        # Build upgrade section if applicable
-        upgrade_section = ""
-        if upgrade_suggestion:
-            upgrade_section = f"\n{upgrade_suggestion}\n"
-            if upgrade_justification:
-                upgrade_section += "Razones:\n"
-                for reason in upgrade_justification:
-                    upgrade_section += f"  - {reason}\n"
-            upgrade_section += "\n"
-        
-        # lang already defined above (line 1060)
-        
-        # === ENHANCED FEEDBACK FOR FREE MODE (JUDGES TESTING) ===
-        # Generate contextual feedback to help judges understand their scores
-        is_demo_mode = session.get('demo_mode') == 'full_interview'
-        free_mode_insights = ""
-        
+    if lang == 'en':
+        response_text = (
+            f"{emoji} *INTERVIEW COMPLETED!*\n\n"
+            f"━━━━━━━━━━━━━━━━━━\n"
+            f"📊 *FINAL RESULTS*\n"
+            f"━━━━━━━━━━━━━━━━━━\n\n"
+            f"👤 *Candidate:* {session['data']['name']}\n"
+            f"💼 *Position:* {session['data']['position']}\n"
+            f"📊 *Inferred level:* {inferred_level}\n\n"
+            f"*SCORES:*\n"
+            f"🔧 Technical: {tech_avg:.1f}/5.0 ({tech_percentage:.0f}%)\n"
+            f"🗣️ English: {english_avg:.1f}/5.0\n"
+            f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
+            f"🎯 *FINAL SCORE: {final_score:.2f}/5.0*\n\n"
+            f"*EMOTIONAL ANALYSIS (AI):*\n"
+            f"😊 Dominant emotion: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
+            f"📈 Average confidence: {avg_confidence:.0%}\n"
+            f"{journey_en}\n\n"
+            f"*RELIABILITY ANALYSIS:*\n"
+            f"🔍 Trust Score: {trust_score}/100\n"
+            f"   _(based on consistency, clarity, and emotional stability)_\n"
+            f"{inconsistency_report}\n\n"
+            f"{free_mode_insights}"
+            f"{decision}\n\n"
+            f"{upgrade_section}"
+            f"{next_step_en}"
+        )
+    else:
+        # Spanish insights (translate the English ones)
         if not is_demo_mode:  # Show enhanced insights in FREE MODE
-            # Benchmarks for comparison
-            BENCHMARK_TECH = 3.0
-            BENCHMARK_ENGLISH = 3.0
-            BENCHMARK_SOFT = 3.0
-            BENCHMARK_FINAL = 3.0
-            
-            # Generate insights based on scores
-            insights_parts = []
+            tech_insight_es = ""
+            english_insight_es = ""
+            soft_insight_es = ""
             
-            # Technical score insights
             if tech_avg >= 4.5:
-                tech_insight = "🌟 Excellent technical knowledge! Your responses show deep understanding and practical experience."
+                tech_insight_es = "🌟 ¡Excelente conocimiento técnico! Tus respuestas muestran comprensión profunda y experiencia práctica."
             elif tech_avg >= 3.5:
-                tech_insight = "✅ Good technical foundation! You demonstrated solid knowledge with room for advanced concepts."
+                tech_insight_es = "✅ Buena base técnica! Demostraste conocimiento sólido con espacio para conceptos avanzados."
             elif tech_avg >= 2.5:
-                tech_insight = "📚 Basic technical understanding. Consider diving deeper into core concepts for this role."
+                tech_insight_es = "📚 Comprensión técnica básica. Considera profundizar en conceptos clave para este rol."
             else:
-                tech_insight = "💡 Foundational level detected. Focus on building core technical skills for this position."
+                tech_insight_es = "💡 Nivel fundamental detectado. Enfócate en construir habilidades técnicas básicas para esta posición."
             
-            # English score insights
             if english_avg >= 4.5:
-                english_insight = "🌟 Fluent English! Your communication is clear and professional."
+                english_insight_es = "🌟 ¡Inglés fluido! Tu comunicación es clara y profesional."
             elif english_avg >= 3.5:
-                english_insight = "✅ Good English level! You can communicate effectively in professional settings."
+                english_insight_es = "✅ Buen nivel de inglés! Puedes comunicarte efectivamente en entornos profesionales."
             elif english_avg >= 2.5:
-                english_insight = "📚 Intermediate English. Practice will help you express complex ideas more fluently."
+                english_insight_es = "📚 Inglés intermedio. La práctica te ayudará a expresar ideas complejas con más fluidez."
             else:
-                english_insight = "💡 Basic English level. Consider focused practice for technical communication."
+                english_insight_es = "💡 Nivel básico de inglés. Considera práctica enfocada en comunicación técnica."
             
-            # Soft skills insights
             if soft_skills >= 4.5:
-                soft_insight = "🌟 Outstanding soft skills! You show strong leadership and collaboration abilities."
-            elif soft_skills >= 3.5:
-                soft_insight = "✅ Good interpersonal skills! You demonstrate teamwork and problem-solving."
-            elif soft_skills >= 2.5:
-                soft_insight = "📚 Developing soft skills. Focus on examples that show leadership and collaboration."
-            else:
-                soft_insight = "💡 Basic soft skills. Highlight specific examples of teamwork and communication."
-            
-            # Comparison with benchmarks
-            tech_vs_benchmark = tech_avg - BENCHMARK_TECH
-            english_vs_benchmark = english_avg - BENCHMARK_ENGLISH
-            soft_vs_benchmark = soft_skills - BENCHMARK_SOFT
-            
-            if lang == 'en':
-                free_mode_insights = (
-                    "\n━━━━━━━━━━━━━━━━━━\n"
-                    "💡 *YOUR PERFORMANCE INSIGHTS*\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"🔧 *Technical ({tech_avg:.1f}/5.0):*\n"
-                    f"{tech_insight}\n"
-                    f"{'📈 Above average' if tech_vs_benchmark > 0 else '📊 Average' if tech_vs_benchmark == 0 else '📉 Below average'} "
-                    f"(benchmark: {BENCHMARK_TECH:.1f}/5.0)\n\n"
-                    f"🗣️ *English ({english_avg:.1f}/5.0):*\n"
-                    f"{english_insight}\n"
-                    f"{'📈 Above average' if english_vs_benchmark > 0 else '📊 Average' if english_vs_benchmark == 0 else '📉 Below average'} "
-                    f"(benchmark: {BENCHMARK_ENGLISH:.1f}/5.0)\n\n"
-                    f"💼 *Soft Skills ({soft_skills:.1f}/5.0):*\n"
-                    f"{soft_insight}\n"
-                    f"{'📈 Above average' if soft_vs_benchmark > 0 else '📊 Average' if soft_vs_benchmark == 0 else '📉 Below average'} "
-                    f"(benchmark: {BENCHMARK_SOFT:.1f}/5.0)\n\n"
-                    f"🎯 *Overall Assessment:*\n"
-                    f"Your final score of {final_score:.2f}/5.0 places you in the "
-                    f"{'top tier' if final_score >= 4.3 else 'strong candidate' if final_score >= 3.8 else 'developing' if final_score >= 3.3 else 'needs improvement'} "
-                    f"category. This evaluation reflects your real-time responses and demonstrates how SAORI AI adapts to different candidate profiles.\n"
-                )
-        if lang == 'en':
-            response_text = (
-                f"{emoji} *INTERVIEW COMPLETED!*\n\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"📊 *FINAL RESULTS*\n"
-                f"━━━━━━━━━━━━━━━━━━\n\n"
-                f"👤 *Candidate:* {session['data']['name']}\n"
-                f"💼 *Position:* {session['data']['position']}\n"
-                f"📊 *Inferred level:* {inferred_level}\n\n"
-                f"*SCORES:*\n"
-                f"🔧 Technical: {tech_avg:.1f}/5.0 ({tech_percentage:.0f}%)\n"
-                f"🗣️ English: {english_avg:.1f}/5.0\n"
-                f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
-                f"🎯 *FINAL SCORE: {final_score:.2f}/5.0*\n\n"
-                f"*EMOTIONAL ANALYSIS (AI):*\n"
-                f"😊 Dominant emotion: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
-                f"📈 Average confidence: {avg_confidence:.0%}\n"
-                f"{journey_en}\n\n"
-                f"*RELIABILITY ANALYSIS:*\n"
-                f"🔍 Trust Score: {trust_score}/100\n"
-                f"   _(based on consistency, clarity, and emotional stability)_\n"
-                f"{inconsistency_report}\n\n"
-                f"{free_mode_insights}"
-                f"{decision}\n\n"
-                f"{upgrade_section}"
-                f"{next_step_en}"
-            )
-        else:
-            # Spanish insights (translate the English ones)
-            if not is_demo_mode:  # Show enhanced insights in FREE MODE
-                tech_insight_es = ""
-                english_insight_es = ""
-                soft_insight_es = ""
-                
-                if tech_avg >= 4.5:
-                    tech_insight_es = "🌟 ¡Excelente conocimiento técnico! Tus respuestas muestran comprensión profunda y experiencia práctica."
-                elif tech_avg >= 3.5:
-                    tech_insight_es = "✅ Buena base técnica! Demostraste conocimiento sólido con espacio para conceptos avanzados."
-                elif tech_avg >= 2.5:
-                    tech_insight_es = "📚 Comprensión técnica básica. Considera profundizar en conceptos clave para este rol."
-                else:
-                    tech_insight_es = "💡 Nivel fundamental detectado. Enfócate en construir habilidades técnicas básicas para esta posición."
-                
-                if english_avg >= 4.5:
-                    english_insight_es = "🌟 ¡Inglés fluido! Tu comunicación es clara y profesional."
-                elif english_avg >= 3.5:
-                    english_insight_es = "✅ Buen nivel de inglés! Puedes comunicarte efectivamente en entornos profesionales."
-                elif english_avg >= 2.5:
-                    english_insight_es = "📚 Inglés intermedio. La práctica te ayudará a expresar ideas complejas con más fluidez."
-                else:
-                    english_insight_es = "💡 Nivel básico de inglés. Considera práctica enfocada en comunicación técnica."
-                
-                if soft_skills >= 4.5:
-                    soft_insight_es = "🌟 ¡Soft skills excepcionales! Muestras fuerte liderazgo y habilidades de colaboración."
-                elif soft_skills >= 3.5:
-                    soft_insight_es = "✅ Buenas habilidades interpersonales! Demuestras trabajo en equipo y resolución de problemas."
-                elif soft_skills >= 2.5:
-                    soft_insight_es = "📚 Soft skills en desarrollo. Enfócate en ejemplos que muestren liderazgo y colaboración."
-                else:
-                    soft_insight_es = "💡 Soft skills básicas. Destaca ejemplos específicos de trabajo en equipo y comunicación."
-                
-                BENCHMARK_TECH = 3.0
-                BENCHMARK_ENGLISH = 3.0
-                BENCHMARK_SOFT = 3.0
-                tech_vs_benchmark = tech_avg - BENCHMARK_TECH
-                english_vs_benchmark = english_avg - BENCHMARK_ENGLISH
-                soft_vs_benchmark = soft_skills - BENCHMARK_SOFT
-                
-                free_mode_insights = (
-                    "\n━━━━━━━━━━━━━━━━━━\n"
-                    "💡 *INSIGHTS DE TU RENDIMIENTO*\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    f"🔧 *Técnico ({tech_avg:.1f}/5.0):*\n"
-                    f"{tech_insight_es}\n"
-                    f"{'📈 Por encima del promedio' if tech_vs_benchmark > 0 else '📊 Promedio' if tech_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
-                    f"(referencia: {BENCHMARK_TECH:.1f}/5.0)\n\n"
-                    f"🗣️ *Inglés ({english_avg:.1f}/5.0):*\n"
-                    f"{english_insight_es}\n"
-                    f"{'📈 Por encima del promedio' if english_vs_benchmark > 0 else '📊 Promedio' if english_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
-                    f"(referencia: {BENCHMARK_ENGLISH:.1f}/5.0)\n\n"
-                    f"💼 *Soft Skills ({soft_skills:.1f}/5.0):*\n"
-                    f"{soft_insight_es}\n"
-                    f"{'📈 Por encima del promedio' if soft_vs_benchmark > 0 else '📊 Promedio' if soft_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
-                    f"(referencia: {BENCHMARK_SOFT:.1f}/5.0)\n\n"
-                    f"🎯 *Evaluación General:*\n"
-                    f"Tu score final de {final_score:.2f}/5.0 te coloca en la categoría "
-                    f"{'de excelencia' if final_score >= 4.3 else 'de candidato fuerte' if final_score >= 3.8 else 'en desarrollo' if final_score >= 3.3 else 'de mejora'} "
-                    f". Esta evaluación refleja tus respuestas en tiempo real y demuestra cómo SAORI AI se adapta a diferentes perfiles de candidatos.\n"
-                )
-            
-            # Create visual bars for scores (Spanish)
-            tech_bar = "█" * int(tech_percentage / 5) + "░" * (20 - int(tech_percentage / 5))
-            english_bar = "█" * int((english_avg / 5.0 * 100) / 5) + "░" * (20 - int((english_avg / 5.0 * 100) / 5))
-            soft_bar = "█" * int((soft_skills / 5.0 * 100) / 5) + "░" * (20 - int((soft_skills / 5.0 * 100) / 5))
-            
-            # Stars for scores
-            tech_stars = "⭐" * min(5, int(tech_avg))
-            english_stars = "⭐" * min(5, int(english_avg))
-            soft_stars = "⭐" * min(5, int(soft_skills))
-            
-            response_text = (
-                f"{emoji} *¡ENTREVISTA COMPLETADA!*\n\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"📊 *RESULTADOS FINALES*\n"
-                f"━━━━━━━━━━━━━━━━━━\n\n"
-                f"👤 *Candidato:* {session['data']['name']}\n"
-                f"💼 *Posición:* {session['data']['position']}\n"
-                f"📊 *Nivel inferido:* {inferred_level}\n\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"*SCORES*\n"
-                f"━━━━━━━━━━━━━━━━━━\n\n"
-                f"💻 Habilidades Técnicas: {tech_avg:.1f}/5.0 {tech_stars}\n"
-                f"   {tech_bar} {tech_percentage:.0f}%\n\n"
-                f"🗣️ Nivel de Inglés: {english_avg:.1f}/5.0 {english_stars}\n"
-                f"   {english_bar} {int(english_avg / 5.0 * 100):.0f}%\n\n"
-                f"💼 Soft Skills: {soft_skills:.1f}/5.0 {soft_stars}\n"
-                f"   {soft_bar} {int(soft_skills / 5.0 * 100):.0f}%\n\n"
-                f"━━━━━━━━━━━━━━━━━━\n"
-                f"🎯 *SCORE FINAL: {final_score:.2f}/5.0*\n"
-                f"━━━━━━━━━━━━━━━━━━\n\n"
-                f"*ANÁLISIS EMOCIONAL (AI):*\n"
-                f"😊 Emoción dominante: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
-                f"📈 Confianza promedio: {avg_confidence:.0%}\n"
-                f"{journey_es}\n\n"
-                f"*ANÁLISIS DE CONFIABILIDAD:*\n"
-                f"🔍 Trust Score: {trust_score}/100\n"
-                f"   _(basado en consistencia, claridad y estabilidad emocional)_\n"
-                f"{inconsistency_report}\n\n"
-                f"{free_mode_insights}"
-                f"{decision}\n\n"
-                f"{upgrade_section}"
-                f"{next_step_es}"
-            )
-        
-        # Save final results
-        session['final_results'] = {
-            'tech_score': tech_avg,
-            'tech_percentage': tech_percentage,
-            'english_score': english_avg,
-            'soft_skills_score': soft_skills,
-            'final_score': final_score,
-            'inferred_level': inferred_level,
-            'dominant_emotion': dominant_emotion,
-            'avg_confidence': avg_confidence,
-            'trust_score': trust_score,
-            'inconsistencies_count': len(inconsistencies),
-            'decision': decision,
-            'action': action,
-            'upgrade_suggestion': upgrade_suggestion,
-            'upgrade_justification': upgrade_justification,
-            'completed_at': datetime.now().isoformat()
-        }
-        
-        # Check if this is a "REVIEW IN 6 MONTHS" decision (second chance feature)
-        if final_score >= 2.3 and final_score < 3.3:
-            session['stage'] = 13.5  # Go to second chance stage (UNIQUE STAGE NUMBER)
-            session['second_chance_offered'] = True
-        else:
-            session['stage'] = 14  # Go directly to feedback stage
-        
-        # CRITICAL: Return response_text immediately after generating final results
-        # This ensures the message is sent even if there are errors in subsequent stages
-        session['results_sent'] = True  # Mark that results were sent
-        save_session(phone_number, session)
-        print(f"[INFO] Final results generated for {phone_number} (length: {len(response_text)} chars)")
-        print(f"[DEBUG] Final results preview: {response_text[:200]}...")
-        print(f"[DEBUG] Final results will be split if > 1500 chars: {len(response_text) > 1500}")
-        return response_text
-    
-    elif stage == 13.5:  # Second Chance (only for REVIEW IN 6 MONTHS candidates)
-        print(f"[DEBUG] ====== STAGE 13.5: SECOND CHANCE ======")
-        print(f"[DEBUG] Message received: {message_text}")
-        
-        # CRITICAL FIX: Check if results were sent, if not, send them now
-        if not session.get('results_sent', False):
-            print(f"[WARNING] Results not sent yet for {phone_number}, sending now...")
-            final_results = session.get('final_results', {})
-            if final_results:
-                # Regenerate results message
-                lang = session.get('language', 'es')
-                tech_avg = final_results.get('tech_score', 0)
-                english_avg = final_results.get('english_score', 0)
-                soft_skills = final_results.get('soft_skills_score', 0)
-                final_score = final_results.get('final_score', 0)
-                inferred_level = final_results.get('inferred_level', 'N/A')
-                dominant_emotion = final_results.get('dominant_emotion', 'neutral')
-                avg_confidence = final_results.get('avg_confidence', 0)
-                trust_score = final_results.get('trust_score', 100)
-                inconsistency_report = session.get('inconsistencies', {}).get('report', '')
-                
-                # Generate results message (simplified version)
-                if lang == 'en':
-                    response_text = (
-                        f"📊 *INTERVIEW COMPLETED!*\n\n"
-                        f"━━━━━━━━━━━━━━━━━━\n"
-                        f"📊 *FINAL RESULTS*\n"
-                        f"━━━━━━━━━━━━━━━━━━\n\n"
-                        f"👤 *Candidate:* {session['data']['name']}\n"
-                        f"💼 *Position:* {session['data']['position']}\n"
-                        f"📊 *Inferred level:* {inferred_level}\n\n"
-                        f"*SCORES:*\n"
-                        f"🔧 Technical: {tech_avg:.1f}/5.0\n"
-                        f"🗣️ English: {english_avg:.1f}/5.0\n"
-                        f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
-                        f"🎯 *FINAL SCORE: {final_score:.2f}/5.0*\n\n"
-                        f"*EMOTIONAL ANALYSIS (AI):*\n"
-                        f"😊 Dominant emotion: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
-                        f"📈 Average confidence: {avg_confidence:.0%}\n\n"
-                        f"*RELIABILITY ANALYSIS:*\n"
-                        f"🔍 Trust Score: {trust_score}/100\n"
-                        f"{inconsistency_report}\n\n"
-                        f"━━━━━━━━━━━━━━━━━━\n\n"
-                        f"⏳ *REVIEW IN 6 MONTHS*\n\n"
-                        f"Thank you for completing the interview. We'll review your profile again in 6 months.\n\n"
-                    )
-                else:
-                    response_text = (
-                        f"📊 *¡ENTREVISTA COMPLETADA!*\n\n"
-                        f"━━━━━━━━━━━━━━━━━━\n"
-                        f"📊 *RESULTADOS FINALES*\n"
-                        f"━━━━━━━━━━━━━━━━━━\n\n"
-                        f"👤 *Candidato:* {session['data']['name']}\n"
-                        f"💼 *Posición:* {session['data']['position']}\n"
-                        f"📊 *Nivel inferido:* {inferred_level}\n\n"
-                        f"*SCORES:*\n"
-                        f"🔧 Técnico: {tech_avg:.1f}/5.0\n"
-                        f"🗣️ Inglés: {english_avg:.1f}/5.0\n"
-                        f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
-                        f"🎯 *SCORE FINAL: {final_score:.2f}/5.0*\n\n"
-                        f"*ANÁLISIS EMOCIONAL (AI):*\n"
-                        f"😊 Emoción dominante: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
-                        f"📈 Confianza promedio: {avg_confidence:.0%}\n\n"
-                        f"*ANÁLISIS DE CONFIABILIDAD:*\n"
-                        f"🔍 Trust Score: {trust_score}/100\n"
-                        f"{inconsistency_report}\n\n"
-                        f"━━━━━━━━━━━━━━━━━━\n\n"
-                        f"⏳ *REVISAR EN 6 MESES*\n\n"
-                        f"Gracias por completar la entrevista. Revisaremos tu perfil nuevamente en 6 meses.\n\n"
-                    )
-                
-                session['results_sent'] = True
-                save_session(phone_number, session)
-                print(f"[INFO] Results sent to {phone_number} in stage 13.5 (recovery)")
-                return response_text
-        
-        user_choice = message_text.strip().upper()
-        print(f"[DEBUG] User choice: {user_choice}")
-        lang = session.get('language', 'es')
-        
-        if user_choice in ['SKIP', 'OMITIR', 'SALTAR']:
-            # User declined second chance - go directly to final message
-            if lang == 'en':
-                response_text = (
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "💙 Thank you for sharing your journey with me today!\n\n"
-                    "I can see your potential, and I believe in your growth. While this specific role might not be the perfect match right now, that doesn't define your worth or capabilities.\n\n"
-                    "🌸 I'll reach out again in 6 months to explore new opportunities together. In the meantime:\n\n"
-                    "• Keep learning and building\n"
-                    "• Document your progress\n"
-                    "• Stay curious and confident\n\n"
-                    "Every step forward matters, and I'm excited to see where your journey takes you. 🌱\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "Take care, and see you soon!\n\n"
-                    "— *Saori 🌸*\n\n"
-                    "✅ Interview completed"
-                )
-            else:
-                response_text = (
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "💙 ¡Gracias por compartir tu camino conmigo hoy!\n\n"
-                    "Puedo ver tu potencial y creo en tu crecimiento. Aunque este rol específico quizás no sea el match perfecto ahora, eso no define tu valor ni tus capacidades.\n\n"
-                    "🌸 Me comunicaré contigo de nuevo en 6 meses para explorar nuevas oportunidades juntos. Mientras tanto:\n\n"
-                    "• Sigue aprendiendo y construyendo\n"
-                    "• Documenta tu progreso\n"
-                    "• Mantente curioso y confiado\n\n"
-                    "Cada paso adelante importa, y estoy emocionada de ver hacia dónde te lleva tu viaje. 🌱\n\n"
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "¡Cuídate y nos vemos pronto!\n\n"
-                    "— *Saori 🌸*\n\n"
-                    "✅ Entrevista completada"
-                )
-            session['stage'] = 15  # Go directly to closing (skip feedback)
-        else:
-            # User selected a position number (for future implementation)
-            if lang == 'en':
-                response_text = (
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "🎯 Thank you for your interest!\n"
-                    "We've noted your preference for this position.\n\n"
-                    "🙏 *Thank you for using SAORI AI Core!*\n"
-                    "Powered by AI 🤖\n\n"
-                    "✅ Your interview has been completed.\n"
-                    "📧 A recruiter will contact you soon.\n\n"
-                    "To start a new interview, type: *RESTART*"
-                )
-            else:
-                response_text = (
-                    "━━━━━━━━━━━━━━━━━━\n\n"
-                    "🎯 ¡Gracias por tu interés!\n"
-                    "Hemos anotado tu preferencia por esta posición.\n\n"
-                    "🙏 *¡Gracias por usar SAORI AI Core!*\n"
-                    "Powered by AI 🤖\n\n"
-                    "✅ Tu entrevista ha sido completada.\n"
-                    "📧 Un recruiter se contactará contigo pronto.\n\n"
-                    "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
-                )
-            session['stage'] = 15  # Go directly to closing (skip feedback)
-    
-    elif stage == 14:  # Feedback
-        # Check if user is trying to send answers or commands
-        lang = session.get('language', 'es')
+                soft_insight_es = "🌟 ¡Soft skills excepcionales! Muestras fuerte liderazgo y habilidades de colaboración."
+            elif soft_skills >= 3.5:
+                soft_insight_es = "✅ Buenas habilidades interpersonales! Demuestras trabajo en equipo y resolución de problemas."
+            elif soft_skills >= 2.5:
+                soft_insight_es = "📚 Soft skills en desarrollo. Enfócate en ejemplos que muestren liderazgo y colaboración."
+            else:
+                soft_insight_es = "💡 Soft skills básicas. Destaca ejemplos específicos de trabajo en equipo y comunicación."
+            
+            BENCHMARK_TECH = 3.0
+            BENCHMARK_ENGLISH = 3.0
+            BENCHMARK_SOFT = 3.0
+            tech_vs_benchmark = tech_avg - BENCHMARK_TECH
+            english_vs_benchmark = english_avg - BENCHMARK_ENGLISH
+            soft_vs_benchmark = soft_skills - BENCHMARK_SOFT
+            
+            free_mode_insights = (
+                "\n━━━━━━━━━━━━━━━━━━\n"
+                "💡 *INSIGHTS DE TU RENDIMIENTO*\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                f"🔧 *Técnico ({tech_avg:.1f}/5.0):*\n"
+                f"{tech_insight_es}\n"
+                f"{'📈 Por encima del promedio' if tech_vs_benchmark > 0 else '📊 Promedio' if tech_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
+                f"(referencia: {BENCHMARK_TECH:.1f}/5.0)\n\n"
+                f"🗣️ *Inglés ({english_avg:.1f}/5.0):*\n"
+                f"{english_insight_es}\n"
+                f"{'📈 Por encima del promedio' if english_vs_benchmark > 0 else '📊 Promedio' if english_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
+                f"(referencia: {BENCHMARK_ENGLISH:.1f}/5.0)\n\n"
+                f"💼 *Soft Skills ({soft_skills:.1f}/5.0):*\n"
+                f"{soft_insight_es}\n"
+                f"{'📈 Por encima del promedio' if soft_vs_benchmark > 0 else '📊 Promedio' if soft_vs_benchmark == 0 else '📉 Por debajo del promedio'} "
+                f"(referencia: {BENCHMARK_SOFT:.1f}/5.0)\n\n"
+                f"🎯 *Evaluación General:*\n"
+                f"Tu score final de {final_score:.2f}/5.0 te coloca en la categoría "
+                f"{'de excelencia' if final_score >= 4.3 else 'de candidato fuerte' if final_score >= 3.8 else 'en desarrollo' if final_score >= 3.3 else 'de mejora'} "
+                f". Esta evaluación refleja tus respuestas en tiempo real y demuestra cómo SAORI AI se adapta a diferentes perfiles de candidatos.\n"
+            )
         
-        # Check if this is a command first
-        if fuzzy_match_command(message_text, ['RESPUESTAS', 'RESPUESTA', 'respuestas', 'respuesta', 'RESPUEST',
-                                               'ANSWERS', 'ANSWER', 'answers', 'answer', 'ANSWR', 'ANSW',
-                                               'RESPONSES', 'RESPONSE', 'responses', 'response'], threshold=70):
-            # User is asking for answers - show them
-            response_text = show_answers_for_profile(session)
-            save_session(phone_number, session)
-            return response_text
+        # Create visual bars for scores (Spanish)
+        tech_bar = "█" * int(tech_percentage / 5) + "░" * (20 - int(tech_percentage / 5))
+        english_bar = "█" * int((english_avg / 5.0 * 100) / 5) + "░" * (20 - int((english_avg / 5.0 * 100) / 5))
+        soft_bar = "█" * int((soft_skills / 5.0 * 100) / 5) + "░" * (20 - int((soft_skills / 5.0 * 100) / 5))
         
-        # Check if user is trying to restart
-        if fuzzy_match_command(message_text, ['REINICIAR', 'RESTART', 'NUEVO', 'NEW'], threshold=80):
-            del sessions[phone_number]
+        # Stars for scores
+        tech_stars = "⭐" * min(5, int(tech_avg))
+        english_stars = "⭐" * min(5, int(english_avg))
+        soft_stars = "⭐" * min(5, int(soft_skills))
+        
+        response_text = (
+            f"{emoji} *¡ENTREVISTA COMPLETADA!*\n\n"
+            f"━━━━━━━━━━━━━━━━━━\n"
+            f"📊 *RESULTADOS FINALES*\n"
+            f"━━━━━━━━━━━━━━━━━━\n\n"
+            f"👤 *Candidato:* {session['data']['name']}\n"
+            f"💼 *Posición:* {session['data']['position']}\n"
+            f"📊 *Nivel inferido:* {inferred_level}\n\n"
+            f"━━━━━━━━━━━━━━━━━━\n"
+            f"*SCORES*\n"
+            f"━━━━━━━━━━━━━━━━━━\n\n"
+            f"💻 Habilidades Técnicas: {tech_avg:.1f}/5.0 {tech_stars}\n"
+            f"   {tech_bar} {tech_percentage:.0f}%\n\n"
+            f"🗣️ Nivel de Inglés: {english_avg:.1f}/5.0 {english_stars}\n"
+            f"   {english_bar} {int(english_avg / 5.0 * 100):.0f}%\n\n"
+            f"💼 Soft Skills: {soft_skills:.1f}/5.0 {soft_stars}\n"
+            f"   {soft_bar} {int(soft_skills / 5.0 * 100):.0f}%\n\n"
+            f"━━━━━━━━━━━━━━━━━━\n"
+            f"🎯 *SCORE FINAL: {final_score:.2f}/5.0*\n"
+            f"━━━━━━━━━━━━━━━━━━\n\n"
+            f"*ANÁLISIS EMOCIONAL (AI):*\n"
+            f"😊 Emoción dominante: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
+            f"📈 Confianza promedio: {avg_confidence:.0%}\n"
+            f"{journey_es}\n\n"
+            f"*ANÁLISIS DE CONFIABILIDAD:*\n"
+            f"🔍 Trust Score: {trust_score}/100\n"
+            f"   _(basado en consistencia, claridad y estabilidad emocional)_\n"
+            f"{inconsistency_report}\n\n"
+            f"{free_mode_insights}"
+            f"{decision}\n\n"
+            f"{upgrade_section}"
+            f"{next_step_es}"
+        )
+    
+    # Save final results
+    session['final_results'] = {
+        'tech_score': tech_avg,
+        'tech_percentage': tech_percentage,
+        'english_score': english_avg,
+        'soft_skills_score': soft_skills,
+        'final_score': final_score,
+        'inference_percentage': inference_percentage,
+        'adjusted_percentage': adjusted_percentage,
+        'penalties': penalties,
+        'inferred_level': inferred_level,
+        'dominant_emotion': dominant_emotion,
+        'avg_confidence': avg_confidence,
+        'trust_score': trust_score,
+        'inconsistencies_count': len(inconsistencies),
+        'decision': decision,
+        'action': action,
+        'upgrade_suggestion': upgrade_suggestion,
+        'upgrade_justification': upgrade_justification,
+        'completed_at': datetime.now().isoformat()
+    }
+    
+    # Check if this is a "REVIEW IN 6 MONTHS" decision (second chance feature)
+    if final_score >= 2.3 and final_score < 3.3:
+        session['stage'] = 13.5  # Go to second chance stage (UNIQUE STAGE NUMBER)
+        session['second_chance_offered'] = True
+    else:
+        session['stage'] = 14  # Go directly to feedback stage
+    
+    # CRITICAL: Return response_text immediately after generating final results
+    # This ensures the message is sent even if there are errors in subsequent stages
+    session['results_sent'] = True  # Mark that results were sent
+    save_session(phone_number, session)
+    log.info("Final results generated for %s (length: %s chars)", phone_number, len(response_text))
+    log.debug("Final results preview: %s...", response_text[:200])
+    log.debug("Final results will be split if > 1500 chars: %s", len(response_text) > 1500)
+    return response_text
+
+@stage_machine.stage(13.5, 'second_chance', transitions=(15,))
+def handle_second_chance_stage(phone_number, message_text, session):
+    """Stage 13.5: Second Chance (only for REVIEW IN 6 MONTHS candidates)"""
+    response_text = ""
+    
+    log.debug("====== STAGE 13.5: SECOND CHANCE ======")
+    log.debug("Message received: %s", message_text)
+    
+    # CRITICAL FIX: Check if results were sent, if not, send them now
+    if not session.get('results_sent', False):
+        log.warning("Results not sent yet for %s, sending now...", phone_number)
+        final_results = session.get('final_results', {})
+        if final_results:
+            # Regenerate results message
+            lang = session.get('language', 'es')
+            tech_avg = final_results.get('tech_score', 0)
+            english_avg = final_results.get('english_score', 0)
+            soft_skills = final_results.get('soft_skills_score', 0)
+            final_score = final_results.get('final_score', 0)
+            inferred_level = final_results.get('inferred_level', 'N/A')
+            dominant_emotion = final_results.get('dominant_emotion', 'neutral')
+            avg_confidence = final_results.get('avg_confidence', 0)
+            trust_score = final_results.get('trust_score', 100)
+            inconsistency_report = session.get('inconsistencies', {}).get('report', '')
+            
+            # Generate results message (simplified version)
             if lang == 'en':
                 response_text = (
-                    "🔄 *Fresh start!* 🌸\n\n"
-                    "Ready when you are! Just send any message to start your interview."
+                    f"📊 *INTERVIEW COMPLETED!*\n\n"
+                    f"━━━━━━━━━━━━━━━━━━\n"
+                    f"📊 *FINAL RESULTS*\n"
+                    f"━━━━━━━━━━━━━━━━━━\n\n"
+                    f"👤 *Candidate:* {session['data']['name']}\n"
+                    f"💼 *Position:* {session['data']['position']}\n"
+                    f"📊 *Inferred level:* {inferred_level}\n\n"
+                    f"*SCORES:*\n"
+                    f"🔧 Technical: {tech_avg:.1f}/5.0\n"
+                    f"🗣️ English: {english_avg:.1f}/5.0\n"
+                    f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
+                    f"🎯 *FINAL SCORE: {final_score:.2f}/5.0*\n\n"
+                    f"*EMOTIONAL ANALYSIS (AI):*\n"
+                    f"😊 Dominant emotion: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
+                    f"📈 Average confidence: {avg_confidence:.0%}\n\n"
+                    f"*RELIABILITY ANALYSIS:*\n"
+                    f"🔍 Trust Score: {trust_score}/100\n"
+                    f"{inconsistency_report}\n\n"
+                    f"━━━━━━━━━━━━━━━━━━\n\n"
+                    f"⏳ *REVIEW IN 6 MONTHS*\n\n"
+                    f"Thank you for completing the interview. We'll review your profile again in 6 months.\n\n"
                 )
             else:
                 response_text = (
-                    "🔄 *¡Empecemos de nuevo!* 🌸\n\n"
-                    "¡Lista cuando tú lo estés! Solo envía cualquier mensaje para iniciar tu entrevista."
+                    f"📊 *¡ENTREVISTA COMPLETADA!*\n\n"
+                    f"━━━━━━━━━━━━━━━━━━\n"
+                    f"📊 *RESULTADOS FINALES*\n"
+                    f"━━━━━━━━━━━━━━━━━━\n\n"
+                    f"👤 *Candidato:* {session['data']['name']}\n"
+                    f"💼 *Posición:* {session['data']['position']}\n"
+                    f"📊 *Nivel inferido:* {inferred_level}\n\n"
+                    f"*SCORES:*\n"
+                    f"🔧 Técnico: {tech_avg:.1f}/5.0\n"
+                    f"🗣️ Inglés: {english_avg:.1f}/5.0\n"
+                    f"💼 Soft Skills: {soft_skills:.1f}/5.0\n\n"
+                    f"🎯 *SCORE FINAL: {final_score:.2f}/5.0*\n\n"
+                    f"*ANÁLISIS EMOCIONAL (AI):*\n"
+                    f"😊 Emoción dominante: {dominant_emotion} {EMOTION_EMOJIS.get(dominant_emotion, '😐')}\n"
+                    f"📈 Confianza promedio: {avg_confidence:.0%}\n\n"
+                    f"*ANÁLISIS DE CONFIABILIDAD:*\n"
+                    f"🔍 Trust Score: {trust_score}/100\n"
+                    f"{inconsistency_report}\n\n"
+                    f"━━━━━━━━━━━━━━━━━━\n\n"
+                    f"⏳ *REVISAR EN 6 MESES*\n\n"
+                    f"Gracias por completar la entrevista. Revisaremos tu perfil nuevamente en 6 meses.\n\n"
                 )
+            
+            session['results_sent'] = True
             save_session(phone_number, session)
+            log.info("Results sent to %s in stage 13.5 (recovery)", phone_number)
             return response_text
-        
-        # Check if user copied a suggested answer (compare with final_answer if exists)
-        final_answer = session.get('data', {}).get('final_answer', '')
-        if final_answer and len(message_text) > 50:
-            # Check if message is very similar to final_answer (user copied suggested answer)
-            message_lower = message_text.lower().strip()
-            final_lower = final_answer.lower().strip()
-            if message_lower == final_lower or (len(message_lower) > 50 and message_lower in final_lower):
-                # User copied the suggested answer, but interview is already complete
-                if lang == 'en':
-                    response_text = (
-                        "✅ *Your interview has already been completed!* 🌸\n\n"
-                        "Your final answer was already submitted and evaluated.\n\n"
-                        "📧 A recruiter will contact you soon.\n\n"
-                        "To start a new interview, type: *RESTART*"
-                    )
-                else:
-                    response_text = (
-                        "✅ *¡Tu entrevista ya fue completada!* 🌸\n\n"
-                        "Tu respuesta final ya fue enviada y evaluada.\n\n"
-                        "📧 Un recruiter se contactará contigo pronto.\n\n"
-                        "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
-                    )
-                save_session(phone_number, session)
-                return response_text
-        
-        # Save feedback if not a command
-        if message_text.upper() not in ['OMITIR', 'SKIP', 'SALTAR']:
-            session['feedback'] = message_text
-        
+    
+    user_choice = message_text.strip().upper()
+    log.debug("User choice: %s", user_choice)
+    lang = session.get('language', 'es')
+    
+    if user_choice in ['SKIP', 'OMITIR', 'SALTAR']:
+        # User declined second chance - go directly to final message
+        if lang == 'en':
+            response_text = (
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "💙 Thank you for sharing your journey with me today!\n\n"
+                "I can see your potential, and I believe in your growth. While this specific role might not be the perfect match right now, that doesn't define your worth or capabilities.\n\n"
+                "🌸 I'll reach out again in 6 months to explore new opportunities together. In the meantime:\n\n"
+                "• Keep learning and building\n"
+                "• Document your progress\n"
+                "• Stay curious and confident\n\n"
+                "Every step forward matters, and I'm excited to see where your journey takes you. 🌱\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "Take care, and see you soon!\n\n"
+                "— *Saori 🌸*\n\n"
+                "✅ Interview completed"
+            )
+        else:
+            response_text = (
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "💙 ¡Gracias por compartir tu camino conmigo hoy!\n\n"
+                "Puedo ver tu potencial y creo en tu crecimiento. Aunque este rol específico quizás no sea el match perfecto ahora, eso no define tu valor ni tus capacidades.\n\n"
+                "🌸 Me comunicaré contigo de nuevo en 6 meses para explorar nuevas oportunidades juntos. Mientras tanto:\n\n"
+                "• Sigue aprendiendo y construyendo\n"
+                "• Documenta tu progreso\n"
+                "• Mantente curioso y confiado\n\n"
+                "Cada paso adelante importa, y estoy emocionada de ver hacia dónde te lleva tu viaje. 🌱\n\n"
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "¡Cuídate y nos vemos pronto!\n\n"
+                "— *Saori 🌸*\n\n"
+                "✅ Entrevista completada"
+            )
+        session['stage'] = 15  # Go directly to closing (skip feedback)
+    else:
+        # User selected a position number (for future implementation)
         if lang == 'en':
             response_text = (
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "🎯 Thank you for your interest!\n"
+                "We've noted your preference for this position.\n\n"
                 "🙏 *Thank you for using SAORI AI Core!*\n"
                 "Powered by AI 🤖\n\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
                 "✅ Your interview has been completed.\n"
                 "📧 A recruiter will contact you soon.\n\n"
                 "To start a new interview, type: *RESTART*"
             )
         else:
             response_text = (
+                "━━━━━━━━━━━━━━━━━━\n\n"
+                "🎯 ¡Gracias por tu interés!\n"
+                "Hemos anotado tu preferencia por esta posición.\n\n"
                 "🙏 *¡Gracias por usar SAORI AI Core!*\n"
                 "Powered by AI 🤖\n\n"
-                "━━━━━━━━━━━━━━━━━━\n\n"
                 "✅ Tu entrevista ha sido completada.\n"
                 "📧 Un recruiter se contactará contigo pronto.\n\n"
                 "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
             )
-        
-        session['stage'] = 15
+        session['stage'] = 15  # Go directly to closing (skip feedback)
     
-    elif stage == 15:  # Closing
-        lang = session.get('language', 'es')
-        
-        # Check for restart command
-        if message_text.upper() in ['REINICIAR', 'RESTART', 'NUEVO', 'NEW']:
-            del sessions[phone_number]
-            if lang == 'en':
-                response_text = (
-                    "🔄 *Fresh start!* 🌸\n\n"
-                    "Ready when you are! Just send any message to start your interview."
-                )
-            else:
-                response_text = (
-                    "🔄 *¡Empecemos de nuevo!* 🌸\n\n"
-                    "¡Lista cuando tú lo estés! Solo envía cualquier mensaje para iniciar tu entrevista."
-                )
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(14, 'feedback', transitions=(15,))
+def handle_feedback_stage(phone_number, message_text, session):
+    """Stage 14: Feedback"""
+    response_text = ""
+    
+    # Check if user is trying to send answers or commands
+    lang = session.get('language', 'es')
+    
+    # Check if this is a command first
+    if fuzzy_match_command(message_text, ['RESPUESTAS', 'RESPUESTA', 'respuestas', 'respuesta', 'RESPUEST',
+                                           'ANSWERS', 'ANSWER', 'answers', 'answer', 'ANSWR', 'ANSW',
+                                           'RESPONSES', 'RESPONSE', 'responses', 'response'], threshold=70):
+        # User is asking for answers - show them
+        response_text = show_answers_for_profile(session)
+        save_session(phone_number, session)
+        return response_text
+    
+    # Check if user is trying to restart
+    if fuzzy_match_command(message_text, ['REINICIAR', 'RESTART', 'NUEVO', 'NEW'], threshold=80):
+        cancel_detection(phone_number)
+        del sessions[phone_number]
+        if lang == 'en':
+            response_text = (
+                "🔄 *Fresh start!* 🌸\n\n"
+                "Ready when you are! Just send any message to start your interview."
+            )
         else:
+            response_text = (
+                "🔄 *¡Empecemos de nuevo!* 🌸\n\n"
+                "¡Lista cuando tú lo estés! Solo envía cualquier mensaje para iniciar tu entrevista."
+            )
+        save_session(phone_number, session)
+        return response_text
+    
+    # Check if user copied a suggested answer (compare with final_answer if exists)
+    final_answer = session.get('data', {}).get('final_answer', '')
+    if final_answer and len(message_text) > 50:
+        # Check if message is very similar to final_answer (user copied suggested answer)
+        message_lower = message_text.lower().strip()
+        final_lower = final_answer.lower().strip()
+        if message_lower == final_lower or (len(message_lower) > 50 and message_lower in final_lower):
+            # User copied the suggested answer, but interview is already complete
             if lang == 'en':
                 response_text = (
-                    "✅ Interview completed.\n\n"
+                    "✅ *Your interview has already been completed!* 🌸\n\n"
+                    "Your final answer was already submitted and evaluated.\n\n"
+                    "📧 A recruiter will contact you soon.\n\n"
                     "To start a new interview, type: *RESTART*"
                 )
             else:
                 response_text = (
-                    "Ya completaste tu entrevista. ✅\n\n"
+                    "✅ *¡Tu entrevista ya fue completada!* 🌸\n\n"
+                    "Tu respuesta final ya fue enviada y evaluada.\n\n"
+                    "📧 Un recruiter se contactará contigo pronto.\n\n"
                     "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
                 )
+            save_session(phone_number, session)
+            return response_text
     
-    # Save session
-    save_session(phone_number, session)
+    # Save feedback if not a command
+    if message_text.upper() not in ['OMITIR', 'SKIP', 'SALTAR']:
+        session['feedback'] = message_text
     
-    print(f"[DEBUG] Returning response_text, length: {len(response_text)}")
-    print(f"[DEBUG] First 100 chars: {response_text[:100] if response_text else 'EMPTY'}")
+    if lang == 'en':
+        response_text = (
+            "🙏 *Thank you for using SAORI AI Core!*\n"
+            "Powered by AI 🤖\n\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "✅ Your interview has been completed.\n"
+            "📧 A recruiter will contact you soon.\n\n"
+            "To start a new interview, type: *RESTART*"
+        )
+    else:
+        response_text = (
+            "🙏 *¡Gracias por usar SAORI AI Core!*\n"
+            "Powered by AI 🤖\n\n"
+            "━━━━━━━━━━━━━━━━━━\n\n"
+            "✅ Tu entrevista ha sido completada.\n"
+            "📧 Un recruiter se contactará contigo pronto.\n\n"
+            "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
+        )
     
-    return response_text
+    session['stage'] = 15
+    
+    return finish_stage(phone_number, session, response_text)
+
+@stage_machine.stage(15, 'closing', transitions=())
+def handle_closing_stage(phone_number, message_text, session):
+    """Stage 15: Closing"""
+    response_text = ""
+    
+    lang = session.get('language', 'es')
+    
+    # Check for restart command
+    if message_text.upper() in ['REINICIAR', 'RESTART', 'NUEVO', 'NEW']:
+        cancel_detection(phone_number)
+        del sessions[phone_number]
+        if lang == 'en':
+            response_text = (
+                "🔄 *Fresh start!* 🌸\n\n"
+                "Ready when you are! Just send any message to start your interview."
+            )
+        else:
+            response_text = (
+                "🔄 *¡Empecemos de nuevo!* 🌸\n\n"
+                "¡Lista cuando tú lo estés! Solo envía cualquier mensaje para iniciar tu entrevista."
+            )
+    else:
+        if lang == 'en':
+            response_text = (
+                "✅ Interview completed.\n\n"
+                "To start a new interview, type: *RESTART*"
+            )
+        else:
+            response_text = (
+                "Ya completaste tu entrevista. ✅\n\n"
+                "Para iniciar una nueva entrevista, escribe: *REINICIAR*"
+            )
+    
+    return finish_stage(phone_number, session, response_text)
 
 # ====================
 # DEMO MODE SUPPORT
@@ -4377,14 +4764,166 @@ def process_demo_mode(phone_number, message_text):
     # Step 3: Continue with normal interview
     return process_message(phone_number, message_text)
 
+@contextmanager
+def conversation_scope(phone_number):
+    """
+    Context manager that serializes work on one conversation
+    
+    Messages from the same phone number are processed one at a time, in
+    arrival order (different conversations still run in parallel). In shared
+    mode it also holds the cross-worker lease and commits the session on exit.
+    """
+    if not phone_number:
+        yield
+        return
+    with conversation_locks.hold(phone_number):
+        with (shared_sessions.conversation(phone_number) if shared_sessions else nullcontext()):
+            yield
+
+# Idempotent webhook: Twilio retries are answered from the reply of the first
+# delivery (keyed by MessageSid) instead of re-running the interview logic
+message_dedup = MessageDedupIndex(
+    window_seconds=float(os.getenv('DEDUP_WINDOW_SECONDS', '600')),
+    max_entries=int(os.getenv('DEDUP_MAX_ENTRIES', '10000'))
+)
+DEDUP_WAIT_TIMEOUT = float(os.getenv('DEDUP_WAIT_TIMEOUT', '10'))
+
+# Webhook latency: HTTP time per mode, interview logic time per stage at arrival
+WEBHOOK_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+webhook_request_seconds = metrics_registry.histogram(
+    'webhook_request_seconds', 'Webhook HTTP handling time by mode', ('mode',),
+    buckets=WEBHOOK_LATENCY_BUCKETS
+)
+webhook_stage_seconds = metrics_registry.histogram(
+    'webhook_stage_seconds', 'Interview logic time per message by stage at arrival', ('stage',),
+    buckets=WEBHOOK_LATENCY_BUCKETS
+)
+
 @app.route('/webhook', methods=['POST'])
 def webhook():
     """Twilio webhook endpoint with DEMO support"""
+    start = time.perf_counter()
+    mode = 'sync'
     try:
         # Get incoming message
         incoming_msg = request.values.get('Body', '').strip()
         from_number = request.values.get('From', '')
+        message_sid = request.values.get('MessageSid', '')
+        
+        # Twilio retry of a message we already have: answer with the original reply
+        dedup_entry = None
+        while message_sid:
+            dedup_entry, is_new = message_dedup.claim(message_sid)
+            if is_new:
+                break
+            log.info("Duplicate delivery of %s from %s, not reprocessing", message_sid, from_number)
+            parts = message_dedup.wait(dedup_entry, DEDUP_WAIT_TIMEOUT)
+            if parts is ORIGINAL_FAILED:
+                # The first delivery raised and forgot the sid: claim it and process this one
+                log.info("Original delivery of %s failed, processing the retry", message_sid)
+                continue
+            mode = 'duplicate'
+            # Extra parts were already queued by the original delivery
+            return twiml_response(from_number, parts[:1] if parts else [])
         
+        try:
+            if inbound_processor and from_number:
+                # Fast-ack mode: acknowledge now, process and reply in background
+                mode = 'async'
+                if inbound_processor.submit(from_number, incoming_msg):
+                    parts = []
+                else:
+                    log.warning("Inbound queue full, rejecting message from %s", from_number)
+                    parts = [BUSY_MESSAGE]
+            else:
+                with conversation_scope(from_number):
+                    parts = timed_handle_webhook(from_number, incoming_msg)
+        except Exception:
+            if dedup_entry is not None:
+                message_dedup.fail(dedup_entry)
+            raise
+        
+        if dedup_entry is not None and message_dedup.complete(dedup_entry, parts) and parts and outbound:
+            # A retry stopped waiting for us, so Twilio ignores this response: use the API
+            log.info("Sending reply to %s through the API (webhook response discarded by retry)", message_sid)
+            outbound.send_parts(from_number, parts, spacing=0.3)
+            return twiml_response(from_number, [])
+        return twiml_response(from_number, parts)
+    finally:
+        webhook_request_seconds.observe(time.perf_counter() - start, mode=mode)
+
+def stage_label(session):
+    """Stage of a session as a metrics label ('DEMO' while picking a demo profile, '0'...'15', '13.5')"""
+    if session.get('demo_mode') in ('select_language', 'select_profile'):
+        return 'DEMO'
+    stage = session.get('stage', 0)
+    return f"{stage:g}" if isinstance(stage, (int, float)) else str(stage)
+
+def timed_handle_webhook(from_number, incoming_msg):
+    """
+    handle_webhook() recorded in webhook_stage_seconds under the stage the message arrived at
+    ('new' for a phone without a session yet)
+    
+    Log records inside carry the phone and that stage (see src/structured_log.py).
+    """
+    start = time.perf_counter()
+    # Solo lectura: la etiqueta de métricas no debe crear la sesión antes que handle_webhook
+    session = peek_session(from_number) if from_number else None
+    stage = stage_label(session) if session is not None else ('new' if from_number else 'unknown')
+    parts = None
+    with log_context(phone=from_number, stage=stage):
+        try:
+            parts = handle_webhook(from_number, incoming_msg)
+            return parts
+        finally:
+            elapsed = time.perf_counter() - start
+            webhook_stage_seconds.observe(elapsed, stage=stage)
+            webhook_log.info(
+                "Message handled",
+                extra={'elapsed_ms': round(elapsed * 1000, 1), 'parts': len(parts) if parts is not None else 0}
+            )
+
+def process_inbound_message(from_number, incoming_msg):
+    """Fast-ack worker: run the interview logic and send the reply through the Twilio API"""
+    with conversation_scope(from_number):
+        parts = timed_handle_webhook(from_number, incoming_msg)
+    queued = outbound.send_parts(from_number, parts, spacing=0.3)
+    if queued < len(parts):
+        log.error("Queued only %s/%s reply parts for %s", queued, len(parts), from_number)
+
+# Fast-ack mode (WEBHOOK_ASYNC=1): the webhook returns an empty TwiML at once and
+# workers process messages in order per phone, replying through the Twilio API.
+# Needs the outbound dispatcher (Twilio credentials); otherwise replies stay in TwiML.
+WEBHOOK_ASYNC = os.getenv('WEBHOOK_ASYNC', '').lower() in ('1', 'true', 'yes')
+inbound_processor = None
+if WEBHOOK_ASYNC:
+    if outbound:
+        inbound_processor = InboundProcessor(
+            process_inbound_message,
+            workers=int(os.getenv('WEBHOOK_WORKERS', '8')),
+            max_pending=int(os.getenv('WEBHOOK_MAX_PENDING', '1000'))
+        )
+        log.info("Fast-ack webhook enabled (replies sent through the Twilio API)")
+    else:
+        log.warning("WEBHOOK_ASYNC needs Twilio credentials for outbound replies; using synchronous webhook")
+
+BUSY_MESSAGE = (
+    "⏳ *Estamos recibiendo muchos mensajes.* Por favor reenvía tu respuesta en un momento.\n"
+    "⏳ *We're receiving a lot of messages.* Please resend your reply in a moment."
+)
+
+def handle_webhook(from_number, incoming_msg):
+    """
+    Handle one incoming Twilio message
+    
+    Args:
+        from_number: Sender (whatsapp:+...)
+        incoming_msg: Stripped message body
+    
+    Returns:
+        list: Reply parts to send, in order (each within the WhatsApp limit)
+    """
+    try:
         # Get session for logging (may not exist yet)
         session = sessions.get(from_number, None)
         log_user_action(from_number, "Received message", incoming_msg, session, "INFO")
@@ -4392,6 +4931,7 @@ def webhook():
         # Check if this is a join code - if so, automatically start the flow
         if incoming_msg.lower().startswith('join '):
             # Clear any existing session
+            cancel_detection(from_number)
             if from_number in sessions:
                 del sessions[from_number]
             
@@ -4416,14 +4956,8 @@ def webhook():
                 "¿Qué idioma? / Which language? Just reply: *1* or *2* 😊"
             )
             
-            # Create Twilio response
-            resp = MessagingResponse()
-            msg = resp.message(response_text)
             log_user_action(from_number, f"Join code detected - showing language selection", response_text[:150], session, "INFO")
-            response_str = str(resp)
-            response = make_response(response_str)
-            response.headers['Content-Type'] = 'text/xml; charset=utf-8'
-            return response
+            return [response_text]
         
         # AUTO-START: Detect new user joining sandbox
         # When user scans QR or enters code, they receive "all set" from Twilio
@@ -4451,9 +4985,10 @@ def webhook():
         
         # If new user detected, auto-start SAORI
         if is_new_user:
-            print(f"[INFO] ✅ New user detected from {from_number} - auto-starting SAORI")
+            log.info("✅ New user detected from %s - auto-starting SAORI", from_number)
             
             # Clear any existing session
+            cancel_detection(from_number)
             if from_number in sessions:
                 del sessions[from_number]
             
@@ -4480,15 +5015,8 @@ def webhook():
                 "¿Qué idioma? / Which language? Just reply: *1* or *2* 😊"
             )
             
-            # Create Twilio response
-            resp = MessagingResponse()
-            msg = resp.message(response_text)
             log_user_action(from_number, "Auto-started SAORI (new user detected)", response_text[:150], session, "INFO")
-            
-            response_str = str(resp)
-            response = make_response(response_str)
-            response.headers['Content-Type'] = 'text/xml; charset=utf-8'
-            return response
+            return [response_text]
         
         # Check for help commands (with fuzzy matching for typo tolerance)
         help_match = fuzzy_match_command(incoming_msg, ['AYUDA', 'HELP', '?', 'H'], threshold=80)
@@ -4506,6 +5034,7 @@ def webhook():
         # Check for reset command (with fuzzy matching)
         elif fuzzy_match_command(incoming_msg, ['RESET'], threshold=80):
             session = get_session(from_number)
+            cancel_detection(from_number, session)
             session['stage'] = 0
             session['demo_mode'] = None  # Clear demo mode completely
             session['data'] = {}
@@ -4528,6 +5057,7 @@ def webhook():
             
             # Get or create session
             session = get_session(from_number)
+            cancel_detection(from_number, session)
             
             # Reset session but keep language preference
             session['stage'] = 0.6  # Go directly to DEMO/Free mode selection
@@ -4653,33 +5183,9 @@ def webhook():
                                 tip_part = parts[0].strip()
                                 answer_part = parts[1].strip()
                                 
-                                # Send tip first via webhook response
-                                resp = MessagingResponse()
-                                resp.message(tip_part)
-                                
-                                # Send answer second (using Twilio API directly)
-                                try:
-                                    if client and TWILIO_ACCOUNT_SID and TWILIO_ACCOUNT_SID != 'your_account_sid':
-                                        # Use global threading module (imported at top of file)
-                                        def send_answer():
-                                            time.sleep(0.5)  # Small delay between messages
-                                            client.messages.create(
-                                                body=answer_part,
-                                                from_=TWILIO_WHATSAPP_NUMBER,
-                                                to=from_number
-                                            )
-                                            print(f"[INFO] Sent answer as second message to {from_number}")
-                                        
-                                        threading.Thread(target=send_answer, daemon=True).start()
-                                    
-                                    save_session(from_number, session)
-                                    response_str = str(resp)
-                                    response = make_response(response_str)
-                                    response.headers['Content-Type'] = 'text/xml; charset=utf-8'
-                                    return response
-                                except Exception as e:
-                                    print(f"[ERROR] Failed to send answer as second message: {e}")
-                                    # Fallback: send as single message
+                                # Send tip first, answer second (as a separate message)
+                                save_session(from_number, session)
+                                return [tip_part, answer_part]
                     
                     save_session(from_number, session)
                 elif help_match:
@@ -4783,7 +5289,7 @@ def webhook():
         
         # CRITICAL: Validate response_text before sending
         if not response_text or response_text.strip() == "":
-            print(f"[ERROR] Empty response_text for {from_number}, using fallback")
+            log.error("Empty response_text for %s, using fallback", from_number)
             lang = session.get('language', 'es') if session else 'es'
             if lang == 'en':
                 response_text = (
@@ -4807,231 +5313,197 @@ def webhook():
         # Replace multiple consecutive newlines with double newline
         sanitized_text = re.sub(r'\n{3,}', '\n\n', response_text)
         
-        # CRITICAL: Handle long messages by splitting into multiple messages
-        # WhatsApp limit is 1600 chars per message, but Twilio may concatenate, so use smaller limit
-        MAX_MESSAGE_LENGTH = 1000  # Reduced to 1000 to ensure better message splitting and avoid truncation
-        if len(sanitized_text) > MAX_MESSAGE_LENGTH:
-            print(f"[WARNING] Message too long ({len(sanitized_text)} chars), splitting into multiple messages")
-            
-            # Split message at logical points (double newlines or section separators)
-            parts = []
-            current_part = ""
-            
-            # Try to split at section separators first (━━━━━━━━━━━━━━━━━━)
-            sections = re.split(r'(━━━━━━━━━━━━━━━━━━[^\n]*)', sanitized_text)
-            
-            for section in sections:
-                # Check if adding this section would exceed limit
-                if len(current_part) + len(section) <= MAX_MESSAGE_LENGTH:
-                    current_part += section
-                else:
-                    # Save current part if it has content
-                    if current_part.strip():
-                        parts.append(current_part.strip())
-                    # If a single section is too long, split it by newlines
-                    if len(section) > MAX_MESSAGE_LENGTH:
-                        lines = section.split('\n')
-                        temp_part = ""
-                        for line in lines:
-                            # Check if adding this line would exceed limit
-                            if len(temp_part) + len(line) + 1 <= MAX_MESSAGE_LENGTH:
-                                temp_part += line + '\n'
-                            else:
-                                # Save temp_part if it has content
-                                if temp_part.strip():
-                                    parts.append(temp_part.strip())
-                                # Start new part with current line
-                                temp_part = line + '\n'
-                        if temp_part.strip():
-                            current_part = temp_part.strip()
-                        else:
-                            current_part = ""
-                    else:
-                        current_part = section
-            
-            # Add final part if it has content
-            if current_part.strip():
-                parts.append(current_part.strip())
-            
-            # CRITICAL: Verify all parts are within limit and add part indicators
-            verified_parts = []
-            for i, part in enumerate(parts, start=1):
-                # Add part indicator to prevent Twilio concatenation
-                part_indicator = f"[Parte {i}/{len(parts)}]\n\n"
-                # Check if adding indicator would exceed limit
-                if len(part) + len(part_indicator) <= MAX_MESSAGE_LENGTH:
-                    verified_part = part_indicator + part
-                else:
-                    # If part is too long even without indicator, truncate it
-                    max_part_length = MAX_MESSAGE_LENGTH - len(part_indicator) - 10
-                    verified_part = part_indicator + part[:max_part_length] + "\n... (continúa)"
-                
-                # Final safety check
-                if len(verified_part) > MAX_MESSAGE_LENGTH:
-                    print(f"[WARNING] Part {i} still too long ({len(verified_part)} chars), truncating")
-                    verified_part = verified_part[:MAX_MESSAGE_LENGTH - 20] + "\n... (truncado)"
-                
-                verified_parts.append(verified_part)
-                print(f"[DEBUG] Part {i}/{len(parts)}: {len(verified_part)} chars")
-            
-            parts = verified_parts
-            
-            # Send first part via webhook response
-            # CRITICAL: Verify first part length before sending
-            sanitized_text = parts[0]
-            if len(sanitized_text) > 1600:
-                print(f"[ERROR] First part exceeds 1600 chars ({len(sanitized_text)} chars), truncating")
-                sanitized_text = sanitized_text[:1570] + "\n... (mensaje truncado)"
-            if len(parts) > 1:
-                print(f"[INFO] Message split into {len(parts)} parts. Sending first part ({len(sanitized_text)} chars)")
-                
-                # CRITICAL: Validate Twilio credentials and client before attempting to send additional parts
-                if (client and TWILIO_ACCOUNT_SID and TWILIO_ACCOUNT_SID != 'your_account_sid' and 
-                    TWILIO_AUTH_TOKEN and TWILIO_AUTH_TOKEN != 'your_auth_token'):
-                    # Send remaining parts asynchronously using Twilio API
-                    try:
-                        # CRITICAL: Ensure threading is available (imported at top level)
-                        # Use the global threading module, not a local import
-                        def send_remaining_parts():
-                            for i, part in enumerate(parts[1:], start=2):
-                                try:
-                                    # CRITICAL: Verify part length before sending
-                                    if len(part) > 1600:
-                                        print(f"[ERROR] Part {i} exceeds 1600 chars ({len(part)} chars), truncating")
-                                        part = part[:1570] + "\n... (mensaje truncado)"
-                                    
-                                    # Send message with explicit parameters to prevent concatenation
-                                    client.messages.create(
-                                        body=part,
-                                        from_=TWILIO_WHATSAPP_NUMBER,
-                                        to=from_number,
-                                        # Add status callback to track delivery
-                                        status_callback=None  # Can add webhook URL if needed
-                                    )
-                                    print(f"[INFO] Sent part {i}/{len(parts)} to {from_number} ({len(part)} chars)")
-                                    # Optimized delay between messages to prevent Twilio concatenation
-                                    if i < len(parts):  # Don't sleep after last part
-                                        time.sleep(0.3)  # Optimized: 0.3s is sufficient and faster
-                                except Exception as e:
-                                    print(f"[ERROR] Failed to send part {i}: {e}")
-                                    print(f"[ERROR] Part length: {len(part)} chars")
-                                    import traceback
-                                    print(f"[TRACEBACK] {traceback.format_exc()}")
-                        
-                        # Send remaining parts in background thread
-                        # Use global threading module (imported at top of file)
-                        # CRITICAL: Add delay before starting thread to ensure part 1 is sent first
-                        def start_thread_with_delay():
-                            time.sleep(0.5)  # Wait 0.5s to ensure part 1 is sent via webhook response first
-                            send_remaining_parts()
-                        
-                        thread = threading.Thread(target=start_thread_with_delay, daemon=True)
-                        thread.start()
-                        print(f"[INFO] Started thread to send {len(parts)-1} remaining parts (with 0.5s delay to ensure part 1 is sent first)")
-                    except Exception as e:
-                        print(f"[ERROR] Failed to start thread for remaining parts: {e}")
-                        import traceback
-                        print(f"[TRACEBACK] {traceback.format_exc()}")
-                        # Fallback: append indication that message was truncated
-                        sanitized_text += "\n\n... (mensaje continuará - error al enviar partes adicionales)"
-                else:
-                    print(f"[WARNING] Twilio credentials not configured or client not initialized. Only sending first part.")
-                    print(f"[WARNING] To send multiple parts, configure TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in .env file")
-                    # Append indication that message was truncated
-                    sanitized_text += "\n\n... (mensaje continuará - configure credenciales de Twilio en .env)"
-            else:
-                print(f"[INFO] Message fits in single part after sanitization ({len(sanitized_text)} chars)")
-        
-        # Final check: if still too long after sanitization, truncate with indication
-        # Use 1600 as absolute maximum (Twilio hard limit)
-        ABSOLUTE_MAX_LENGTH = 1600
-        if len(sanitized_text) > ABSOLUTE_MAX_LENGTH:
-            print(f"[WARNING] Message still too long after sanitization ({len(sanitized_text)} chars), truncating to {ABSOLUTE_MAX_LENGTH}")
-            sanitized_text = sanitized_text[:ABSOLUTE_MAX_LENGTH - 50] + "\n\n... (mensaje truncado por longitud)"
         # Ensure text is properly encoded
         try:
             sanitized_text = sanitized_text.encode('utf-8').decode('utf-8')
         except Exception as e:
-            print(f"[WARNING] Encoding issue with message: {e}")
+            log.warning("Encoding issue with message: %s", e)
             # Fallback: remove problematic characters
             sanitized_text = response_text.encode('ascii', 'ignore').decode('ascii')
         
-        # Create Twilio response
-        resp = MessagingResponse()
-        try:
-            msg = resp.message(sanitized_text)
-            print(f"[DEBUG WEBHOOK] Message created successfully")
-        except Exception as e:
-            print(f"[ERROR] Failed to create Twilio message: {e}")
-            import traceback
-            print(f"[TRACEBACK] {traceback.format_exc()}")
-            # Fallback: try with simplified message
-            resp = MessagingResponse()
-            fallback_msg = "❌ Error al generar respuesta. Por favor intenta de nuevo."
-            msg = resp.message(fallback_msg)
-            sanitized_text = fallback_msg
-        
-        # Log that message is being sent
-        print(f"[INFO] Sending message to {from_number} (length: {len(sanitized_text)} chars)")
-        print(f"[DEBUG WEBHOOK] MessagingResponse created: {type(resp)}")
-        print(f"[DEBUG WEBHOOK] Message object: {type(msg)}")
-        
-        try:
-            response_str = str(resp)
-            print(f"[DEBUG WEBHOOK] Final XML length: {len(response_str)}")
-            print(f"[DEBUG WEBHOOK] Final XML preview: {response_str[:300]}")
-            
-            # Verify XML is valid and contains the message
-            if not response_str or len(response_str) < 50:
-                print(f"[ERROR] Invalid XML response generated (length: {len(response_str)})")
-                # Generate fallback response
-                resp = MessagingResponse()
-                resp.message("❌ Error técnico. Por favor intenta de nuevo.")
-                response_str = str(resp)
-            elif sanitized_text not in response_str and len(sanitized_text) < 100:
-                # Check if message content is in XML (for short messages)
-                print(f"[WARNING] Message content may not be in XML response")
-                print(f"[DEBUG] Looking for: {sanitized_text[:50]}...")
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to convert response to string: {e}")
-            import traceback
-            print(f"[TRACEBACK] {traceback.format_exc()}")
-            # Generate fallback response
-            resp = MessagingResponse()
-            resp.message("❌ Error técnico. Por favor intenta de nuevo.")
-            response_str = str(resp)
-        
-        # CRITICAL: Ensure proper Content-Type for Twilio
-        response = make_response(response_str)
-        response.headers['Content-Type'] = 'text/xml; charset=utf-8'
-        return response
+        # CRITICAL: Handle long messages by splitting into multiple messages
+        parts = split_message(sanitized_text)
+        if len(parts) > 1:
+            log.warning("Message too long (%s chars), split into %s parts", len(sanitized_text), len(parts))
+        return parts
     
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Webhook error: {e}")
-        print(f"[TRACEBACK] {traceback.format_exc()}")
-        resp = MessagingResponse()
-        resp.message(
+        log.error("Webhook error: %s", e, exc_info=True)
+        return [
             "❌ *Oops! Something went wrong.* 🌸\n\n"
             "💡 *Need help?*\n"
             "• Send *HELP* for help\n"
             "• Send *RESET* to restart\n"
             "• Send *RESTART* to clear session\n\n"
             "If the problem persists, try again in a few moments."
-        )
-        response_str = str(resp)
-        response = make_response(response_str)
+        ]
+
+def twiml_response(from_number, parts):
+    """
+    Build the webhook TwiML reply
+    
+    The first part goes in the TwiML, the rest through the outbound dispatcher
+    (an empty parts list acknowledges the message without replying).
+    """
+    resp = MessagingResponse()
+    if not parts:
+        response = make_response(str(resp))
         response.headers['Content-Type'] = 'text/xml; charset=utf-8'
         return response
+    
+    sanitized_text = parts[0]
+    if len(parts) > 1:
+        if outbound:
+            # 0.5s head start so part 1 (webhook response) arrives first
+            queued = outbound.send_parts(from_number, parts[1:], initial_delay=0.5, spacing=0.3)
+            log.info("Queued %s/%s remaining parts for %s", queued, len(parts)-1, from_number)
+            if queued < len(parts) - 1:
+                sanitized_text += "\n\n... (mensaje continuará - error al enviar partes adicionales)"
+        else:
+            log.warning("Twilio credentials not configured. Only sending first part.")
+            log.warning("To send multiple parts, configure TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN in .env file")
+            # Append indication that message was truncated
+            sanitized_text += "\n\n... (mensaje continuará - configure credenciales de Twilio en .env)"
+    
+    # Final check: if still too long, truncate with indication
+    # Use 1600 as absolute maximum (Twilio hard limit)
+    ABSOLUTE_MAX_LENGTH = 1600
+    if len(sanitized_text) > ABSOLUTE_MAX_LENGTH:
+        log.warning("Message still too long after sanitization (%s chars), truncating to %s", len(sanitized_text), ABSOLUTE_MAX_LENGTH)
+        sanitized_text = sanitized_text[:ABSOLUTE_MAX_LENGTH - 50] + "\n\n... (mensaje truncado por longitud)"
+    
+    try:
+        msg = resp.message(sanitized_text)
+        webhook_log.debug("Message created successfully")
+    except Exception as e:
+        log.error("Failed to create Twilio message: %s", e, exc_info=True)
+        # Fallback: try with simplified message
+        resp = MessagingResponse()
+        fallback_msg = "❌ Error al generar respuesta. Por favor intenta de nuevo."
+        msg = resp.message(fallback_msg)
+        sanitized_text = fallback_msg
+    
+    # Log that message is being sent
+    log.info("Sending message to %s (length: %s chars)", from_number, len(sanitized_text))
+    webhook_log.debug("MessagingResponse created: %s", type(resp))
+    webhook_log.debug("Message object: %s", type(msg))
+    
+    try:
+        response_str = str(resp)
+        webhook_log.debug("Final XML length: %s", len(response_str))
+        webhook_log.debug("Final XML preview: %s", response_str[:300])
+        
+        # Verify XML is valid and contains the message
+        if not response_str or len(response_str) < 50:
+            log.error("Invalid XML response generated (length: %s)", len(response_str))
+            # Generate fallback response
+            resp = MessagingResponse()
+            resp.message("❌ Error técnico. Por favor intenta de nuevo.")
+            response_str = str(resp)
+        elif sanitized_text not in response_str and len(sanitized_text) < 100:
+            # Check if message content is in XML (for short messages)
+            log.warning("Message content may not be in XML response")
+            log.debug("Looking for: %s...", sanitized_text[:50])
+        
+    except Exception as e:
+        log.error("Failed to convert response to string: %s", e, exc_info=True)
+        # Generate fallback response
+        resp = MessagingResponse()
+        resp.message("❌ Error técnico. Por favor intenta de nuevo.")
+        response_str = str(resp)
+    
+    # CRITICAL: Ensure proper Content-Type for Twilio
+    response = make_response(response_str)
+    response.headers['Content-Type'] = 'text/xml; charset=utf-8'
+    return response
+
+@app.route('/admin/reload-detector', methods=['POST'])
+def admin_reload_detector():
+    """
+    Hot-reload inconsistency detector rules without discarding loaded models
+    
+    Disabled unless ADMIN_TOKEN is set; callers must send it in X-Admin-Token.
+    """
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token:
+        return {'status': 'disabled'}, 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'), admin_token.encode('utf-8')):
+        return {'status': 'forbidden'}, 403
+    try:
+        preserved = reload_preserving_state(detector_module)
+    except Exception as e:
+        log.error("Detector hot reload failed: %s", e)
+        return {'status': 'error', 'error': str(e)}, 500
+    return {'status': 'reloaded', 'preserved': preserved}
+
+# Development only: reload detector rules when the source file changes
+if os.getenv('DETECTOR_HOT_RELOAD', '').lower() in ('1', 'true', 'yes'):
+    ModuleFileWatcher(detector_module).start()
+
+# Gauges refreshed only when /metrics is scraped (nothing extra on the request path)
+sessions_active_gauge = metrics_registry.gauge('sessions_active', 'Sessions in the in-memory working set')
+sessions_archived_gauge = metrics_registry.gauge(
+    'sessions_archived', 'Persisted sessions not currently in memory (idle, evicted or finished)'
+)
+cache_hit_ratio_gauge = metrics_registry.gauge(
+    'inference_cache_hit_ratio', 'Hits / lookups of each inference cache since start', ('cache',)
+)
+
+def collect_runtime_metrics():
+    active = sessions.keys()
+    sessions_active_gauge.set(len(active))
+    try:
+        # Stored sessions not in memory (new, not yet flushed ones are not in the store)
+        active = set(active)
+        sessions_archived_gauge.set(sum(1 for key in session_store.keys() if key not in active))
+    except Exception as e:
+        log.warning("Could not count stored sessions: %s", e)
+    
+    lookups = {}
+    for (cache, outcome), count in emotion_cache.requests_total.samples().items():
+        hits, total = lookups.get(cache, (0, 0))
+        lookups[cache] = (hits + (count if outcome == 'hit' else 0), total + count)
+    for cache, (hits, total) in lookups.items():
+        cache_hit_ratio_gauge.set(hits / total if total else 0.0, cache=cache)
+
+metrics_registry.add_collector(collect_runtime_metrics)
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint (text exposition format 0.0.4)
+    
+    Open by default; when METRICS_TOKEN is set, callers must send
+    Authorization: Bearer <token>.
+    """
+    metrics_token = os.getenv('METRICS_TOKEN')
+    if metrics_token and not hmac.compare_digest(
+        request.headers.get('Authorization', '').encode('utf-8'), f"Bearer {metrics_token}".encode('utf-8')
+    ):
+        return {'status': 'forbidden'}, 403
+    response = make_response(metrics_registry.render())
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return {
         'status': 'healthy',
-        'model_loaded': sentiment_predictor is not None,
+        'model_loaded': model_registry.state('sentiment') == 'ready',
+        'models': model_registry.status(),
         'active_sessions': len(sessions),
+        'conversations_in_flight': conversation_locks.active.value(),
+        'conversation_queue_depth': conversation_locks.queue_depth.value(),
+        'detection_jobs_in_flight': detection_pool.in_flight.value(),
+        'inbound_queue_depth': inbound_processor.pending() if inbound_processor else 0,
+        'duplicate_deliveries_absorbed': (
+            message_dedup.duplicates_total.value(outcome='cached') +
+            message_dedup.duplicates_total.value(outcome='waited')
+        ),
+        'inference_caches': {
+            cache.name: cache.stats() for cache in (emotion_cache, language_cache, grammar_service.cache)
+        },
         'timestamp': datetime.now().isoformat()
     }
 
@@ -5101,45 +5573,34 @@ def home():
 # Pre-load BERT model at startup for better performance
 def preload_bert_models():
     """Pre-load BERT models for both languages to avoid delays during interviews"""
-    try:
-        print("[INFO] Pre-cargando modelos BERT para mejor rendimiento...")
-        import src.whatsapp_inconsistency_detector as detector_module
-        
-        # Pre-load para español
-        print("[INFO] Pre-cargando modelo BERT (Español)...")
-        detector_module._get_bert_checker(language='es')
-        
-        # Pre-load para inglés
-        print("[INFO] Pre-cargando modelo BERT (Inglés)...")
-        detector_module._get_bert_checker(language='en')
-        
-        print("[INFO] ✅ Modelos BERT pre-cargados correctamente")
-    except Exception as e:
-        print(f"[WARNING] No se pudieron pre-cargar modelos BERT: {e}")
-        print("[INFO] El sistema funcionará normalmente, pero puede haber pequeñas demoras en la primera detección")
+    log.info("Pre-cargando modelos BERT (Español, Inglés) en background...")
+    return model_registry.preload([f"similarity:{lang}" for lang in detector_module.BERT_LANGUAGES])
+
+# Sessions are loaded lazily by get_session(); eager warm-up is opt-in
+if os.getenv('SESSION_PRELOAD', '').lower() in ('1', 'true', 'yes'):
+    log.info("Loading all sessions from store...")
+    load_all_sessions()
 
-# Load all sessions at startup to prevent loss on restart
-print("[INFO] Loading all sessions from files...")
-load_all_sessions()
+# Background model preload (startup is not blocked; /health shows each model's state)
+# MODEL_PRELOAD: comma-separated registry keys, e.g. sentiment,similarity:es,similarity:en,grammar
+MODEL_PRELOAD = [key.strip() for key in os.getenv('MODEL_PRELOAD', 'sentiment').split(',') if key.strip()]
+# Start (or connect to) the shared LanguageTool server before the first English answer
+if os.getenv('GRAMMAR_WARMUP', '').lower() in ('1', 'true', 'yes') and 'grammar' not in MODEL_PRELOAD:
+    MODEL_PRELOAD.append('grammar')
+model_registry.preload(MODEL_PRELOAD)
 
 # MAIN EXECUTION DISABLED - Using main from whatsapp_bot_with_profiles.py instead
 if __name__ == '__main__':
     print("="*60)
     print("🎯 SAORI AI Core - WhatsApp Bot")
     print("="*60)
-    print(f"[INFO] AI Model: Loaded ✅")
-    print(f"[INFO] Twilio: Configured ✅")
+    log.info("AI Model: %s (preloading in background)", model_registry.state('sentiment'))
+    log.info("Twilio: Configured ✅")
     
     # Pre-load BERT models in background (non-blocking)
-    try:
-        import threading
-        bert_thread = threading.Thread(target=preload_bert_models, daemon=True)
-        bert_thread.start()
-        print(f"[INFO] BERT pre-load iniciado en background...")
-    except Exception as e:
-        print(f"[WARNING] No se pudo iniciar pre-carga de BERT: {e}")
+    preload_bert_models()
     
-    print(f"[INFO] Starting Flask server...")
+    log.info("Starting Flask server...")
     print("="*60)
     
     # Run Flask app (debug=False to avoid caching issues)
@@ -5150,8 +5611,8 @@ if __name__ == '__main__':
             raise ValueError("Port out of valid range")
     except (ValueError, TypeError):
         port = 5000
-        print("[WARNING] Invalid PORT environment variable, using default 5000")
+        log.warning("Invalid PORT environment variable, using default 5000")
     
-    print(f"[INFO] Server starting on port {port}")
+    log.info("Server starting on port %s", port)
     app.run(debug=False, host='0.0.0.0', port=port)
 
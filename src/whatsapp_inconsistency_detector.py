@@ -4,89 +4,307 @@ Detects red flags in candidate responses during WhatsApp interviews
 Enhanced with BERT-based semantic analysis
 """
  
-# BERT Consistency Checker (opcional, mejora detección)
-_bert_checker = None
-_bert_loading = False
-_bert_failed = False
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from Modules.keyword_matcher import KeywordMatcher
+from Modules.model_optimization import (
+    optimized_dir_for, select_backend, load_torch_int8, OnnxSentenceEncoder
+)
+from src.model_registry import model_registry
+from src.metrics import registry as metrics_registry
+from src.structured_log import get_logger
+
+log = get_logger('detector')
+
+# BERT Consistency Checker (opcional, mejora detección); modelos en src/model_registry
+BERT_LANGUAGES = ('es', 'en')
 _BERT_TIMEOUT = 3.0  # Timeout en segundos para operaciones BERT
 
+# Cache de embeddings por contenido (hash del modelo + texto)
+# Compartido entre detecciones: cada respuesta se codifica una sola vez
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+_EMBEDDING_CACHE_MAX_SIZE = 4096
+
+# Mismas métricas que src/inference_cache.py (cache='embedding') y el micro-batcher
+_embedding_requests = metrics_registry.counter(
+    'inference_cache_requests_total', 'Inference cache lookups by outcome', ('cache', 'outcome')
+)
+_inference_latency = metrics_registry.histogram(
+    'inference_latency_seconds', 'Model forward pass time per batch', ('model',)
+)
+_inference_batch_size = metrics_registry.histogram(
+    'inference_batch_size', 'Texts per model forward pass', ('model',),
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+
+# Estado que sobrevive a un hot-reload de reglas (ver src/hot_reload.py):
+# los embeddings no se descartan al recargar el módulo (los modelos viven en el registry)
+_RELOAD_PRESERVE = (
+    '_embedding_cache', '_embedding_cache_lock'
+)
+
+# Keyword tables of the detections (compiled once, one pass per text)
+# DETECTION 2: Generic "I don't know" patterns (EXPANDED)
+DONT_KNOW_PATTERNS = [
+    # English patterns
+    "i don't know", "i'm not sure", "haven't used", "i do not know", "i do not have",
+    "i haven't", "i never", "i'm not familiar", "not familiar", "unfamiliar",
+    "i'm unsure", "unsure", "not sure", "not certain",
+    "i can't", "cannot", "no puedo", "i don't remember",
+    "i forgot", "i'm not aware", "i'm not experienced", "haven't worked",
+    "limited knowledge", "little experience", "not much experience",
+    "i haven't had", "never used", "don't have experience", "lack experience",
+    "not my expertise", "outside my knowledge", "beyond my knowledge",
+    
+    # Spanish patterns
+    "no sé", "no estoy seguro", "no lo he usado", "no tengo", "no conozco",
+    "no he usado", "nunca he usado", "no estoy familiarizado",
+    "no puedo", "no sé cómo", "no recuerdo", "olvidé", "no estoy al tanto",
+    "no tengo experiencia", "poca experiencia", "experiencia limitada",
+    "no he trabajado", "nunca he trabajado", "no conozco mucho",
+    "fuera de mi conocimiento", "más allá de mi conocimiento",
+    "no es mi especialidad", "no tengo mucha experiencia"
+]
+
+# DETECTION 4: Position-specific keywords (EXPANDED WITH NEW KEYWORDS)
+POSITION_KEYWORDS = {
+    'backend': [
+        # Basic backend terms
+        'api', 'apis', 'server', 'servers', 'database', 'databases', 'endpoint', 'endpoints',
+        'rest', 'restful', 'graphql', 'http', 'https', 'node', 'express', 'python', 'java',
+        'django', 'models', 'orm', 'serializer', 'view', 'queryset', 'json', 'framework',
+        'docker', 'container', 'deployment', 'microservices', 'middleware', 'authentication',
+        # Expanded terms
+        'djangorestframework', 'drf', 'viewset', 'viewsets', 'serialization', 'querysets',
+        'postgresql', 'postgres', 'mysql', 'sqlite', 'authentication', 'authorization',
+        'permissions', 'migration', 'migrations', 'middleware', 'dockerfile', 'docker-compose',
+        'kubernetes', 'k8s', 'ci/cd', 'cicd', 'continuous', 'integration', 'deployment',
+        'microservice', 'monolith', 'monolithic', 'stateless', 'stateful'
+    ],
+    'data engineer': [
+        # Basic data engineering terms
+        'etl', 'elt', 'pipeline', 'pipelines', 'data', 'spark', 'apache spark', 'airflow',
+        'apache airflow', 'sql', 'warehouse', 'data warehouse', 'transform', 'transformation',
+        'aws', 'amazon web services', 'processing', 'pyspark', 'infrastructure',
+        'normalization', 'normalize', 'schema', '1nf', '2nf', '3nf', 'rdd', 'dataframe',
+        'kafka', 'dbt', 'mlflow', 'data lake', 'batch', 'streaming', 'scalable',
+        # Expanded terms
+        'normalized', 'normalizing', 'denormalization', 'redundancy', 'redundant', 'integrity',
+        'first normal form', 'second normal form', 'third normal form', 'dependencies',
+        'dependency', 'relational', 'relationships', 'foreign key', 'primary key', 'index',
+        'dataframes', 'datasets', 'dataset', 'transformations', 'transform', 'transforms',
+        'fault tolerance', 'tolerant', 'resilient', 'resilience', 'distributed', 'distribution',
+        'cluster', 'clusters', 'data build tool', 'apache kafka', 'cloud computing',
+        'data pipeline', 'real-time', 'realtime', 'latency', 'throughput', 'scalability'
+    ],
+    'analytics engineer': [
+        # Basic analytics terms
+        'etl', 'pipeline', 'data', 'sql', 'dbt', 'warehouse', 'transform', 'analytics',
+        'normalization', 'schema', 'python', 'pandas', 'numpy', 'dataframe', 'query',
+        # Expanded terms
+        'data warehouse', 'data lake', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
+        'query', 'queries', 'sql', 'normalize', 'normalized', 'schema', 'schemas',
+        'transform', 'transformation', 'transformations', 'analytics', 'analysis'
+    ],
+    'frontend': [
+        'react', 'component', 'components', 'state', 'hooks', 'ui', 'css', 'html', 'dom',
+        'typescript', 'javascript', 'jsx', 'redux', 'vue', 'angular', 'frontend'
+    ],
+    'devops': [
+        'docker', 'kubernetes', 'k8s', 'ci/cd', 'cicd', 'pipeline', 'pipelines', 'deploy',
+        'deployment', 'container', 'containers', 'cloud', 'jenkins', 'github', 'aws',
+        'terraform', 'infrastructure', 'automation', 'orchestration'
+    ],
+    'full stack': [
+        'frontend', 'backend', 'database', 'databases', 'api', 'apis', 'full', 'stack',
+        'react', 'node', 'python', 'django', 'javascript', 'typescript', 'sql'
+    ],
+    'machine learning': [
+        'ml', 'machine learning', 'model', 'models', 'training', 'algorithm', 'python',
+        'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'data', 'dataset'
+    ]
+}
+
+# DETECTION 9: Generic/Vague Responses (EXPANDED)
+GENERIC_PATTERNS = [
+    # English patterns
+    "it depends", "depends on", "it varies", "varies", "generally", "usually", "typically",
+    "can be", "might be", "sometimes", "often", "in general", "typically speaking",
+    "it's a tool", "it's used for", "it helps", "it allows", "it enables",
+    "es una herramienta", "se usa para", "ayuda a", "permite", "facilita",
+    # Spanish patterns
+    "depende", "depende de", "varía", "en general", "usualmente", "típicamente",
+    "puede ser", "podría ser", "a veces", "generalmente", "normalmente",
+    # Definition-only patterns (without explanation)
+    "is a", "es un", "es una", "are used", "se usan", "se utiliza"
+]
+
+_dont_know_matcher = KeywordMatcher(DONT_KNOW_PATTERNS)
+_position_keywords_matcher = KeywordMatcher(POSITION_KEYWORDS)
+_generic_matcher = KeywordMatcher(GENERIC_PATTERNS)
+
+def _load_bert_checker(language):
+    """
+    Carga el modelo de similitud de un idioma (loader del model registry)
+    
+    Args:
+        language: 'es' (modelo multilingüe) o 'en' (monolingüe)
+        
+    Returns:
+        SentenceTransformer (o encoder optimizado) con embedding_cache_key
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+        import torch
+    except ImportError:
+        log.warning("sentence-transformers no disponible, usando solo detección basada en reglas")
+        raise
+    
+    # Usar modelo multilingüe si es español, monolingüe si es inglés
+    model_name = 'paraphrase-multilingual-MiniLM-L12-v2' if language == 'es' else 'paraphrase-MiniLM-L6-v2'
+    
+    # Artefacto optimizado (int8 / ONNX) si fue exportado y pasó paridad
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    artifact_dir = optimized_dir_for(model_name)
+    backend, artifact = select_backend(artifact_dir, os.getenv('SIMILARITY_BACKEND', 'auto'), device.type)
+    
+    log.info("Inicializando modelo: %s (backend: %s)", model_name, backend)
+    
+    if backend == 'onnx-int8':
+        bert_checker = OnnxSentenceEncoder(artifact_dir, artifact)
+    else:
+        bert_checker = SentenceTransformer(model_name, device='cpu')  # Cargar en CPU primero
+        if backend == 'torch-int8':
+            bert_checker = load_torch_int8(bert_checker, artifact_dir / artifact['file'])
+    # Los embeddings cambian con el modelo y el backend: clave de cache distinta
+    bert_checker.embedding_cache_key = model_name if backend == 'fp32' else f"{model_name}:{backend}"
+    
+    # Mover a GPU si está disponible (solo fp32)
+    if device.type == 'cuda' and backend == 'fp32':
+        try:
+            bert_checker.to(device)
+            log.info("Modelo cargado en %s", device)
+        except Exception as gpu_error:
+            log.warning("No se pudo usar GPU, usando CPU: %s", gpu_error)
+    else:
+        log.info("Modelo cargado en CPU")
+    
+    return bert_checker
+
+# Una variante por idioma; el registry carga cada una una sola vez (sin sondeo)
+# y la conserva entre hot-reloads de este módulo
+model_registry.register('similarity', _load_bert_checker, variants=BERT_LANGUAGES)
+
 def _get_bert_checker(language='es', timeout=_BERT_TIMEOUT):
     """
-    Lazy initialization de BERT checker con manejo robusto de errores
+    Modelo de similitud para language, cargándolo si hace falta
     
     Args:
         language: 'es' o 'en'
-        timeout: Timeout en segundos para operaciones
+        timeout: Segundos máximos de espera si otro hilo lo está cargando
         
     Returns:
         BERT checker o None si no disponible
     """
-    global _bert_checker, _bert_loading, _bert_failed
-    
-    # Si ya falló antes, no intentar de nuevo
-    if _bert_failed:
-        return None
-    
-    # Si está cargando, esperar un poco
-    if _bert_loading:
-        import time
-        wait_time = 0
-        while _bert_loading and wait_time < timeout:
-            time.sleep(0.1)
-            wait_time += 0.1
-        if _bert_checker is not None:
-            return _bert_checker
-        return None
-    
-    if _bert_checker is None:
-        try:
-            _bert_loading = True
-            from sentence_transformers import SentenceTransformer
-            import torch
-            
-            # Usar modelo multilingüe si es español, monolingüe si es inglés
-            model_name = 'paraphrase-multilingual-MiniLM-L12-v2' if language == 'es' else 'paraphrase-MiniLM-L6-v2'
-            
-            print(f"[BERT Consistency] Inicializando modelo: {model_name}")
-            
-            # Cargar modelo con timeout implícito (si tarda mucho, falla rápido)
-            _bert_checker = SentenceTransformer(model_name, device='cpu')  # Cargar en CPU primero
-            
-            # Mover a GPU si está disponible
-            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            if device.type == 'cuda':
-                try:
-                    _bert_checker.to(device)
-                    print(f"[BERT Consistency] Modelo cargado en {device}")
-                except Exception as gpu_error:
-                    print(f"[BERT Consistency] No se pudo usar GPU, usando CPU: {gpu_error}")
-                    device = torch.device("cpu")
-            else:
-                print(f"[BERT Consistency] Modelo cargado en CPU")
-            
-            _bert_loading = False
-            return _bert_checker
-            
-        except ImportError:
-            print("[BERT Consistency] sentence-transformers no disponible, usando solo detección basada en reglas")
-            _bert_failed = True
-            _bert_loading = False
-            return None
-        except Exception as e:
-            print(f"[BERT Consistency] Error inicializando: {e}")
-            _bert_failed = True
-            _bert_loading = False
-            return None
+    return model_registry.get('similarity', variant='en' if language == 'en' else 'es', timeout=timeout)
+
+def _embedding_key(bert_checker, text):
+    """Clave de cache: hash del modelo + contenido del texto"""
+    model_key = getattr(bert_checker, 'embedding_cache_key', '')
+    return hashlib.sha1(f"{model_key}\0{text}".encode('utf-8')).hexdigest()
+
+def encode_cached(bert_checker, texts):
+    """
+    Devuelve embeddings de texts, codificando solo los que no están en cache
     
-    return _bert_checker
+    Args:
+        bert_checker: Modelo SentenceTransformer
+        texts: Lista de textos
+        
+    Returns:
+        numpy.ndarray: Matriz (len(texts), dim) en el mismo orden que texts
+    """
+    import numpy as np
+    
+    keys = [_embedding_key(bert_checker, text) for text in texts]
+    with _embedding_cache_lock:
+        cached = {key: _embedding_cache[key] for key in keys if key in _embedding_cache}
+        for key in cached:
+            _embedding_cache.move_to_end(key)
+    
+    missing = {}  # key -> texto (sin duplicados, en orden)
+    for text, key in zip(texts, keys):
+        if key not in cached:
+            missing.setdefault(key, text)
+    hits = len(keys) - sum(1 for key in keys if key not in cached)
+    if hits:
+        _embedding_requests.inc(hits, cache='embedding', outcome='hit')
+    if missing:
+        _embedding_requests.inc(len(keys) - hits, cache='embedding', outcome='miss')
+        start = time.perf_counter()
+        embeddings = bert_checker.encode(
+            list(missing.values()),
+            convert_to_numpy=True,
+            batch_size=8,  # Procesar en batches pequeños para evitar memoria
+            show_progress_bar=False  # No mostrar barra de progreso
+        )
+        _inference_latency.observe(time.perf_counter() - start, model='similarity')
+        _inference_batch_size.observe(len(missing), model='similarity')
+        with _embedding_cache_lock:
+            for key, embedding in zip(missing, embeddings):
+                _embedding_cache[key] = embedding
+                cached[key] = embedding
+            while len(_embedding_cache) > _EMBEDDING_CACHE_MAX_SIZE:
+                _embedding_cache.popitem(last=False)
+    
+    return np.vstack([cached[key] for key in keys])
 
-def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
+def warm_answer_embeddings(answer, language='es'):
+    """
+    Pre-calcula embeddings de una respuesta apenas llega (etapas 7-13)
+    
+    Codifica las dos formas que usa la detección final (texto original y
+    normalizado en minúsculas), de modo que al final de la entrevista
+    detect_whatsapp_inconsistencies solo hace operaciones de matrices.
+    
+    Args:
+        answer: Texto de la respuesta del candidato
+        language: 'es' o 'en'
+    """
+    if not answer or not answer.strip():
+        return
+    bert_checker = _get_bert_checker(language)
+    if bert_checker is None:
+        return
+    try:
+        encode_cached(bert_checker, [answer, answer.lower().strip()])
+    except Exception as e:
+        log.warning("Error pre-calculando embeddings: %s", e)
+
+class DetectionCancelled(Exception):
+    """La detección fue cancelada (p.ej. el candidato reinició la entrevista)"""
+    pass
+
+def _raise_if_cancelled(cancel_event):
+    """Punto de cancelación cooperativa entre bloques de detección"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise DetectionCancelled()
+
+def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True, cancel_event=None):
     """
     Analyze WhatsApp interview session for inconsistencies
     
     Args:
         session_data: Dictionary with interview data from session
         language: 'en' or 'es' for message language
+        use_bert: Use BERT embeddings for semantic checks
+        cancel_event: Optional threading.Event; when set, detection stops at
+            the next checkpoint by raising DetectionCancelled
         
     Returns:
         List of inconsistency warnings
@@ -204,6 +422,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                 similar_pairs.append((i, j, similarity))
     
     # === MEJORA CON BERT: Detección semántica más precisa ===
+    _raise_if_cancelled(cancel_event)
     bert_checker = _get_bert_checker(language) if use_bert else None
     bert_similar_pairs = []
     
@@ -220,12 +439,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             max_responses = 10  # Procesar máximo 10 respuestas para mantener velocidad
             responses_to_process = response_list[:max_responses]
             
-            embeddings = bert_checker.encode(
-                responses_to_process, 
-                convert_to_numpy=True,
-                batch_size=8,  # Procesar en batches pequeños para evitar memoria
-                show_progress_bar=False  # No mostrar barra de progreso
-            )
+            embeddings = encode_cached(bert_checker, responses_to_process)
             
             similarity_matrix = cosine_similarity(embeddings)
             
@@ -239,10 +453,10 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             
             elapsed = time.time() - start_time
             if elapsed > 2.0:  # Si tarda más de 2 segundos, log warning
-                print(f"[BERT Consistency] Detección semántica tardó {elapsed:.2f}s (considerar optimización)")
+                log.warning("Detección semántica tardó %.2fs (considerar optimización)", elapsed)
             
         except Exception as e:
-            print(f"[BERT Consistency] Error en detección semántica: {e}")
+            log.warning("Error en detección semántica: %s", e)
             # Continuar sin BERT, usar método tradicional
     
     # Combinar resultados: usar BERT si está disponible, sino usar método tradicional
@@ -262,30 +476,10 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
         })
     
     # === DETECTION 2: Generic "I don't know" patterns (EXPANDED) ===
-    dont_know_patterns = [
-        # English patterns
-        "i don't know", "i'm not sure", "haven't used", "i do not know", "i do not have",
-        "i haven't", "i never", "i'm not familiar", "not familiar", "unfamiliar",
-        "i'm unsure", "unsure", "not sure", "not certain",
-        "i can't", "cannot", "no puedo", "i don't remember",
-        "i forgot", "i'm not aware", "i'm not experienced", "haven't worked",
-        "limited knowledge", "little experience", "not much experience",
-        "i haven't had", "never used", "don't have experience", "lack experience",
-        "not my expertise", "outside my knowledge", "beyond my knowledge",
-        
-        # Spanish patterns
-        "no sé", "no estoy seguro", "no lo he usado", "no tengo", "no conozco",
-        "no he usado", "nunca he usado", "no estoy familiarizado",
-        "no puedo", "no sé cómo", "no recuerdo", "olvidé", "no estoy al tanto",
-        "no tengo experiencia", "poca experiencia", "experiencia limitada",
-        "no he trabajado", "nunca he trabajado", "no conozco mucho",
-        "fuera de mi conocimiento", "más allá de mi conocimiento",
-        "no es mi especialidad", "no tengo mucha experiencia"
-    ]
-    
+    _raise_if_cancelled(cancel_event)
     dont_know_count = sum(
         1 for response in all_responses 
-        if any(pattern in response.lower() for pattern in dont_know_patterns)
+        if _dont_know_matcher.contains_any(response)
     )
     
     if dont_know_count >= 2:
@@ -313,80 +507,22 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
         })
     
     # === DETECTION 4: Position-specific keyword validation (EXPANDED WITH NEW KEYWORDS) ===
-    position_keywords = {
-        'backend': [
-            # Basic backend terms
-            'api', 'apis', 'server', 'servers', 'database', 'databases', 'endpoint', 'endpoints',
-            'rest', 'restful', 'graphql', 'http', 'https', 'node', 'express', 'python', 'java',
-            'django', 'models', 'orm', 'serializer', 'view', 'queryset', 'json', 'framework',
-            'docker', 'container', 'deployment', 'microservices', 'middleware', 'authentication',
-            # Expanded terms
-            'djangorestframework', 'drf', 'viewset', 'viewsets', 'serialization', 'querysets',
-            'postgresql', 'postgres', 'mysql', 'sqlite', 'authentication', 'authorization',
-            'permissions', 'migration', 'migrations', 'middleware', 'dockerfile', 'docker-compose',
-            'kubernetes', 'k8s', 'ci/cd', 'cicd', 'continuous', 'integration', 'deployment',
-            'microservice', 'monolith', 'monolithic', 'stateless', 'stateful'
-        ],
-        'data engineer': [
-            # Basic data engineering terms
-            'etl', 'elt', 'pipeline', 'pipelines', 'data', 'spark', 'apache spark', 'airflow',
-            'apache airflow', 'sql', 'warehouse', 'data warehouse', 'transform', 'transformation',
-            'aws', 'amazon web services', 'processing', 'pyspark', 'infrastructure',
-            'normalization', 'normalize', 'schema', '1nf', '2nf', '3nf', 'rdd', 'dataframe',
-            'kafka', 'dbt', 'mlflow', 'data lake', 'batch', 'streaming', 'scalable',
-            # Expanded terms
-            'normalized', 'normalizing', 'denormalization', 'redundancy', 'redundant', 'integrity',
-            'first normal form', 'second normal form', 'third normal form', 'dependencies',
-            'dependency', 'relational', 'relationships', 'foreign key', 'primary key', 'index',
-            'dataframes', 'datasets', 'dataset', 'transformations', 'transform', 'transforms',
-            'fault tolerance', 'tolerant', 'resilient', 'resilience', 'distributed', 'distribution',
-            'cluster', 'clusters', 'data build tool', 'apache kafka', 'cloud computing',
-            'data pipeline', 'real-time', 'realtime', 'latency', 'throughput', 'scalability'
-        ],
-        'analytics engineer': [
-            # Basic analytics terms
-            'etl', 'pipeline', 'data', 'sql', 'dbt', 'warehouse', 'transform', 'analytics',
-            'normalization', 'schema', 'python', 'pandas', 'numpy', 'dataframe', 'query',
-            # Expanded terms
-            'data warehouse', 'data lake', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
-            'query', 'queries', 'sql', 'normalize', 'normalized', 'schema', 'schemas',
-            'transform', 'transformation', 'transformations', 'analytics', 'analysis'
-        ],
-        'frontend': [
-            'react', 'component', 'components', 'state', 'hooks', 'ui', 'css', 'html', 'dom',
-            'typescript', 'javascript', 'jsx', 'redux', 'vue', 'angular', 'frontend'
-        ],
-        'devops': [
-            'docker', 'kubernetes', 'k8s', 'ci/cd', 'cicd', 'pipeline', 'pipelines', 'deploy',
-            'deployment', 'container', 'containers', 'cloud', 'jenkins', 'github', 'aws',
-            'terraform', 'infrastructure', 'automation', 'orchestration'
-        ],
-        'full stack': [
-            'frontend', 'backend', 'database', 'databases', 'api', 'apis', 'full', 'stack',
-            'react', 'node', 'python', 'django', 'javascript', 'typescript', 'sql'
-        ],
-        'machine learning': [
-            'ml', 'machine learning', 'model', 'models', 'training', 'algorithm', 'python',
-            'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'data', 'dataset'
-        ]
-    }
-    
     # Find matching position category
     matched_category = None
-    for category, keywords in position_keywords.items():
+    for category in POSITION_KEYWORDS:
         if category in position:
             matched_category = category
             break
     
     if matched_category:
-        expected_keywords = position_keywords[matched_category]
         # Search in ALL responses (tech + English) for better detection
-        all_text = ' '.join(all_responses).lower()
+        all_text = ' '.join(all_responses)
         
-        found_keywords = [kw for kw in expected_keywords if kw in all_text]
+        # Entries of the category list found (duplicated entries count twice)
+        found_count = _position_keywords_matcher.count(all_text)[matched_category]
         
         # More lenient: only flag if less than 3 keywords found
-        if len(found_keywords) < 3:
+        if found_count < 3:
             if language == 'en':
                 msg = f'⚠️ Few relevant technical keywords for {position} detected'
             else:
@@ -486,6 +622,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             })
     
     # === DETECTION 8: Contradictions Detection (NEW) ===
+    _raise_if_cancelled(cancel_event)
     # Detect contradictions in responses
     contradictions = []
     
@@ -596,6 +733,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
         })
     
     # === MEJORA CON BERT: Detección de contradicciones semánticas sutiles ===
+    _raise_if_cancelled(cancel_event)
     if bert_checker and len(tech_responses) >= 2:
         try:
             import time
@@ -607,12 +745,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             # Generar embeddings de respuestas técnicas (máximo 5 respuestas técnicas)
             tech_responses_limited = tech_responses[:5]
             
-            tech_embeddings = bert_checker.encode(
-                tech_responses_limited, 
-                convert_to_numpy=True,
-                batch_size=8,
-                show_progress_bar=False
-            )
+            tech_embeddings = encode_cached(bert_checker, tech_responses_limited)
             tech_similarity_matrix = cosine_similarity(tech_embeddings)
             
             # Detectar contradicciones semánticas
@@ -635,7 +768,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             
             elapsed = time.time() - start_time
             if elapsed > 2.0:
-                print(f"[BERT Consistency] Detección de contradicciones tardó {elapsed:.2f}s")
+                log.warning("Detección de contradicciones tardó %.2fs", elapsed)
             
             if len(semantic_contradictions) >= 1:
                 if language == 'en':
@@ -648,26 +781,14 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                     'message': msg
                 })
         except Exception as e:
-            print(f"[BERT Consistency] Error en detección de contradicciones: {e}")
+            log.warning("Error en detección de contradicciones: %s", e)
             # Continuar sin BERT, no es crítico
     
     # === DETECTION 9: Generic/Vague Responses (EXPANDED) ===
-    generic_patterns = [
-        # English patterns
-        "it depends", "depends on", "it varies", "varies", "generally", "usually", "typically",
-        "can be", "might be", "sometimes", "often", "in general", "typically speaking",
-        "it's a tool", "it's used for", "it helps", "it allows", "it enables",
-        "es una herramienta", "se usa para", "ayuda a", "permite", "facilita",
-        # Spanish patterns
-        "depende", "depende de", "varía", "en general", "usualmente", "típicamente",
-        "puede ser", "podría ser", "a veces", "generalmente", "normalmente",
-        # Definition-only patterns (without explanation)
-        "is a", "es un", "es una", "are used", "se usan", "se utiliza"
-    ]
-    
+    _raise_if_cancelled(cancel_event)
     generic_count = sum(
         1 for response in tech_responses 
-        if any(pattern in response.lower() for pattern in generic_patterns)
+        if _generic_matcher.contains_any(response)
     )
     
     if generic_count >= 2:
@@ -731,6 +852,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                     break
     
     # === DETECTION 11: Technical Contradictions (ENHANCED WITH BERT) ===
+    _raise_if_cancelled(cancel_event)
     if len(tech_responses) >= 2:
         # Check for contradictions between technical knowledge claims
         knowledge_claims = []
@@ -764,6 +886,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
             })
         
         # === MEJORA CON BERT: Validación de coherencia técnica ===
+        _raise_if_cancelled(cancel_event)
         if bert_checker:
             try:
                 import time
@@ -776,12 +899,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                 tech_responses_limited = tech_responses[:5]
                 
                 # Generar embeddings de respuestas técnicas
-                tech_embeddings = bert_checker.encode(
-                    tech_responses_limited, 
-                    convert_to_numpy=True,
-                    batch_size=8,
-                    show_progress_bar=False
-                )
+                tech_embeddings = encode_cached(bert_checker, tech_responses_limited)
                 tech_similarity_matrix = cosine_similarity(tech_embeddings)
                 
                 # Detectar respuestas con baja coherencia
@@ -800,7 +918,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                 
                 elapsed = time.time() - start_time
                 if elapsed > 2.0:
-                    print(f"[BERT Consistency] Validación de coherencia tardó {elapsed:.2f}s")
+                    log.warning("Validación de coherencia tardó %.2fs", elapsed)
                 
                 if len(coherence_issues) >= 2:
                     if language == 'en':
@@ -813,7 +931,7 @@ def detect_whatsapp_inconsistencies(session_data, language='es', use_bert=True):
                         'message': msg
                     })
             except Exception as e:
-                print(f"[BERT Consistency] Error en validación de coherencia: {e}")
+                log.warning("Error en validación de coherencia: %s", e)
                 # Continuar sin BERT, no es crítico
     
     return issues
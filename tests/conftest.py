@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Los tests importan los módulos como lo hace la app: src.x / Modules.x
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
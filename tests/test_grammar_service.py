@@ -0,0 +1,148 @@
+"""
+GrammarService client pool tests with a fake language_tool_python module
+"""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+import src.grammar_service as grammar_service
+from src.grammar_service import GrammarService
+from src.metrics import MetricsRegistry
+
+
+class FakeMatch:
+    def __init__(self, message, offset, length):
+        self.message = message
+        self.offset = offset
+        self.errorLength = length
+
+
+class FakeLanguageTool:
+    """Local server object; _url is missing when expose_url is False (old versions)"""
+
+    instances = []
+    expose_url = False
+
+    def __init__(self, language, remote_server=None):
+        self.remote_server = remote_server
+        if remote_server is None and FakeLanguageTool.expose_url:
+            self._url = "http://127.0.0.1:8081/v2"
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        FakeLanguageTool.instances.append(self)
+
+    def check(self, text):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return [FakeMatch("typo", 0, 3)] if "teh" in text else []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_languagetool(monkeypatch):
+    FakeLanguageTool.instances = []
+    FakeLanguageTool.expose_url = False
+    module = types.ModuleType("language_tool_python")
+    module.LanguageTool = FakeLanguageTool
+    monkeypatch.setitem(sys.modules, "language_tool_python", module)
+    return FakeLanguageTool
+
+
+def run_checks(service, texts, concurrency=4):
+    """Checks in rounds of `concurrency` parallel calls (the pool size, so none is rejected as busy)"""
+    results = []
+    for start in range(0, len(texts), concurrency):
+        results += run_round(service, texts[start:start + concurrency])
+    return results
+
+
+def run_round(service, texts):
+    results = [None] * len(texts)
+
+    def worker(i):
+        results[i] = service.check(texts[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_unknown_server_url_uses_a_single_client(fake_languagetool, tmp_path):
+    service = GrammarService(pool_size=4, timeout=5.0, state_dir=tmp_path, metrics=MetricsRegistry())
+    results = run_checks(service, [f"teh sentence {i}" for i in range(16)])
+
+    assert all(result is not None and len(result) == 1 for result in results)
+    assert len(fake_languagetool.instances) == 1
+    server = fake_languagetool.instances[0]
+    assert server.max_in_flight == 1
+    # Put back exactly once: never queued twice
+    assert service._clients.qsize() == 1
+    service.close()
+
+
+def test_known_server_url_pools_remote_clients(fake_languagetool, tmp_path):
+    service = GrammarService(server_url="http://lt:8081", pool_size=4, timeout=5.0,
+                             state_dir=tmp_path, metrics=MetricsRegistry())
+    results = run_checks(service, [f"sentence {i}" for i in range(16)])
+
+    assert all(result == [] for result in results)
+    assert all(tool.remote_server == "http://lt:8081" for tool in fake_languagetool.instances)
+    assert 1 <= len(fake_languagetool.instances) <= 4
+    assert all(tool.max_in_flight == 1 for tool in fake_languagetool.instances)
+    service.close()
+
+
+def test_results_are_cached(fake_languagetool, tmp_path):
+    registry = MetricsRegistry()
+    service = GrammarService(server_url="http://lt:8081", state_dir=tmp_path, metrics=registry)
+    first = service.check("teh cat")
+    second = service.check("teh cat")
+    assert first == second
+    assert service.checks_total.value(outcome='miss') == 1
+    assert service.checks_total.value(outcome='hit') == 1
+    service.close()
+
+
+def test_takeover_drops_stale_server_url(fake_languagetool, tmp_path):
+    # A previous owner died and left its URL behind
+    (tmp_path / "saori-languagetool.url").write_text("http://127.0.0.1:9999", encoding='utf-8')
+    service = GrammarService(timeout=5.0, state_dir=tmp_path, metrics=MetricsRegistry())
+
+    assert service._resolve_server_url() is None
+    assert not (tmp_path / "saori-languagetool.url").exists()
+    assert service.server_url is None
+    service.close()
+
+
+def test_waiting_for_shared_server_does_not_hold_server_lock(fake_languagetool, tmp_path, monkeypatch):
+    monkeypatch.setattr(grammar_service, '_try_lock', lambda handle: False)
+    service = GrammarService(timeout=5.0, state_dir=tmp_path, startup_timeout=5.0,
+                             metrics=MetricsRegistry())
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('url', service._resolve_server_url()))
+    thread.start()
+    time.sleep(0.1)
+
+    # The check failure handler must not block behind the poll
+    assert service._server_lock.acquire(timeout=0.2)
+    service._server_lock.release()
+
+    (tmp_path / "saori-languagetool.url").write_text("http://127.0.0.1:8081", encoding='utf-8')
+    thread.join(5.0)
+    assert result['url'] == "http://127.0.0.1:8081"
+    assert service.server_url == "http://127.0.0.1:8081"
+    service.close()
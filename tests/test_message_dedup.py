@@ -0,0 +1,95 @@
+"""
+MessageDedupIndex tests: cached, waited, timed-out and failed originals
+"""
+
+import threading
+import time
+
+from src.message_dedup import MessageDedupIndex, ORIGINAL_FAILED
+from src.metrics import MetricsRegistry
+
+
+def make_index(**kwargs):
+    return MessageDedupIndex(metrics=MetricsRegistry(), **kwargs)
+
+
+def wait_in_thread(index, entry, timeout):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('reply', index.wait(entry, timeout)))
+    thread.start()
+    return thread, result
+
+
+def test_retry_after_completion_gets_cached_reply():
+    index = make_index()
+    entry, is_new = index.claim("SM1")
+    assert is_new
+    assert index.complete(entry, ["hola"]) is False
+
+    duplicate, is_new = index.claim("SM1")
+    assert not is_new and duplicate is entry
+    assert index.wait(duplicate, 1.0) == ["hola"]
+    assert index.duplicates_total.value(outcome='cached') == 1
+
+
+def test_retry_waits_for_running_original():
+    index = make_index()
+    entry, _ = index.claim("SM1")
+    duplicate, _ = index.claim("SM1")
+    thread, result = wait_in_thread(index, duplicate, 5.0)
+
+    index.complete(entry, ["respuesta"])
+    thread.join(5.0)
+    assert result['reply'] == ["respuesta"]
+    assert index.duplicates_total.value(outcome='waited') == 1
+
+
+def test_timed_out_retry_orphans_the_original():
+    index = make_index()
+    entry, _ = index.claim("SM1")
+    duplicate, _ = index.claim("SM1")
+    assert index.wait(duplicate, 0.01) is None
+    # The original must now deliver its reply out of band
+    assert index.complete(entry, ["tarde"]) is True
+    assert index.duplicates_total.value(outcome='timeout') == 1
+
+
+def test_failed_original_is_reported_and_retry_can_reclaim():
+    index = make_index()
+    entry, _ = index.claim("SM1")
+    duplicate, _ = index.claim("SM1")
+    thread, result = wait_in_thread(index, duplicate, 5.0)
+
+    index.fail(entry)
+    thread.join(5.0)
+    assert result['reply'] is ORIGINAL_FAILED
+    assert index.duplicates_total.value(outcome='failed') == 1
+
+    # The sid was forgotten: the retry claims it and is processed normally
+    retry, is_new = index.claim("SM1")
+    assert is_new and retry is not entry
+    assert index.complete(retry, ["ok"]) is False
+    later, is_new = index.claim("SM1")
+    assert not is_new and index.wait(later, 1.0) == ["ok"]
+
+
+def test_empty_reply_is_not_a_failure():
+    # Fast-ack mode completes with no parts; a retry must not reprocess it
+    index = make_index()
+    entry, _ = index.claim("SM1")
+    index.complete(entry, [])
+    duplicate, _ = index.claim("SM1")
+    assert index.wait(duplicate, 1.0) == []
+
+
+def test_window_and_size_bounds():
+    index = make_index(window_seconds=600.0, max_entries=2)
+    for sid in ("SM1", "SM2", "SM3"):
+        index.claim(sid)
+    assert len(index) == 2
+    assert index.claim("SM1")[1]  # oldest was dropped
+
+    index = make_index(window_seconds=0.01)
+    index.claim("SM1")
+    time.sleep(0.05)
+    assert index.claim("SM1")[1]
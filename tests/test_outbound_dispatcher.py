@@ -0,0 +1,322 @@
+"""
+OutboundDispatcher tests with a fake sender (ordering, backoff, parked
+recipients, token bucket, shutdown) and TwilioRestSender tests against a
+local fake Twilio endpoint.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from src.metrics import MetricsRegistry
+from src.outbound_dispatcher import OutboundDispatcher, SendError, TokenBucket, TwilioRestSender
+
+SENDER = "whatsapp:+14155238886"
+
+
+class FakeSender:
+    """Records every attempt; failures maps body -> list of errors to raise first"""
+
+    def __init__(self, failures=None, latency=0.0):
+        self.failures = {body: list(errors) for body, errors in (failures or {}).items()}
+        self.latency = latency
+        self.attempts = []  # (monotonic time, to, body)
+        self.sent = []
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def send(self, from_, to, body):
+        with self._lock:
+            self.attempts.append((time.monotonic(), to, body))
+            pending = self.failures.get(body)
+            error = pending.pop(0) if pending else None
+        if self.latency:
+            time.sleep(self.latency)
+        if error is not None:
+            raise error
+        with self._lock:
+            self.sent.append((to, body))
+        return f"SM{len(self.sent)}"
+
+    def close(self):
+        self.closed = True
+
+
+def make_dispatcher(sender, **kwargs):
+    kwargs.setdefault('metrics', MetricsRegistry())
+    return OutboundDispatcher(sender, SENDER, **kwargs)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def test_per_recipient_order_is_kept():
+    sender = FakeSender(latency=0.001)
+    dispatcher = make_dispatcher(sender, workers=4, rate_per_second=10_000, burst=10_000)
+    recipients = [f"whatsapp:+1809000{i:04d}" for i in range(12)]
+    for n in range(20):
+        for to in recipients:
+            assert dispatcher.send(to, f"{to}#{n}")
+
+    assert wait_until(lambda: len(sender.sent) == 240)
+    for to in recipients:
+        bodies = [body for recipient, body in sender.sent if recipient == to]
+        assert bodies == [f"{to}#{n}" for n in range(20)]
+    dispatcher.close()
+
+
+def test_delayed_parts_do_not_overtake_each_other():
+    sender = FakeSender()
+    dispatcher = make_dispatcher(sender, workers=2, rate_per_second=10_000, burst=10_000)
+    dispatcher.send_parts("whatsapp:+1", ["a", "b", "c"], initial_delay=0.05, spacing=0.02)
+    dispatcher.send("whatsapp:+1", "d")
+    assert wait_until(lambda: len(sender.sent) == 4)
+    assert [body for _, body in sender.sent] == ["a", "b", "c", "d"]
+    dispatcher.close()
+
+
+def test_retryable_errors_back_off_exponentially():
+    sender = FakeSender(failures={"hi": [SendError("503", retryable=True), SendError("503", retryable=True)]})
+    registry = MetricsRegistry()
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.05, rate_per_second=1000, burst=10,
+                                 metrics=registry)
+    dispatcher.send("whatsapp:+1", "hi")
+    assert wait_until(lambda: len(sender.sent) == 1)
+
+    times = [t for t, _, _ in sender.attempts]
+    assert len(times) == 3
+    assert times[1] - times[0] >= 0.05
+    assert times[2] - times[1] >= 0.10
+    assert dispatcher.messages_total.value(outcome='retried') == 2
+    assert dispatcher.messages_total.value(outcome='sent') == 1
+    dispatcher.close()
+
+
+def test_retry_after_overrides_backoff():
+    sender = FakeSender(failures={"hi": [SendError("429", retryable=True, retry_after=0.2)]})
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.01)
+    dispatcher.send("whatsapp:+1", "hi")
+    assert wait_until(lambda: len(sender.sent) == 1)
+    times = [t for t, _, _ in sender.attempts]
+    assert times[1] - times[0] >= 0.2
+    dispatcher.close()
+
+
+def test_retry_after_is_capped():
+    sender = FakeSender(failures={"hi": [SendError("429", retryable=True, retry_after=3600)]})
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.01, max_retry_after=0.05)
+    dispatcher.send("whatsapp:+1", "hi")
+    assert wait_until(lambda: len(sender.sent) == 1, timeout=2.0)
+    dispatcher.close()
+
+
+def test_throttled_recipient_does_not_block_its_worker():
+    # One worker: both recipients share the shard
+    sender = FakeSender(failures={"a1": [SendError("429", retryable=True, retry_after=1.0)]})
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.01, rate_per_second=10_000, burst=10_000)
+    start = time.monotonic()
+    dispatcher.send("whatsapp:+1", "a1")
+    dispatcher.send("whatsapp:+1", "a2")
+    dispatcher.send("whatsapp:+2", "b1")
+    dispatcher.send("whatsapp:+2", "b2")
+
+    assert wait_until(lambda: [body for _, body in sender.sent] == ["b1", "b2"], timeout=0.5)
+    assert time.monotonic() - start < 0.5
+    # The throttled recipient keeps its own order once Retry-After has passed
+    assert wait_until(lambda: len(sender.sent) == 4)
+    assert [body for _, body in sender.sent] == ["b1", "b2", "a1", "a2"]
+    assert sender.attempts[-2][0] - start >= 1.0
+    dispatcher.close()
+
+
+def test_rate_limited_sender_does_not_block_other_senders():
+    sender = FakeSender()
+    dispatcher = make_dispatcher(sender, workers=1, rate_per_second=2, burst=1)
+    dispatcher.send("whatsapp:+1", "a1")
+    dispatcher.send("whatsapp:+1", "a2")  # waits ~0.5s for a token of SENDER
+    dispatcher.send("whatsapp:+2", "b1", from_="whatsapp:+14155550000")
+    assert wait_until(lambda: [body for _, body in sender.sent] == ["a1", "b1"], timeout=0.3)
+    assert wait_until(lambda: len(sender.sent) == 3)
+    dispatcher.close()
+
+
+def test_non_retryable_error_is_not_retried():
+    sender = FakeSender(failures={"hi": [SendError("maybe delivered", retryable=False)]})
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.01)
+    dispatcher.send("whatsapp:+1", "hi")
+    dispatcher.send("whatsapp:+1", "next")
+    assert wait_until(lambda: len(sender.sent) == 1)
+    assert [body for _, _, body in sender.attempts] == ["hi", "next"]
+    assert dispatcher.messages_total.value(outcome='failed') == 1
+    dispatcher.close()
+
+
+def test_gives_up_after_max_retries():
+    errors = [SendError("503", retryable=True) for _ in range(5)]
+    sender = FakeSender(failures={"hi": errors})
+    dispatcher = make_dispatcher(sender, workers=1, backoff_base=0.001, max_retries=2)
+    dispatcher.send("whatsapp:+1", "hi")
+    assert wait_until(lambda: dispatcher.messages_total.value(outcome='failed') == 1)
+    assert len(sender.attempts) == 3
+    assert sender.sent == []
+    dispatcher.close()
+
+
+def test_token_bucket_limits_send_rate():
+    sender = FakeSender()
+    dispatcher = make_dispatcher(sender, workers=4, rate_per_second=50, burst=5)
+    start = time.monotonic()
+    for i in range(25):
+        dispatcher.send(f"whatsapp:+1{i}", f"m{i}")
+    assert wait_until(lambda: len(sender.sent) == 25)
+    elapsed = time.monotonic() - start
+    # 5 tokens up front, then 50/s for the remaining 20
+    assert elapsed >= 20 / 50 * 0.9
+    dispatcher.close()
+
+
+def test_token_bucket_reserve():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_close_does_not_block_on_full_queue():
+    sender = FakeSender(latency=0.05)
+    dispatcher = make_dispatcher(sender, workers=1, max_queue=3, rate_per_second=10_000, burst=10_000)
+    while dispatcher.send("whatsapp:+1", "x"):
+        pass
+    start = time.monotonic()
+    dispatcher.close(timeout=0.2)
+    assert time.monotonic() - start < 1.0
+    assert sender.closed
+    assert not dispatcher.send("whatsapp:+1", "late")
+
+
+def test_metrics_exist_before_workers_start():
+    sender = FakeSender()
+    dispatcher = make_dispatcher(sender, workers=2)
+    assert dispatcher.queue_depth.value() == 0
+    dispatcher.send("whatsapp:+1", "hi")
+    assert wait_until(lambda: len(sender.sent) == 1)
+    assert dispatcher.queue_depth.value() == 0
+    dispatcher.close()
+
+
+# ---------------------------------------------------------------------------
+# TwilioRestSender against a local fake Twilio endpoint
+# ---------------------------------------------------------------------------
+
+class FakeTwilio(BaseHTTPRequestHandler):
+    responses = []  # (status, headers, body) served in order, then 201
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        FakeTwilio.received.append({k: v[0] for k, v in form.items()})
+        if FakeTwilio.responses:
+            status, headers, body = FakeTwilio.responses.pop(0)
+        else:
+            status, headers, body = 201, {}, json.dumps({'sid': f"SM{len(FakeTwilio.received)}"})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # Clients that timed out leave broken pipes behind
+
+
+@pytest.fixture
+def fake_twilio():
+    pytest.importorskip("requests")
+    FakeTwilio.responses = []
+    FakeTwilio.received = []
+    server = QuietServer(("127.0.0.1", 0), FakeTwilio)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_rest_sender_posts_message(fake_twilio):
+    sender = TwilioRestSender("AC123", "token", api_base=fake_twilio)
+    assert sender.send(SENDER, "whatsapp:+1", "hola") == "SM1"
+    assert FakeTwilio.received == [{'From': SENDER, 'To': "whatsapp:+1", 'Body': "hola"}]
+    sender.close()
+
+
+@pytest.mark.parametrize("status, retryable", [(429, True), (503, True), (500, False), (400, False)])
+def test_rest_sender_classifies_status(fake_twilio, status, retryable):
+    FakeTwilio.responses = [(status, {'Retry-After': '2'}, '{}')]
+    sender = TwilioRestSender("AC123", "token", api_base=fake_twilio)
+    with pytest.raises(SendError) as excinfo:
+        sender.send(SENDER, "whatsapp:+1", "hola")
+    assert excinfo.value.retryable is retryable
+    assert excinfo.value.retry_after == 2.0
+    sender.close()
+
+
+def test_rest_sender_retries_only_unsent_requests():
+    pytest.importorskip("requests")
+    # Nothing listens on this port: the connection is refused before sending
+    server = QuietServer(("127.0.0.1", 0), FakeTwilio)
+    port = server.server_address[1]
+    server.server_close()
+    sender = TwilioRestSender("AC123", "token", api_base=f"http://127.0.0.1:{port}")
+    with pytest.raises(SendError) as excinfo:
+        sender.send(SENDER, "whatsapp:+1", "hola")
+    assert excinfo.value.retryable is True
+    sender.close()
+
+
+def test_rest_sender_read_timeout_is_not_retried(fake_twilio):
+    class SlowTwilio(FakeTwilio):
+        def do_POST(self):
+            time.sleep(0.5)
+            super().do_POST()
+
+    server = QuietServer(("127.0.0.1", 0), SlowTwilio)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sender = TwilioRestSender("AC123", "token", api_base=f"http://127.0.0.1:{server.server_address[1]}",
+                              timeout=0.1)
+    try:
+        with pytest.raises(SendError) as excinfo:
+            sender.send(SENDER, "whatsapp:+1", "hola")
+        # Twilio may already have created the message: a retry could duplicate it
+        assert excinfo.value.retryable is False
+    finally:
+        sender.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_dispatcher_delivers_through_fake_twilio(fake_twilio):
+    FakeTwilio.responses = [(429, {'Retry-After': '0.05'}, '{}')]
+    sender = TwilioRestSender("AC123", "token", api_base=fake_twilio)
+    dispatcher = make_dispatcher(sender, workers=2, backoff_base=0.01)
+    dispatcher.send_parts("whatsapp:+1", ["p1", "p2", "p3"], spacing=0.0)
+    assert wait_until(lambda: len(FakeTwilio.received) == 4)
+    assert [r['Body'] for r in FakeTwilio.received] == ["p1", "p1", "p2", "p3"]
+    dispatcher.close()
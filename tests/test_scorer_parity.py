@@ -0,0 +1,360 @@
+"""
+Scorer-level parity: the keyword scorers must give the same results as the
+substring loops they replaced ('keyword in text.lower()' per keyword).
+
+- SoftSkillsEvaluator / EnglishLevelEvaluator: compared with subclasses that
+  keep the previous method bodies verbatim.
+- Inconsistency detector DETECTION 2/4/9 and the bot's evaluate_response /
+  evaluate_soft_skills: the compiled matchers are swapped for
+  LegacyKeywordMatcher (the old loops behind the same interface) and the
+  full outputs are compared on the same corpus.
+"""
+
+import random
+
+import pytest
+
+from Modules.english_level_evaluator import EnglishLevelEvaluator, ENGLISH_INDICATORS
+from Modules.keyword_matcher import KeywordMatcher
+from Modules.soft_skills_evaluator import SoftSkillsEvaluator
+
+
+class LegacyKeywordMatcher:
+    """KeywordMatcher interface implemented with the previous per-keyword loops"""
+
+    def __init__(self, categories):
+        if not isinstance(categories, dict):
+            categories = {None: list(categories)}
+        self.categories = {category: list(words) for category, words in categories.items()}
+
+    def count(self, text):
+        text_lower = (text or "").lower()
+        return {
+            category: len([kw for kw in words if kw in text_lower])
+            for category, words in self.categories.items()
+        }
+
+    def total(self, text):
+        return sum(1 for kw in self.categories[None] if kw.lower() in (text or "").lower())
+
+    def categories_hit(self, text):
+        text_lower = (text or "").lower()
+        hit = set()
+        for category, words in self.categories.items():
+            for keyword in words:
+                if keyword in text_lower:
+                    hit.add(category)
+                    break  # Count category only once
+        return hit
+
+    def contains_any(self, text):
+        text_lower = (text or "").lower()
+        return any(pattern in text_lower for pattern in self.categories[None])
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+HANDWRITTEN = [
+    "",
+    "ok",
+    "Sí",
+    "I don't know, I'm not sure about that.",
+    "No sé cómo funciona, nunca he usado Kafka.",
+    "It depends. Generally it's a tool that helps with data pipelines.",
+    "Depende de la situación, a veces es una herramienta útil.",
+    "I built a RESTful API with Django REST Framework, PostgreSQL and Docker-Compose, "
+    "deployed with CI/CD on Kubernetes (k8s).",
+    "Normalization removes redundancy: 1NF, 2NF and 3NF. A foreign key keeps integrity. "
+    "Spark RDDs give fault tolerance through lineage.",
+    "Lideré un equipo de 5 personas, coordinamos entregas y logramos terminar antes del plazo.",
+    "I would have implemented it differently, although the architecture was scalable; "
+    "however, for example, the deployment was slow. Moreover, I mean, we utilize caching.",
+    "WELL, ACTUALLY I COLLABORATE WITH TEAMS AND MANAGE DEADLINES, ON TIME.",
+    "Mentoring juniors, documenting decisions and presenting feedback in meetings.",
+    "Team lead: I led, organized and coordinated the rollout; we achieved success quickly.",
+]
+
+
+def _keyword_pool():
+    from src import whatsapp_inconsistency_detector as detector
+
+    pool = set()
+    for words in ENGLISH_INDICATORS.values():
+        pool.update(words)
+    for words in SoftSkillsEvaluator().soft_skills_keywords.values():
+        pool.update(words)
+    pool.update(detector.DONT_KNOW_PATTERNS)
+    pool.update(detector.GENERIC_PATTERNS)
+    for words in detector.POSITION_KEYWORDS.values():
+        pool.update(words)
+    return sorted(pool)
+
+
+FILLER = ["the", "we", "and", "project", "y", "el", "de", "con", "a", "it", "in", "that", "data", "x"]
+
+
+def corpus(n=400, seed=7):
+    """Handwritten answers plus random mixes of keywords, fillers and glued fragments"""
+    rng = random.Random(seed)
+    pool = _keyword_pool()
+    texts = list(HANDWRITTEN)
+    for _ in range(n):
+        words = []
+        for _ in range(rng.randint(0, 40)):
+            roll = rng.random()
+            if roll < 0.45:
+                word = rng.choice(pool)
+            elif roll < 0.9:
+                word = rng.choice(FILLER)
+            else:
+                # Keyword glued to its neighbour ("teamwork", "apis.") - substring semantics
+                word = rng.choice(pool) + rng.choice(["", "s", "ing", ".", ","]) + rng.choice(pool)
+            if rng.random() < 0.2:
+                word = word.upper() if rng.random() < 0.5 else word.capitalize()
+            words.append(word)
+        texts.append(" ".join(words))
+    return texts
+
+
+TEXTS = corpus()
+
+
+# ---------------------------------------------------------------------------
+# Modules/soft_skills_evaluator.py
+# ---------------------------------------------------------------------------
+
+class LegacySoftSkillsEvaluator(SoftSkillsEvaluator):
+    """evaluate_soft_skills() as it was before the compiled matcher"""
+
+    def evaluate_soft_skills(self, text):
+        if not text or len(text.strip()) < 10:
+            return {skill: 0.5 for skill in self.soft_skills_keywords.keys()}
+
+        text_lower = text.lower()
+        scores = {}
+
+        for skill, keywords in self.soft_skills_keywords.items():
+            matches = sum(1 for keyword in keywords if keyword in text_lower)
+            max_expected_matches = min(len(keywords), 8)
+            score = min(matches / max_expected_matches, 1.0)
+            weighted_score = score * self.skill_weights[skill]
+            scores[skill] = round(weighted_score, 2)
+
+        return scores
+
+
+def test_soft_skills_evaluator_parity():
+    current, legacy = SoftSkillsEvaluator(), LegacySoftSkillsEvaluator()
+    for text in TEXTS:
+        expected = legacy.evaluate_soft_skills(text)
+        assert current.evaluate_soft_skills(text) == expected, text
+        assert (current.calculate_overall_soft_skills_score(current.evaluate_soft_skills(text))
+                == legacy.calculate_overall_soft_skills_score(expected))
+
+
+# ---------------------------------------------------------------------------
+# Modules/english_level_evaluator.py
+# ---------------------------------------------------------------------------
+
+class LegacyEnglishLevelEvaluator(EnglishLevelEvaluator):
+    """The four dimension scorers as they were before the compiled matcher"""
+
+    def _evaluate_grammar(self, responses, indicator_counts=None):
+        all_text = " ".join(responses).lower()
+        advanced_structures = ENGLISH_INDICATORS["advanced_structures"]
+        intermediate_structures = ENGLISH_INDICATORS["intermediate_structures"]
+        advanced_count = sum(1 for struct in advanced_structures if struct in all_text)
+        intermediate_count = sum(1 for struct in intermediate_structures if struct in all_text)
+        if advanced_count >= 2:
+            return 3
+        elif intermediate_count >= 3 or advanced_count >= 1:
+            return 2
+        else:
+            return 1
+
+    def _evaluate_vocabulary(self, responses, indicator_counts=None):
+        all_text = " ".join(responses).lower()
+        words = all_text.split()
+        if len(words) < 10:
+            return 1
+        unique_words = len(set(words))
+        lexical_diversity = unique_words / len(words)
+        technical_count = sum(1 for term in ENGLISH_INDICATORS["technical_terms"] if term in all_text)
+        sophisticated_count = sum(1 for word in ENGLISH_INDICATORS["sophisticated_words"] if word in all_text)
+        if lexical_diversity > 0.7 and (technical_count >= 3 or sophisticated_count >= 2):
+            return 3
+        elif lexical_diversity > 0.5 and (technical_count >= 1 or sophisticated_count >= 1):
+            return 2
+        else:
+            return 1
+
+    def _evaluate_fluency(self, responses, indicator_counts=None):
+        if not responses:
+            return 1
+        avg_length = sum(len(r.split()) for r in responses) / len(responses)
+        all_text = " ".join(responses).lower()
+        connector_count = sum(1 for marker in ENGLISH_INDICATORS["fluency_markers"] if marker in all_text)
+        if avg_length > 20 and connector_count >= 3:
+            return 3
+        elif avg_length > 10 and connector_count >= 1:
+            return 2
+        else:
+            return 1
+
+    def _evaluate_comprehension(self, responses, indicator_counts=None):
+        avg_length = sum(len(r.split()) for r in responses) / len(responses) if responses else 0
+        all_text = " ".join(responses).lower()
+        elaboration_count = sum(1 for marker in ENGLISH_INDICATORS["elaboration_markers"] if marker in all_text)
+        if avg_length > 15 and elaboration_count >= 2:
+            return 3
+        elif avg_length > 8 and elaboration_count >= 1:
+            return 2
+        else:
+            return 1
+
+
+def test_english_indicator_tables_match_previous_lists():
+    # The tables were hoisted out of the methods unchanged
+    assert ENGLISH_INDICATORS["advanced_structures"] == [
+        "would have", "could have", "should have", "which", "whom", "whose",
+        "despite", "although", "whereas", "however", "having", "been", "not only", "but also"
+    ]
+    assert ENGLISH_INDICATORS["intermediate_structures"] == [
+        "because", "therefore", "thus", "can", "could", "should", "would",
+        "if", "when", "while", "since", "will", "going to"
+    ]
+
+
+def test_english_level_evaluator_parity():
+    current, legacy = EnglishLevelEvaluator(), LegacyEnglishLevelEvaluator()
+    rng = random.Random(3)
+    for i in range(0, len(TEXTS), 3):
+        responses = [t for t in TEXTS[i:i + rng.randint(1, 4)] if t]
+        for declared_level in (1, 2, 3):
+            assert (current.evaluate_during_conversation(responses, declared_level)
+                    == legacy.evaluate_during_conversation(responses, declared_level)), responses
+
+
+# ---------------------------------------------------------------------------
+# src/whatsapp_inconsistency_detector.py - DETECTION 2 / 4 / 9
+# ---------------------------------------------------------------------------
+
+POSITIONS = [
+    "Backend Developer", "Data Engineer", "Analytics Engineer", "Frontend Developer",
+    "DevOps Engineer", "Full Stack Developer", "Machine Learning Engineer", "Product Designer",
+]
+
+
+def sessions(n=150, seed=11):
+    rng = random.Random(seed)
+    for _ in range(n):
+        # Mitad respuestas escritas a mano, para que cada detección salte y no salte
+        answers = [rng.choice(HANDWRITTEN if rng.random() < 0.6 else TEXTS) for _ in range(7)]
+        yield {
+            'data': {
+                'name': "Test Candidate",
+                'position': rng.choice(POSITIONS),
+                'technical_questions': [{'question': f"Q{i}", 'answer': a} for i, a in enumerate(answers[:3])],
+                'english_questions': [{'question': f"E{i}", 'answer': a} for i, a in enumerate(answers[3:5])],
+                'soft_skills': answers[5],
+                'final_answer': answers[6],
+            },
+            'scores': {'technical': rng.uniform(0, 15), 'english': rng.uniform(0, 10), 'soft_skills': rng.uniform(0, 5)},
+            'emotions': [],
+        }
+
+
+KEYWORD_DETECTIONS = ('low_confidence', 'missing_keywords', 'generic_responses')  # DETECTION 2 / 4 / 9
+
+
+def _detection_types(issues):
+    return {issue.get('type') for issue in issues} & set(KEYWORD_DETECTIONS)
+
+
+def test_detector_keyword_detections_parity(monkeypatch):
+    from src import whatsapp_inconsistency_detector as detector
+
+    corpus_sessions = list(sessions())
+    for language in ('es', 'en'):
+        current = [detector.detect_whatsapp_inconsistencies(s, language=language, use_bert=False)
+                   for s in corpus_sessions]
+        with monkeypatch.context() as patch:
+            patch.setattr(detector, '_dont_know_matcher', LegacyKeywordMatcher(detector.DONT_KNOW_PATTERNS))
+            patch.setattr(detector, '_position_keywords_matcher', LegacyKeywordMatcher(detector.POSITION_KEYWORDS))
+            patch.setattr(detector, '_generic_matcher', LegacyKeywordMatcher(detector.GENERIC_PATTERNS))
+            legacy = [detector.detect_whatsapp_inconsistencies(s, language=language, use_bert=False)
+                      for s in corpus_sessions]
+        assert current == legacy
+        # El corpus no es trivial: cada detección salta en algunas sesiones y no en otras
+        for detection in KEYWORD_DETECTIONS:
+            fired = sum(1 for issues in current if detection in _detection_types(issues))
+            assert 0 < fired < len(current), (language, detection, fired)
+        assert ([detector.calculate_trust_score(issues) for issues in current]
+                == [detector.calculate_trust_score(issues) for issues in legacy])
+
+
+def test_detector_matchers_equal_loops_per_text():
+    from src import whatsapp_inconsistency_detector as detector
+
+    pairs = [
+        (detector._dont_know_matcher, LegacyKeywordMatcher(detector.DONT_KNOW_PATTERNS)),
+        (detector._generic_matcher, LegacyKeywordMatcher(detector.GENERIC_PATTERNS)),
+    ]
+    position = LegacyKeywordMatcher(detector.POSITION_KEYWORDS)
+    for text in TEXTS:
+        for compiled, legacy in pairs:
+            assert compiled.contains_any(text) == legacy.contains_any(text), text
+        # DETECTION 4 compared len(found_keywords) per category, duplicates included
+        assert detector._position_keywords_matcher.count(text) == position.count(text), text
+
+
+# ---------------------------------------------------------------------------
+# src/whatsapp_bot.py - evaluate_response / evaluate_soft_skills
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def bot():
+    for dependency in ("flask", "twilio", "langdetect", "torch"):
+        pytest.importorskip(dependency)
+    from src import whatsapp_bot
+    return whatsapp_bot
+
+
+def test_bot_evaluate_soft_skills_parity(bot, monkeypatch):
+    current = [bot.evaluate_soft_skills(text) for text in TEXTS]
+    monkeypatch.setattr(bot, '_soft_skills_matcher', LegacyKeywordMatcher(bot.SOFT_SKILLS_KEYWORDS))
+    assert [bot.evaluate_soft_skills(text) for text in TEXTS] == current
+
+
+def test_bot_evaluate_response_parity(bot, monkeypatch):
+    cases = [
+        (question, text, position, brief)
+        for text in TEXTS
+        for question, position, brief in (
+            ("Explain REST APIs", "Backend Developer", False),
+            ("¿Qué es la normalización?", "Data Engineer", False),
+            ("Years of experience?", "General", True),
+        )
+    ]
+    current = [bot.evaluate_response(*case) for case in cases]
+    monkeypatch.setattr(bot, '_technical_keywords_matcher', LegacyKeywordMatcher(bot.TECHNICAL_KEYWORDS))
+    assert [bot.evaluate_response(*case) for case in cases] == current
+
+
+def test_bot_keyword_tables_compile_to_same_counts(bot):
+    soft = LegacyKeywordMatcher(bot.SOFT_SKILLS_KEYWORDS)
+    technical = LegacyKeywordMatcher(bot.TECHNICAL_KEYWORDS)
+    for text in TEXTS:
+        assert bot._soft_skills_matcher.categories_hit(text.lower()) == soft.categories_hit(text.lower())
+        assert bot._technical_keywords_matcher.total(text) == technical.total(text)
+
+
+def test_legacy_matcher_agrees_with_compiled_on_tricky_prefixes():
+    # Overlapping keywords sharing prefixes, duplicates and accents
+    table = {'a': ['coordin', 'coordinate', 'coordinated', 'rápid', 'api', 'apis', 'api'], 'b': ['no sé', 'no sé cómo']}
+    compiled, legacy = KeywordMatcher(table), LegacyKeywordMatcher(table)
+    for text in ["Coordinated APIs rápidamente", "no sé cómo", "NO SÉ", "apiapis", ""] + TEXTS[:50]:
+        assert compiled.count(text) == legacy.count(text), text
+        assert compiled.categories_hit(text) == legacy.categories_hit(text), text
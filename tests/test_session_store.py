@@ -0,0 +1,259 @@
+"""
+Session store tests: crash consistency of the persistent backends and the
+write-behind snapshot semantics.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from src.session_store import (
+    JournalSessionStore, JsonFileSessionStore, SQLiteSessionStore, SessionCache, WriteBehindWriter,
+    decode_session_key, encode_session_key
+)
+
+KEY = "whatsapp:+18099121128"
+
+
+def raw(session):
+    return json.dumps(session, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Filename encoding
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("key", [
+    KEY, "test_user", "test_user:x", "whatsapp:+1_2", "demo 50%", "a/b\\c", "plain",
+])
+def test_session_key_round_trip(key):
+    assert decode_session_key(encode_session_key(key)) == key
+
+
+def test_legacy_tokens_restore_channel_colon():
+    assert decode_session_key("whatsapp_+18099121128") == KEY
+
+
+def test_json_store_reads_legacy_and_migrates(tmp_path):
+    (tmp_path / "session_whatsapp_+18099121128.json").write_text(raw({'stage': 7}), encoding='utf-8')
+    store = JsonFileSessionStore(tmp_path)
+    store.save_many({"test_user": raw({'stage': 1})})
+    assert sorted(store.keys()) == sorted([KEY, "test_user"])
+    assert store.load(KEY) == {'stage': 7}
+
+    store.save_many({KEY: raw({'stage': 8})})
+    reopened = JsonFileSessionStore(tmp_path)
+    assert sorted(reopened.keys()) == sorted([KEY, "test_user"])
+    assert reopened.load("test_user") == {'stage': 1}
+    assert not (tmp_path / "session_whatsapp_+18099121128.json").exists()
+
+
+# ---------------------------------------------------------------------------
+# Journal: torn tail
+# ---------------------------------------------------------------------------
+
+def test_journal_torn_tail_keeps_previous_version(tmp_path):
+    store = JournalSessionStore(tmp_path)
+    store.save_many({KEY: raw({'stage': 3})})
+    store.close()
+    intact_size = (tmp_path / "sessions.journal").stat().st_size
+
+    # Crash in the middle of appending stage 4
+    with open(tmp_path / "sessions.journal", 'ab') as f:
+        f.write(b'{"key":"whatsapp:+18099121128","session":"{\\"stage\\": 4')
+
+    store = JournalSessionStore(tmp_path)
+    assert store.load(KEY) == {'stage': 3}
+    assert (tmp_path / "sessions.journal").stat().st_size == intact_size
+
+    # New appends start on a clean line and survive another restart
+    store.save_many({KEY: raw({'stage': 5})})
+    store.close()
+    assert JournalSessionStore(tmp_path).load(KEY) == {'stage': 5}
+
+
+def test_journal_corrupt_line_stops_replay(tmp_path):
+    store = JournalSessionStore(tmp_path)
+    store.save_many({KEY: raw({'stage': 1})})
+    store.close()
+    with open(tmp_path / "sessions.journal", 'ab') as f:
+        f.write(b'\x00\x00garbage\n')
+
+    assert JournalSessionStore(tmp_path).load(KEY) == {'stage': 1}
+
+
+def test_journal_compaction_keeps_latest(tmp_path):
+    store = JournalSessionStore(tmp_path, compact_ratio=2, min_compact_records=4)
+    for stage in range(10):
+        store.save_many({KEY: raw({'stage': stage}), "whatsapp:+1": raw({'stage': 0})})
+    store.close()
+
+    lines = (tmp_path / "sessions.journal").read_text(encoding='utf-8').splitlines()
+    assert len(lines) < 20
+    assert JournalSessionStore(tmp_path).load(KEY) == {'stage': 9}
+
+
+# ---------------------------------------------------------------------------
+# JSON files: atomic replace
+# ---------------------------------------------------------------------------
+
+def test_json_crash_before_replace_keeps_old_file(tmp_path, monkeypatch):
+    store = JsonFileSessionStore(tmp_path)
+    store.save_many({KEY: raw({'stage': 2})})
+
+    def crash(src, dst):
+        raise OSError("simulated crash before rename")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        store.save_many({KEY: raw({'stage': 3})})
+    monkeypatch.undo()
+
+    # The half-done write is only in the .tmp file, which the index ignores
+    reopened = JsonFileSessionStore(tmp_path)
+    assert reopened.keys() == [KEY]
+    assert reopened.load(KEY) == {'stage': 2}
+
+
+def test_json_replace_is_complete_file(tmp_path):
+    store = JsonFileSessionStore(tmp_path)
+    store.save_many({KEY: raw({'stage': 2, 'data': {'name': 'Ana'}})})
+    store.save_many({KEY: raw({'stage': 3})})
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 1 and files[0].endswith(".json")
+    assert JsonFileSessionStore(tmp_path).load(KEY) == {'stage': 3}
+
+
+# ---------------------------------------------------------------------------
+# SQLite: transaction rollback
+# ---------------------------------------------------------------------------
+
+def test_sqlite_failed_batch_is_rolled_back(tmp_path):
+    store = SQLiteSessionStore(tmp_path / "sessions.db")
+    store.save_many({KEY: raw({'stage': 1}), "whatsapp:+1": raw({'stage': 1})})
+
+    # The second row violates NOT NULL: the whole batch must be discarded
+    with pytest.raises(Exception):
+        store.save_many({KEY: raw({'stage': 2}), "whatsapp:+1": None})
+    store.close()
+
+    reopened = SQLiteSessionStore(tmp_path / "sessions.db")
+    assert reopened.load_versioned(KEY) == ({'stage': 1}, 1)
+    assert reopened.load_versioned("whatsapp:+1") == ({'stage': 1}, 1)
+    reopened.close()
+
+
+# ---------------------------------------------------------------------------
+# Write-behind
+# ---------------------------------------------------------------------------
+
+class FailingStore(JsonFileSessionStore):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.fail = True
+
+    def save_many(self, items):
+        if self.fail:
+            raise OSError("disk full")
+        super().save_many(items)
+
+
+def test_write_behind_persists_snapshot_not_live_dict(tmp_path):
+    store = JsonFileSessionStore(tmp_path)
+    writer = WriteBehindWriter(store, flush_interval=3600)
+    session = {'stage': 4, 'responses': ['a']}
+    writer.mark_dirty(KEY, session)
+
+    # Later mutations (outside the conversation lock) do not leak into the flush
+    session['stage'] = 5
+    session['responses'].append('b')
+    assert writer.pending(KEY) == {'stage': 4, 'responses': ['a']}
+    assert writer.flush() == 1
+    assert store.load(KEY) == {'stage': 4, 'responses': ['a']}
+    writer.close()
+
+
+def test_write_behind_coalesces_and_keeps_latest(tmp_path):
+    store = JsonFileSessionStore(tmp_path)
+    writer = WriteBehindWriter(store, flush_interval=3600)
+    for stage in range(5):
+        writer.mark_dirty(KEY, {'stage': stage})
+    assert writer.flush() == 1
+    assert writer.flush() == 0
+    assert store.load(KEY) == {'stage': 4}
+    writer.close()
+
+
+def test_write_behind_requeues_failed_flush(tmp_path):
+    store = FailingStore(tmp_path)
+    writer = WriteBehindWriter(store, flush_interval=3600)
+    writer.mark_dirty(KEY, {'stage': 1})
+    assert writer.flush() == 0
+    assert writer.pending(KEY) == {'stage': 1}
+
+    store.fail = False
+    assert writer.flush() == 1
+    assert store.load(KEY) == {'stage': 1}
+    writer.close()
+
+
+class BlockingStore(JsonFileSessionStore):
+    """save_many() waits until the test lets it finish"""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def save_many(self, items):
+        self.entered.set()
+        assert self.release.wait(5)
+        super().save_many(items)
+
+
+def test_write_behind_pending_covers_batch_being_written(tmp_path):
+    store = BlockingStore(tmp_path)
+    JsonFileSessionStore.save_many(store, {KEY: raw({'stage': 1})})
+    writer = WriteBehindWriter(store, flush_interval=3600)
+    writer.mark_dirty(KEY, {'stage': 2})
+
+    flusher = threading.Thread(target=writer.flush)
+    flusher.start()
+    assert store.entered.wait(5)
+    # The store still has stage 1: a reload now must see the in-flight snapshot
+    assert store.load(KEY) == {'stage': 1}
+    assert writer.pending(KEY) == {'stage': 2}
+
+    # A newer snapshot taken meanwhile wins over the in-flight one
+    writer.mark_dirty(KEY, {'stage': 3})
+    assert writer.pending(KEY) == {'stage': 3}
+
+    store.release.set()
+    flusher.join(5)
+    assert store.load(KEY) == {'stage': 2}
+    assert writer.pending(KEY) == {'stage': 3}
+    assert writer.flush() == 1
+    assert writer.pending(KEY) is None
+    assert store.load(KEY) == {'stage': 3}
+    writer.close()
+
+
+def test_write_behind_rejects_unserializable_session(tmp_path):
+    writer = WriteBehindWriter(JsonFileSessionStore(tmp_path), flush_interval=3600)
+    with pytest.raises(TypeError):
+        writer.mark_dirty(KEY, {'stage': 1, 'bad': object()})
+    assert writer.pending(KEY) is None
+    writer.close()
+
+
+def test_session_cache_keys_do_not_refresh_lru():
+    cache = SessionCache(max_size=2, ttl_seconds=0)
+    cache['a'] = {'stage': 1}
+    cache['b'] = {'stage': 2}
+    assert cache.keys() == ['a', 'b']
+    # Listing keys (metrics) must not keep 'a' alive
+    cache['c'] = {'stage': 3}
+    assert cache.keys() == ['b', 'c']
@@ -0,0 +1,149 @@
+"""
+SharedSessionCoordinator tests: two coordinators (as two gunicorn workers)
+sharing one SQLite file, each with its own connection and session cache.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.session_store import SQLiteSessionStore, SessionCache, SharedSessionCoordinator
+
+KEY = "whatsapp:+18099121128"
+
+
+@pytest.fixture
+def workers(tmp_path):
+    created = []
+
+    def make(**kwargs):
+        store = SQLiteSessionStore(tmp_path / "sessions.db")
+        cache = SessionCache(max_size=100, ttl_seconds=0)
+        coordinator = SharedSessionCoordinator(store, cache, poll_interval=0.005, **kwargs)
+        created.append(store)
+        return coordinator
+
+    yield make
+    for store in created:
+        store.close()
+
+
+def run_in_thread(target):
+    """Leases are owned per pid:thread, so each worker acts from its own thread"""
+    result = {}
+
+    def wrapper():
+        result['value'] = target()
+
+    thread = threading.Thread(target=wrapper)
+    thread.start()
+    return thread, result
+
+
+def test_lease_contention_waits_for_release(workers):
+    a = workers(lease_seconds=30)
+    b = workers(lease_seconds=30, acquire_timeout=5)
+    holding = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def worker_a():
+        with a.conversation(KEY):
+            holding.set()
+            release.wait(5)
+            a.cache[KEY] = {'stage': 1}
+            a.mark_dirty(KEY, {'stage': 1})
+            order.append('a')
+
+    def worker_b():
+        holding.wait(5)
+        with b.conversation(KEY):
+            order.append('b')
+            return b.load(KEY)
+
+    thread_a, _ = run_in_thread(worker_a)
+    thread_b, result_b = run_in_thread(worker_b)
+    holding.wait(5)
+    time.sleep(0.1)
+    assert order == []  # B is still waiting for A's lease
+    release.set()
+    thread_a.join(5)
+    thread_b.join(5)
+
+    assert order == ['a', 'b']
+    assert result_b['value'] == {'stage': 1}
+    assert a.conflicts == b.conflicts == 0
+
+
+def test_lease_timeout_when_holder_does_not_release(workers):
+    a = workers(lease_seconds=30)
+    b = workers(lease_seconds=30, acquire_timeout=0.1)
+
+    thread, _ = run_in_thread(lambda: a.acquire(KEY))
+    thread.join(5)
+    thread, result = run_in_thread(lambda: b.acquire(KEY))
+    thread.join(5)
+
+    assert result['value'] is False
+    assert b.lock_timeouts == 1
+
+
+def test_expired_lease_is_taken_over(workers):
+    a = workers(lease_seconds=0.05)
+    b = workers(lease_seconds=30, acquire_timeout=2)
+
+    thread, result_a = run_in_thread(lambda: a.acquire(KEY))
+    thread.join(5)
+    assert result_a['value'] is True
+
+    # A crashed without releasing: B gets the lease once it expires
+    start = time.monotonic()
+    thread, result_b = run_in_thread(lambda: b.acquire(KEY))
+    thread.join(5)
+    assert result_b['value'] is True
+    assert time.monotonic() - start < 2
+    assert b.lock_timeouts == 0
+
+
+def test_version_conflict_keeps_stored_session(workers):
+    a = workers()
+    b = workers()
+    a.store.save_many({KEY: '{"stage": 1}'})
+
+    assert a.load(KEY) == {'stage': 1}
+    assert b.load(KEY) == {'stage': 1}
+
+    b.mark_dirty(KEY, {'stage': 2, 'writer': 'b'})
+    assert b.commit(KEY) is True
+
+    # A read version 1 before B's write: its commit must not overwrite it
+    a.cache[KEY] = {'stage': 2, 'writer': 'a'}
+    a.mark_dirty(KEY, {'stage': 2, 'writer': 'a'})
+    assert a.commit(KEY) is False
+    assert a.conflicts == 1
+    assert KEY not in a.cache  # stale local copy dropped
+    assert a.store.load_versioned(KEY) == ({'stage': 2, 'writer': 'b'}, 2)
+
+
+def test_new_session_created_by_both_workers_conflicts(workers):
+    a = workers()
+    b = workers()
+    assert a.load(KEY) is None
+    assert b.load(KEY) is None
+
+    a.mark_dirty(KEY, {'stage': 0, 'writer': 'a'})
+    b.mark_dirty(KEY, {'stage': 0, 'writer': 'b'})
+    assert a.commit(KEY) is True
+    assert b.commit(KEY) is False
+    assert b.store.load(KEY) == {'stage': 0, 'writer': 'a'}
+
+
+def test_commit_advances_version_for_next_write(workers):
+    a = workers()
+    a.load(KEY)
+    for stage in range(3):
+        a.mark_dirty(KEY, {'stage': stage})
+        assert a.commit(KEY) is True
+    assert a.store.load_versioned(KEY) == ({'stage': 2}, 3)
+    assert a.conflicts == 0
@@ -0,0 +1,89 @@
+"""
+TimezoneGazetteer / TimezoneResolver tests against Data/timezone_gazetteer.json
+"""
+
+import json
+
+import pytest
+
+from Modules.timezone_gazetteer import GAZETTEER_PATH, TimezoneCache, TimezoneGazetteer, TimezoneResolver
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return TimezoneGazetteer()
+
+
+@pytest.mark.parametrize("location, zone, how", [
+    ("Bogota, Colombia", "America/Bogota", "city"),
+    ("Santo Domingo, Dominican Rep.", "America/Santo_Domingo", "city"),
+    ("Remote from New York, USA", "America/New_York", "city"),
+    ("Cordoba, Argentina", "America/Argentina/Cordoba", "city"),
+    # Ciudad conocida de otro país: decide el calificador
+    ("Cordoba, Spain", "Europe/Madrid", "country"),
+    ("Paris, Texas", "America/Chicago", "region"),
+    ("Lima, Ohio", "America/New_York", "region"),
+    ("Lima, Ohio, USA", "America/New_York", "region"),
+    ("Spokane, Washington", "America/Los_Angeles", "region"),
+    ("Miami, Florida, USA", "America/New_York", "city"),
+    ("Washington, DC", "America/New_York", "city"),
+    ("Vancouver, British Columbia", "America/Vancouver", "city"),
+    # Georgia: estado de EE. UU. o país, según la ciudad
+    ("Atlanta, Georgia", "America/New_York", "city"),
+    ("Tbilisi, Georgia", "Asia/Tbilisi", "country"),
+    # Sin calificador, igual que antes
+    ("Texas", "America/Chicago", "city"),
+    ("Paris", "Europe/Paris", "city"),
+    ("Lima", "America/Lima", "city"),
+    ("Bogta, Colombia", "America/Bogota", "country"),
+    ("Bogta", "America/Bogota", "fuzzy-city"),
+])
+def test_lookup(gazetteer, location, zone, how):
+    assert gazetteer.lookup(location) == (zone, how)
+
+
+def test_unknown_location(gazetteer):
+    assert gazetteer.lookup("Atlantis") == (None, None)
+    assert gazetteer.lookup(" , ") == (None, None)
+
+
+def test_resolver_caches_and_falls_back():
+    gazetteer = TimezoneGazetteer()
+    calls = []
+
+    def geocoder(location):
+        calls.append(location)
+        return "Europe/Oslo" if location == "Tromso" else None
+
+    resolver = TimezoneResolver(gazetteer, TimezoneCache(None), geocoder=geocoder)
+    assert resolver.resolve("Paris, Texas") == "America/Chicago"
+    assert resolver.resolve("Tromso") == "Europe/Oslo"
+    assert resolver.resolve("Tromso") == "Europe/Oslo"
+    assert resolver.resolve("Atlantis") == "UTC"
+    assert resolver.resolve("Atlantis") == "UTC"
+    assert resolver.resolve("") == "UTC"
+    assert calls == ["Tromso", "Atlantis"]
+
+
+def test_cache_drops_gazetteer_answers_when_gazetteer_changes(tmp_path):
+    data = json.loads(GAZETTEER_PATH.read_text(encoding="utf-8"))
+    path = tmp_path / "gazetteer.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    cache_path = tmp_path / "cache.json"
+
+    old = TimezoneGazetteer(path)
+    cache = TimezoneCache(cache_path, old.version)
+    cache.set("paris texas", "Europe/Paris", "gazetteer")
+    cache.set("tromso", "Europe/Oslo", "geocoder")
+    cache.flush()
+
+    # Mismo last_updated, contenido distinto: la versión cambia igual
+    data["regions"].append(["finnmark", "norway", "Europe/Oslo"])
+    path.write_text(json.dumps(data), encoding="utf-8")
+    new = TimezoneGazetteer(path)
+    assert new.version != old.version
+
+    reloaded = TimezoneCache(cache_path, new.version)
+    assert reloaded.get("paris texas") is None
+    assert reloaded.get("tromso") == "Europe/Oslo"
+    assert TimezoneResolver(new, reloaded).resolve("Paris, Texas") == "America/Chicago"